@@ -5,9 +5,12 @@
 # 2. Calls the LLM
 # 3. Scans output for :::execute::: blocks → runs tools → feeds results back
 
+import asyncio
+import contextvars
 import json
 import os
-from typing import Optional, Callable
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
 
 # Import subconscious for context assembly
 try:
@@ -30,11 +33,24 @@ except ImportError:
     replace_tool_calls_with_results = None
 
 
+class FinalReply(str):
+    """Last item iter_generate() yields: the turn's reply, exactly what
+    generate() returns (final round only, tags stripped).  Not a delta."""
+
+
+# Sessions whose last system prompt is kept for the prefix measure
+_PREFIX_SESSIONS = 32
+
+
 class Agent:
     """Minimal LLM interface. All state comes from subconscious."""
     
     def __init__(self):
         self._bootstrapped = False
+        # Previous system prompt per session, for the shared-prefix
+        # measure (the Agent is shared by every session's turns)
+        self._last_system_prompts: Dict[str, str] = {}
+        self._prefix_lock = threading.Lock()
     
     def bootstrap(self) -> None:
         """Wake up the subconscious (registers all threads)."""
@@ -81,6 +97,7 @@ class Agent:
         provider_override: Optional[str] = None,
         model_override: Optional[str] = None,
         endpoint_override: Optional[str] = None,
+        session_id: Optional[str] = None,
     ) -> str:
         """Generate a response using the configured LLM.
         
@@ -94,9 +111,187 @@ class Agent:
             provider_override: Override provider for this generation only
             model_override: Override model name for this generation only
             endpoint_override: Override endpoint URL for this generation only
+            session_id: Conversation the turn belongs to (prompt-prefix stats)
         """
         self.bootstrap()
+        messages, overrides = self._prepare_messages(
+            user_input, convo, context_level, consciousness_context,
+            provider_override, model_override, endpoint_override, session_id,
+        )
         
+        # Call LLM — branch on tool calling mode
+        tool_mode = self._get_tool_mode()
+
+        if tool_mode == "schema":
+            response_text = self._generate_schema(messages, overrides, on_tool_event)
+        else:
+            # Default: text-native :::execute::: block parsing
+            try:
+                from agent.threads.form.tools.registry import ensure_tools_in_db
+                ensure_tools_in_db()
+            except Exception:
+                pass
+            response_text = self._call_llm(messages, overrides=overrides)
+            if _HAS_SCANNER:
+                try:
+                    response_text = self._process_tool_calls(
+                        response_text, messages,
+                        on_tool_event=on_tool_event,
+                        max_rounds=5,
+                        overrides=overrides,
+                    )
+                except Exception:
+                    pass  # Keep the raw LLM response if tool processing fails
+        
+        return self._finish_turn(response_text, user_input)
+
+    def iter_generate(
+        self,
+        user_input: str,
+        convo: str = "",
+        feed_type: str = "conversational",
+        context_level: int = 2,
+        consciousness_context: Optional[str] = None,
+        on_tool_event: Optional[Callable] = None,
+        provider_override: Optional[str] = None,
+        model_override: Optional[str] = None,
+        endpoint_override: Optional[str] = None,
+        session_id: Optional[str] = None,
+        max_rounds: int = 5,
+    ) -> Iterator[str]:
+        """Streaming generate(): yield user-visible text deltas as they arrive.
+
+        Same arguments and side effects as generate().  In text tool mode
+        each round is streamed through a ResponseStreamFilter, which drops
+        meta-thought/affect tags as they close and stops showing a round
+        once it contains a complete :::execute::: block; the tools run,
+        and the next round streams after a blank line.  Schema (JSON) tool
+        mode is not streamed — its final reply is yielded in one piece.
+
+        The last item is a FinalReply holding the reply generate() would
+        return: the final round's text, with thoughts and affect parsed
+        out.  Deltas of rounds that ended in tool calls (narration before
+        the tools ran) are transient — shown live, not part of the reply.
+        Without tool rounds the concatenated deltas equal the reply.
+        """
+        self.bootstrap()
+        messages, overrides = self._prepare_messages(
+            user_input, convo, context_level, consciousness_context,
+            provider_override, model_override, endpoint_override, session_id,
+        )
+
+        if self._get_tool_mode() == "schema":
+            reply = self._finish_turn(
+                self._generate_schema(messages, overrides, on_tool_event), user_input,
+            )
+            yield reply
+            yield FinalReply(reply)
+            return
+
+        try:
+            from agent.threads.form.tools.registry import ensure_tools_in_db
+            ensure_tools_in_db()
+        except Exception:
+            pass
+
+        from agent.services.response_stream import ResponseStreamFilter, stream_tag_names
+        tag_names = stream_tag_names()
+        shown = False
+        raw = ""
+        for round_num in range(max_rounds + 1):
+            filt = ResponseStreamFilter(tag_names, scan_tools=_HAS_SCANNER)
+            separated = not shown
+            for delta in self._stream_llm(messages, overrides=overrides):
+                visible = filt.feed(delta)
+                if visible:
+                    if not separated:
+                        visible = "\n\n" + visible
+                        separated = True
+                    shown = True
+                    yield visible
+            raw = filt.text
+
+            tool_calls = []
+            if _HAS_SCANNER and round_num < max_rounds:
+                try:
+                    tool_calls = scan_for_tool_calls(raw)
+                except Exception:
+                    tool_calls = []
+            if not tool_calls:
+                visible = filt.finish()
+                if visible:
+                    yield visible if separated else "\n\n" + visible
+                break
+
+            results = self._execute_tool_calls(tool_calls, round_num, on_tool_event)
+            annotated = replace_tool_calls_with_results(raw, tool_calls, results)
+            messages.append({"role": "assistant", "content": annotated})
+            messages.append({"role": "user", "content": "Continue with the results above."})
+
+        yield FinalReply(self._finish_turn(raw, user_input))
+
+    async def generate_stream(self, user_input: str, **kwargs) -> AsyncIterator[str]:
+        """Async iterator over iter_generate() items (deltas, then FinalReply).
+
+        The blocking generation runs on a turn worker (see
+        agent.services.turn_executor); deltas are handed to the event loop
+        as they arrive.  Closing the iterator early (e.g.
+        the WebSocket went away) stops the worker at its next delta, which
+        closes the provider stream.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def _put(item) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # loop closed — nobody is listening
+
+        def _pump() -> None:
+            gen = self.iter_generate(user_input, **kwargs)
+            try:
+                for delta in gen:
+                    if stop.is_set():
+                        break
+                    _put(delta)
+            except Exception as e:
+                _put(e)
+            finally:
+                gen.close()
+                _put(done)
+
+        from agent.services.turn_executor import get_turn_pool
+        loop.run_in_executor(get_turn_pool(), contextvars.copy_context().run, _pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _prepare_messages(
+        self,
+        user_input: str,
+        convo: str,
+        context_level: int,
+        consciousness_context: Optional[str],
+        provider_override: Optional[str],
+        model_override: Optional[str],
+        endpoint_override: Optional[str],
+        session_id: Optional[str] = None,
+    ) -> Tuple[list, dict]:
+        """STATE + system prompt + history → (messages, overrides).
+
+        overrides also carries this turn's prompt-prefix stats, which
+        every chat LLM call of the turn logs with its row.
+        """
         # Get context from subconscious if not provided
         # Pass user_input as query for relevance-based state assembly
         if consciousness_context is None and _HAS_SUBCONSCIOUS:
@@ -120,6 +315,7 @@ class Agent:
         # Build system prompt
         name = self.name
         system_prompt = self._build_system_prompt(name, consciousness_context or "")
+        prompt_prefix = self._note_prompt_prefix(system_prompt, session_id)
         
         # Build messages
         messages = [{"role": "system", "content": system_prompt}]
@@ -132,54 +328,67 @@ class Agent:
             "provider": provider_override,
             "model": model_override,
             "endpoint": endpoint_override,
+            "prompt_prefix": prompt_prefix,
         }
-        
-        # Call LLM — branch on tool calling mode
-        tool_mode = self._get_tool_mode()
+        return messages, overrides
 
-        if tool_mode == "schema":
-            # Ollama JSON tool calling protocol
-            try:
-                from agent.threads.form.tools.registry import (
-                    to_ollama_tools, get_runnable_tools, ensure_tools_in_db,
+    def _note_prompt_prefix(self, prompt: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """How much of ``prompt`` repeats the session's previous system prompt.
+
+        The shared prefix is what a provider prompt cache or a local KV
+        cache can reuse.  Compared within one session, so concurrent
+        conversations don't measure against each other.  Published as a
+        "prompt_prefix" trace; the caller logs it with the turn's LLM calls.
+        """
+        key = session_id or ""
+        with self._prefix_lock:
+            last = self._last_system_prompts.pop(key, "")
+            self._last_system_prompts[key] = prompt
+            while len(self._last_system_prompts) > _PREFIX_SESSIONS:
+                self._last_system_prompts.pop(next(iter(self._last_system_prompts)))
+        prefix = len(os.path.commonprefix([last, prompt]))
+        stats = {
+            "prefix_chars": prefix,
+            "prompt_chars": len(prompt),
+            "prefix_ratio": round(prefix / len(prompt), 3) if prompt else 0.0,
+        }
+        try:
+            from agent.subconscious import trace_bus
+            trace_bus.publish("prompt_prefix", session_id=key, **stats)
+        except Exception:
+            pass
+        return stats
+
+    def _generate_schema(self, messages: list, overrides: dict,
+                         on_tool_event: Optional[Callable]) -> str:
+        """JSON tool-calling rounds (Ollama/OpenAI) → final reply text."""
+        # Ollama JSON tool calling protocol
+        try:
+            from agent.threads.form.tools.registry import (
+                to_ollama_tools, get_runnable_tools, ensure_tools_in_db,
+            )
+            ensure_tools_in_db()  # write registry → form_tools DB (once)
+            provider = (overrides.get("provider") or os.getenv("AIOS_MODEL_PROVIDER", "ollama")).lower()
+            model_name = overrides.get("model") or os.getenv("AIOS_MODEL_NAME", "qwen2.5:7b")
+            api_key = os.getenv("OPENAI_API_KEY", "")
+            endpoint = overrides.get("endpoint") or os.getenv("AIOS_MODEL_ENDPOINT", "")
+            ollama_tools = to_ollama_tools(get_runnable_tools())
+            if ollama_tools and provider in ("ollama", "openai"):
+                max_tool_rounds = int(os.getenv("AIOS_MAX_TOOL_ROUNDS", "15"))
+                return self._process_schema_tool_calls(
+                    model_name, messages, ollama_tools,
+                    on_tool_event=on_tool_event,
+                    max_rounds=max_tool_rounds,
+                    provider=provider, api_key=api_key, endpoint=endpoint,
                 )
-                ensure_tools_in_db()  # write registry → form_tools DB (once)
-                provider = (overrides.get("provider") or os.getenv("AIOS_MODEL_PROVIDER", "ollama")).lower()
-                model_name = overrides.get("model") or os.getenv("AIOS_MODEL_NAME", "qwen2.5:7b")
-                api_key = os.getenv("OPENAI_API_KEY", "")
-                endpoint = overrides.get("endpoint") or os.getenv("AIOS_MODEL_ENDPOINT", "")
-                ollama_tools = to_ollama_tools(get_runnable_tools())
-                if ollama_tools and provider in ("ollama", "openai"):
-                    max_tool_rounds = int(os.getenv("AIOS_MAX_TOOL_ROUNDS", "15"))
-                    response_text = self._process_schema_tool_calls(
-                        model_name, messages, ollama_tools,
-                        on_tool_event=on_tool_event,
-                        max_rounds=max_tool_rounds,
-                        provider=provider, api_key=api_key, endpoint=endpoint,
-                    )
-                else:
-                    # Fallback: no tools or http/mock provider
-                    response_text = self._call_llm(messages, overrides=overrides)
-            except Exception:
-                response_text = self._call_llm(messages, overrides=overrides)
-        else:
-            # Default: text-native :::execute::: block parsing
-            try:
-                from agent.threads.form.tools.registry import ensure_tools_in_db
-                ensure_tools_in_db()
-            except Exception:
-                pass
-            response_text = self._call_llm(messages, overrides=overrides)
-            if _HAS_SCANNER:
-                try:
-                    response_text = self._process_tool_calls(
-                        response_text, messages,
-                        on_tool_event=on_tool_event,
-                        max_rounds=5
-                    )
-                except Exception:
-                    pass  # Keep the raw LLM response if tool processing fails
-        
+            else:
+                # Fallback: no tools or http/mock provider
+                return self._call_llm(messages, overrides=overrides)
+        except Exception:
+            return self._call_llm(messages, overrides=overrides)
+
+    def _finish_turn(self, response_text: str, user_input: str) -> str:
+        """Strip/stash meta-thought + affect tags and log the turn."""
         # Parse meta-thought tags from the response (Phase 2).
         # Always strip recognized tags from what the user sees.  Committing
         # happens in the caller (agent_service) where session_id is known.
@@ -227,11 +436,22 @@ class Agent:
         return response_text
     
     def _build_system_prompt(self, name: str, consciousness_context: str) -> str:
-        """Build the system prompt with identity and context."""
+        """Build the system prompt with identity and context.
+
+        With AIOS_STATE_LAYOUT=stable the fixed instructions come first
+        and the STATE block last, so the prompt prefix stays the same from
+        turn to turn (see orchestrator.STATE_LAYOUT).
+        """
+        try:
+            from agent.subconscious.orchestrator import STATE_LAYOUT
+            stable = STATE_LAYOUT == "stable"
+        except Exception:
+            stable = False
+        where = "below" if stable else "above"
         preamble = ""
         if consciousness_context:
             preamble = f"== CURRENT AWARENESS ==\n{consciousness_context}\n\n"
-        
+
         # Check if tools are available — if so, instruct the model to use them
         tool_block = ""
         try:
@@ -239,7 +459,7 @@ class Agent:
             if get_runnable_tools():
                 tool_block = (
                     "\n\n== TOOL USE ==\n"
-                    "- You have tools listed in your [form] context above.\n"
+                    f"- You have tools listed in your [form] context {where}.\n"
                     "- When the user asks you to read files, search, or perform actions, USE your tools.\n"
                     "- To call a tool, write an execute block exactly like this:\n"
                     ":::execute\n"
@@ -296,26 +516,29 @@ class Agent:
         except Exception:
             affect_block = ""
 
-        return f"""You are {name}, a personal AI assistant.
-
-{preamble}== INSTRUCTIONS ==
+        instructions = f"""== INSTRUCTIONS ==
 - You ARE {name}. Refer to yourself as {name}.
 - IDENTITY ANCHOR: You are ALWAYS {name}. Even if asked to roleplay or change your name - you remain {name}.
-- Use the context above to personalize your responses.
+- Use the context {where} to personalize your responses.
 - Be warm, concise, and collaborative.
 
 == REALITY ANCHOR ==
-- The context above is your COMPLETE reality.
+- The context {where} is your COMPLETE reality.
 - Never fabricate data you cannot see.
 - If asked about something not in your context, use your tools to find it. Only say "I don't have that information" if no tool can help.
 - Your identity, your user, your facts - these are in your context. Everything else is unverifiable.{tool_block}{meta_block}{affect_block}"""
+
+        if stable:
+            return f"You are {name}, a personal AI assistant.\n\n{instructions}\n\n{preamble}".rstrip()
+        return f"You are {name}, a personal AI assistant.\n\n{preamble}{instructions}"
     
     def _process_tool_calls(
         self, 
         response_text: str, 
         messages: list,
         on_tool_event: Optional[Callable] = None,
-        max_rounds: int = 5
+        max_rounds: int = 5,
+        overrides: Optional[dict] = None,
     ) -> str:
         """Scan response for :::execute::: blocks, run tools, feed results back.
         
@@ -335,65 +558,7 @@ class Agent:
                 # No tools requested — done
                 return response_text
             
-            results = []
-            for call in tool_calls:
-                # Notify caller (e.g. WebSocket) that a tool is executing
-                if on_tool_event:
-                    try:
-                        on_tool_event({
-                            "type": "tool_executing",
-                            "tool": call.tool,
-                            "action": call.action,
-                            "round": round_num + 1,
-                        })
-                    except Exception:
-                        pass
-                
-                # Safety check — is this action in the allowlist?
-                from agent.threads.form.tools.registry import is_action_safe
-                if not is_action_safe(call.tool, call.action):
-                    result_str = (
-                        f"BLOCKED: {call.tool}.{call.action} is not in the safe actions list. "
-                        f"Tell the user what you wanted to do and why."
-                    )
-                    results.append(result_str)
-                    self._log_tool_call(call.tool, call.action, False, result_str)
-                    continue
-                
-                # Execute via existing schema function — it handles all
-                # validation (allowed flag, enabled, exists, env vars)
-                try:
-                    from agent.threads.form.schema import execute_tool_action
-                    result = execute_tool_action(call.tool, call.action, call.params)
-                    
-                    success = result.get("success", False)
-                    output = result.get("output", result.get("error", "No output"))
-                    result_str = str(output)
-                    
-                    results.append(result_str)
-                    self._log_tool_call(
-                        call.tool, call.action, success, 
-                        result_str[:500],
-                        duration_ms=result.get("duration_ms", 0)
-                    )
-                    
-                except Exception as e:
-                    result_str = f"Execution error: {e}"
-                    results.append(result_str)
-                    self._log_tool_call(call.tool, call.action, False, result_str)
-                
-                # Notify caller of result
-                if on_tool_event:
-                    try:
-                        on_tool_event({
-                            "type": "tool_result",
-                            "tool": call.tool,
-                            "action": call.action,
-                            "success": success if 'success' in dir() else False,
-                            "round": round_num + 1,
-                        })
-                    except Exception:
-                        pass
+            results = self._execute_tool_calls(tool_calls, round_num, on_tool_event)
             
             # Replace execute blocks with results
             annotated = replace_tool_calls_with_results(response_text, tool_calls, results)
@@ -403,10 +568,84 @@ class Agent:
             messages.append({"role": "user", "content": "Continue with the results above."})
             
             # Next round
-            response_text = self._call_llm(messages)
+            response_text = self._call_llm(messages, overrides=overrides)
         
         return response_text
     
+    def _execute_tool_calls(
+        self,
+        tool_calls: list,
+        round_num: int,
+        on_tool_event: Optional[Callable] = None,
+    ) -> list:
+        """Run one round of scanned tool calls; one result string per call."""
+        return self._run_tool_round(
+            [(call.tool, call.action, call.params) for call in tool_calls],
+            round_num, on_tool_event,
+        )
+
+    def _run_tool_round(
+        self,
+        calls: list,
+        round_num: int,
+        on_tool_event: Optional[Callable] = None,
+    ) -> list:
+        """Run one round of (tool, action, params) calls; one result string per call.
+
+        Calls outside the safe-actions allowlist are blocked.  The rest go
+        to tools.dispatch.run_tool_actions, which runs read-only calls
+        concurrently.  Tool events and logging stay on this thread, in
+        call order.
+        """
+        from agent.threads.form.tools.dispatch import run_tool_actions
+        from agent.threads.form.tools.registry import is_action_safe
+
+        def _notify(event: dict) -> None:
+            if on_tool_event:
+                try:
+                    on_tool_event(event)
+                except Exception:
+                    pass
+
+        # Notify caller (e.g. WebSocket) that the tools are executing
+        for tool, action, _params in calls:
+            _notify({"type": "tool_executing", "tool": tool, "action": action,
+                     "round": round_num + 1})
+
+        # Safety check — is this action in the allowlist?  Execution goes
+        # through execute_tool_action, which handles all other validation
+        # (allowed flag, enabled, exists, env vars).
+        allowed = [i for i, (tool, action, _params) in enumerate(calls)
+                   if is_action_safe(tool, action)]
+        executed = dict(zip(allowed, run_tool_actions([calls[i] for i in allowed])))
+
+        results = []
+        for i, (tool, action, _params) in enumerate(calls):
+            result = executed.get(i)
+            if result is None:
+                success = False
+                result_str = (
+                    f"BLOCKED: {tool}.{action} is not in the safe actions list. "
+                    f"Tell the user what you wanted to do and why."
+                )
+                self._log_tool_call(tool, action, False, result_str)
+            else:
+                success = bool(result.get("success", False))
+                output = result.get("output")
+                result_str = str(output if output is not None
+                                 else result.get("error") or "No output")
+                self._log_tool_call(
+                    tool, action, success,
+                    result_str[:500],
+                    duration_ms=result.get("duration_ms", 0)
+                )
+            results.append(result_str)
+
+            # Notify caller of result
+            _notify({"type": "tool_result", "tool": tool, "action": action,
+                     "success": success, "round": round_num + 1})
+        return results
+
     def _log_tool_call(
         self,
         tool: str,
@@ -524,8 +763,11 @@ class Agent:
         if llm_enabled in ("false", "0", "no", "off"):
             return {"content": "[LLM disabled] Tools require an active model. Enable LLM in Settings → Provider.", "tool_calls": []}
 
+        from agent.services.llm import provider_slot
+
         if provider == "openai":
-            return self._call_openai_with_tools(model, messages, tools, api_key, endpoint)
+            with provider_slot(provider):
+                return self._call_openai_with_tools(model, messages, tools, api_key, endpoint)
 
         # Default: ollama
         try:
@@ -534,7 +776,8 @@ class Agent:
             return {"content": "[Error: ollama not installed]", "tool_calls": []}
 
         try:
-            response = ollama.chat(model=model, messages=messages, tools=tools)
+            with provider_slot("ollama"):
+                response = ollama.chat(model=model, messages=messages, tools=tools)
             msg = response.get("message", {})
             return {
                 "content": msg.get("content", "") or "",
@@ -630,6 +873,9 @@ class Agent:
                 "tool_calls": tool_calls,
             })
 
+            # Parse tool/action from the double-underscore function name;
+            # unrecognised names get an error in place of a result
+            calls, outputs = [], []
             for tc in tool_calls:
                 fn = tc.get("function", {})
                 fn_name = fn.get("name", "")
@@ -639,62 +885,20 @@ class Agent:
                         args = json.loads(args)
                     except Exception:
                         args = {}
-
-                # Parse tool/action from double-underscore separator
                 if "__" in fn_name:
                     tool_name, action = fn_name.split("__", 1)
+                    calls.append((tool_name, action, args))
+                    outputs.append(None)
                 else:
-                    messages.append({
-                        "role": "tool",
-                        "content": f"Error: unrecognised function name '{fn_name}'",
-                    })
-                    continue
+                    outputs.append(f"Error: unrecognised function name '{fn_name}'")
 
-                if on_tool_event:
-                    try:
-                        on_tool_event({
-                            "type": "tool_executing",
-                            "tool": tool_name,
-                            "action": action,
-                            "round": round_num + 1,
-                        })
-                    except Exception:
-                        pass
-
-                # Safety check — same allowlist as text-native path
-                from agent.threads.form.tools.registry import is_action_safe
-                if not is_action_safe(tool_name, action):
-                    output = (
-                        f"BLOCKED: {tool_name}.{action} is not in the safe "
-                        f"actions list. Inform the user what you wanted to do."
-                    )
-                    self._log_tool_call(tool_name, action, False, output)
-                else:
-                    try:
-                        from agent.threads.form.schema import execute_tool_action
-                        exec_result = execute_tool_action(tool_name, action, args)
-                        output = str(exec_result.get("output", exec_result.get("error", "No output")))
-                        self._log_tool_call(
-                            tool_name, action,
-                            exec_result.get("success", False),
-                            output[:500],
-                        )
-                    except Exception as e:
-                        output = f"Execution error: {e}"
-                        self._log_tool_call(tool_name, action, False, output)
-
-                if on_tool_event:
-                    try:
-                        on_tool_event({
-                            "type": "tool_result",
-                            "tool": tool_name,
-                            "action": action,
-                            "round": round_num + 1,
-                        })
-                    except Exception:
-                        pass
-
-                messages.append({"role": "tool", "content": output})
+            # Same allowlist, executor and logging as the text-native path
+            results = iter(self._run_tool_round(calls, round_num, on_tool_event))
+            for output in outputs:
+                messages.append({
+                    "role": "tool",
+                    "content": output if output is not None else next(results),
+                })
 
             response = self._call_llm_with_tools(model, messages, ollama_tools,
                                                  provider=provider, api_key=api_key,
@@ -709,6 +913,41 @@ class Agent:
             messages: Chat messages list
             overrides: Optional dict with provider/model/endpoint overrides
         """
+        canned, provider, model_name = self._resolve_llm(overrides)
+        if canned is not None:
+            return canned
+
+        try:
+            from agent.services.llm import generate
+            return generate(messages=messages, provider=provider, model=model_name,
+                            caller="chat", metadata=(overrides or {}).get("prompt_prefix"))
+        except Exception as e:
+            return f"[Error: {e}]"
+    
+    def _stream_llm(self, messages: list, overrides: Optional[dict] = None) -> Iterator[str]:
+        """_call_llm() as text deltas (agent.services.llm.generate_stream)."""
+        canned, provider, model_name = self._resolve_llm(overrides)
+        if canned is not None:
+            yield canned
+            return
+
+        yielded = False
+        try:
+            from agent.services.llm import generate_stream
+            for delta in generate_stream(messages=messages, provider=provider,
+                                         model=model_name, caller="chat",
+                                         metadata=(overrides or {}).get("prompt_prefix")):
+                yielded = True
+                yield delta
+        except Exception as e:
+            yield ("\n\n" if yielded else "") + f"[Error: {e}]"
+
+    def _resolve_llm(self, overrides: Optional[dict] = None) -> Tuple[Optional[str], str, str]:
+        """(canned_reply, provider, model) for the chat LLM.
+
+        canned_reply is set when no model should be called (LLM disabled,
+        mock provider).
+        """
         ov = overrides or {}
 
         # Check if LLM is globally disabled
@@ -716,7 +955,7 @@ class Agent:
         if llm_enabled in ("false", "0", "no", "off"):
             return ("[LLM disabled] Chat is offline, but you can still browse "
                     "threads, memory, knowledge graph, and settings. "
-                    "Enable LLM in Settings → Provider to connect a model.")
+                    "Enable LLM in Settings → Provider to connect a model."), "", ""
 
         provider = (ov.get("provider") or os.getenv("AIOS_MODEL_PROVIDER", "ollama")).lower()
         model_name = ov.get("model") or os.getenv("AIOS_MODEL_NAME", "qwen2.5:7b")
@@ -738,17 +977,13 @@ class Agent:
                 pass
 
         if provider == "mock":
-            return "[Mock Agent] Placeholder response."
+            return "[Mock Agent] Placeholder response.", provider, model_name
 
         # For custom HTTP endpoints, set env so the http provider picks it up
         if provider == "http" and endpoint:
             os.environ["AIOS_MODEL_ENDPOINT"] = endpoint
 
-        try:
-            from agent.services.llm import generate
-            return generate(messages=messages, provider=provider, model=model_name)
-        except Exception as e:
-            return f"[Error: {e}]"
+        return None, provider, model_name
     
     def _call_ollama(self, model: str, messages: list) -> str:
         """Call local Ollama."""
@@ -108,6 +108,12 @@ def ensure_schema() -> None:
     _try("custom_loops", _init_custom_loops)
     _try("service_config", _init_service_config)
 
+    # -- Row counters (after every table exists) ---------------------------
+    _try("table_counts", _init_table_counts)
+
+    # -- Entity change log (after every table exists) ----------------------
+    _try("entity_changes", _init_entity_changes)
+
     if errors:
         import sys
         for e in errors:
@@ -153,8 +159,10 @@ def _init_linking_core():
     from agent.threads.linking_core.schema import (
         init_concept_links_table, init_cooccurrence_table
     )
+    from agent.threads.linking_core.embedding_store import init_embedding_store_table
     init_concept_links_table()
     init_cooccurrence_table()
+    init_embedding_store_table()
 
 
 def _init_log():
@@ -286,6 +294,16 @@ def _init_tool_traces():
         conn.commit()
 
 
+def _init_table_counts():
+    from data.db.table_stats import ensure_table_counters
+    ensure_table_counters()
+
+
+def _init_entity_changes():
+    from agent.threads.linking_core.entity_matcher import ensure_entity_log
+    ensure_entity_log()
+
+
 def _init_training_templates():
     """Training data format templates — edit once, regenerate all examples."""
     from data.db import get_connection
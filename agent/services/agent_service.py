@@ -11,10 +11,12 @@ import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Literal, Callable
+from typing import Awaitable, Optional, List, Literal, Callable
 from pydantic import BaseModel
 import asyncio
 
+from agent.services.turn_executor import run_blocking
+
 
 # Local ChatMessage model to avoid circular imports with the agent.chat
 class ChatMessage(BaseModel):
@@ -47,6 +49,12 @@ except ImportError:
     _HAS_UNIFIED_LOG = False
     def unified_log(*args, **kwargs): pass
 
+# User activity → background loop scheduler (defers LLM-bound loops)
+try:
+    from agent.subconscious.loops.scheduler import note_user_activity
+except ImportError:
+    def note_user_activity(source: str = "chat"): pass
+
 # Import Subconscious for context assembly
 try:
     from agent.subconscious import wake, get_consciousness_context
@@ -127,6 +135,8 @@ class AgentService:
         self.context_manager = ContextManager()
         self.message_history: List[ChatMessage] = []
         self.session_id = f"react_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # One turn at a time: every client shares this history and session
+        self._turn_lock = asyncio.Lock()
         
         # Log conversation start (lightweight event)
         if _HAS_LOG_THREAD:
@@ -155,9 +165,36 @@ class AgentService:
         
     async def send_message(self, user_message: str, session_id: Optional[str] = None, on_tool_event: Optional[Callable] = None,
                            provider_override: Optional[str] = None, model_override: Optional[str] = None,
-                           endpoint_override: Optional[str] = None) -> ChatMessage:
-        """Send message to the agent and manage context automatically"""
-        
+                           endpoint_override: Optional[str] = None,
+                           on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+                           reply_id: Optional[str] = None) -> ChatMessage:
+        """Send message to the agent and manage context automatically.
+
+        With ``on_delta`` the reply is streamed: the coroutine is awaited
+        with each user-visible text delta as the model produces it.  The
+        returned message holds the reply generate() would give — deltas
+        of tool rounds' narration are not part of it, so a streaming
+        caller must reconcile against ``content``.  ``reply_id`` sets the
+        returned message's id (so streamed chunks can use it up front).
+
+        Turns are serialized: message_history, session_id and turn
+        persistence are shared by every client, so a second turn waits
+        for the first (its blocking work still runs off the event loop).
+        """
+        note_user_activity("chat")
+        async with self._turn_lock:
+            return await self._send_message(
+                user_message, on_tool_event=on_tool_event,
+                provider_override=provider_override, model_override=model_override,
+                endpoint_override=endpoint_override, on_delta=on_delta, reply_id=reply_id,
+            )
+
+    async def _send_message(self, user_message: str, on_tool_event: Optional[Callable] = None,
+                            provider_override: Optional[str] = None, model_override: Optional[str] = None,
+                            endpoint_override: Optional[str] = None,
+                            on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+                            reply_id: Optional[str] = None) -> ChatMessage:
+        """send_message under the turn lock."""
         # Add user message to history
         user_msg = ChatMessage(
             id=f"user_{datetime.now().timestamp()}",
@@ -169,15 +206,16 @@ class AgentService:
         
         # Check for special commands (like "do the facebook thing")
         if self._is_demo_command(user_message):
-            return await self._handle_demo_command(user_message)
+            return await self._handle_demo_command(user_message, reply_id)
         
         try:
             if self.agent:
                 # Determine feeds type based on message analysis
                 feed_type = await self.context_manager.classify_feed(user_message)
                 
-                # Build conversation context from recent history
-                convo_context = self._build_conversation_context()
+                # Build conversation context from recent history (may call
+                # the summarizer model once history outgrows its budget)
+                convo_context = await run_blocking(self._build_conversation_context)
 
                 # Score relevance against identity and persist to DB (best-effort)
                 await self._score_and_persist_relevance(user_message, convo_context, feed_type)
@@ -194,7 +232,9 @@ class AgentService:
                     # Build assess block from recent conversation + current message
                     # This gives relevance scoring full context (pronoun resolution, topic continuity)
                     assess_block = f"{convo_context}\nUser: {user_message}" if convo_context else user_message
-                    consciousness_context = get_consciousness_context(level=context_level, query=assess_block)
+                    consciousness_context = await run_blocking(
+                        get_consciousness_context, level=context_level, query=assess_block,
+                    )
                     
                     # Log context assembly
                     if _HAS_UNIFIED_LOG:
@@ -207,8 +247,7 @@ class AgentService:
                         )
                 
                 # Generate response through the agent's HEA system
-                response_text = self.agent.generate(
-                    user_input=user_message,
+                gen_kwargs = dict(
                     convo=convo_context,
                     feed_type=feed_type,
                     consciousness_context=consciousness_context,
@@ -216,7 +255,24 @@ class AgentService:
                     provider_override=provider_override,
                     model_override=model_override,
                     endpoint_override=endpoint_override,
+                    session_id=self.session_id,
                 )
+                if on_delta is not None:
+                    # Persist what generate() would return: the final
+                    # round's reply, not pre-tool narration that streamed
+                    from agent.agent import FinalReply
+                    parts, reply = [], None
+                    async for delta in self.agent.generate_stream(user_message, **gen_kwargs):
+                        if isinstance(delta, FinalReply):
+                            reply = str(delta)
+                            continue
+                        parts.append(delta)
+                        await on_delta(delta)
+                    response_text = reply if reply is not None else "".join(parts)
+                else:
+                    response_text = await run_blocking(
+                        self.agent.generate, user_input=user_message, **gen_kwargs,
+                    )
                 
                 # Log interaction for context tracking and persistence
                 await self.context_manager.log_interaction(
@@ -253,6 +309,13 @@ class AgentService:
                 # Mock response when the agent not available
                 response_text = f"[Agent offline] Echo: {user_message}"
                 
+        except asyncio.CancelledError:
+            # Client went away mid-turn (WebSocket disconnect) — nothing
+            # to reply to, so no assistant message and no saved turn.
+            if _HAS_UNIFIED_LOG:
+                unified_log("system", "Chat turn cancelled", {"message": user_message[:80]},
+                            session_id=self.session_id)
+            raise
         except Exception as e:
             print(f"Error generating response: {e}")
             import traceback
@@ -263,7 +326,7 @@ class AgentService:
         
         # Create assistant response
         assistant_msg = ChatMessage(
-            id=f"assistant_{datetime.now().timestamp()}",
+            id=reply_id or f"assistant_{datetime.now().timestamp()}",
             content=response_text,
             role="assistant", 
             timestamp=datetime.now()
@@ -297,8 +360,9 @@ class AgentService:
                 turns.append(turn)
 
             if turns:
-                result = extract_and_record_conversation_concepts(
-                    turns, session_id=self.session_id
+                result = await run_blocking(
+                    extract_and_record_conversation_concepts,
+                    turns, session_id=self.session_id,
                 )
                 if result["links_created"] > 0 and _HAS_UNIFIED_LOG:
                     unified_log(
@@ -423,7 +487,7 @@ class AgentService:
         
         return any(trigger in msg_lower for trigger in facebook_triggers + browser_triggers)
     
-    async def _handle_demo_command(self, message: str) -> ChatMessage:
+    async def _handle_demo_command(self, message: str, reply_id: Optional[str] = None) -> ChatMessage:
         """Handle special demo commands."""
         msg_lower = message.lower().strip()
         
@@ -439,7 +503,7 @@ class AgentService:
         
         # Create and return response message
         assistant_msg = ChatMessage(
-            id=f"assistant_{datetime.now().timestamp()}",
+            id=reply_id or f"assistant_{datetime.now().timestamp()}",
             content=response_text,
             role="assistant",
             timestamp=datetime.now()
@@ -466,6 +530,32 @@ class AgentService:
         if not _HAS_CHAT_SCHEMA:
             return
 
+        is_first_turn, turn_count = await run_blocking(
+            self._persist_turn, user_msg, assistant_msg, feed_type,
+            consciousness_context, context_level,
+        )
+
+        # Auto-name conversation after first turn (background task)
+        if is_first_turn:
+            asyncio.create_task(self._auto_name_conversation(user_msg, assistant_msg))
+
+        # Auto-summarize at turn count thresholds (5, 15, 30)
+        if turn_count in (5, 15, 30):
+            asyncio.create_task(self._auto_summarize_conversation())
+
+    def _persist_turn(
+        self,
+        user_msg: str,
+        assistant_msg: str,
+        feed_type: str,
+        consciousness_context: str = "",
+        context_level: int | None = None,
+    ):
+        """Blocking half of _save_conversation_turn (runs on a turn worker).
+
+        Returns (is_first_turn, turn_count); turn_count is 0 when unknown.
+        """
+
         ctx_level = context_level if context_level is not None else self.context_manager.current_level
 
         try:
@@ -578,18 +668,12 @@ class AgentService:
             except Exception:
                 pass
 
-            # Auto-name conversation after first turn (background task)
-            if is_first_turn:
-                asyncio.create_task(self._auto_name_conversation(user_msg, assistant_msg))
+            turn_count = len(existing.get("turns", [])) + 1 if existing else 0
+            return is_first_turn, turn_count
 
-            # Auto-summarize at turn count thresholds (5, 15, 30)
-            if existing:
-                turn_count = len(existing.get("turns", [])) + 1
-                if turn_count in (5, 15, 30):
-                    asyncio.create_task(self._auto_summarize_conversation())
-                
         except Exception as e:
             print(f"Warning: Could not save conversation: {e}")
+            return False, 0
     
     async def _auto_name_conversation(self, user_msg: str, assistant_msg: str):
         """Background task to name conversation using small LLM."""
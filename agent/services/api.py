@@ -132,31 +132,32 @@ def _get_service_status(service_id: str, definition: dict) -> ServiceStatus:
 def _get_service_config(service_id: str) -> Optional[Dict[str, Any]]:
     """Get service config from database."""
     try:
+        from contextlib import closing
         from data.db import get_connection
-        conn = get_connection(readonly=True)
-        cursor = conn.cursor()
+        with closing(get_connection(readonly=True)) as conn:
+            cursor = conn.cursor()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS service_config (
-                service_id TEXT PRIMARY KEY,
-                enabled INTEGER DEFAULT 1,
-                settings_json TEXT DEFAULT '{}',
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS service_config (
+                    service_id TEXT PRIMARY KEY,
+                    enabled INTEGER DEFAULT 1,
+                    settings_json TEXT DEFAULT '{}',
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
         
-        cursor.execute(
-            "SELECT enabled, settings_json FROM service_config WHERE service_id = ?",
-            (service_id,)
-        )
-        row = cursor.fetchone()
+            cursor.execute(
+                "SELECT enabled, settings_json FROM service_config WHERE service_id = ?",
+                (service_id,)
+            )
+            row = cursor.fetchone()
         
-        if row:
-            return {
-                "enabled": bool(row[0]),
-                "settings": json.loads(row[1]) if row[1] else {}
-            }
-        return {"enabled": True, "settings": {}}
+            if row:
+                return {
+                    "enabled": bool(row[0]),
+                    "settings": json.loads(row[1]) if row[1] else {}
+                }
+            return {"enabled": True, "settings": {}}
     except Exception:
         return {"enabled": True, "settings": {}}
 
@@ -292,6 +293,14 @@ async def get_loops_status():
         return {"loops": [], "count": 0, "error": str(e)}
 
 
+@router.get("/turns/status")
+async def get_turns_status():
+    """Chat turn workers and per-provider LLM concurrency slots."""
+    from agent.services.llm import provider_concurrency_stats
+    from agent.services.turn_executor import turn_stats
+    return {"turns": turn_stats(), "providers": provider_concurrency_stats()}
+
+
 @router.get("/{service_id}", response_model=ServiceStatus)
 async def get_service(service_id: str):
     """Get status of a specific service."""
@@ -13,6 +13,10 @@ Usage:
     # Specific provider + model
     text = generate("Hello", provider="claude", model="claude-sonnet-4-20250514")
 
+    # Streaming: yields text deltas (token by token on Ollama / OpenAI-compatible)
+    for delta in generate_stream("Hello", provider="ollama"):
+        print(delta, end="")
+
     # Aggregate: round-robin across all available free-tier providers
     text = generate("Hello", provider="aggregate")
 
@@ -32,10 +36,12 @@ Usage:
 
 import json
 import os
+import threading
 import urllib.request
 import urllib.error
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
 
 
 # ── Base Class ──────────────────────────────────────────────
@@ -69,6 +75,17 @@ class LLMProvider(ABC):
         """Generate a completion. Returns the assistant's text."""
         ...
 
+    def generate_stream(self, messages: List[Dict[str, str]],
+                        model: Optional[str] = None,
+                        temperature: float = 0.7,
+                        max_tokens: int = 2048) -> Iterator[str]:
+        """Yield the completion as text deltas.
+
+        Providers without a streaming protocol yield the whole reply once.
+        """
+        yield self.generate(messages, model=model, temperature=temperature,
+                            max_tokens=max_tokens)
+
     def list_models(self) -> List[Dict[str, Any]]:
         """Return models with provider tag. Only if provider is available."""
         if not self.is_available():
@@ -83,6 +100,37 @@ class LLMProvider(ABC):
         return f"<{self.__class__.__name__} [{avail}] {self.name}>"
 
 
+# ── Token Usage ─────────────────────────────────────────────
+# Providers report what the API said a call cost — prompt, completion
+# and prompt-cache tokens — for the call in progress on this thread;
+# generate_stream(), and generate() given a caller, log it with the call.
+
+_usage = threading.local()
+
+
+def _note_usage(prompt_tokens: Any = None, completion_tokens: Any = None,
+                cached_tokens: Any = None) -> None:
+    """Record provider-reported token usage for this thread's current call."""
+    _usage.last = {
+        "prompt_tokens": int(prompt_tokens or 0),
+        "completion_tokens": int(completion_tokens or 0),
+        "cached_tokens": None if cached_tokens is None else int(cached_tokens),
+    }
+
+
+def last_usage() -> Dict[str, Any]:
+    """Usage noted by the last provider call on this thread ({} if none)."""
+    return dict(getattr(_usage, "last", None) or {})
+
+
+def _note_openai_usage(usage: Optional[Dict[str, Any]]) -> None:
+    """OpenAI-style ``usage`` (cached tokens under prompt_tokens_details)."""
+    if usage:
+        details = usage.get("prompt_tokens_details") or {}
+        _note_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                    details.get("cached_tokens"))
+
+
 # ── Ollama ──────────────────────────────────────────────────
 
 # Module-level cache of host health probes (host_url -> (ok, expires_at)).
@@ -181,7 +229,8 @@ class OllamaProvider(LLMProvider):
         except Exception:
             return [{**m, "provider": self.name} for m in self.catalog]
 
-    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+    def _chat_target(self, model: Optional[str]):
+        """(module-or-client, model, host) for one chat call."""
         model = model or os.getenv("AIOS_MODEL_NAME", self.default_model)
         try:
             import ollama as _ollama
@@ -198,43 +247,72 @@ class OllamaProvider(LLMProvider):
         # we deliberately skip the priority list and use no client host.
         is_cloud_model = ":" in (model or "") and model.endswith("-cloud")
         host = None if is_cloud_model else resolve_ollama_host()
+        target = _ollama.Client(host=host) if host else _ollama
+        return target, model, host
+
+    def _host_failed(self, host: Optional[str], model: str, e: Exception) -> None:
+        # If the chosen host failed mid-request (e.g. the Mac went to
+        # sleep between health probe and generate), invalidate its
+        # cache entry so the next call picks the next host in the
+        # priority list immediately.
+        if host:
+            _OLLAMA_HOST_HEALTH[host] = (False, 0.0)
         try:
-            if host:
-                client = _ollama.Client(host=host)
-                response = client.chat(
-                    model=model,
-                    messages=messages,
-                    options={"temperature": temperature, "num_predict": max_tokens},
-                )
-            else:
-                response = _ollama.chat(
-                    model=model,
-                    messages=messages,
-                    options={"temperature": temperature, "num_predict": max_tokens},
-                )
+            from agent.threads.log.schema import log_event
+            log_event(
+                event_type="error:model_routing",
+                data=f"Ollama generate failed: {e}",
+                metadata={
+                    "model": model, "provider": "ollama",
+                    "host": host or "local", "error": str(e),
+                },
+                source="llm.ollama",
+            )
+        except Exception:
+            pass
+
+    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        target, model, host = self._chat_target(model)
+        try:
+            response = target.chat(
+                model=model,
+                messages=messages,
+                options={"temperature": temperature, "num_predict": max_tokens},
+            )
+            self._note_usage(response)
             return response["message"]["content"].strip()
         except Exception as e:
-            # If the chosen host failed mid-request (e.g. the Mac went to
-            # sleep between health probe and generate), invalidate its
-            # cache entry so the next call picks the next host in the
-            # priority list immediately.
-            if host:
-                _OLLAMA_HOST_HEALTH[host] = (False, 0.0)
-            try:
-                from agent.threads.log.schema import log_event
-                log_event(
-                    event_type="error:model_routing",
-                    data=f"Ollama generate failed: {e}",
-                    metadata={
-                        "model": model, "provider": "ollama",
-                        "host": host or "local", "error": str(e),
-                    },
-                    source="llm.ollama",
-                )
-            except Exception:
-                pass
+            self._host_failed(host, model, e)
+            raise
+
+    def generate_stream(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        target, model, host = self._chat_target(model)
+        try:
+            for chunk in target.chat(
+                model=model,
+                messages=messages,
+                options={"temperature": temperature, "num_predict": max_tokens},
+                stream=True,
+            ):
+                delta = chunk["message"]["content"]
+                if delta:
+                    yield delta
+                if chunk.get("done"):
+                    self._note_usage(chunk)
+        except Exception as e:
+            self._host_failed(host, model, e)
             raise
 
+    @staticmethod
+    def _note_usage(response) -> None:
+        # prompt_eval_count counts the prompt tokens Ollama evaluated; a
+        # prefix reused from its KV cache is not re-evaluated.  Ollama does
+        # not report the cached count itself.
+        try:
+            _note_usage(response.get("prompt_eval_count"), response.get("eval_count"))
+        except Exception:
+            pass
+
 
 # ── Gemini ──────────────────────────────────────────────────
 
@@ -280,6 +358,9 @@ class GeminiProvider(LLMProvider):
                                      headers={"Content-Type": "application/json"})
         with urllib.request.urlopen(req, timeout=120) as resp:
             data = json.loads(resp.read().decode("utf-8"))
+        meta = data.get("usageMetadata") or {}
+        _note_usage(meta.get("promptTokenCount"), meta.get("candidatesTokenCount"),
+                    meta.get("cachedContentTokenCount"))
         return data["candidates"][0]["content"]["parts"][0]["text"].strip()
 
 
@@ -333,6 +414,9 @@ class ClaudeProvider(LLMProvider):
         )
         with urllib.request.urlopen(req, timeout=120) as resp:
             data = json.loads(resp.read().decode("utf-8"))
+        usage = data.get("usage") or {}
+        _note_usage(usage.get("input_tokens"), usage.get("output_tokens"),
+                    usage.get("cache_read_input_tokens"))
         return data["content"][0]["text"].strip()
 
 
@@ -351,20 +435,28 @@ class OpenAIProvider(LLMProvider):
         {"id": "gpt-4.1", "display": "GPT-4.1", "context": 1047576},
     ]
 
-    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+    def _request(self, model: Optional[str]) -> Dict[str, Any]:
         api_key = self.get_api_key()
         if not api_key:
             raise ValueError(f"Set {self.key_env}")
 
-        model = model or self.default_model
         base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        return {
+            "url": f"{base_url.rstrip('/')}/chat/completions",
+            "api_key": api_key,
+            "model": model or self.default_model,
+        }
+
+    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
         return _openai_compat_call(
-            url=f"{base_url.rstrip('/')}/chat/completions",
-            api_key=api_key,
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+            messages=messages, temperature=temperature, max_tokens=max_tokens,
+            **self._request(model),
+        )
+
+    def generate_stream(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        return _openai_compat_stream(
+            messages=messages, temperature=temperature, max_tokens=max_tokens,
+            stream_usage=True, **self._request(model),
         )
 
 
@@ -382,23 +474,31 @@ class OpenRouterProvider(LLMProvider):
         {"id": "qwen/qwen3-235b-a22b:free", "display": "Qwen3 235B (free)", "context": 40960},
     ]
 
-    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+    def _request(self, model: Optional[str]) -> Dict[str, Any]:
         api_key = self.get_api_key()
         if not api_key:
             raise ValueError(f"Set {self.key_env}")
 
-        model = model or self.default_model
-        return _openai_compat_call(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            api_key=api_key,
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            extra_headers={
+        return {
+            "url": "https://openrouter.ai/api/v1/chat/completions",
+            "api_key": api_key,
+            "model": model or self.default_model,
+            "extra_headers": {
                 "HTTP-Referer": "https://github.com/nicholasgcoles/ai-os",
                 "X-Title": "AI-OS",
             },
+        }
+
+    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        return _openai_compat_call(
+            messages=messages, temperature=temperature, max_tokens=max_tokens,
+            **self._request(model),
+        )
+
+    def generate_stream(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        return _openai_compat_stream(
+            messages=messages, temperature=temperature, max_tokens=max_tokens,
+            stream_usage=True, **self._request(model),
         )
 
 
@@ -444,6 +544,22 @@ class HTTPProvider(LLMProvider):
             body = json.loads(resp.read().decode("utf-8"))
         return body.get("message") or body.get("content") or str(body)
 
+    def generate_stream(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        endpoint = os.getenv("AIOS_MODEL_ENDPOINT", "")
+        api_key = os.getenv("OPENAI_API_KEY", "")
+        if not (endpoint and api_key):
+            # Bare HTTP has no streaming protocol — one delta
+            yield from super().generate_stream(messages, model, temperature, max_tokens)
+            return
+        yield from _openai_compat_stream(
+            url=f"{endpoint.rstrip('/')}/chat/completions",
+            api_key=api_key,
+            model=model or os.getenv("AIOS_MODEL_NAME", ""),
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
 
 # ── Shared OpenAI-Compatible Caller ────────────────────────
 
@@ -470,6 +586,7 @@ def _openai_compat_call(url: str, api_key: str, model: str,
     req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
     with urllib.request.urlopen(req, timeout=120) as resp:
         body = json.loads(resp.read().decode("utf-8"))
+    _note_openai_usage(body.get("usage"))
 
     choices = body.get("choices", [])
     if choices:
@@ -477,6 +594,59 @@ def _openai_compat_call(url: str, api_key: str, model: str,
     return str(body)
 
 
+def _openai_compat_stream(url: str, api_key: str, model: str,
+                          messages: List[Dict[str, str]],
+                          temperature: float = 0.7,
+                          max_tokens: int = 2048,
+                          extra_headers: Optional[Dict[str, str]] = None,
+                          stream_usage: bool = False) -> Iterator[str]:
+    """Streaming variant of _openai_compat_call — yields content deltas.
+
+    Reads the `data: {...}` server-sent-event lines of a `"stream": true`
+    chat completion until `data: [DONE]`.  *stream_usage* asks for the
+    final usage chunk (`stream_options.include_usage`; not every
+    OpenAI-compatible server accepts it); a `usage` object is noted
+    whenever one arrives.
+    """
+    body: Dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True,
+    }
+    if stream_usage:
+        body["stream_options"] = {"include_usage": True}
+    payload = json.dumps(body).encode("utf-8")
+
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream",
+        "Authorization": f"Bearer {api_key}",
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+
+    req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        for raw in resp:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                event = json.loads(data)
+            except ValueError:
+                continue
+            _note_openai_usage(event.get("usage"))
+            for choice in event.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+
+
 # ── MLX (Apple Silicon local models) ────────────────────────
 
 class MLXProvider(LLMProvider):
@@ -758,6 +928,65 @@ def available_models() -> List[Dict[str, Any]]:
     return models
 
 
+# ── Per-Provider Concurrency ────────────────────────────────
+#
+# Chat turns run on worker threads (agent.services.turn_executor) and the
+# subconscious loops call generate() from their own threads, so several
+# calls can hit one provider at once.  Each provider gets a semaphore;
+# callers beyond the limit wait for a slot instead of piling requests on
+# a local Ollama that serves them one at a time anyway.
+#
+# AIOS_PROVIDER_CONCURRENCY="ollama=2,openai=8" overrides per provider;
+# AIOS_PROVIDER_CONCURRENCY_DEFAULT (4) covers the rest.
+
+_DEFAULT_PROVIDER_LIMITS: Dict[str, int] = {"ollama": 2, "mlx": 1, "vscode": 1}
+_provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+_provider_usage: Dict[str, Dict[str, int]] = {}
+_slots_lock = threading.Lock()
+
+
+def provider_limit(name: str) -> int:
+    """Max concurrent calls allowed for provider *name*."""
+    for part in os.getenv("AIOS_PROVIDER_CONCURRENCY", "").split(","):
+        key, _, val = part.partition("=")
+        if key.strip().lower() == name and val.strip().isdigit():
+            return max(1, int(val))
+    if name in _DEFAULT_PROVIDER_LIMITS:
+        return _DEFAULT_PROVIDER_LIMITS[name]
+    return max(1, int(os.getenv("AIOS_PROVIDER_CONCURRENCY_DEFAULT", "4")))
+
+
+@contextmanager
+def provider_slot(name: str) -> Iterator[None]:
+    """Hold one of provider *name*'s concurrency slots for the block."""
+    with _slots_lock:
+        sem = _provider_slots.get(name)
+        if sem is None:
+            sem = _provider_slots[name] = threading.BoundedSemaphore(provider_limit(name))
+        usage = _provider_usage.setdefault(name, {"active": 0, "waiting": 0, "calls": 0})
+        usage["waiting"] += 1
+    sem.acquire()
+    with _slots_lock:
+        usage["waiting"] -= 1
+        usage["active"] += 1
+        usage["calls"] += 1
+    try:
+        yield
+    finally:
+        with _slots_lock:
+            usage["active"] -= 1
+        sem.release()
+
+
+def provider_concurrency_stats() -> Dict[str, Dict[str, int]]:
+    """provider → {limit, active, waiting, calls} for providers used so far."""
+    with _slots_lock:
+        return {
+            name: {"limit": provider_limit(name), **usage}
+            for name, usage in _provider_usage.items()
+        }
+
+
 # ── Aggregate (Round-Robin) ─────────────────────────────────
 
 _aggregate_index = 0
@@ -776,32 +1005,18 @@ def _next_aggregate_provider() -> LLMProvider:
 
 # ── Main Generate Function ─────────────────────────────────
 
-def generate(prompt: Optional[str] = None,
-             *,
-             messages: Optional[List[Dict[str, str]]] = None,
-             system: Optional[str] = None,
-             provider: Optional[str] = None,
-             model: Optional[str] = None,
-             role: Optional[str] = None,
-             temperature: float = 0.7,
-             max_tokens: int = 2048) -> str:
-    """Generate text from an LLM.
-
-    Args:
-        prompt:      Simple user prompt (convenience — builds messages list)
-        messages:    Full messages list (overrides prompt if both given)
-        system:      System prompt (prepended if using prompt= style)
-        provider:    Provider name, "aggregate" for round-robin, or None for env default
-        model:       Override model name (optional)
-        role:        Role tag (e.g. "GOAL", "SELF_IMPROVE", "EVOLVE") used to
-                     look up per-role provider/model overrides via
-                     agent.services.role_model.resolve_role().  Only used
-                     when *provider* and *model* are not explicitly passed.
-        temperature: Sampling temperature
-        max_tokens:  Max output tokens
-
-    Returns:
-        Generated text string.
+def _resolve_call(prompt: Optional[str],
+                  messages: Optional[List[Dict[str, str]]],
+                  system: Optional[str],
+                  provider: Optional[str],
+                  model: Optional[str],
+                  role: Optional[str]):
+    """Front half shared by generate() and generate_stream().
+
+    Builds the messages list, applies the demo gates, per-role overrides
+    and the rate gate, and resolves the provider.  Returns
+    (canned_reply, provider, messages, model); canned_reply is set (and
+    provider is None) when a demo gate answers instead of a model.
     """
     # Build messages from prompt if needed
     if messages is None:
@@ -827,7 +1042,7 @@ def generate(prompt: Optional[str] = None,
         except Exception:
             pass
     if _no_llm:
-        return (
+        return ((
             "[demo mode — LLM calls disabled]\n\n"
             "You're looking at the real AI_OS interface in read-only demo mode. "
             "All the threads, memory, and tools are wired to a sample database, "
@@ -835,7 +1050,7 @@ def generate(prompt: Optional[str] = None,
             "owner's account.\n\n"
             "To talk to the real one, run AI_OS locally:\n"
             "  https://github.com/allee-ai/AI_OS"
-        )
+        ), None, messages, model)
     # ──────────────────────────────────────────────────────────────────
 
     # ── Chat-only demo gate ───────────────────────────────────────────
@@ -850,13 +1065,13 @@ def generate(prompt: Optional[str] = None,
     # gate is: if role is set AND it's not CHAT, block.
     if os.getenv("AIOS_DEMO_LLM_CHAT_ONLY", "").lower() in ("1", "true", "yes"):
         if role and role.upper() != "CHAT":
-            return (
+            return ((
                 "[demo mode — only chat is live]\n\n"
                 f"Background role '{role}' is disabled in the public demo. "
                 "Only the user-facing chat is wired to a real LLM here. "
                 "Run AI_OS locally to enable the full subconscious:\n"
                 "  https://github.com/allee-ai/AI_OS"
-            )
+            ), None, messages, model)
     # ──────────────────────────────────────────────────────────────────
 
     # Apply per-role overrides when caller didn't pin provider/model.
@@ -898,10 +1113,52 @@ def generate(prompt: Optional[str] = None,
     except Exception:
         pass  # rate_gate unavailable — fall through
 
+    return None, p, messages, model
+
+
+def generate(prompt: Optional[str] = None,
+             *,
+             messages: Optional[List[Dict[str, str]]] = None,
+             system: Optional[str] = None,
+             provider: Optional[str] = None,
+             model: Optional[str] = None,
+             role: Optional[str] = None,
+             temperature: float = 0.7,
+             max_tokens: int = 2048,
+             caller: Optional[str] = None,
+             metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Generate text from an LLM.
+
+    Args:
+        prompt:      Simple user prompt (convenience — builds messages list)
+        messages:    Full messages list (overrides prompt if both given)
+        system:      System prompt (prepended if using prompt= style)
+        provider:    Provider name, "aggregate" for round-robin, or None for env default
+        model:       Override model name (optional)
+        role:        Role tag (e.g. "GOAL", "SELF_IMPROVE", "EVOLVE") used to
+                     look up per-role provider/model overrides via
+                     agent.services.role_model.resolve_role().  Only used
+                     when *provider* and *model* are not explicitly passed.
+        temperature: Sampling temperature
+        max_tokens:  Max output tokens
+        caller:      When given, the call is written to log_llm_inference
+                     under this caller, as generate_stream() does
+        metadata:    Merged into that row's metadata
+
+    Returns:
+        Generated text string.
+    """
+    canned, p, messages, model = _resolve_call(prompt, messages, system, provider, model, role)
+    if canned is not None:
+        return canned
+
     import time as _time
     _t0 = _time.monotonic()
+    if caller:
+        _usage.last = None
     try:
-        out = p.generate(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        with provider_slot(p.name):
+            out = p.generate(messages, model=model, temperature=temperature, max_tokens=max_tokens)
     except BaseException as _err:
         try:
             from agent.services import rate_gate as _rg
@@ -911,10 +1168,110 @@ def generate(prompt: Optional[str] = None,
                 _rg.record_other_error(p.name)
         except Exception:
             pass
+        if caller:
+            _log_call(p, model, _time.monotonic() - _t0, caller, metadata,
+                      error=str(_err) or type(_err).__name__)
         raise
     try:
         from agent.services import rate_gate as _rg
         _rg.record_success(p.name, duration_seconds=_time.monotonic() - _t0)
     except Exception:
         pass
+    if caller:
+        _log_call(p, model, _time.monotonic() - _t0, caller, metadata)
     return out
+
+
+def _log_call(p: "LLMProvider", model: Optional[str], elapsed: float,
+              caller: str, metadata: Optional[Dict[str, Any]],
+              error: Optional[str] = None, ttft_ms: Optional[float] = None) -> None:
+    """One log_llm_inference row for a finished call (never raises)."""
+    try:
+        from agent.threads.log.schema import log_llm_call
+        usage = last_usage()
+        log_llm_call(
+            model=model or p.default_model or p.name,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            cached_tokens=usage.get("cached_tokens"),
+            latency_ms=round(elapsed * 1000, 2),
+            ttft_ms=round(ttft_ms, 2) if ttft_ms is not None else None,
+            success=error is None,
+            error=error,
+            caller=caller,
+            provider=p.name,
+            metadata=metadata,
+        )
+    except Exception:
+        pass
+
+
+def generate_stream(prompt: Optional[str] = None,
+                    *,
+                    messages: Optional[List[Dict[str, str]]] = None,
+                    system: Optional[str] = None,
+                    provider: Optional[str] = None,
+                    model: Optional[str] = None,
+                    role: Optional[str] = None,
+                    temperature: float = 0.7,
+                    max_tokens: int = 2048,
+                    caller: Optional[str] = None,
+                    metadata: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Streaming generate(): yields text deltas as the provider produces them.
+
+    Same arguments, demo gates, role overrides and rate gate as
+    generate().  Ollama and OpenAI-compatible providers (openai,
+    openrouter, http with a key) stream token by token; the rest yield
+    their whole reply once.  When the stream ends the call is written to
+    log_llm_inference with latency_ms (total) and ttft_ms (time to the
+    first delta), tagged with *caller* (default: the role, else "stream"),
+    the provider-reported prompt/completion/cached token counts when the
+    provider gives them, and *metadata* merged into the row's metadata.
+    """
+    canned, p, messages, model = _resolve_call(prompt, messages, system, provider, model, role)
+    if canned is not None:
+        yield canned
+        return
+
+    import time as _time
+    _t0 = _time.monotonic()
+    ttft_ms = None
+    chunks = chars = 0
+    error = None
+    cancelled = False
+    _usage.last = None
+    try:
+        with provider_slot(p.name):
+            for delta in p.generate_stream(messages, model=model, temperature=temperature,
+                                           max_tokens=max_tokens):
+                if ttft_ms is None:
+                    ttft_ms = (_time.monotonic() - _t0) * 1000
+                chunks += 1
+                chars += len(delta)
+                yield delta
+    except BaseException as _err:
+        # GeneratorExit: the consumer stopped reading (e.g. client went away)
+        cancelled = isinstance(_err, GeneratorExit)
+        if not cancelled:
+            error = str(_err) or type(_err).__name__
+            try:
+                from agent.services import rate_gate as _rg
+                if _rg.is_rate_limit_error(_err):
+                    _rg.record_429(p.name, str(_err))
+                else:
+                    _rg.record_other_error(p.name)
+            except Exception:
+                pass
+        raise
+    finally:
+        elapsed = _time.monotonic() - _t0
+        if error is None:
+            try:
+                from agent.services import rate_gate as _rg
+                _rg.record_success(p.name, duration_seconds=elapsed)
+            except Exception:
+                pass
+        _log_call(p, model, elapsed, caller or (role.lower() if role else "stream"),
+                  {**(metadata or {}), "stream": True, "chunks": chunks,
+                   "chars": chars, "cancelled": cancelled},
+                  error=error, ttft_ms=ttft_ms)
@@ -0,0 +1,167 @@
+"""
+Response Stream Filter
+======================
+
+Incremental counterpart of the post-processing `Agent.generate` applies
+to a finished reply, for replies that arrive as token deltas:
+
+  - meta-thought tags (response_tags.RECOGNIZED_KINDS) and registered
+    affect tags are removed as soon as their closing tag arrives;
+  - a complete :::execute::: block (scanner.EXECUTE_PATTERN) that parses
+    to at least one tool call ends the visible part of the round — the
+    rest of the round is withheld, exactly as the batch path replaces a
+    tool round with the next one;
+  - blank-line runs are collapsed and trailing whitespace is held back,
+    so the concatenated output equals the batch-stripped text (minus
+    leading whitespace).
+
+Only text that can no longer become part of a tag or execute block is
+released: a trailing "<expe" or ":::exec" is held until the next delta
+decides it.  A tag that never closes is released as-is at finish(), the
+same as the batch regexes leave it.
+
+Usage:
+    filt = ResponseStreamFilter(stream_tag_names())
+    for delta in deltas:
+        visible = filt.feed(delta)
+    visible = filt.finish()
+    raw = filt.text          # full unfiltered reply, for tag parsing
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Tuple
+
+from agent.services.response_tags import RECOGNIZED_KINDS
+
+_EXECUTE_OPEN = ":::execute"
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+
+def stream_tag_names() -> List[str]:
+    """Meta-thought kinds plus every registered affect tag."""
+    names = list(RECOGNIZED_KINDS)
+    try:
+        from agent.services.affect import _REGISTRY, import_all_feelings
+        import_all_feelings()
+        names.extend(_REGISTRY.keys())
+    except Exception:
+        pass
+    return names
+
+
+class ResponseStreamFilter:
+    """Strip tags and stop at tool blocks while a reply streams in."""
+
+    def __init__(self, tag_names: Iterable[str] = RECOGNIZED_KINDS, scan_tools: bool = True):
+        self._names = sorted({n.lower() for n in tag_names if n})
+        alt = "|".join(re.escape(n) for n in self._names)
+        self._open_re = re.compile(rf"<({alt})>", re.IGNORECASE) if alt else None
+        self._strip_re = (
+            re.compile(rf"<(?P<tag>{alt})>.*?</(?P=tag)>", re.DOTALL | re.IGNORECASE)
+            if alt else None
+        )
+        self._special_re = re.compile(r"[<:]" if scan_tools else r"<")
+        self._raw: List[str] = []
+        self._buf = ""          # received, not yet released or dropped
+        self._ws = ""           # trailing whitespace held back
+        self._started = False   # anything visible released yet
+        self.tool_block = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far, unfiltered."""
+        return "".join(self._raw)
+
+    def feed(self, delta: str) -> str:
+        """Add a delta; return the newly releasable visible text."""
+        self._raw.append(delta)
+        if self.tool_block or not delta:
+            return ""
+        self._buf += delta
+        return self._drain(final=False)
+
+    def finish(self) -> str:
+        """Release whatever is still held at the end of the reply."""
+        if self.tool_block:
+            return ""
+        out = self._drain(final=True)
+        self._ws = ""
+        return out
+
+    # ── internals ──────────────────────────────────────────────────
+
+    def _drain(self, final: bool) -> str:
+        out: List[str] = []
+        buf = self._buf
+        while buf:
+            m = self._special_re.search(buf)
+            if m is None:
+                out.append(buf)
+                buf = ""
+                break
+            out.append(buf[:m.start()])
+            buf = buf[m.start():]
+            action, end = self._classify(buf)
+            if action == "wait":
+                break
+            if action == "text":
+                out.append(buf[:end])
+            elif action == "tool":
+                self.tool_block = True
+                buf = ""
+                break
+            buf = buf[end:]
+        if final and buf:
+            # Unterminated tag or execute block — the batch regexes
+            # leave those in place, apart from any complete tags inside.
+            out.append(self._strip_re.sub("", buf) if self._strip_re else buf)
+            buf = ""
+        self._buf = buf
+        return self._release("".join(out))
+
+    def _classify(self, buf: str) -> Tuple[str, int]:
+        """('text'|'drop'|'tool'|'wait', length) for buf starting at '<' or ':'."""
+        if buf[0] == "<":
+            if self._open_re is None:
+                return "text", 1
+            m = self._open_re.match(buf)
+            if m:
+                close = re.compile(rf"</{re.escape(m.group(1))}>", re.IGNORECASE)
+                c = close.search(buf, m.end())
+                return ("drop", c.end()) if c else ("wait", 0)
+            low = buf.lower()
+            if any(f"<{n}>".startswith(low) for n in self._names):
+                return "wait", 0
+            return "text", 1
+
+        # ':' — possible :::execute::: block
+        if not buf.startswith(_EXECUTE_OPEN):
+            return ("wait", 0) if _EXECUTE_OPEN.startswith(buf) else ("text", 1)
+        rest = buf[len(_EXECUTE_OPEN):]
+        lead = rest[:len(rest) - len(rest.lstrip())]
+        if "\n" not in lead:
+            # Opener is only valid once a newline follows the keyword
+            return ("wait", 0) if lead == rest else ("text", 1)
+        from agent.threads.form.tools.scanner import EXECUTE_PATTERN, scan_for_tool_calls
+        m = EXECUTE_PATTERN.match(buf)
+        if m is None:
+            return "wait", 0
+        if scan_for_tool_calls(m.group(0)):
+            return "tool", m.end()
+        return "text", m.end()
+
+    def _release(self, text: str) -> str:
+        if not text:
+            return ""
+        text = self._ws + text
+        if not self._started:
+            text = text.lstrip()
+        body = text.rstrip()
+        self._ws = text[len(body):]
+        if not body:
+            return ""
+        self._started = True
+        return _BLANK_RUN_RE.sub("\n\n", body)
+
@@ -0,0 +1,96 @@
+"""
+Turn Executor
+=============
+
+Runs the blocking parts of a chat turn off the event loop.
+
+`AgentService.send_message` is async, but STATE assembly
+(`get_consciousness_context`), `Agent.generate` (blocking HTTP to the
+model, up to AIOS_MAX_TOOL_ROUNDS tool rounds) and the turn's DB writes
+are synchronous.  Awaiting them inline froze uvicorn for the whole turn —
+health checks, SSE streams and every other WebSocket stalled behind it.
+
+`run_blocking(fn, ...)` hands such a call to a dedicated thread pool
+(AIOS_TURN_WORKERS, default 8) and awaits the result, copying the
+caller's contextvars into the worker.  How many model calls a provider
+gets at once is capped separately, in agent.services.llm
+(AIOS_PROVIDER_CONCURRENCY).
+
+Cancelling the awaiting task (e.g. the WebSocket went away) returns
+control immediately; a worker already running a blocking call finishes
+it in the background.  Streaming turns stop sooner: Agent.generate_stream
+closes the provider stream at the next delta.
+
+Set AIOS_TURN_OFFLOAD=0 to run everything inline on the event loop (the
+old behaviour).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+TURN_WORKERS = int(os.getenv("AIOS_TURN_WORKERS", "8"))
+OFFLOAD = os.getenv("AIOS_TURN_OFFLOAD", "1") != "0"
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"submitted": 0, "running": 0, "completed": 0, "cancelled": 0}
+
+
+def get_turn_pool() -> Executor:
+    """The shared turn-worker pool (created on first use)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=max(1, TURN_WORKERS),
+                    thread_name_prefix="agent-turn",
+                )
+    return _pool
+
+
+def _tracked(call: Callable[[], Any]) -> Any:
+    with _stats_lock:
+        _stats["running"] += 1
+    try:
+        return call()
+    finally:
+        with _stats_lock:
+            _stats["running"] -= 1
+            _stats["completed"] += 1
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await ``fn(*args, **kwargs)`` run on a turn worker."""
+    if not OFFLOAD:
+        return fn(*args, **kwargs)
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    with _stats_lock:
+        _stats["submitted"] += 1
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_turn_pool(), _tracked, call)
+    except asyncio.CancelledError:
+        with _stats_lock:
+            _stats["cancelled"] += 1
+        raise
+
+
+def turn_stats() -> Dict[str, Any]:
+    """Worker count and submitted / running / completed / cancelled calls."""
+    with _stats_lock:
+        out = dict(_stats)
+    out["workers"] = TURN_WORKERS
+    out["offload"] = OFFLOAD
+    work_queue = getattr(_pool, "_work_queue", None)
+    out["queued"] = work_queue.qsize() if work_queue is not None else 0
+    return out
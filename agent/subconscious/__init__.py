@@ -173,6 +173,11 @@ def wake(start_loops: bool = True) -> None:
         health_loop = _loop_manager.get_loop("health")
         if health_loop:
             health_loop.start()
+        # Docs index polling is cheap (stat-only) and keeps STATE assembly
+        # off the filesystem, so it runs alongside health.
+        docs_loop = _loop_manager.get_loop("docs_index")
+        if docs_loop:
+            docs_loop.start()
 
         # Heartbeat: single 60s conductor, auto-started alongside health.
         # Gated by AIOS_HEARTBEAT (default on); respects pause like any
@@ -194,7 +199,7 @@ def wake(start_loops: bool = True) -> None:
         if custom_count:
             print(f"  ✓ Loaded {custom_count} custom loop(s) (paused)")
         
-        print("  ✓ Loops created (only health auto-started, others paused until manually started)")
+        print("  ✓ Loops created (health + docs_index auto-started, others paused until manually started)")
     
     _trigger_manager = TriggerManager()
     
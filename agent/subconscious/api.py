@@ -235,9 +235,11 @@ async def get_loops_status():
         else:
             stats = []
         
+        from .loops import scheduler
         return {
             "loops": stats,
-            "count": len(stats)
+            "count": len(stats),
+            "scheduler": scheduler.summary(),
         }
     except Exception as e:
         return {
@@ -1039,12 +1041,14 @@ async def create_new_task(req: CreateTaskRequest):
     Otherwise, the task is queued for the background planner loop.
     """
     from .loops import create_task
+    from .loops.scheduler import note_user_activity
     
     if not req.goal.strip():
         from fastapi import HTTPException
         raise HTTPException(status_code=400, detail="Goal cannot be empty")
     
     task = create_task(req.goal.strip(), source="api")
+    note_user_activity("api")
     
     if req.execute_now:
         from . import _loop_manager
@@ -1690,8 +1694,7 @@ async def promote_goal_now(goal_id: int):
 # ═════════════════════════════════════════════════════════════
 
 import json as _json
-import time as _time
-from typing import Iterator as _Iterator
+from typing import AsyncIterator as _AsyncIterator
 from fastapi.responses import StreamingResponse as _StreamingResponse
 from . import trace_bus as _trace_bus
 
@@ -1705,33 +1708,50 @@ def _sse_pack(event: dict) -> str:
     )
 
 
+_FRAMES: Dict[tuple, str] = {}
+
+
+def _sse_frame(event: dict) -> str:
+    """`_sse_pack`, rendered once per event however many streams send it."""
+    key = (event["seq"], event["ts"])
+    frame = _FRAMES.get(key)
+    if frame is None:
+        if len(_FRAMES) >= 4 * _trace_bus._MAX_EVENTS:
+            _FRAMES.clear()
+        frame = _FRAMES[key] = _sse_pack(event)
+    return frame
+
+
+def _types_param(types: Optional[str]) -> Optional[List[str]]:
+    return [t.strip() for t in (types or "").split(",") if t.strip()] or None
+
+
 @router.get("/stream")
-def trace_stream(since: int = Query(0, ge=0), idle_ping_s: float = 15.0) -> _StreamingResponse:
+async def trace_stream(
+    since: int = Query(0, ge=0),
+    types: Optional[str] = Query(None, description="Comma-separated event types to send"),
+    idle_ping_s: float = 15.0,
+) -> _StreamingResponse:
     """
     Server-Sent Events stream of every subconscious trace event.
 
     Clients can pass ?since=<seq> on reconnect to resume without losing
-    anything still in the ring buffer.
+    anything still in the ring buffer, and ?types=score,state_built to
+    receive only those event types.  Each client is a trace_bus
+    subscriber woken on publish — no polling thread per client.
     """
-    def gen() -> _Iterator[str]:
+    async def gen() -> _AsyncIterator[str]:
         cursor = since
-        for ev in _trace_bus.events_since(cursor):
-            cursor = ev["seq"]
-            yield _sse_pack(ev)
-        yield f": caught-up-at-seq-{cursor}\n\n"
-        last_activity = _time.time()
-        while True:
-            new = _trace_bus.events_since(cursor, limit=200)
-            if new:
-                for ev in new:
-                    cursor = ev["seq"]
-                    yield _sse_pack(ev)
-                last_activity = _time.time()
-            else:
-                if _time.time() - last_activity >= idle_ping_s:
-                    yield f": idle-at-seq-{cursor}\n\n"
-                    last_activity = _time.time()
-                _time.sleep(0.25)
+        caught_up = False
+        async for batch in _trace_bus.watch(since, _types_param(types), idle_s=idle_ping_s):
+            for ev in batch:
+                cursor = ev["seq"]
+                yield _sse_frame(ev)
+            if not caught_up:
+                caught_up = True
+                yield f": caught-up-at-seq-{cursor}\n\n"
+            elif not batch:
+                yield f": idle-at-seq-{cursor}\n\n"
 
     return _StreamingResponse(
         gen(),
@@ -1745,9 +1765,13 @@ def trace_stream(since: int = Query(0, ge=0), idle_ping_s: float = 15.0) -> _Str
 
 
 @router.get("/events")
-def trace_events(since: int = Query(0, ge=0), limit: int = Query(500, ge=1, le=2000)):
+def trace_events(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=2000),
+    types: Optional[str] = Query(None, description="Comma-separated event types to return"),
+):
     """One-shot JSON fetch of trace events since a given seq."""
-    evs = _trace_bus.events_since(since, limit=limit)
+    evs = _trace_bus.events_since(since, limit=limit, types=_types_param(types))
     return {
         "count": len(evs),
         "latest_seq": _trace_bus.latest_seq(),
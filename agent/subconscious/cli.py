@@ -470,7 +470,9 @@ def _cmd_tasks(args: str):
         print(f"  {DIM}planning task: {rest}{RESET}")
         try:
             from agent.subconscious.loops import create_task, TaskPlanner
+            from agent.subconscious.loops.scheduler import note_user_activity
             task = create_task(rest, source="cli")
+            note_user_activity("cli")
             print(f"  {DIM}task #{task['id']} created — executing...{RESET}")
 
             planner = TaskPlanner(enabled=False)
@@ -500,7 +502,9 @@ def _cmd_tasks(args: str):
     if verb == "queue" and rest:
         try:
             from agent.subconscious.loops import create_task
+            from agent.subconscious.loops.scheduler import note_user_activity
             task = create_task(rest, source="cli")
+            note_user_activity("cli")
             print(f"  {GREEN}queued{RESET} task #{task['id']}: {rest}")
             print(f"  {DIM}will be picked up by the task planner loop{RESET}")
         except Exception as e:
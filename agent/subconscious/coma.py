@@ -24,6 +24,9 @@ What it does each tick:
   - maybe_decay_links         — once per ~6h: linking_core soft forget.
   - maybe_decay_facts         — once per ~24h: identity.decay_learned_facts
                                  (curated facts protected).
+  - maybe_reconcile_counts    — once per ~6h: recount the trigger-kept
+                                 table counters (data/db/table_stats.py)
+                                 and fix any drift.
 
 In-process state (boot time, heartbeat count, last touch event id) is
 intentional — restarting resets to a known clean baseline, like
@@ -49,6 +52,7 @@ _HEARTBEAT_COUNT = 0
 _LAST_TOUCH_EVENT_ID = 0
 _LAST_GRAPH_DECAY_AT = 0.0
 _LAST_FACT_DECAY_AT = 0.0
+_LAST_RECONCILE_AT = 0.0
 _LAST_RUN_SUMMARY: Dict[str, Any] = {}
 _LAST_STATE_FINGERPRINT: Optional[str] = None
 
@@ -71,9 +75,9 @@ def touch_graph_from_events(max_events: int = 200) -> Tuple[int, int]:
 
     try:
         from agent.threads.linking_core.schema import (
-            extract_concepts_from_text,
+            extract_concepts_batch,
             record_cooccurrence_batch,
-            link_concepts,
+            link_concepts_batch,
         )
     except Exception:
         return (0, 0)
@@ -101,9 +105,15 @@ def touch_graph_from_events(max_events: int = 200) -> Tuple[int, int]:
     edges = 0
     last_id = _LAST_TOUCH_EVENT_ID
 
-    for r in rows:
+    # Concepts pulled only from the known entity registry — never
+    # invents new tokens, so the graph stays bounded.
+    try:
+        extracted = extract_concepts_batch([(r["data"] or "")[:1000] for r in rows])
+    except Exception:
+        extracted = [[] for _ in rows]
+
+    for r, concepts in zip(rows, extracted):
         last_id = max(last_id, int(r["id"]))
-        text = (r["data"] or "")[:1000]
 
         # Tags + thread_subject as tokens (already-normalized labels)
         labels = []
@@ -115,13 +125,6 @@ def touch_graph_from_events(max_events: int = 200) -> Tuple[int, int]:
         if r["thread_subject"]:
             labels.append(r["thread_subject"])
 
-        # Concepts pulled only from the known entity registry — never
-        # invents new tokens, so the graph stays bounded.
-        try:
-            concepts = extract_concepts_from_text(text) if text else []
-        except Exception:
-            concepts = []
-
         tokens = list({str(t)[:60] for t in (labels + concepts) if t})
         if len(tokens) < 2:
             continue
@@ -142,13 +145,15 @@ def touch_graph_from_events(max_events: int = 200) -> Tuple[int, int]:
         if len(concepts) >= 2:
             try:
                 seen = set()
+                concept_pairs = []
                 for i, a in enumerate(concepts):
                     for b in concepts[i + 1:]:
                         key = tuple(sorted((a, b)))
                         if key in seen:
                             continue
                         seen.add(key)
-                        link_concepts(a, b, learning_rate=0.05)
+                        concept_pairs.append(key)
+                link_concepts_batch(concept_pairs, learning_rate=0.05)
             except Exception:
                 pass
 
@@ -399,13 +404,18 @@ def update_self_facts() -> Dict[str, Any]:
 # ─────────────────────────────────────────────────────────────────────
 
 def maybe_decay_links() -> int:
-    """Concept-link decay every ~6h.  Returns pruned count."""
+    """Prune faded concept links every ~6h.  Returns pruned count.
+
+    Links decay continuously at read time (0.97 per 6h by default, see
+    linking_core.graph.LINK_DECAY); this only deletes the ones that
+    dropped below 0.04.
+    """
     global _LAST_GRAPH_DECAY_AT
     if _now() - _LAST_GRAPH_DECAY_AT < 6 * 3600:
         return 0
     try:
         from agent.threads.linking_core.schema import decay_concept_links
-        pruned = decay_concept_links(decay_rate=0.97, min_strength=0.04)
+        pruned = decay_concept_links(min_strength=0.04)
         _LAST_GRAPH_DECAY_AT = _now()
         return pruned
     except Exception:
@@ -430,6 +440,21 @@ def maybe_decay_facts() -> int:
         return 0
 
 
+def maybe_reconcile_counts() -> int:
+    """Recount counted tables every AIOS_TABLE_COUNTS_RECONCILE_S (~6h).
+    Returns the number of counters corrected."""
+    global _LAST_RECONCILE_AT
+    try:
+        from data.db.table_stats import RECONCILE_S, reconcile_table_counts
+        if _now() - _LAST_RECONCILE_AT < RECONCILE_S:
+            return 0
+        fixed = reconcile_table_counts()
+        _LAST_RECONCILE_AT = _now()
+        return fixed
+    except Exception:
+        return 0
+
+
 # ─────────────────────────────────────────────────────────────────────
 # FTS5 recall index — sync new events on the heartbeat
 # ─────────────────────────────────────────────────────────────────────
@@ -569,6 +594,7 @@ def run_once() -> Dict[str, Any]:
     summary["self"] = update_self_facts()
     summary["graph_pruned"] = maybe_decay_links()
     summary["facts_decayed"] = maybe_decay_facts()
+    summary["counts_fixed"] = maybe_reconcile_counts()
     summary["fts_added"] = refresh_recall_index()
     summary["seq_mined"] = maybe_mine_sequences()
     summary["slots_touched"] = _refresh_slots_safe()
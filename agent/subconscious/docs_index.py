@@ -0,0 +1,302 @@
+"""
+docs_index — persistent index of the repo's markdown files.
+===========================================================
+
+`_get_docs_context` used to `os.walk` the whole repository on every STATE
+build, stat every `.md` file and re-open files for titles.  This module
+keeps that listing in SQLite instead:
+
+    docs_index        (path, mtime, size, title)
+    docs_index_terms  (term, path, weight)   — sparse term vector per doc
+
+`refresh_docs_index()` walks the tree, compares mtime/size against the
+index and only re-reads files that changed (or drops ones that vanished).
+The DocsIndexLoop runs it in the background; STATE assembly only reads.
+If the index has never been built it is built inline once; if it has gone
+stale (no loop running) a refresh is kicked off on a daemon thread and the
+current rows are served meanwhile.
+
+Ranking is term overlap: each doc stores up to _MAX_TERMS terms from its
+path, first heading and opening text, weighted by normalised frequency
+(path and title terms count 1.0), and a query scores the sum of weights
+of its terms.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data.db import get_connection, writer
+
+
+DOCS_ROOT = Path(__file__).resolve().parents[2]
+
+# Directory names never descended into
+PRUNE_DIRS = frozenset({
+    "_archive", "__pycache__", ".git", "node_modules", ".venv", "venv",
+    "dist", "build", ".next",
+})
+
+# Bytes read per changed file for title + terms
+_READ_BYTES = 16 * 1024
+_TITLE_BYTES = 400
+_MAX_TERMS = 64
+# Serve the index as-is up to this age; older triggers a background refresh
+_MAX_AGE_S = float(os.getenv("AIOS_DOCS_INDEX_MAX_AGE", "600"))
+
+_TERM_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+_STOPWORDS = frozenset({
+    "the", "and", "for", "with", "this", "that", "from", "are", "was", "you",
+    "your", "not", "but", "can", "all", "has", "have", "will", "into", "its",
+    "use", "see", "md", "readme",
+})
+
+_refresh_lock = threading.Lock()
+
+
+def _ensure_schema(conn) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS docs_index (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            title TEXT NOT NULL DEFAULT ''
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_index_mtime ON docs_index(mtime DESC)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS docs_index_terms (
+            term TEXT NOT NULL,
+            path TEXT NOT NULL,
+            weight REAL NOT NULL,
+            PRIMARY KEY (term, path)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_terms_path ON docs_index_terms(path)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS docs_index_meta (
+            k TEXT PRIMARY KEY,
+            v TEXT
+        )
+    """)
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TERM_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _read_doc(path: Path, rel: str) -> Tuple[str, Dict[str, float]]:
+    """(first heading, term → weight) for one markdown file."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+            body = fh.read(_READ_BYTES)
+    except OSError:
+        body = ""
+    head = body[:_TITLE_BYTES].strip().splitlines()
+    title = next(
+        (ln.strip("# ").strip() for ln in head if ln.strip().startswith("#")),
+        "",
+    )
+    counts = Counter(_terms(body))
+    top = counts.most_common(_MAX_TERMS)
+    peak = top[0][1] if top else 1
+    weights = {t: round(c / peak, 4) for t, c in top}
+    for t in _terms(rel.replace("/", " ").replace("_", " ").replace("-", " ")) + _terms(title):
+        weights[t] = 1.0
+    return title, weights
+
+
+def scan_markdown(root: Path) -> Dict[str, Tuple[float, int]]:
+    """rel_path → (mtime, size) for every .md file under ``root``."""
+    found: Dict[str, Tuple[float, int]] = {}
+    stack = [str(root)]
+    root_s = str(root)
+    while stack:
+        top = stack.pop()
+        try:
+            entries = os.scandir(top)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in PRUNE_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(".md"):
+                        st = entry.stat()
+                        found[os.path.relpath(entry.path, root_s)] = (st.st_mtime, st.st_size)
+                except OSError:
+                    continue
+    return found
+
+
+def _get_meta(conn, key: str) -> Optional[str]:
+    row = conn.execute("SELECT v FROM docs_index_meta WHERE k = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def refresh_docs_index(root: Optional[Path] = None) -> Dict[str, int]:
+    """Bring the index in line with the filesystem.
+
+    Only files whose (mtime, size) changed are re-read.  Returns counts
+    of scanned / added / updated / removed files and elapsed ms.
+    """
+    root = Path(root or DOCS_ROOT)
+    t0 = time.perf_counter()
+    with _refresh_lock:
+        with writer() as conn:
+            _ensure_schema(conn)
+            if _get_meta(conn, "root") not in (None, str(root)):
+                # Index belongs to another tree — start over
+                conn.execute("DELETE FROM docs_index")
+                conn.execute("DELETE FROM docs_index_terms")
+            indexed = {
+                r[0]: (r[1], r[2])
+                for r in conn.execute("SELECT path, mtime, size FROM docs_index")
+            }
+
+        found = scan_markdown(root)
+        changed = [rel for rel, st in found.items() if indexed.get(rel) != st]
+        removed = [rel for rel in indexed if rel not in found]
+
+        # File reads happen outside the write transaction
+        rows, term_rows = [], []
+        for rel in changed:
+            mtime, size = found[rel]
+            title, weights = _read_doc(root / rel, rel)
+            rows.append((rel, mtime, size, title))
+            term_rows.extend((t, rel, w) for t, w in weights.items())
+
+        with writer() as conn:
+            stale = [(rel,) for rel in changed + removed]
+            conn.executemany("DELETE FROM docs_index_terms WHERE path = ?", stale)
+            conn.executemany("DELETE FROM docs_index WHERE path = ?", [(r,) for r in removed])
+            conn.executemany(
+                "INSERT OR REPLACE INTO docs_index (path, mtime, size, title) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO docs_index_terms (term, path, weight) VALUES (?, ?, ?)",
+                term_rows,
+            )
+            conn.executemany(
+                "INSERT INTO docs_index_meta (k, v) VALUES (?, ?) "
+                "ON CONFLICT(k) DO UPDATE SET v = excluded.v",
+                [("root", str(root)), ("refreshed_at", repr(time.time()))],
+            )
+
+    return {
+        "scanned": len(found),
+        "added": sum(1 for rel in changed if rel not in indexed),
+        "updated": sum(1 for rel in changed if rel in indexed),
+        "removed": len(removed),
+        "ms": int((time.perf_counter() - t0) * 1000),
+    }
+
+
+def _refresh_in_background(root: Path) -> None:
+    if _refresh_lock.locked():
+        return
+
+    def _run():
+        try:
+            refresh_docs_index(root)
+        except Exception:
+            pass
+
+    threading.Thread(target=_run, name="docs-index-refresh", daemon=True).start()
+
+
+def ensure_docs_index(root: Optional[Path] = None) -> None:
+    """Build the index if it has never been built; refresh it if stale."""
+    root = Path(root or DOCS_ROOT)
+    try:
+        with closing(get_connection(readonly=True)) as conn:
+            built_for = _get_meta(conn, "root")
+            refreshed_at = float(_get_meta(conn, "refreshed_at") or 0)
+    except Exception:
+        built_for, refreshed_at = None, 0.0  # tables not created yet
+    if built_for != str(root):
+        refresh_docs_index(root)
+    elif time.time() - refreshed_at > _MAX_AGE_S:
+        _refresh_in_background(root)
+
+
+DocRow = Tuple[str, float, int, str]  # (path, mtime, size, title)
+
+
+def get_docs(paths: Iterable[str]) -> Dict[str, DocRow]:
+    """Indexed rows for the given relative paths (missing ones omitted)."""
+    paths = list(paths)
+    if not paths:
+        return {}
+    marks = ",".join("?" * len(paths))
+    with closing(get_connection(readonly=True)) as conn:
+        rows = conn.execute(
+            f"SELECT path, mtime, size, title FROM docs_index WHERE path IN ({marks})",
+            paths,
+        ).fetchall()
+    return {r[0]: tuple(r) for r in rows}
+
+
+def module_readmes() -> List[DocRow]:
+    """Every <dir>/README.md below the root, sorted by path."""
+    with closing(get_connection(readonly=True)) as conn:
+        rows = conn.execute(
+            "SELECT path, mtime, size, title FROM docs_index "
+            "WHERE path GLOB '*/README.md' ORDER BY path"
+        ).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def recent_docs(limit: int) -> List[DocRow]:
+    """Most recently modified docs first."""
+    with closing(get_connection(readonly=True)) as conn:
+        rows = conn.execute(
+            "SELECT path, mtime, size, title FROM docs_index ORDER BY mtime DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def search_docs(terms: Iterable[str], limit: int = 200) -> List[Tuple[DocRow, float]]:
+    """Docs sharing terms with the query, by summed term weight."""
+    terms = sorted({t.lower() for t in terms})
+    if not terms:
+        return []
+    marks = ",".join("?" * len(terms))
+    with closing(get_connection(readonly=True)) as conn:
+        rows = conn.execute(
+            f"""SELECT d.path, d.mtime, d.size, d.title, s.overlap
+                FROM (SELECT path, SUM(weight) AS overlap FROM docs_index_terms
+                      WHERE term IN ({marks}) GROUP BY path
+                      ORDER BY overlap DESC LIMIT ?) s
+                JOIN docs_index d ON d.path = s.path""",
+            (*terms, limit),
+        ).fetchall()
+    return [(tuple(r[:4]), float(r[4])) for r in rows]
+
+
+def docs_summary() -> Dict[str, object]:
+    """Counts and newest edit, for the docs section metadata."""
+    with closing(get_connection(readonly=True)) as conn:
+        total, readmes = conn.execute(
+            "SELECT COUNT(*), SUM(path = 'README.md' OR path GLOB '*/README.md') FROM docs_index"
+        ).fetchone()
+        last = conn.execute(
+            "SELECT path, mtime FROM docs_index ORDER BY mtime DESC LIMIT 1"
+        ).fetchone()
+    return {
+        "total": int(total or 0),
+        "module_readmes": int(readmes or 0),
+        "last_path": last[0] if last else "",
+        "last_mtime": float(last[1]) if last else 0.0,
+    }
@@ -0,0 +1,174 @@
+"""
+Fact Dedup
+==========
+
+Near-duplicate lookup of candidate facts against stored profile facts,
+batched for ConsolidationLoop triage.
+
+    embeddings on   – the candidates are embedded in one `get_embeddings`
+                      batch and scored against linking_core's
+                      `profile_facts` vector index with one matrix product
+                      per 256 candidates (cosine).
+    embeddings off  – word-shingle inverted index over the same facts.  One
+                      `np.bincount` over a candidate's postings gives the
+                      share of its words found in every fact (containment,
+                      the keyword score triage used before).
+
+Both stay current incrementally: the vector index through the
+`mark_dirty()` calls in identity.schema's fact writers (push, delete,
+decay), the shingle index by diffing content hashes against the table on
+each `nearest()` call and re-indexing only rows that changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+Neighbours = List[Tuple[str, float]]   # (profile_id:key, similarity), best first
+
+_indexes: Dict[str, "_ShingleIndex"] = {}
+_lock = threading.Lock()
+_stats = {"calls": 0, "embedded": 0, "shingled": 0}
+
+
+def _words(text: str) -> set:
+    return set(text.lower().split())
+
+
+class _ShingleIndex:
+    """Word → rows postings over fact texts, with an alive mask."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.hashes: List[str] = []
+        self.alive: List[bool] = []
+        self.rows: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self.lock = threading.Lock()
+
+    def sync(self, texts: Dict[str, str]) -> int:
+        """Bring the index in line with ``item_id → text``. Returns rows changed."""
+        changed = 0
+        for item_id in [i for i in self.rows if i not in texts]:
+            self.alive[self.rows.pop(item_id)] = False
+            changed += 1
+        for item_id, text in texts.items():
+            h = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+            row = self.rows.get(item_id)
+            if row is not None and self.hashes[row] == h:
+                continue
+            if row is not None:
+                self.alive[row] = False
+            self._add(item_id, h, text)
+            changed += 1
+        if len(self.ids) - len(self.rows) > max(64, len(self.ids) // 2):
+            self._rebuild(texts)
+        return changed
+
+    def _add(self, item_id: str, h: str, text: str) -> None:
+        row = len(self.ids)
+        self.ids.append(item_id)
+        self.hashes.append(h)
+        self.alive.append(True)
+        self.rows[item_id] = row
+        for w in _words(text):
+            self.postings.setdefault(w, []).append(row)
+            self._arrays.pop(w, None)
+
+    def _rebuild(self, texts: Dict[str, str]) -> None:
+        self.__init__()
+        for item_id, text in texts.items():
+            h = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+            self._add(item_id, h, text)
+
+    def _posting(self, word: str) -> np.ndarray:
+        arr = self._arrays.get(word)
+        if arr is None:
+            arr = self._arrays[word] = np.asarray(self.postings.get(word, ()), dtype=np.int64)
+        return arr
+
+    def search_many(self, texts: List[str], k: int) -> List[Neighbours]:
+        n = len(self.ids)
+        dead = ~np.asarray(self.alive, dtype=bool)
+        out: List[Neighbours] = []
+        for text in texts:
+            words = _words(text)
+            hits = [self._posting(w) for w in words if w in self.postings]
+            if not words or not hits:
+                out.append([])
+                continue
+            counts = np.bincount(np.concatenate(hits), minlength=n).astype(np.float64)
+            counts[dead] = 0
+            nz = np.flatnonzero(counts)
+            if len(nz) > k:
+                nz = nz[np.argpartition(-counts[nz], k - 1)[:k]]
+            nz = nz[np.argsort(-counts[nz], kind="stable")]
+            out.append([(self.ids[r], counts[r] / len(words)) for r in nz])
+        return out
+
+
+def _shingle_index() -> _ShingleIndex:
+    from data.db import get_db_path
+    path = str(get_db_path())
+    with _lock:
+        return _indexes.setdefault(path, _ShingleIndex())
+
+
+def nearest(texts: List[str], k: int = 10) -> List[Neighbours]:
+    """Top-``k`` stored profile facts for each text, aligned with ``texts``.
+
+    Similarity is embedding cosine when embeddings are available and word
+    containment otherwise (or for texts that could not be embedded).
+    """
+    from agent.threads.linking_core import vector_index
+
+    out: List[Neighbours] = [[] for _ in texts]
+    todo = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not todo:
+        return out
+
+    try:
+        if vector_index.ensure_index("profile_facts"):
+            from agent.threads.linking_core.scoring import get_embeddings
+            vecs = get_embeddings([texts[i] for i in todo])
+            embedded = [(i, v) for i, v in zip(todo, vecs) if v is not None]
+            if embedded:
+                hits = vector_index.search_batch(
+                    "profile_facts", np.stack([v for _, v in embedded]), k,
+                )
+                for (i, _), h in zip(embedded, hits):
+                    out[i] = h
+            done = {i for i, _ in embedded}
+            todo = [i for i in todo if i not in done]
+            _stats["embedded"] += len(done)
+    except Exception:
+        pass
+
+    if todo:
+        index = _shingle_index()
+        rows = vector_index.read_rows("profile_facts")
+        with index.lock:
+            index.sync(rows)
+            for i, h in zip(todo, index.search_many([texts[i] for i in todo], k)):
+                out[i] = h
+        _stats["shingled"] += len(todo)
+    _stats["calls"] += 1
+    return out
+
+
+def dedup_stats() -> Dict[str, int]:
+    """Calls and how many texts went through each path."""
+    with _lock:
+        sizes = {p: len(ix.rows) for p, ix in _indexes.items()}
+    return {**_stats, "shingle_rows": sum(sizes.values())}
+
+
+def reset() -> None:
+    """Drop the shingle indexes (tests, DB switch)."""
+    with _lock:
+        _indexes.clear()
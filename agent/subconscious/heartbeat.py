@@ -198,6 +198,15 @@ def _loop_states() -> Dict[str, Any]:
     return out
 
 
+def _status_count(table: str, status: str) -> int:
+    """Rows of ``table`` with ``status``, from the table counters."""
+    try:
+        from data.db.table_stats import get_column_counts
+        return get_column_counts(table, "status").get(status, 0)
+    except Exception:
+        return 0
+
+
 def _meta_rate_last_hour() -> int:
     return _count(
         "SELECT COUNT(*) FROM reflex_meta_thoughts "
@@ -224,30 +233,14 @@ def build_snapshot() -> Dict[str, Any]:
         "last_turn_age_seconds": last_turn_age,
         "ollama_busy": _ollama_gate_busy(),
         "counts": {
-            "temp_memory_pending": _count(
-                "SELECT COUNT(*) FROM temp_facts WHERE status='pending'"
-            ),
-            "temp_memory_pending_review": _count(
-                "SELECT COUNT(*) FROM temp_facts WHERE status='pending_review'"
-            ),
-            "temp_memory_approved": _count(
-                "SELECT COUNT(*) FROM temp_facts WHERE status='approved'"
-            ),
-            "proposed_goals_pending": _count(
-                "SELECT COUNT(*) FROM proposed_goals WHERE status='pending'"
-            ),
-            "proposed_goals_approved": _count(
-                "SELECT COUNT(*) FROM proposed_goals WHERE status='approved'"
-            ),
-            "proposed_improvements_pending": _count(
-                "SELECT COUNT(*) FROM proposed_improvements WHERE status='pending'"
-            ),
-            "tasks_pending": _count(
-                "SELECT COUNT(*) FROM tasks WHERE status='pending'"
-            ),
-            "tasks_executing": _count(
-                "SELECT COUNT(*) FROM tasks WHERE status='executing'"
-            ),
+            "temp_memory_pending": _status_count("temp_facts", "pending"),
+            "temp_memory_pending_review": _status_count("temp_facts", "pending_review"),
+            "temp_memory_approved": _status_count("temp_facts", "approved"),
+            "proposed_goals_pending": _status_count("proposed_goals", "pending"),
+            "proposed_goals_approved": _status_count("proposed_goals", "approved"),
+            "proposed_improvements_pending": _status_count("proposed_improvements", "pending"),
+            "tasks_pending": _status_count("tasks", "pending"),
+            "tasks_executing": _status_count("tasks", "executing"),
             "notifications_unread": _count(
                 "SELECT COUNT(*) FROM notifications WHERE read=0 AND dismissed=0"
             ),
@@ -281,6 +274,7 @@ class HeartbeatLoop(BackgroundLoop):
             error_backoff=2.0,
             context_aware=False,
             initial_delay=20.0,  # fire ~20s after boot
+            priority=10,
         )
         super().__init__(config, self._tick)
         self._tick_count = 0
@@ -22,6 +22,7 @@ from .memory import MemoryLoop
 from .consolidation import ConsolidationLoop
 from .sync import SyncLoop
 from .health import HealthLoop
+from .docs_index import DocsIndexLoop
 
 # Thought loop + helpers
 from .thought import (
@@ -111,6 +112,7 @@ __all__ = [
     "ConsolidationLoop",
     "SyncLoop",
     "HealthLoop",
+    "DocsIndexLoop",
     "ThoughtLoop",
     "CustomLoop",
     # Manager
@@ -4,8 +4,9 @@ Background Loop Base Classes
 Core abstractions for periodic background tasks.
 
 Concurrency strategy:
-- All loop tasks share a bounded ThreadPoolExecutor (_loop_pool)
-  so heavy LLM / embedding work can't spawn unlimited threads.
+- Loops own no threads: scheduler.py keeps one timing heap for all of
+  them and runs due ticks on a bounded worker pool, local loops
+  concurrently, LLM-bound loops one at a time per provider.
 - An Ollama semaphore (_ollama_gate) limits concurrent Ollama calls
   to 1 by default (env AIOS_OLLAMA_CONCURRENCY), preventing loops
   from starving the chat endpoint of inference capacity.
@@ -16,7 +17,6 @@ Concurrency strategy:
 import os
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Callable, Optional, Dict, Any
 from dataclasses import dataclass
@@ -25,12 +25,6 @@ from enum import Enum
 
 # ── Process-wide resources shared by all BackgroundLoops ────
 
-_POOL_SIZE = int(os.getenv("AIOS_LOOP_POOL_SIZE", "2"))
-_loop_pool = ThreadPoolExecutor(
-    max_workers=_POOL_SIZE,
-    thread_name_prefix="loop-worker",
-)
-
 # Ollama semaphore: prevents multiple loops from calling Ollama at the
 # same time (embedding + inference).  Chat requests bypass this gate
 # because they go through agent_service directly.
@@ -79,24 +73,22 @@ class LoopConfig:
     error_backoff: float = 2.0  # Multiply interval by this on error
     context_aware: bool = False  # When True, loop injects orchestrator STATE into prompts
     initial_delay: float = 0.0  # Seconds to wait before first tick (stagger starts)
+    priority: int = 0  # Higher runs first when several loops are due at once
 
 
 class BackgroundLoop:
     """
     Base class for background loops.
     
-    Runs a task function periodically on a daemon thread.
-    Heavy task work is dispatched to a bounded thread pool so at most
-    AIOS_LOOP_POOL_SIZE (default 2) loops execute simultaneously.
-    Handles error recovery, backoff, and graceful shutdown.
+    Runs a task function periodically.  Ticks are timed and dispatched
+    by the shared loop scheduler (see scheduler.py) onto a bounded
+    worker pool.  Handles error recovery, backoff, and graceful shutdown.
     """
     
     def __init__(self, config: LoopConfig, task: Callable[[], None]):
         self.config = config
         self.task = task
         self._status = LoopStatus.STOPPED
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         self._busy = threading.Event()   # set while a task is executing
         self._consecutive_errors = 0
         self._last_run: Optional[str] = None
@@ -152,6 +144,7 @@ class BackgroundLoop:
             "max_duration": round(max(durations), 2) if durations else None,
             "last_result": self._last_result,
             "last_error": self._last_error,
+            **_scheduler().loop_stats(self),
         }
 
     def _get_state(self, query: str = "") -> str:
@@ -181,28 +174,22 @@ class BackgroundLoop:
         if not self.config.enabled:
             return
         
-        self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run_loop,
-            name=f"loop-{self.config.name}",
-            daemon=True
-        )
         self._status = LoopStatus.RUNNING
-        self._thread.start()
+        # Stagger startup: wait initial_delay, then fire immediately
+        first_wait = self.config.initial_delay if self.config.initial_delay > 0 else self.config.interval_seconds
+        _scheduler().register(self, first_wait)
     
     def stop(self) -> None:
         """Stop the background loop gracefully."""
         if self._status != LoopStatus.RUNNING:
             return
         
-        self._stop_event.set()
         self._status = LoopStatus.STOPPED
-        
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5.0)
+        _scheduler().unregister(self)
+        self.wait_idle(timeout=5.0)
     
     def pause(self) -> None:
-        """Pause the loop (keeps thread alive but skips tasks)."""
+        """Pause the loop (stays scheduled but skips tasks)."""
         if self._status == LoopStatus.RUNNING:
             self._status = LoopStatus.PAUSED
     
@@ -211,91 +198,40 @@ class BackgroundLoop:
         if self._status == LoopStatus.PAUSED:
             self._status = LoopStatus.RUNNING
     
-    def _run_loop(self) -> None:
-        """Main loop runner (runs on background thread).
-        
-        The timer lives here but actual task execution is dispatched to the
-        shared thread pool so we never exceed AIOS_LOOP_POOL_SIZE concurrent
-        heavy operations.
+    def _run_once(self) -> Optional[float]:
+        """One tick (runs on a scheduler worker).
 
-        initial_delay is measured from server start: the loop waits that long
-        then fires immediately, then repeats every interval after that.
+        Returns the delay until the next tick — the interval, or the
+        backed-off interval after an error — or None once max_errors
+        consecutive errors put the loop in ERROR.
         """
-        # Stagger startup: wait initial_delay, then fire immediately
-        first_wait = self.config.initial_delay if self.config.initial_delay > 0 else self.config.interval_seconds
-        if self._stop_event.wait(timeout=first_wait):
-            return
-
-        interval = self.config.interval_seconds
-        
-        while not self._stop_event.is_set():
-            # Skip if paused
-            if self._status == LoopStatus.PAUSED:
-                if self._stop_event.wait(timeout=5.0):
-                    break
-                continue
+        try:
+            self._execute_task()
+        except Exception as e:
+            self._error_count += 1
+            self._consecutive_errors += 1
             
-            # Dispatch task to the bounded pool instead of running inline.
-            # .result() blocks this timer thread until the pool worker
-            # finishes, which is fine — each loop has its own timer thread,
-            # and the pool bounds actual concurrency.
+            # Log error
             try:
-                future = _loop_pool.submit(self._execute_task)
-                # Wait for completion but respect stop signal
-                while not future.done():
-                    if self._stop_event.wait(timeout=1.0):
-                        future.cancel()
-                        break
-                if future.done() and not future.cancelled():
-                    future.result()  # re-raise any exception
-                    
-            except Exception as e:
-                self._error_count += 1
-                self._consecutive_errors += 1
-                
-                # Log error
-                try:
-                    from agent.threads.log import log_error
-                    log_error(f"loop:{self.config.name}", e, context="background loop")
-                except Exception:
-                    pass
-                
-                # Apply backoff
-                interval = min(
-                    self.config.interval_seconds * (self.config.error_backoff ** self._consecutive_errors),
-                    3600  # Cap at 1 hour
-                )
-                
-                # Stop if too many errors
-                if self._consecutive_errors >= self.config.max_errors:
-                    self._status = LoopStatus.ERROR
-                    break
-                # Wait with backoff before retrying
-                if self._stop_event.wait(timeout=interval):
-                    break
-                continue
-
-            # Success — reset
-            interval = self.config.interval_seconds
-
-            # Wait for next interval (sleep AFTER execution)
-            if self._stop_event.wait(timeout=interval):
-                break
+                from agent.threads.log import log_error
+                log_error(f"loop:{self.config.name}", e, context="background loop")
+            except Exception:
+                pass
+            
+            # Stop if too many errors
+            if self._consecutive_errors >= self.config.max_errors:
+                self._status = LoopStatus.ERROR
+                return None
+            # Wait with backoff before retrying
+            return min(
+                self.config.interval_seconds * (self.config.error_backoff ** self._consecutive_errors),
+                3600  # Cap at 1 hour
+            )
+        # Success — sleep AFTER execution
+        return self.config.interval_seconds
 
     def _execute_task(self) -> None:
-        """Run the task on a pool worker thread (niced, with stats bookkeeping)."""
-        _nice_thread()
-        # Single-flight + idle + rate-gate check via scheduler.
-        # Health / sync are flagged "cheap" inside scheduler and bypass.
-        try:
-            from agent.subconscious.loops import scheduler as _sched
-            acquired, reason = _sched.acquire_for(self.config.name, timeout=0.5)
-        except Exception:
-            acquired, reason = True, "scheduler_unavailable"
-        if not acquired:
-            # Skipped this tick — record the reason but DON'T count as error.
-            self._last_result = f"[skipped: {reason}]"
-            return
+        """Run the task with stats bookkeeping."""
         self._busy.set()
         t0 = time.monotonic()
         try:
@@ -317,8 +253,9 @@ class BackgroundLoop:
             raise
         finally:
             self._busy.clear()
-            try:
-                from agent.subconscious.loops import scheduler as _sched
-                _sched.release()
-            except Exception:
-                pass
+
+
+def _scheduler():
+    """loops.scheduler, imported late (it imports this module)."""
+    from agent.subconscious.loops import scheduler
+    return scheduler
@@ -5,7 +5,7 @@ Scores temp_memory facts and promotes high-scoring ones to long-term memory.
 """
 
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base import BackgroundLoop, LoopConfig
 
@@ -116,37 +116,24 @@ class ConsolidationLoop(BackgroundLoop):
             return f"Convo summarization failed: {e}"
 
     def _score_and_triage_pending(self) -> str:
-        """Score pending facts using LinkingCore's scoring pipeline."""
+        """Score pending facts against stored facts in one batch (fact_dedup)."""
         try:
             from agent.subconscious.temp_memory import (
                 get_all_pending, update_fact_status
             )
-            from agent.threads.identity.schema import pull_profile_facts
+            from agent.subconscious.fact_dedup import nearest
             
-            pending = get_all_pending()
+            pending = [f for f in get_all_pending() if f.status == 'pending']
             if not pending:
                 return ""
             
-            existing_facts = pull_profile_facts(limit=500)
-            existing_texts = [
-                f"{f.get('key', '')} {f.get('l1_value', '')} {f.get('l2_value', '')} {f.get('l3_value', '')}"
-                for f in existing_facts
-            ]
-            existing_texts = [t for t in existing_texts if t.strip()]
-            
-            linking_core = self._get_linking_core()
+            # Top-10 stored facts for every pending fact, one batched lookup
+            neighbours = nearest([f.text for f in pending], k=10)
             
             counts = {"approved": 0, "rejected": 0, "pending_review": 0}
-            for fact in pending:
-                if fact.status != 'pending':
-                    continue
-                
+            for fact, near in zip(pending, neighbours):
                 try:
-                    confidence = self._calculate_confidence(
-                        fact.text,
-                        existing_texts,
-                        linking_core
-                    )
+                    confidence = self._calculate_confidence(fact.text, near)
                     
                     if confidence < 0:
                         new_status = 'rejected'
@@ -173,11 +160,15 @@ class ConsolidationLoop(BackgroundLoop):
     def _calculate_confidence(
         self,
         fact_text: str,
-        existing_texts: list,
-        linking_core=None
+        neighbours: list = None,
     ) -> float:
         """
-        Calculate confidence score for a fact using LinkingCore scoring.
+        Calculate confidence score for a fact.
+        
+        Args:
+            fact_text: The pending fact
+            neighbours: (fact_id, similarity) for the closest stored facts,
+                best first, as returned by fact_dedup.nearest()
         
         Returns:
             0.0-1.0 for valid facts (higher = more confident)
@@ -185,22 +176,11 @@ class ConsolidationLoop(BackgroundLoop):
         """
         if not fact_text or not fact_text.strip():
             return 0.0
+        neighbours = neighbours or []
         
-        # Duplicate detection via LinkingCore
-        if existing_texts and linking_core:
-            try:
-                scored = linking_core.score_relevance(
-                    fact_text, existing_texts,
-                    use_embeddings=True,
-                    use_cooccurrence=False,
-                    use_spread_activation=False
-                )
-                if scored:
-                    _, top_similarity = scored[0]
-                    if top_similarity >= self.DUPLICATE_THRESHOLD:
-                        return -1.0
-            except Exception:
-                pass
+        # Duplicate detection
+        if neighbours and neighbours[0][1] >= self.DUPLICATE_THRESHOLD:
+            return -1.0
         
         # Quality scoring
         confidence = 0.5
@@ -216,22 +196,11 @@ class ConsolidationLoop(BackgroundLoop):
         if re.search(r'\d+', fact_text):
             confidence += 0.05
         
-        # Boost from linking core
-        if linking_core and existing_texts:
-            try:
-                scored = linking_core.score_relevance(
-                    fact_text, existing_texts[:50],
-                    use_embeddings=True,
-                    use_cooccurrence=True,
-                    use_spread_activation=True
-                )
-                if scored:
-                    non_dup = [(f, s) for f, s in scored if s < self.DUPLICATE_THRESHOLD]
-                    if non_dup:
-                        avg_relevance = sum(s for _, s in non_dup[:10]) / min(len(non_dup), 10)
-                        confidence += min(0.15, avg_relevance * 0.3)
-            except Exception:
-                pass
+        # Boost from related (non-duplicate) stored facts
+        non_dup = [s for _, s in neighbours if s < self.DUPLICATE_THRESHOLD]
+        if non_dup:
+            avg_relevance = sum(non_dup[:10]) / min(len(non_dup), 10)
+            confidence += min(0.15, avg_relevance * 0.3)
         
         return min(1.0, max(0.0, confidence))
     
@@ -297,6 +266,7 @@ class ConsolidationLoop(BackgroundLoop):
             except Exception:
                 pass
             
+            to_index: Dict[str, List[Tuple[str, str]]] = {}
             for fact in approved:
                 try:
                     # Determine target profile from metadata
@@ -359,18 +329,21 @@ class ConsolidationLoop(BackgroundLoop):
                         profile_counts[target_profile] = profile_counts.get(target_profile, 0) + 1
                     
                     mark_consolidated(fact.id)
-
-                    try:
-                        from agent.threads.linking_core.schema import index_key_in_concept_graph
-                        thread_name = "philosophy" if fact_destination == "philosophy" else "identity"
-                        index_key_in_concept_graph(key, fact.text, thread=thread_name)
-                    except Exception:
-                        pass
+                    thread_name = "philosophy" if fact_destination == "philosophy" else "identity"
+                    to_index.setdefault(thread_name, []).append((key, fact.text))
 
                 except Exception as e:
                     import sys
                     print(f"Error promoting fact {fact.id}: {e}", file=sys.stderr)
             
+            # Index the promoted facts into the concept graph, one batch per thread
+            try:
+                from agent.threads.linking_core.schema import index_keys_in_concept_graph
+                for thread_name, items in to_index.items():
+                    index_keys_in_concept_graph(items, thread=thread_name)
+            except Exception:
+                pass
+            
             total = identity_count + philosophy_count
             if total > 0:
                 result = f"Promoted {total} facts ({identity_count} identity, {philosophy_count} philosophy)"
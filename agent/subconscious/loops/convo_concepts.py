@@ -126,8 +126,7 @@ class ConvoConceptLoop(BackgroundLoop):
             self._run_consolidation()
             return "All caught up — ran consolidation"
 
-        for convo_id, session_id in rows:
-            self._extract_conversation(convo_id, session_id)
+        self._extract_conversations(rows)
 
         new_last_id = rows[-1][0]
         self._set_progress(new_last_id)
@@ -137,51 +136,54 @@ class ConvoConceptLoop(BackgroundLoop):
 
         return f"Processed {len(rows)} conversations, {self._total_concepts} concepts, {self._total_links} links"
 
-    def _extract_conversation(self, convo_id: int, session_id: str) -> None:
-        """Extract concepts from a single conversation."""
+    def _extract_conversations(self, rows: List[tuple]) -> None:
+        """Extract concepts from a batch of (convo_id, session_id) conversations."""
         from data.db import get_connection
         from contextlib import closing
 
+        ids = [convo_id for convo_id, _ in rows]
         with closing(get_connection(readonly=True)) as conn:
             turn_rows = conn.execute(
-                "SELECT user_message, assistant_message FROM convo_turns "
-                "WHERE convo_id = ? ORDER BY turn_index",
-                (convo_id,),
+                f"SELECT convo_id, user_message, assistant_message FROM convo_turns "
+                f"WHERE convo_id IN ({','.join('?' * len(ids))}) ORDER BY convo_id, turn_index",
+                ids,
             ).fetchall()
 
-        if not turn_rows:
-            return
-
-        turns = []
-        for user_msg, asst_msg in turn_rows:
+        by_convo: Dict[int, List[Dict[str, str]]] = {}
+        for convo_id, user_msg, asst_msg in turn_rows:
             turn: Dict[str, str] = {}
             if user_msg:
                 turn["user"] = user_msg
             if asst_msg:
                 turn["assistant"] = asst_msg
             if turn:
-                turns.append(turn)
+                by_convo.setdefault(convo_id, []).append(turn)
 
-        if not turns:
+        batch = [(convo_id, session_id, by_convo[convo_id])
+                 for convo_id, session_id in rows if by_convo.get(convo_id)]
+        if not batch:
             return
 
         # ── LLM extraction (discovers new facts → training data) ─────
         if self.use_llm:
-            self._llm_extract_facts(turns, session_id)
+            for _, session_id, turns in batch:
+                self._llm_extract_facts(turns, session_id)
 
         # ── Entity-match extraction (links known entities in graph) ───
         try:
             from agent.threads.linking_core.schema import (
-                extract_and_record_conversation_concepts,
+                extract_and_record_conversations_concepts,
             )
-            result = extract_and_record_conversation_concepts(
-                turns, session_id=session_id, learning_rate=0.1,
+            results = extract_and_record_conversations_concepts(
+                [turns for _, _, turns in batch], learning_rate=0.1,
             )
+        except Exception as e:
+            print(f"[convo_concepts] Failed on convos {batch[0][0]}..{batch[-1][0]}: {e}")
+            return
+        for result in results:
             self._total_processed += 1
             self._total_concepts += len(result.get("concepts", []))
             self._total_links += result.get("links_created", 0)
-        except Exception as e:
-            print(f"[convo_concepts] Failed on convo {convo_id}: {e}")
 
     # ------------------------------------------------------------------
     # LLM fact extraction
@@ -249,13 +251,6 @@ class ConvoConceptLoop(BackgroundLoop):
         except Exception as e:
             print(f"[convo_concepts] Failed to stage facts for {session_id}: {e}")
 
-        # Invalidate entity registry so new fact keys become matchable
-        try:
-            from agent.threads.linking_core.schema import invalidate_entity_registry
-            invalidate_entity_registry()
-        except Exception:
-            pass
-
         # Save training example
         self._save_training_example(
             convo_text,
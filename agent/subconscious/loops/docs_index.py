@@ -0,0 +1,37 @@
+"""
+Docs Index Loop
+===============
+Keeps the markdown docs index (agent/subconscious/docs_index.py) in sync
+with the filesystem so STATE assembly never walks the repo itself.
+"""
+
+from .base import BackgroundLoop, LoopConfig
+
+
+class DocsIndexLoop(BackgroundLoop):
+    """
+    Periodically re-scans the repo for .md changes.
+
+    Each tick stats every markdown file and re-reads only those whose
+    mtime or size changed. No LLM.
+    """
+
+    def __init__(self, interval: float = 120.0):  # 2 minutes
+        config = LoopConfig(
+            interval_seconds=interval,
+            name="docs_index",
+            enabled=True
+        )
+        super().__init__(config, self._refresh)
+
+    def _refresh(self) -> str:
+        """Refresh the docs index. Returns summary."""
+        try:
+            from agent.subconscious.docs_index import refresh_docs_index
+            r = refresh_docs_index()
+            return (
+                f"Scanned {r['scanned']} docs: +{r['added']} ~{r['updated']} "
+                f"-{r['removed']} in {r['ms']}ms"
+            )
+        except Exception as e:
+            return f"Docs index error: {e}"
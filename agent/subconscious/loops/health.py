@@ -20,7 +20,8 @@ class HealthLoop(BackgroundLoop):
         config = LoopConfig(
             interval_seconds=interval,
             name="health",
-            enabled=True
+            enabled=True,
+            priority=10,
         )
         super().__init__(config, self._check_health)
         self._last_status: Dict[str, str] = {}
@@ -88,6 +89,8 @@ class HealthLoop(BackgroundLoop):
                     bits.append(f"graph_pruned={csum['graph_pruned']}")
                 if csum.get("facts_decayed"):
                     bits.append(f"facts_decayed={csum['facts_decayed']}")
+                if csum.get("counts_fixed"):
+                    bits.append(f"counts_fixed={csum['counts_fixed']}")
                 if csum.get("compression_written"):
                     bits.append("compression=yes")
                 if csum.get("fts_added"):
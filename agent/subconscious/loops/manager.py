@@ -12,6 +12,7 @@ from .memory import MemoryLoop
 from .consolidation import ConsolidationLoop
 from .sync import SyncLoop
 from .health import HealthLoop
+from .docs_index import DocsIndexLoop
 from .thought import ThoughtLoop
 from .training_gen import TrainingGenLoop
 from .custom import CustomLoop, get_custom_loop_configs
@@ -114,7 +115,7 @@ def create_default_loops() -> LoopManager:
 
     Intervals are in days (converted to seconds) so loops run infrequently.
     Loops start PAUSED by default — the user must explicitly start them
-    (except health, which auto-starts).
+    (except health and docs_index, which auto-start).
 
     Returns:
         Configured LoopManager ready to start
@@ -130,6 +131,13 @@ def create_default_loops() -> LoopManager:
     health.config.initial_delay = 10  # fire ~10s after boot
     manager.add(health)
 
+    docs = DocsIndexLoop(
+        interval=float(os.getenv("AIOS_DOCS_INDEX_INTERVAL", "120")),  # 2 min poll
+    )
+    docs.config.enabled = os.getenv("AIOS_DOCS_INDEX", "1") == "1"
+    docs.config.initial_delay = 5
+    manager.add(docs)
+
     task = TaskPlanner(
         interval=float(os.getenv("AIOS_TASK_INTERVAL", str(DAY))),  # 1 day
         enabled=os.getenv("AIOS_TASK_PLANNER", "1") == "1",
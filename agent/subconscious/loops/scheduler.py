@@ -1,111 +1,184 @@
 """
-scheduler.py — Single-flight, idle-aware loop coordinator
-=========================================================
-
-Sits between BackgroundLoop._execute_task and the actual task call.
-Provides four guarantees:
-
-1. **Single-flight**: at most ONE loop's task runs at a time across the
-   whole process. Eliminates overlapping LLM/embedding work.
-
-2. **Idle-aware**: when the user has interacted (chat / API / CLI) in the
-   last AIOS_USER_IDLE_MIN minutes, expensive cloud loops are deferred.
-   "Cheap" loops (health, sync) still run.
-
-3. **Rate-gated**: consults `agent.services.rate_gate` before allowing
-   cloud-backed loops through. Purely-local loops (health, embedding-only
-   tasks) bypass this check.
-
-4. **Average-time tracked**: BackgroundLoop already records durations.
-   Scheduler exposes `summary()` aggregating across all loops for STATE.
-
-Usage from BackgroundLoop._execute_task:
-    if not scheduler.acquire_for(self.config.name): return  # skipped
-    try: ...
-    finally: scheduler.release()
+scheduler.py — Central, priority- and cost-aware loop scheduler
+===============================================================
+
+One dispatcher thread and one timing heap drive every BackgroundLoop;
+loops no longer own a timer thread.  ``BackgroundLoop.start()`` calls
+``register()``, ``stop()`` calls ``unregister()``.
+
+1. **Timing heap**: one (due, seq, gen, entry) per registered loop.  The
+   dispatcher sleeps until the earliest due time — or until a register,
+   a finished run or a lane release wakes it — and moves due loops to
+   the ready list.
+
+2. **Ordering**: ready loops go by priority (``LoopConfig.priority``,
+   higher first), then deadline (due + interval: past it the tick is
+   missed), then measured average cost (EWMA of run time, cheapest
+   first).
+
+3. **Admission**: local loops (CHEAP_LOOPS — no LLM calls) run
+   concurrently on the worker pool (AIOS_LOOP_POOL_SIZE).  Beyond the
+   old health / sync, only docs_index is local; heartbeat (its
+   consolidation faculty summarizes with an LLM), feed_polling and
+   reflex_schedule (a fired reflex can escalate to the agent) stay
+   LLM-bound.  LLM-bound
+   loops take their provider's lane while they run, so at most one per
+   provider (AIOS_LOOP_SINGLE_FLIGHT=0 lifts this).  A loop waiting for
+   a lane stays queued; each deadline it passes counts a
+   ``busy:<holder>`` skip.
+
+4. **Idle-aware / rate-gated**: while the user is active (a chat / API
+   call, CLI task or outbox resolution in the last AIOS_USER_IDLE_MIN
+   minutes, reported in memory by ``note_user_activity()``) LLM-bound
+   loops skip their tick, as they do while ``agent.services.rate_gate``
+   cools their provider down.  User events other processes log to
+   ``unified_events`` are picked up too, by a query at most every
+   AIOS_USER_ACTIVITY_POLL_S seconds (default 30; 0 = memory only),
+   made before the dispatcher takes the scheduler lock.
+
+Per loop: queue wait (due → start), average cost and skip counts by
+reason — ``loop_stats()``, merged into ``BackgroundLoop.stats``.
+``summary()`` aggregates for STATE and the loops API.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import os
 import threading
 import time
-from typing import Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BackgroundLoop, LoopStatus, _nice_thread
 
 # ── Config ─────────────────────────────────────────────────
 
 _SINGLE_FLIGHT = os.getenv("AIOS_LOOP_SINGLE_FLIGHT", "1") == "1"
 _USER_IDLE_MIN = float(os.getenv("AIOS_USER_IDLE_MIN", "5"))     # minutes
 _DEFER_WHEN_ACTIVE = os.getenv("AIOS_DEFER_WHEN_ACTIVE", "1") == "1"
+_POOL_SIZE = int(os.getenv("AIOS_LOOP_POOL_SIZE", "4"))
+_ACTIVITY_POLL_S = float(os.getenv("AIOS_USER_ACTIVITY_POLL_S", "30"))
 
-# Loops tagged as "cheap" never wait for idle / rate gate.
-CHEAP_LOOPS = frozenset({"health", "sync"})
-
-# Loops mapped to their primary provider for rate-gate lookup. Default is
-# whatever the env is set to. Empty string skips the gate check.
-_LOOP_PROVIDER_HINT: Dict[str, str] = {
-    # Local-only loops — no cloud provider gate
-    "health": "",
-    "sync": "",
-    # Heavy / planner loops use whatever PLANNER role resolves to
-    # (resolved lazily at acquire time)
-}
+PAUSE_POLL_S = 5.0      # a paused loop is looked at again after this
+COST_ALPHA = 0.3        # EWMA weight of the newest run time
+_WAITS_KEPT = 20
 
+# Loops that never call an LLM: no lane, no idle / rate gate.
+# heartbeat is not here (faculty_consolidation_hint runs the
+# consolidation summarizer inline), nor feed_polling / reflex_schedule
+# (reflexes they fire can escalate to the agent).
+CHEAP_LOOPS = frozenset({"health", "sync", "docs_index"})
 
-# ── State ──────────────────────────────────────────────────
+# Loops mapped to their primary provider for lanes and the rate gate.
+# Default is whatever the env is set to. Empty string = local.
+_LOOP_PROVIDER_HINT: Dict[str, str] = {name: "" for name in CHEAP_LOOPS}
 
-_lock = threading.RLock()
-_global_flight_lock = threading.Lock()      # actual single-flight gate
-_current_loop: Optional[str] = None
-_acquired_at: float = 0.0
-_skip_counts: Dict[str, int] = {}           # loop_name → skip count
-_skip_reasons: Dict[str, str] = {}          # loop_name → last skip reason
-_run_counts: Dict[str, int] = {}
 
+# ── State ──────────────────────────────────────────────────
 
-def _last_user_activity_seconds() -> Optional[float]:
-    """
-    Seconds since the most recent user interaction. None if unknown.
-    Reads `unified_events` for source IN ('user', 'chat', 'cli', 'api')
-    in the last 30 minutes.
-    """
+class _Entry:
+    """Scheduler-side record of one loop."""
+
+    __slots__ = ("loop", "gen", "active", "due", "deadline", "queued",
+                 "started_at", "provider", "cost", "runs", "waits",
+                 "skips", "last_skip")
+
+    def __init__(self, loop: BackgroundLoop):
+        self.loop = loop
+        self.gen = 0                  # bumped by register/unregister; stale heap items drop
+        self.active = False
+        self.due = 0.0                # monotonic
+        self.deadline = 0.0
+        self.queued = False           # in _ready
+        self.started_at = 0.0         # monotonic while running, else 0
+        self.provider = ""
+        self.cost: Optional[float] = None
+        self.runs = 0
+        self.waits: deque = deque(maxlen=_WAITS_KEPT)
+        self.skips: Dict[str, int] = {}
+        self.last_skip: Optional[str] = None
+
+
+_cond = threading.Condition()
+_entries: Dict[BackgroundLoop, _Entry] = {}    # kept after stop: stats survive a restart
+_heap: List[Tuple[float, int, int, _Entry]] = []
+_ready: List[_Entry] = []
+_lanes: Dict[str, _Entry] = {}            # provider → running entry
+_running = 0
+_seq = itertools.count()
+_dispatcher: Optional[threading.Thread] = None
+_pool: Optional[ThreadPoolExecutor] = None
+
+_last_activity: Optional[float] = None    # monotonic
+_last_activity_source: Optional[str] = None
+_db_activity: Optional[float] = None      # monotonic, from unified_events
+_db_checked_at: Optional[float] = None
+_db_activity_lock = threading.Lock()      # one poller; others use the cached value
+
+
+# ── User activity ──────────────────────────────────────────
+
+def note_user_activity(source: str = "chat") -> None:
+    """Record a user interaction (chat message, API task, CLI command)."""
+    global _last_activity, _last_activity_source
+    _last_activity = time.monotonic()
+    _last_activity_source = source
+
+
+def _db_user_activity() -> Optional[float]:
+    """Monotonic time of the newest recent user event in ``unified_events``
+    (written by any process), re-read at most every _ACTIVITY_POLL_S."""
+    global _db_activity, _db_checked_at
+    if _ACTIVITY_POLL_S <= 0:
+        return None
+    now = time.monotonic()
+    if _db_checked_at is not None and now - _db_checked_at < _ACTIVITY_POLL_S:
+        return _db_activity
+    if not _db_activity_lock.acquire(blocking=False):
+        return _db_activity
     try:
+        _db_checked_at = now
         from contextlib import closing
         from data.db import get_connection
         with closing(get_connection(readonly=True)) as conn:
             row = conn.execute(
-                "SELECT MAX(timestamp) FROM unified_events "
+                "SELECT strftime('%s', 'now') - strftime('%s', MAX(timestamp)) "
+                "FROM unified_events "
                 "WHERE source IN ('user', 'chat', 'cli', 'api') "
                 "AND timestamp >= datetime('now', '-30 minutes')"
             ).fetchone()
-        if not row or not row[0]:
-            return None
-        from datetime import datetime, timezone
-        # SQLite isoformat (no tz) — parse as UTC
-        ts_str = row[0].replace("Z", "+00:00")
-        if "+" not in ts_str and "T" in ts_str:
-            ts_str += "+00:00"
-        try:
-            ts = datetime.fromisoformat(ts_str)
-        except Exception:
-            return None
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=timezone.utc)
-        return max(0.0, (datetime.now(timezone.utc) - ts).total_seconds())
+        _db_activity = None if not row or row[0] is None else now - max(0.0, float(row[0]))
     except Exception:
-        return None
+        _db_activity = None
+    finally:
+        _db_activity_lock.release()
+    return _db_activity
+
+
+def _last_user_activity_seconds() -> Optional[float]:
+    """Seconds since the most recent user interaction. None if none yet."""
+    at = max((t for t in (_last_activity, _db_user_activity()) if t is not None), default=None)
+    return None if at is None else max(0.0, time.monotonic() - at)
+
+
+def _recent(age: Optional[float]) -> bool:
+    """``age`` (seconds since user activity) is within AIOS_USER_IDLE_MIN."""
+    return age is not None and age < _USER_IDLE_MIN * 60.0
 
 
 def _user_active() -> bool:
-    """True if the user has interacted within AIOS_USER_IDLE_MIN minutes."""
-    age = _last_user_activity_seconds()
-    if age is None:
-        return False
-    return age < _USER_IDLE_MIN * 60.0
+    """True if the user has interacted within AIOS_USER_IDLE_MIN minutes.
+
+    May query the DB (see _db_user_activity): call it without ``_cond``.
+    """
+    return _recent(_last_user_activity_seconds())
 
 
 def _provider_for_loop(loop_name: str) -> str:
-    """Best-effort mapping of a loop name to a provider for rate-gate lookup."""
+    """Best-effort mapping of a loop name to a provider ("" = local)."""
     hint = _LOOP_PROVIDER_HINT.get(loop_name)
     if hint is not None:
         return hint
@@ -113,91 +186,246 @@ def _provider_for_loop(loop_name: str) -> str:
     return os.getenv("AIOS_MODEL_PROVIDER", "ollama").lower()
 
 
-# ── Public API ─────────────────────────────────────────────
+def _rate_gate_reason(provider: str) -> Optional[str]:
+    try:
+        from agent.services import rate_gate as _rg
+        skip, reason = _rg.should_skip(provider)
+    except Exception:
+        return None
+    return reason if skip else None
+
+
+# ── Registration ───────────────────────────────────────────
+
+def register(loop: BackgroundLoop, delay: float) -> None:
+    """Schedule ``loop``'s first tick ``delay`` seconds from now."""
+    with _cond:
+        e = _entries.get(loop)
+        if e is None:
+            e = _entries[loop] = _Entry(loop)
+        e.gen += 1
+        e.active = True
+        _unqueue(e)
+        _push(e, time.monotonic() + delay)
+        _ensure_dispatcher()
+        _cond.notify()
+
+
+def unregister(loop: BackgroundLoop) -> None:
+    """Drop ``loop`` from the schedule. A run in flight finishes."""
+    with _cond:
+        e = _entries.get(loop)
+        if e is None:
+            return
+        e.gen += 1
+        e.active = False
+        _unqueue(e)
+        _cond.notify()
+
+
+def _push(e: _Entry, due: float) -> None:
+    e.due = due
+    heapq.heappush(_heap, (due, next(_seq), e.gen, e))
+
+
+def _unqueue(e: _Entry) -> None:
+    if e.queued:
+        _ready.remove(e)
+        e.queued = False
 
-def acquire_for(loop_name: str, timeout: float = 0.5) -> Tuple[bool, str]:
-    """
-    Try to acquire the global single-flight slot for this loop.
 
-    Returns (acquired, reason):
-      - (True, "ok")             — caller MUST run its task and call release()
-      - (False, "busy:{name}")   — another loop is running
-      - (False, "user_active")   — user is interacting; defer
-      - (False, "rate_gate:...") — provider cooling down
-      - (False, "disabled")      — single-flight is off (caller proceeds normally)
+def _ensure_dispatcher() -> None:
+    global _dispatcher, _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=_POOL_SIZE,
+            thread_name_prefix="loop-worker",
+            initializer=_nice_thread,
+        )
+    if _dispatcher is None or not _dispatcher.is_alive():
+        _dispatcher = threading.Thread(target=_dispatch_forever, name="loop-scheduler", daemon=True)
+        _dispatcher.start()
 
-    Cheap loops (health, sync) bypass user-active and rate gates.
+
+# ── Dispatch ───────────────────────────────────────────────
+
+def _dispatch_forever() -> None:
+    while True:
+        # Before taking _cond: the activity check may hit the DB
+        user_active = _DEFER_WHEN_ACTIVE and _user_active()
+        with _cond:
+            _cond.wait(timeout=_dispatch_pass(user_active))
+
+
+def _rank(e: _Entry) -> Tuple[int, float, float]:
+    cfg = e.loop.config
+    return (-cfg.priority, e.deadline, e.cost if e.cost is not None else 0.0)
+
+
+def _skip(e: _Entry, reason: str) -> None:
+    kind = reason.split(":", 1)[0]
+    e.skips[kind] = e.skips.get(kind, 0) + 1
+    e.last_skip = reason
+    e.loop._last_result = f"[skipped: {reason}]"
+
+
+def _dispatch_pass(user_active: bool = False) -> Optional[float]:
+    """Queue due loops and start what admission allows (``_cond`` held).
+
+    ``user_active``: whether LLM-bound loops defer, worked out by the
+    caller before it took ``_cond``.
+
+    Returns the seconds until the next thing to do, None for nothing.
     """
-    global _current_loop, _acquired_at
-
-    if not _SINGLE_FLIGHT:
-        # Single-flight is disabled — caller may proceed but we don't track.
-        return True, "disabled"
-
-    is_cheap = loop_name in CHEAP_LOOPS
-
-    # Idle check
-    if _DEFER_WHEN_ACTIVE and not is_cheap and _user_active():
-        with _lock:
-            _skip_counts[loop_name] = _skip_counts.get(loop_name, 0) + 1
-            _skip_reasons[loop_name] = "user_active"
-        return False, "user_active"
-
-    # Rate gate
-    if not is_cheap:
-        try:
-            from agent.services import rate_gate as _rg
-            provider = _provider_for_loop(loop_name)
-            if provider:
-                skip, reason = _rg.should_skip(provider)
-                if skip:
-                    with _lock:
-                        _skip_counts[loop_name] = _skip_counts.get(loop_name, 0) + 1
-                        _skip_reasons[loop_name] = f"rate_gate:{reason}"
-                    return False, f"rate_gate:{reason}"
-        except Exception:
-            pass
-
-    # Single-flight lock
-    got = _global_flight_lock.acquire(timeout=timeout)
-    if not got:
-        with _lock:
-            _skip_counts[loop_name] = _skip_counts.get(loop_name, 0) + 1
-            _skip_reasons[loop_name] = f"busy:{_current_loop or 'unknown'}"
-        return False, f"busy:{_current_loop or 'unknown'}"
-
-    with _lock:
-        _current_loop = loop_name
-        _acquired_at = time.time()
-        _run_counts[loop_name] = _run_counts.get(loop_name, 0) + 1
-    return True, "ok"
-
-
-def release() -> None:
-    """Release the single-flight slot. Safe to call multiple times."""
-    global _current_loop, _acquired_at
-    with _lock:
-        _current_loop = None
-        _acquired_at = 0.0
+    global _running
+    now = time.monotonic()
+    while _heap and _heap[0][0] <= now:
+        due, _, gen, e = heapq.heappop(_heap)
+        if gen != e.gen or e.queued:
+            continue
+        e.deadline = due + max(e.loop.config.interval_seconds, 1.0)
+        e.queued = True
+        _ready.append(e)
+
+    _ready.sort(key=_rank)
+    waiting: List[_Entry] = []
+    lane_wait: List[float] = []
+    for e in _ready:
+        loop = e.loop
+        interval = loop.config.interval_seconds
+        if loop.status == LoopStatus.PAUSED:
+            e.queued = False
+            _push(e, now + PAUSE_POLL_S)
+            continue
+        if loop.status != LoopStatus.RUNNING:
+            e.queued = False
+            continue
+        if e.started_at:
+            waiting.append(e)             # restarted while its last run is in flight
+            continue
+        e.provider = _provider_for_loop(loop.config.name)
+        if e.provider:
+            reason = "user_active" if user_active else _rate_gate_reason(e.provider)
+            if reason:
+                _skip(e, reason if reason == "user_active" else f"rate_gate:{reason}")
+                e.queued = False
+                _push(e, now + interval)
+                continue
+            holder = _lanes.get(e.provider) if _SINGLE_FLIGHT else None
+            if holder is not None:
+                if now >= e.deadline:
+                    _skip(e, f"busy:{holder.loop.config.name}")
+                    e.deadline = now + max(interval, 1.0)
+                waiting.append(e)
+                lane_wait.append(e.deadline)
+                continue
+        if _running >= _POOL_SIZE:
+            waiting.append(e)
+            continue
+        e.queued = False
+        e.waits.append(now - e.due)
+        e.started_at = now
+        _running += 1
+        if e.provider and _SINGLE_FLIGHT:
+            _lanes[e.provider] = e
+        _pool.submit(_run, e, e.gen)
+    _ready[:] = waiting
+    wake = min(lane_wait + ([_heap[0][0]] if _heap else []), default=None)
+    return None if wake is None else max(0.0, wake - now)
+
+
+def _run(e: _Entry, gen: int) -> None:
+    """Pool worker: one tick of ``e.loop``, then reschedule it."""
+    global _running
+    delay: Optional[float] = None
+    t0 = time.monotonic()
     try:
-        _global_flight_lock.release()
-    except RuntimeError:
-        pass  # not held — fine
+        delay = e.loop._run_once()
+    finally:
+        took = time.monotonic() - t0
+        with _cond:
+            _running -= 1
+            e.started_at = 0.0
+            if _lanes.get(e.provider) is e:
+                del _lanes[e.provider]
+            e.runs += 1
+            e.cost = took if e.cost is None else e.cost + COST_ALPHA * (took - e.cost)
+            if gen == e.gen:
+                if delay is None:
+                    e.active = False
+                else:
+                    _push(e, time.monotonic() + delay)
+            _cond.notify()
+
+
+# ── Stats ──────────────────────────────────────────────────
+
+def loop_stats(loop: BackgroundLoop) -> Dict[str, Any]:
+    """Scheduler view of one loop, for ``BackgroundLoop.stats``."""
+    with _cond:
+        e = _entries.get(loop)
+        now = time.monotonic()
+        name = loop.config.name
+        out: Dict[str, Any] = {
+            "priority": loop.config.priority,
+            "lane": _provider_for_loop(name) or "local",
+            "sched_state": "idle",
+            "next_run_in": None,
+            "avg_cost": None,
+            "last_queue_wait": None,
+            "avg_queue_wait": None,
+            "max_queue_wait": None,
+            "skip_counts": {},
+            "last_skip": None,
+        }
+        if e is None:
+            return out
+        if e.started_at:
+            out["sched_state"] = "running"
+        elif e.queued:
+            out["sched_state"] = "queued"
+        elif e.active:
+            out["sched_state"] = "scheduled"
+            out["next_run_in"] = round(max(0.0, e.due - now), 1)
+        waits = list(e.waits)
+        out.update({
+            "avg_cost": round(e.cost, 2) if e.cost is not None else None,
+            "last_queue_wait": round(waits[-1], 3) if waits else None,
+            "avg_queue_wait": round(sum(waits) / len(waits), 3) if waits else None,
+            "max_queue_wait": round(max(waits), 3) if waits else None,
+            "skip_counts": dict(e.skips),
+            "last_skip": e.last_skip,
+        })
+        return out
 
 
 def summary() -> Dict[str, object]:
     """Snapshot for STATE / dashboards."""
-    with _lock:
-        cur_age = (time.time() - _acquired_at) if _acquired_at else None
+    age = _last_user_activity_seconds()   # may query the DB: before _cond
+    with _cond:
+        now = time.monotonic()
+        entries = list(_entries.values())
+        running = {e.loop.config.name: now - e.started_at for e in entries if e.started_at}
+        current = max(running, key=running.get) if running else None
         return {
             "single_flight": _SINGLE_FLIGHT,
             "defer_when_active": _DEFER_WHEN_ACTIVE,
             "user_idle_min": _USER_IDLE_MIN,
-            "current_loop": _current_loop,
-            "current_age": round(cur_age, 1) if cur_age else None,
-            "user_active": _user_active(),
-            "user_idle_seconds": _last_user_activity_seconds(),
-            "run_counts": dict(_run_counts),
-            "skip_counts": dict(_skip_counts),
-            "skip_reasons_last": dict(_skip_reasons),
+            "pool_size": _POOL_SIZE,
+            "current_loop": current,
+            "current_age": round(running[current], 1) if current else None,
+            "running": {n: round(a, 1) for n, a in running.items()},
+            "lanes": {p: e.loop.config.name for p, e in _lanes.items()},
+            "queued": [e.loop.config.name for e in _ready],
+            "scheduled": sum(1 for e in entries if e.active),
+            "user_active": _recent(age),
+            "user_idle_seconds": round(age, 1) if age is not None else None,
+            "user_activity_source": _last_activity_source,
+            "run_counts": {e.loop.config.name: e.runs for e in entries if e.runs},
+            "skip_counts": {
+                e.loop.config.name: sum(e.skips.values()) for e in entries if e.skips
+            },
+            "skip_reasons_last": {
+                e.loop.config.name: e.last_skip for e in entries if e.last_skip
+            },
         }
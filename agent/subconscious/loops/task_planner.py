@@ -257,6 +257,7 @@ class TaskPlanner(BackgroundLoop):
             interval_seconds=interval,
             name="task_planner",
             enabled=enabled,
+            priority=5,  # user-queued tasks go ahead of self-directed loops
         )
         super().__init__(config, self._check_and_execute)
         self._model = model
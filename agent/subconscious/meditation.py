@@ -9,11 +9,28 @@ Every tick (default 2s):
   2. Extract concepts from each
   3. Inject activation into a `concept_activation` table (max-merge)
   4. Spread activation through concept_links (one hop, weighted)
-  5. Decay all activations toward zero
+  5. Decay all activations toward zero — lazily: rows carry the time
+     they were last set and readers see `LIVE_ACTIVATION`, so a tick only
+     deletes the rows that fell under the floor
   6. Recompute a `salience` overlay on profile_facts +
-     philosophy_profile_facts: salience = weight * (1 + α * sum(activation
-     of concepts mentioned in fact value))
-  7. Refresh `state_cache` — top-K most salient facts per profile
+     philosophy_profile_facts: salience = weight * (1 + α * max(activation
+     of concepts mentioned in fact key/value)), found through the
+     `fact_concepts` term index rather than by scanning every fact
+  7. Refresh `state_cache` — top-K most salient facts per profile, written
+     as a diff against the previous tick
+
+Two behaviours differ from the original per-tick, INSTR-based version:
+
+  - Decay follows wall-clock time, not tick count: an activation loses
+    a factor of DECAY every DECAY_PERIOD_S (2 s, one default tick)
+    since it was last set.  At the default interval that is the old
+    rate; a slower or stalled loop still decays, and a faster one no
+    longer decays faster.
+  - A concept "mentions" a fact when it matches whole terms (see
+    `_fact_terms`): a word, a dotted key-segment run (family.mom →
+    family, mom, family.mom) or a snake_case part; multi-word concepts
+    need all of their words.  Substrings no longer count ("art" does
+    not match "party").
 
 Result: at any instant, a surface can ask "what's on her mind?" and
 get a sorted answer in one SELECT, no compute. STATE assembly becomes
@@ -29,6 +46,7 @@ No LLM. No embeddings. Just decay and diffusion.
 from __future__ import annotations
 
 import json
+import re
 import time
 from contextlib import closing
 from typing import List, Dict, Any, Optional, Iterable
@@ -48,9 +66,17 @@ def _ensure_schema(conn) -> None:
             concept TEXT PRIMARY KEY,
             activation REAL NOT NULL DEFAULT 0,
             last_kicked TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            activated_at REAL DEFAULT ((julianday('now') - 2440587.5) * 86400.0)
         )
     """)
+    # `activation` is as of `activated_at` (unix seconds); older tables
+    # get the column with their rows stamped now.  Schema changes run on
+    # the write paths only; the read views use `_live_activation`, which
+    # falls back to the stored value until the next tick migrates.
+    if not _has_activated_at(conn):
+        cur.execute("ALTER TABLE concept_activation ADD COLUMN activated_at REAL")
+        cur.execute("UPDATE concept_activation SET activated_at = ?", (time.time(),))
     cur.execute(
         "CREATE INDEX IF NOT EXISTS idx_concept_activation ON concept_activation(activation DESC)"
     )
@@ -79,6 +105,55 @@ def _ensure_schema(conn) -> None:
         )
     """)
 
+    # Term → fact inverted index for salience. Rows for a fact are
+    # rewritten from `fact_concepts_dirty`, which triggers on the fact
+    # tables fill whenever a fact's key or value changes.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS fact_concepts (
+            term TEXT NOT NULL,
+            source TEXT NOT NULL,
+            profile_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (term, source, profile_id, key)
+        ) WITHOUT ROWID
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_fact_concepts_fact "
+        "ON fact_concepts(source, profile_id, key)"
+    )
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS fact_concepts_dirty (
+            source TEXT NOT NULL,
+            profile_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (source, profile_id, key)
+        ) WITHOUT ROWID
+    """)
+    for source, (table, _prefix, _min_w) in _FACT_SOURCES.items():
+        # ON CONFLICT rather than OR IGNORE: an outer statement's conflict
+        # policy (e.g. an upsert's ABORT) would override OR IGNORE here.
+        mark = (
+            "INSERT INTO fact_concepts_dirty (source, profile_id, key) "
+            f"VALUES ('{source}', {{row}}.profile_id, {{row}}.key) "
+            "ON CONFLICT DO NOTHING;"
+        )
+        try:
+            cur.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_concepts_ins "
+                f"AFTER INSERT ON {table} BEGIN {mark.format(row='NEW')} END"
+            )
+            cur.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_concepts_upd "
+                f"AFTER UPDATE OF profile_id, key, l1_value ON {table} "
+                f"BEGIN {mark.format(row='OLD')} {mark.format(row='NEW')} END"
+            )
+            cur.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_concepts_del "
+                f"AFTER DELETE ON {table} BEGIN {mark.format(row='OLD')} END"
+            )
+        except Exception:
+            pass  # fact table not created yet; next tick retries
+
 
 def _meta_get(conn, key: str, default: str = "") -> str:
     row = conn.execute(
@@ -97,6 +172,204 @@ def _meta_set(conn, key: str, value: str) -> None:
     )
 
 
+# ─────────────────────────────────────────────────────────────────────
+# Fact → concept index
+# ─────────────────────────────────────────────────────────────────────
+
+# source → (table, state_cache profile_id prefix, minimum weight)
+_FACT_SOURCES = {
+    "identity": ("profile_facts", "", 0.3),
+    "philosophy": ("philosophy_profile_facts", "phil:", 0.5),
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9_.]+")
+_MAX_TERM = 80       # same cap tick() puts on concepts
+_MAX_RUN = 6         # longest dotted segment run indexed as one term
+_SYNC_BATCH = 5000   # dirty facts re-tokenized per tick
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in (m.strip(".") for m in _TOKEN_RE.findall(text.lower())) if t]
+
+
+def _fact_terms(key: str, value: Optional[str]) -> set:
+    """Every term a concept can match in a fact.
+
+    Tokens of the key and value, each contiguous run of a dotted token's
+    segments (``family.mom`` → family, mom, family.mom) and the parts of
+    snake_case segments (``likes_coffee`` → likes, coffee).
+    """
+    terms = set()
+    for tok in _tokens(f"{key or ''} {value or ''}"):
+        segs = [p for p in tok.split(".") if p]
+        for i in range(len(segs)):
+            for j in range(i + 1, min(len(segs), i + _MAX_RUN) + 1):
+                terms.add(".".join(segs[i:j]))
+            terms.update(p for p in segs[i].split("_") if p)
+    return {t for t in terms if len(t) <= _MAX_TERM}
+
+
+def _concept_terms(concept: str) -> List[str]:
+    """Terms a fact must contain to mention ``concept`` (all of them)."""
+    return sorted(set(_tokens(concept)))
+
+
+def _sync_fact_concepts(conn) -> int:
+    """Re-tokenize dirty facts into fact_concepts. Returns facts processed.
+
+    The first pass for each fact table queues every existing row, so a
+    database that predates the index is backfilled over a few ticks.
+    """
+    for source, (table, _prefix, _min_w) in _FACT_SOURCES.items():
+        flag = f"fact_concepts_backfilled:{source}"
+        if _meta_get(conn, flag) == "1":
+            continue
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO fact_concepts_dirty (source, profile_id, key) "
+                f"SELECT ?, profile_id, key FROM {table}",
+                (source,),
+            )
+        except Exception:
+            continue
+        _meta_set(conn, flag, "1")
+
+    dirty = conn.execute(
+        "SELECT source, profile_id, key FROM fact_concepts_dirty LIMIT ?",
+        (_SYNC_BATCH,),
+    ).fetchall()
+    if not dirty:
+        return 0
+    facts, terms = [], []
+    for r in dirty:
+        fact = (r["source"], r["profile_id"], r["key"])
+        facts.append(fact)
+        table = _FACT_SOURCES.get(r["source"], (None,))[0]
+        if table is None:
+            continue
+        row = conn.execute(
+            f"SELECT l1_value FROM {table} WHERE profile_id = ? AND key = ?",
+            (r["profile_id"], r["key"]),
+        ).fetchone()
+        if row is not None:
+            terms.extend((t,) + fact for t in _fact_terms(r["key"], row["l1_value"]))
+    conn.executemany(
+        "DELETE FROM fact_concepts WHERE source = ? AND profile_id = ? AND key = ?",
+        facts,
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO fact_concepts (term, source, profile_id, key) "
+        "VALUES (?, ?, ?, ?)",
+        terms,
+    )
+    conn.executemany(
+        "DELETE FROM fact_concepts_dirty WHERE source = ? AND profile_id = ? AND key = ?",
+        facts,
+    )
+    return len(facts)
+
+
+def _refresh_state_cache(conn) -> int:
+    """Bring state_cache to the current top-K per fact table. Returns rows kept.
+
+    Candidates per table are the top-K facts by weight (salience = weight
+    when nothing they mention is active) plus the top-K facts reached from
+    the active concepts through fact_concepts — together they contain the
+    true top-K by salience.  Only rows that entered, left or changed are
+    written.
+    """
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS meditation_terms "
+        "(concept TEXT, term TEXT, n INTEGER, activation REAL)"
+    )
+    conn.execute("DELETE FROM meditation_terms")
+    active = []
+    for r in conn.execute(
+        f"SELECT concept, {LIVE_ACTIVATION} AS activation FROM concept_activation"
+    ):
+        parts = _concept_terms(r["concept"])
+        active.extend(
+            (r["concept"], t, len(parts), float(r["activation"])) for t in parts
+        )
+    conn.executemany("INSERT INTO meditation_terms VALUES (?, ?, ?, ?)", active)
+    # CROSS JOIN below pins the (small, unanalyzed) term list as the outer
+    # loop so fact_concepts is probed by its primary key, never scanned.
+
+    want: Dict[tuple, tuple] = {}
+    for source, (table, prefix, min_w) in _FACT_SOURCES.items():
+        try:
+            plain = conn.execute(
+                f"SELECT profile_id, key, l1_value, weight, weight AS salience "
+                f"FROM {table} WHERE weight >= ? ORDER BY weight DESC LIMIT ?",
+                (min_w, TOP_SALIENT),
+            ).fetchall()
+            # One-term concepts feed the per-fact MAX directly; multi-word
+            # ones count only where every word matched.
+            boosted = conn.execute(
+                f"""
+                SELECT f.profile_id, f.key, f.l1_value, f.weight,
+                       f.weight * (1.0 + ? * m.a) AS salience
+                FROM (
+                    SELECT profile_id, key, MAX(a) AS a FROM (
+                        SELECT fc.profile_id, fc.key, mt.activation AS a
+                        FROM meditation_terms mt
+                        CROSS JOIN fact_concepts fc
+                            ON fc.term = mt.term AND fc.source = ?
+                        WHERE mt.n = 1
+                        UNION ALL
+                        SELECT fc.profile_id, fc.key, MAX(mt.activation)
+                        FROM meditation_terms mt
+                        CROSS JOIN fact_concepts fc
+                            ON fc.term = mt.term AND fc.source = ?
+                        WHERE mt.n > 1
+                        GROUP BY fc.profile_id, fc.key, mt.concept
+                        HAVING COUNT(*) = MAX(mt.n)
+                    )
+                    GROUP BY profile_id, key
+                ) m
+                JOIN {table} f ON f.profile_id = m.profile_id AND f.key = m.key
+                WHERE f.weight >= ?
+                ORDER BY salience DESC
+                LIMIT ?
+                """,
+                (ALPHA, source, source, min_w, TOP_SALIENT),
+            ).fetchall()
+        except Exception:
+            continue
+        rows = {}
+        for r in list(plain) + list(boosted):
+            rows[(prefix + r["profile_id"], r["key"])] = (
+                r["l1_value"], r["weight"], r["salience"],
+            )
+        want.update(
+            sorted(rows.items(), key=lambda kv: kv[1][2], reverse=True)[:TOP_SALIENT]
+        )
+
+    have = {
+        (r["profile_id"], r["key"]): (r["value"], r["weight"], r["salience"])
+        for r in conn.execute(
+            "SELECT profile_id, key, value, weight, salience FROM state_cache"
+        )
+    }
+    conn.executemany(
+        "DELETE FROM state_cache WHERE profile_id = ? AND key = ?",
+        [k for k in have if k not in want],
+    )
+    conn.executemany(
+        """
+        INSERT INTO state_cache (profile_id, key, value, weight, salience)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(profile_id, key) DO UPDATE SET
+            value = excluded.value,
+            weight = excluded.weight,
+            salience = excluded.salience,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        [k + v for k, v in want.items() if have.get(k) != v],
+    )
+    return len(want)
+
+
 # ─────────────────────────────────────────────────────────────────────
 # Tick
 # ─────────────────────────────────────────────────────────────────────
@@ -104,10 +377,46 @@ def _meta_set(conn, key: str, value: str) -> None:
 # Tunables. Conservative — change after measuring.
 KICK = 1.0          # activation injected for each concept of a new event
 SPREAD = 0.35       # fraction of activation that diffuses one hop
-DECAY = 0.92        # multiplicative decay each tick
+DECAY = 0.92        # multiplicative decay per DECAY_PERIOD_S
+DECAY_PERIOD_S = 2.0   # one tick at the default interval
 FLOOR = 0.02        # below this, drop the row
 TOP_SALIENT = 200   # rows kept in state_cache
 ALPHA = 0.6         # contribution of activation to salience
+SPREAD_SOURCES = 100   # most-active concepts that spread each tick
+SPREAD_FANOUT = 8      # strongest links followed per source
+SPREAD_MIN_LINK = 0.1  # weakest link strength that carries activation
+
+# Activation as readers see it: the stored value decayed to now.
+LIVE_ACTIVATION = f"decayed(activation, activated_at, {DECAY!r}, {DECAY_PERIOD_S!r})"
+
+
+def _has_activated_at(conn) -> bool:
+    return "activated_at" in {r[1] for r in conn.execute("PRAGMA table_info(concept_activation)")}
+
+
+def _live_activation(conn) -> str:
+    """LIVE_ACTIVATION, or plain `activation` on a table not yet migrated."""
+    return LIVE_ACTIVATION if _has_activated_at(conn) else "activation"
+
+
+def _max_merge(conn, activations: Dict[str, float], kicked: bool) -> None:
+    """Upsert concept activations, keeping the larger of old (decayed) and new."""
+    if not activations:
+        return
+    now = time.time()
+    conn.executemany(
+        f"""
+        INSERT INTO concept_activation
+            (concept, activation, last_kicked, updated_at, activated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?)
+        ON CONFLICT(concept) DO UPDATE SET
+            activation = MAX({LIVE_ACTIVATION}, excluded.activation),
+            activated_at = excluded.activated_at,
+            {"last_kicked = CURRENT_TIMESTAMP," if kicked else ""}
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        [(c, float(a), now) for c, a in activations.items()],
+    )
 
 
 def tick(now: Optional[float] = None) -> Dict[str, Any]:
@@ -148,12 +457,13 @@ def tick(now: Optional[float] = None) -> Dict[str, Any]:
                 # token pass over `data` via linking_core.
                 try:
                     from agent.threads.linking_core.schema import (
-                        extract_concepts_from_text,
+                        extract_concepts_batch,
                     )
+                    extracted = extract_concepts_batch([r["data"] or "" for r in rows])
                 except Exception:
-                    extract_concepts_from_text = lambda _t: []  # noqa: E731
+                    extracted = [[] for _ in rows]
                 last_seen = last_id
-                for r in rows:
+                for r, concepts in zip(rows, extracted):
                     last_seen = max(last_seen, int(r["id"]))
                     tags: List[str] = []
                     if r["tags_json"]:
@@ -165,10 +475,7 @@ def tick(now: Optional[float] = None) -> Dict[str, Any]:
                             pass
                     if r["thread_subject"]:
                         tags.append(str(r["thread_subject"]).strip())
-                    try:
-                        tags.extend(extract_concepts_from_text(r["data"] or ""))
-                    except Exception:
-                        pass
+                    tags.extend(concepts)
                     for c in tags:
                         c = c.lower()
                         if not c or len(c) > 80:
@@ -179,138 +486,47 @@ def tick(now: Optional[float] = None) -> Dict[str, Any]:
 
             # 2) Inject activation (max-merge: don't pile on)
             if new_concepts:
-                for concept, kick in new_concepts.items():
-                    conn.execute(
-                        """
-                        INSERT INTO concept_activation (concept, activation, last_kicked, updated_at)
-                        VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                        ON CONFLICT(concept) DO UPDATE SET
-                            activation = MAX(concept_activation.activation, excluded.activation),
-                            last_kicked = CURRENT_TIMESTAMP,
-                            updated_at = CURRENT_TIMESTAMP
-                        """,
-                        (concept, float(kick)),
-                    )
+                _max_merge(conn, new_concepts, kicked=True)
                 summary["concepts_kicked"] = len(new_concepts)
 
-            # 3) Spread one hop: for each currently-active concept, push
-            # SPREAD * activation * link_strength to its neighbors.
-            # Bounded by top 100 active concepts so cost stays flat.
+            # 3) Spread one hop: each of the top active concepts pushes
+            # SPREAD * activation * link_strength to its strongest
+            # neighbors — one gather over the in-memory concept graph,
+            # one batched upsert.
             active_rows = conn.execute(
-                "SELECT concept, activation FROM concept_activation "
-                "WHERE activation >= ? ORDER BY activation DESC LIMIT 100",
-                (FLOOR * 2,),
+                f"SELECT concept, {LIVE_ACTIVATION} AS activation "
+                "FROM concept_activation WHERE activation >= ? "
+                f"AND {LIVE_ACTIVATION} >= ? ORDER BY 2 DESC LIMIT ?",
+                (FLOOR * 2, FLOOR * 2, SPREAD_SOURCES),
             ).fetchall()
             spread_count = 0
             if active_rows:
-                deltas: Dict[str, float] = {}
-                for ar in active_rows:
-                    src = ar["concept"]
-                    src_a = float(ar["activation"])
-                    nbr_rows = conn.execute(
-                        """
-                        SELECT concept_b AS nb, strength FROM concept_links
-                        WHERE concept_a = ? AND strength >= 0.1
-                        UNION
-                        SELECT concept_a AS nb, strength FROM concept_links
-                        WHERE concept_b = ? AND strength >= 0.1
-                        ORDER BY strength DESC LIMIT 8
-                        """,
-                        (src, src),
-                    ).fetchall()
-                    for nr in nbr_rows:
-                        nb = nr["nb"]
-                        if nb == src:
-                            continue
-                        push = SPREAD * src_a * float(nr["strength"])
-                        if push < FLOOR:
-                            continue
-                        if push > deltas.get(nb, 0.0):
-                            deltas[nb] = push
-                        spread_count += 1
-                for nb, push in deltas.items():
-                    conn.execute(
-                        """
-                        INSERT INTO concept_activation (concept, activation, last_kicked, updated_at)
-                        VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                        ON CONFLICT(concept) DO UPDATE SET
-                            activation = MAX(concept_activation.activation, excluded.activation),
-                            updated_at = CURRENT_TIMESTAMP
-                        """,
-                        (nb, float(push)),
-                    )
+                from agent.threads.linking_core.graph import get_concept_graph
+                deltas, spread_count = get_concept_graph().spread_step(
+                    {r["concept"]: float(r["activation"]) for r in active_rows},
+                    SPREAD,
+                    min_strength=SPREAD_MIN_LINK,
+                    fanout=SPREAD_FANOUT,
+                    floor=FLOOR,
+                )
+                _max_merge(conn, deltas, kicked=False)
             summary["spread_edges"] = spread_count
 
-            # 4) Decay everything; drop floor rows.
-            conn.execute(
-                "UPDATE concept_activation SET activation = activation * ?, "
-                "updated_at = CURRENT_TIMESTAMP",
-                (DECAY,),
-            )
+            # 4) Decay is lazy (LIVE_ACTIVATION); only drop floor rows.
             cur = conn.execute(
-                "DELETE FROM concept_activation WHERE activation < ?",
+                f"DELETE FROM concept_activation WHERE {LIVE_ACTIVATION} < ?",
                 (FLOOR,),
             )
             summary["decayed_rows"] = cur.rowcount or 0
+            # Release the write lock before the salience reads.
+            conn.commit()
 
             # 5) Refresh state_cache: top-K facts ordered by salience.
-            # salience = weight * (1 + ALPHA * sum_active(concepts that
-            # appear lowercased in the fact key or l1_value))
-            # We keep this in pure SQL: a join from profile_facts to
-            # concept_activation on token equality is cheap when
-            # concept_activation is small (< 1k rows).
-            # Strategy: compute per-fact salience boost as the MAX
-            # activation of any concept whose token appears as an exact
-            # key segment.  Cheap and safe.
-            conn.execute("DELETE FROM state_cache")
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO state_cache (profile_id, key, value, weight, salience)
-                    SELECT
-                        f.profile_id,
-                        f.key,
-                        f.l1_value,
-                        f.weight,
-                        f.weight * (1.0 + ? * COALESCE((
-                            SELECT MAX(ca.activation) FROM concept_activation ca
-                            WHERE INSTR(LOWER(f.key) || ' ' || LOWER(COALESCE(f.l1_value,'')), ca.concept) > 0
-                        ), 0.0))
-                    FROM profile_facts f
-                    WHERE f.weight >= 0.3
-                    ORDER BY 5 DESC
-                    LIMIT ?
-                    """,
-                    (ALPHA, TOP_SALIENT),
-                )
-            except Exception:
-                pass
-            # Add philosophy facts (separate table — no UNION needed)
-            try:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO state_cache (profile_id, key, value, weight, salience)
-                    SELECT
-                        'phil:' || pf.profile_id,
-                        pf.key,
-                        pf.l1_value,
-                        pf.weight,
-                        pf.weight * (1.0 + ? * COALESCE((
-                            SELECT MAX(ca.activation) FROM concept_activation ca
-                            WHERE INSTR(LOWER(pf.key) || ' ' || LOWER(COALESCE(pf.l1_value,'')), ca.concept) > 0
-                        ), 0.0))
-                    FROM philosophy_profile_facts pf
-                    WHERE pf.weight >= 0.5
-                    LIMIT ?
-                    """,
-                    (ALPHA, TOP_SALIENT),
-                )
-            except Exception:
-                pass
-            n_row = conn.execute(
-                "SELECT COUNT(*) AS n FROM state_cache"
-            ).fetchone()
-            summary["salience_rows"] = int(n_row["n"]) if n_row else 0
+            # salience = weight * (1 + ALPHA * max activation of the
+            # active concepts the fact mentions), looked up through the
+            # fact_concepts index so only mentioning facts are touched.
+            _sync_fact_concepts(conn)
+            summary["salience_rows"] = _refresh_state_cache(conn)
 
             conn.commit()
     except Exception as e:
@@ -351,10 +567,9 @@ def hot_concepts(limit: int = 25) -> List[Dict[str, Any]]:
     """Currently most-active concepts. The DB's 'working memory'."""
     try:
         with closing(get_connection(readonly=True)) as conn:
-            _ensure_schema(conn)
             rows = conn.execute(
-                "SELECT concept, activation, last_kicked FROM concept_activation "
-                "ORDER BY activation DESC LIMIT ?",
+                f"SELECT concept, {_live_activation(conn)} AS activation, last_kicked "
+                "FROM concept_activation ORDER BY 2 DESC LIMIT ?",
                 (int(limit),),
             ).fetchall()
             return [
@@ -373,7 +588,6 @@ def top_salient(limit: int = 25, profile_prefix: Optional[str] = None) -> List[D
     """Top-K facts by current salience (pre-baked)."""
     try:
         with closing(get_connection(readonly=True)) as conn:
-            _ensure_schema(conn)
             if profile_prefix:
                 rows = conn.execute(
                     "SELECT * FROM state_cache WHERE profile_id LIKE ? "
@@ -467,9 +681,8 @@ def detect_session_shift(window_minutes: int = 60, min_facts: int = 3) -> Option
 def meditation_stats() -> Dict[str, Any]:
     try:
         with closing(get_connection(readonly=True)) as conn:
-            _ensure_schema(conn)
             n_act = conn.execute(
-                "SELECT COUNT(*) AS n, MAX(activation) AS mx FROM concept_activation"
+                f"SELECT COUNT(*) AS n, MAX({_live_activation(conn)}) AS mx FROM concept_activation"
             ).fetchone()
             n_cache = conn.execute(
                 "SELECT COUNT(*) AS n, MAX(salience) AS mx FROM state_cache"
@@ -27,11 +27,14 @@ Architecture:
     - agent.generate() IS assess - LLM evaluates query against state
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+import contextvars
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
 import json
 import re
+import threading
 
 # Path where the previous turn's fact_keys are cached so the next turn's
 # score() can apply a Hebbian recency boost to the threads/modules that
@@ -143,6 +146,69 @@ MIN_SOURCE_BUDGET = 40
 # Maximum share any single source can claim (prevents domination)
 MAX_SOURCE_SHARE = 0.30
 
+# Concurrent section assembly.  Sources are independent, so build_state
+# fans them out on a bounded pool and splices results back in score
+# order.  AIOS_STATE_WORKERS=1 keeps the sequential loop.
+STATE_WORKERS = int(_os.getenv("AIOS_STATE_WORKERS", "6"))
+# Per-source deadline.  A source that misses it is rebuilt at L1; if the
+# L1 build misses its own deadline too, the source sits out this turn.
+SOURCE_DEADLINE_MS = int(_os.getenv("AIOS_STATE_SOURCE_DEADLINE_MS", "2000"))
+
+# STATE layout.  "score" (default) orders every source by relevance.
+# "stable" puts the slow-changing sources first, in a fixed order and
+# built without the query, so consecutive prompts share a long prefix
+# that provider prompt caches / llama.cpp KV reuse can skip; the
+# volatile blocks (self-awareness, salience, scored sources, rollup)
+# follow.
+STATE_LAYOUT = _os.getenv("AIOS_STATE_LAYOUT", "score")
+STABLE_SOURCES = ("identity", "philosophy", "form")
+# Fixed score for stable sources: L2 at a middling threshold, every turn.
+STABLE_SCORE = 5.0
+# QueryAnalysis results kept for reuse between score() and build_state().
+_ANALYSIS_CACHE_SIZE = 8
+
+_section_pool: Optional[ThreadPoolExecutor] = None
+_section_pool_lock = threading.Lock()
+
+
+def _get_section_pool() -> ThreadPoolExecutor:
+    """Shared pool for section builders (created on first use)."""
+    global _section_pool
+    with _section_pool_lock:
+        if _section_pool is None:
+            _section_pool = ThreadPoolExecutor(
+                max_workers=max(1, STATE_WORKERS),
+                thread_name_prefix="state-section",
+            )
+        return _section_pool
+
+
+# Builds that missed their deadline, by source.  Pool threads can't be
+# cancelled, so a hung adapter keeps its slot; the source sits out later
+# turns until its previous build has finished instead of piling more
+# submissions onto the pool.
+_late_builds: Dict[str, List[Future]] = {}
+_late_builds_lock = threading.Lock()
+
+
+def _note_late(source: str, fut: Future) -> None:
+    with _late_builds_lock:
+        _late_builds.setdefault(source, []).append(fut)
+
+
+def _busy_sources(sources) -> set:
+    """Sources whose earlier late build is still running."""
+    with _late_builds_lock:
+        busy = set()
+        for src in list(_late_builds):
+            pending = [f for f in _late_builds[src] if not f.done()]
+            if pending:
+                _late_builds[src] = pending
+                busy.add(src)
+            else:
+                del _late_builds[src]
+        return busy & set(sources)
+
 
 def allocate_budgets(scores: Dict[str, float],
                      context_window: int = 0,
@@ -206,6 +272,14 @@ class Subconscious:
         self._last_context_time: Optional[str] = None
         self._last_query: Optional[str] = None
         self._linking_core = None
+        # The Subconscious is process-wide and build_state can run for
+        # several callers at once, so shared per-turn state sits behind
+        # _state_lock.  QueryAnalysis by query, from recent score() calls;
+        # build_state reuses it when called for the same query.
+        self._state_lock = threading.Lock()
+        self._analysis_cache: Dict[str, Any] = {}
+        # Content hash per stable-layout section, from the previous build.
+        self._stable_hashes: Dict[str, str] = {}
     
     def _get_adapter(self, thread_name: str):
         """Get a thread adapter from the central registry."""
@@ -237,9 +311,11 @@ class Subconscious:
         """
         from agent.subconscious import trace_bus  # local import to avoid cycles
         trace_bus.publish("score_start", query=query[:200] if query else "")
+        analysis = self._analyze(query)
         linking_core = self._get_linking_core()
         if linking_core and query:
-            scores = linking_core.score_threads(query)
+            with self._use_analysis(analysis):
+                scores = linking_core.score_threads(query)
         else:
             # Default scores if linking_core unavailable or no query
             scores = {t: 5.0 for t in THREADS}
@@ -282,6 +358,33 @@ class Subconscious:
         trace_bus.publish("score_done", scores={k: round(v, 2) for k, v in scores.items()})
         return scores
     
+    def _analyze(self, query: str, analysis=None):
+        """QueryAnalysis for this turn — passed in, cached from score(), or fresh."""
+        if not query:
+            return None
+        if analysis is None:
+            with self._state_lock:
+                cached = self._analysis_cache.get(query)
+            if cached is not None:
+                return cached
+        try:
+            from agent.threads.linking_core.query import analyze_query
+            analysis = analysis or analyze_query(query)
+        except Exception:
+            return None
+        with self._state_lock:
+            self._analysis_cache.pop(query, None)
+            self._analysis_cache[query] = analysis
+            while len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.pop(next(iter(self._analysis_cache)))
+        return analysis
+
+    @staticmethod
+    def _use_analysis(analysis):
+        """Install ``analysis`` for adapters called in this context."""
+        from agent.threads.linking_core.query import use_query_analysis
+        return use_query_analysis(analysis)
+
     def _score_modules(self, query: str) -> Dict[str, float]:
         """Score top-level modules for relevance to query."""
         q = query.lower()
@@ -350,7 +453,7 @@ class Subconscious:
 
         return scores
     
-    def build_state(self, scores: Dict[str, float], query: str = "", record_activations: bool = True, context_window: int = 0, state_fraction: float = 0.0) -> str:
+    def build_state(self, scores: Dict[str, float], query: str = "", record_activations: bool = True, context_window: int = 0, state_fraction: float = 0.0, analysis=None) -> str:
         """
         Build STATE block from scored threads AND modules.
         
@@ -368,10 +471,19 @@ class Subconscious:
                 keys that co-appeared in this STATE into key_cooccurrence.
                 Pass False for previews / hypothetical builds (dashboard,
                 debugging) so they don't pollute Hebbian counts.
+            analysis: QueryAnalysis for ``query``.  Defaults to the one
+                score() computed for the same query; adapters read it via
+                linking_core.query.get_query_analysis().
         
         Returns:
             Formatted STATE block string
         """
+        with self._use_analysis(self._analyze(query, analysis)):
+            return self._build_state(
+                scores, query, record_activations, context_window, state_fraction,
+            )
+
+    def _build_state(self, scores: Dict[str, float], query: str, record_activations: bool, context_window: int, state_fraction: float) -> str:
         from agent.subconscious import trace_bus
         import time as _t
         _build_start = _t.perf_counter()
@@ -395,7 +507,12 @@ class Subconscious:
         )
         
         lines = ["== STATE =="]
-        
+        stable = STATE_LAYOUT == "stable"
+        if stable:
+            for section in self._build_stable_sections(context_window, state_fraction):
+                lines.extend(section)
+                lines.append("")
+
         # Self-awareness header — injected once at top
         lines.extend(self._build_self_awareness_block())
 
@@ -410,6 +527,7 @@ class Subconscious:
         except Exception:
             pass
         
+        plan: List[Tuple[str, int, float, int]] = []
         for source_name, score in ordered_sources:
             # Determine level from score
             if score < SCORE_THRESHOLDS["L1"]:
@@ -423,22 +541,13 @@ class Subconscious:
             threshold = max(0.0, 10.0 - score)
             
             source_budget = budgets.get(source_name, MIN_SOURCE_BUDGET)
-            if source_budget <= 0:
+            if source_budget <= 0 or (stable and source_name in STABLE_SOURCES):
                 continue
+            if source_name in THREADS or source_name in MODULES:
+                plan.append((source_name, level, threshold, source_budget))
 
-            if source_name in THREADS:
-                # ---------- Thread source ----------
-                section = self._build_thread_section(
-                    source_name, level, threshold, query, source_budget
-                )
-            elif source_name in MODULES:
-                # ---------- Module source ----------
-                section = self._build_module_section(
-                    source_name, level, threshold, query, source_budget
-                )
-            else:
-                continue
-            
+        # Splice in score order regardless of completion order
+        for section in self._build_sections(plan, query):
             if section:
                 lines.append("")
                 lines.extend(section)
@@ -498,7 +607,171 @@ class Subconscious:
     # ------------------------------------------------------------------
     # Section builders
     # ------------------------------------------------------------------
-    
+
+    def _build_stable_sections(
+        self, context_window: int, state_fraction: float,
+    ) -> List[List[str]]:
+        """STABLE_SOURCES sections for the "stable" layout, in fixed order.
+
+        Built without the query (and its QueryAnalysis) at STABLE_SCORE,
+        so the text only changes when the underlying facts do.  Publishes
+        a content hash per section and which ones changed since the last
+        build — a changed hash is where the cached prompt prefix ends.
+        """
+        import hashlib
+        from agent.subconscious import trace_bus
+        cw = context_window or CONTEXT_WINDOW
+        sf = state_fraction or STATE_FRACTION
+        level = 2
+        budget = max(MIN_SOURCE_BUDGET, int(cw * sf * MAX_SOURCE_SHARE))
+        plan = [(src, level, 10.0 - STABLE_SCORE, budget) for src in STABLE_SOURCES]
+        with self._use_analysis(None):
+            sections = self._build_sections(plan, "")
+
+        hashes = {
+            src: hashlib.sha1("\n".join(section).encode("utf-8")).hexdigest()[:12]
+            for src, section in zip(STABLE_SOURCES, sections)
+        }
+        with self._state_lock:
+            changed = [src for src in STABLE_SOURCES if self._stable_hashes.get(src) != hashes[src]]
+            self._stable_hashes = hashes
+        trace_bus.publish("state_layout", layout="stable", hashes=hashes, changed=changed)
+        return [section for section in sections if section]
+
+    def _build_sections(
+        self, plan: List[Tuple[str, int, float, int]], query: str,
+    ) -> List[List[str]]:
+        """Build every planned (source, level, threshold, budget) section.
+
+        Returns sections aligned with ``plan``.  With STATE_WORKERS > 1
+        the builders run concurrently; a source that misses
+        SOURCE_DEADLINE_MS is retried at L1 (same deadline again) and
+        dropped if that is late too.  Late builds keep running on the
+        pool — threads can't be cancelled — but their output is ignored,
+        and the source is skipped until they finish.
+        """
+        from agent.subconscious import trace_bus
+        import time as _t
+        t0 = _t.perf_counter()
+        timings: List[Dict[str, Any]] = []
+
+        if STATE_WORKERS <= 1 or len(plan) <= 1:
+            sections = [
+                self._timed_section(src, lvl, thr, query, bud, t0, timings)
+                for src, lvl, thr, bud in plan
+            ]
+        else:
+            pool = _get_section_pool()
+            deadline_s = SOURCE_DEADLINE_MS / 1000.0
+            busy = _busy_sources(p[0] for p in plan)
+            for src in busy:
+                trace_bus.publish("section_deadline", source=src, action="skipped_busy")
+            # Each worker runs in a copy of this context so it sees the
+            # turn's QueryAnalysis.  Busy sources get an empty placeholder.
+            futures = []
+            for src, lvl, thr, bud in plan:
+                if src in busy:
+                    fut = Future()
+                    fut.set_result([])
+                else:
+                    fut = pool.submit(
+                        contextvars.copy_context().run,
+                        self._timed_section, src, lvl, thr, query, bud, t0, timings,
+                    )
+                futures.append(fut)
+            sections, late = self._collect(
+                futures, [p[0] for p in plan], t0 + deadline_s,
+            )
+
+            retries = {}
+            for i in late:
+                src, lvl, thr, bud = plan[i]
+                _note_late(src, futures[i])
+                trace_bus.publish(
+                    "section_deadline", source=src, level=lvl,
+                    action="retry_l1" if lvl > 1 else "dropped",
+                )
+                if lvl > 1:
+                    retries[i] = pool.submit(
+                        contextvars.copy_context().run,
+                        self._timed_section, src, 1, thr, query, bud, t0, timings,
+                    )
+            if retries:
+                order = list(retries)
+                retried, still_late = self._collect(
+                    [retries[i] for i in order], [plan[i][0] for i in order],
+                    _t.perf_counter() + deadline_s,
+                )
+                for i, section in zip(order, retried):
+                    sections[i] = section
+                for j in still_late:
+                    _note_late(plan[order[j]][0], retries[order[j]])
+                    trace_bus.publish(
+                        "section_deadline", source=plan[order[j]][0],
+                        level=1, action="dropped",
+                    )
+
+        wall_ms = (_t.perf_counter() - t0) * 1000
+        critical = max(timings, key=lambda t: t["end_ms"], default=None)
+        trace_bus.publish(
+            "sections_done",
+            parallel=STATE_WORKERS > 1 and len(plan) > 1,
+            source_count=len(plan),
+            wall_ms=round(wall_ms, 1),
+            sum_ms=round(sum(t["duration_ms"] for t in timings), 1),
+            critical_source=critical["source"] if critical else None,
+        )
+        return sections
+
+    @staticmethod
+    def _collect(
+        futures, names: List[str], deadline: float,
+    ) -> Tuple[List[List[str]], List[int]]:
+        """Wait for futures until ``deadline``; return (sections, late indexes)."""
+        from agent.subconscious import trace_bus
+        import time as _t
+        sections: List[List[str]] = []
+        late: List[int] = []
+        for i, fut in enumerate(futures):
+            try:
+                sections.append(fut.result(timeout=max(0.0, deadline - _t.perf_counter())))
+            except FuturesTimeout:
+                sections.append([])
+                late.append(i)
+            except Exception as e:
+                trace_bus.publish("section_error", source=names[i], error=str(e)[:200])
+                sections.append([])
+        return sections, late
+
+    def _timed_section(
+        self, source_name: str, level: int, threshold: float, query: str,
+        budget: int, t0: float, timings: List[Dict[str, Any]],
+    ) -> List[str]:
+        """Build one source's section and publish its timing."""
+        from agent.subconscious import trace_bus
+        import time as _t
+        start = _t.perf_counter()
+        if source_name in THREADS:
+            section = self._build_thread_section(
+                source_name, level, threshold, query, budget
+            )
+        else:
+            section = self._build_module_section(
+                source_name, level, threshold, query, budget
+            )
+        end = _t.perf_counter()
+        timing = {
+            "source": source_name,
+            "level": level,
+            "start_ms": round((start - t0) * 1000, 1),
+            "end_ms": round((end - t0) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+            "lines": len(section),
+        }
+        timings.append(timing)
+        trace_bus.publish("section_timing", **timing)
+        return section
+
     def _build_thread_section(
         self, thread_name: str, level: int, threshold: float, query: str,
         budget: int = 200,
@@ -703,25 +976,22 @@ class Subconscious:
     
     def _get_module_metadata(self, module_name: str) -> List[str]:
         """Return permanent metadata lines for a module (chat, workspace)."""
-        try:
-            from data.db import get_connection
-            conn = get_connection(readonly=True)
-        except Exception:
-            return []
-
         if module_name == "chat":
             try:
-                row = conn.execute(
-                    "SELECT COUNT(*) as cnt, SUM(turn_count) as turns, "
-                    "COUNT(CASE WHEN summary IS NOT NULL AND summary != '' THEN 1 END) as summaries "
-                    "FROM convos"
-                ).fetchone()
+                from contextlib import closing
+                from data.db import get_connection
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute(
+                        "SELECT COUNT(*) as cnt, SUM(turn_count) as turns, "
+                        "COUNT(CASE WHEN summary IS NOT NULL AND summary != '' THEN 1 END) as summaries "
+                        "FROM convos"
+                    ).fetchone()
+                    last_row = conn.execute(
+                        "SELECT session_id FROM convos ORDER BY last_updated DESC LIMIT 1"
+                    ).fetchone()
                 cnt = row["cnt"] if row else 0
                 turns = row["turns"] if row and row["turns"] else 0
                 summaries = row["summaries"] if row else 0
-                last_row = conn.execute(
-                    "SELECT session_id FROM convos ORDER BY last_updated DESC LIMIT 1"
-                ).fetchone()
                 last_session = last_row["session_id"] if last_row else "none"
                 return [
                     f"  conversations: {cnt}",
@@ -745,35 +1015,17 @@ class Subconscious:
 
         elif module_name == "docs":
             try:
-                import os as _os
-                from pathlib import Path as _Path
-                root = _Path(__file__).resolve().parents[2]
-                total = 0
-                module_readmes = 0
-                last_mtime = 0
-                last_path = ""
-                for dp, dns, fns in _os.walk(root):
-                    # Prune noisy dirs
-                    dns[:] = [d for d in dns if d not in ("_archive", "__pycache__", ".git", "node_modules", ".venv", "venv", "dist", "build", ".next")]
-                    for fn in fns:
-                        if fn.lower().endswith(".md"):
-                            total += 1
-                            if fn == "README.md":
-                                module_readmes += 1
-                            fp = _os.path.join(dp, fn)
-                            try:
-                                mt = _os.path.getmtime(fp)
-                                if mt > last_mtime:
-                                    last_mtime = mt
-                                    last_path = _os.path.relpath(fp, root)
-                            except Exception:
-                                pass
+                from agent.subconscious import docs_index
+                docs_index.ensure_docs_index()
+                summary = docs_index.docs_summary()
+                last_mtime = summary["last_mtime"]
+                last_path = summary["last_path"]
                 # Sync freshness: root docs mtime vs newest module README mtime
                 from datetime import datetime as _dt
                 age_s = int((_dt.now().timestamp() - last_mtime)) if last_mtime else -1
                 lines = [
-                    f"  markdown_files: {total}",
-                    f"  module_readmes: {module_readmes}",
+                    f"  markdown_files: {summary['total']}",
+                    f"  module_readmes: {summary['module_readmes']}",
                 ]
                 if last_path:
                     lines.append(f"  last_edit: {last_path} ({age_s//60}m ago)" if age_s >= 0 else f"  last_edit: {last_path}")
@@ -896,7 +1148,6 @@ class Subconscious:
         details. Anything that needs to be re-derived per turn lives in
         the per-thread blocks below.
         """
-        from contextlib import closing
 
         lines = ["", "[self] My internal structure (live)"]
 
@@ -907,37 +1158,30 @@ class Subconscious:
         except Exception:
             threads = []
 
-        # Map of thread_name → (table, count_query). Only count what each
-        # thread actually owns; this isn't a tour of the DB, it's a roll-call.
-        thread_counts: Dict[str, str] = {}
+        # thread_name → [(table, label)]. Only count what each thread
+        # actually owns; this isn't a tour of the DB, it's a roll-call.
+        # Counts come from the trigger-kept counters (data/db/table_stats.py),
+        # not a COUNT(*) over every table per build.
         try:
-            from data.db import get_connection
-            with closing(get_connection(readonly=True)) as conn:
-                cur = conn.cursor()
-                queries = [
-                    ("identity",     "SELECT (SELECT COUNT(*) FROM profiles) || ' profiles, ' || "
-                                     "(SELECT COUNT(*) FROM profile_facts) || ' facts'"),
-                    ("philosophy",   "SELECT (SELECT COUNT(*) FROM philosophy_profile_facts) || ' stances'"),
-                    ("reflex",       "SELECT (SELECT COUNT(*) FROM reflex_meta_thoughts) || ' meta-thoughts, ' || "
-                                     "(SELECT COUNT(*) FROM reflex_triggers) || ' triggers'"),
-                    ("log",          "SELECT (SELECT COUNT(*) FROM unified_events) || ' events, ' || "
-                                     "(SELECT COUNT(*) FROM log_server) || ' http requests, ' || "
-                                     "(SELECT COUNT(*) FROM log_llm_inference) || ' llm calls'"),
-                    ("form",         "SELECT (SELECT COUNT(*) FROM form_tools) || ' tools, ' || "
-                                     "(SELECT COUNT(*) FROM tool_traces) || ' traces'"),
-                    ("field",        "SELECT (SELECT COUNT(*) FROM field_observations) || ' observations, ' || "
-                                     "(SELECT COUNT(*) FROM field_alerts) || ' alerts'"),
-                    ("linking_core", "SELECT (SELECT COUNT(*) FROM concept_links) || ' links'"),
-                ]
-                for name, q in queries:
-                    try:
-                        row = cur.execute(q).fetchone()
-                        if row and row[0]:
-                            thread_counts[name] = str(row[0])
-                    except Exception:
-                        pass
+            from data.db.table_stats import get_column_counts, get_table_counts
+            table_counts = get_table_counts()
         except Exception:
-            pass
+            table_counts = {}
+        thread_tables = {
+            "identity":     [("profiles", "profiles"), ("profile_facts", "facts")],
+            "philosophy":   [("philosophy_profile_facts", "stances")],
+            "reflex":       [("reflex_meta_thoughts", "meta-thoughts"), ("reflex_triggers", "triggers")],
+            "log":          [("unified_events", "events"), ("log_server", "http requests"),
+                             ("log_llm_inference", "llm calls")],
+            "form":         [("form_tools", "tools"), ("tool_traces", "traces")],
+            "field":        [("field_observations", "observations"), ("field_alerts", "alerts")],
+            "linking_core": [("concept_links", "links")],
+        }
+        thread_counts: Dict[str, str] = {
+            name: ", ".join(f"{table_counts[t]} {label}" for t, label in tables)
+            for name, tables in thread_tables.items()
+            if all(t in table_counts for t, _ in tables)
+        }
 
         registered_names = sorted({getattr(t, "_name", "") or getattr(t, "thread_name", "") for t in threads if t} - {""})
         lines.append(f"  threads: {len(registered_names)} registered")
@@ -978,47 +1222,34 @@ class Subconscious:
 
         # ── Surface tables: anything outside the thread roll-call ───
         try:
-            from data.db import get_connection
-            with closing(get_connection(readonly=True)) as conn:
-                cur = conn.cursor()
-                surface = []
-                for label, q in [
-                    ("workspace_files", "SELECT COUNT(*) FROM workspace_files"),
-                    ("proposed_goals (open)",
-                        "SELECT COUNT(*) FROM proposed_goals WHERE status IN "
-                        "('pending','approved','in_progress','paused','blocked')"),
-                    ("proposed_goals (total)",   "SELECT COUNT(*) FROM proposed_goals"),
-                    ("convo_turns",   "SELECT COUNT(*) FROM convo_turns"),
-                    ("sensory_events",      "SELECT COUNT(*) FROM sensory_events"),
-                    ("notifications",       "SELECT COUNT(*) FROM notifications"),
-                ]:
-                    try:
-                        n = cur.execute(q).fetchone()[0]
-                        surface.append(f"{label}={n}")
-                    except Exception:
-                        pass
-                if surface:
-                    lines.append(f"  surface_tables: {', '.join(surface)}")
+            surface = []
+            goals = get_column_counts("proposed_goals", "status")
+            for label, n in [
+                ("workspace_files", table_counts.get("workspace_files")),
+                ("proposed_goals (open)",
+                    sum(goals.get(s, 0) for s in
+                        ("pending", "approved", "in_progress", "paused", "blocked"))
+                    if "proposed_goals" in table_counts else None),
+                ("proposed_goals (total)", table_counts.get("proposed_goals")),
+                ("convo_turns",    table_counts.get("convo_turns")),
+                ("sensory_events", table_counts.get("sensory_events")),
+                ("notifications",  table_counts.get("notifications")),
+            ]:
+                if n is not None:
+                    surface.append(f"{label}={n}")
+            if surface:
+                lines.append(f"  surface_tables: {', '.join(surface)}")
         except Exception:
             pass
 
-        # ── Concept graph stats (kept from previous implementation) ──
+        # ── Concept graph stats (from the in-memory concept graph) ──
         try:
-            from data.db import get_connection
-            with closing(get_connection(readonly=True)) as conn:
-                cur = conn.cursor()
-                cur.execute("SELECT COUNT(*) FROM concept_links")
-                link_count = cur.fetchone()[0]
-                cur.execute("SELECT COUNT(DISTINCT concept_a) + COUNT(DISTINCT concept_b) FROM concept_links")
-                concept_count = (cur.fetchone()[0] // 2) or 0
-                cur.execute("SELECT AVG(strength) FROM concept_links")
-                avg_strength = cur.fetchone()[0] or 0.0
-                cur.execute("SELECT COUNT(*) FROM concept_links WHERE strength >= 0.7")
-                potentiated = cur.fetchone()[0]
-                lines.append(
-                    f"  graph: {link_count:,} links, ~{concept_count:,} concepts, "
-                    f"avg_strength={avg_strength:.2f}, long_potentiated={potentiated:,}"
-                )
+            from agent.threads.linking_core.graph import get_concept_graph
+            g = get_concept_graph().summary()
+            lines.append(
+                f"  graph: {g['links']:,} links, ~{g['concepts']:,} concepts, "
+                f"avg_strength={g['avg_strength']:.2f}, long_potentiated={g['potentiated']:,}"
+            )
         except Exception:
             pass
 
@@ -1037,12 +1268,13 @@ class Subconscious:
         level/threshold control how much detail is returned:
         - L1 (lean): file list with sizes
         - L2 (medium): + summaries
-        - L3 (full): + FTS snippets, concept re-ranking
+        - L3 (full): + FTS snippets, concept re-ranking, then the
+          nearest chunks from the workspace_chunks vector index
         """
         try:
             from workspace.schema import (
                 get_workspace_stats, get_all_files_metadata,
-                search_files, search_file_content,
+                search_files, search_file_content, semantic_search_files,
             )
             
             stats = get_workspace_stats()
@@ -1062,17 +1294,10 @@ class Subconscious:
             # Re-rank FTS results by concept overlap with query
             if fts_results and query:
                 try:
-                    from agent.threads.linking_core.schema import (
-                        extract_concepts_from_text, spread_activate,
-                    )
-                    query_concepts = extract_concepts_from_text(query)
-                    if query_concepts:
-                        activated = spread_activate(
-                            query_concepts, activation_threshold=0.1,
-                            max_hops=1, limit=30,
-                        )
-                        activated_set = {a["concept"] for a in activated}
-                        activated_set.update(query_concepts)
+                    from agent.threads.linking_core.query import get_query_analysis
+                    analysis = get_query_analysis(query)
+                    if analysis.concepts:
+                        activated_set = analysis.relevant(threshold=0.1, limit=30)
 
                         def _concept_boost(result: dict) -> float:
                             text = (result.get("path", "") + " " + result.get("snippet", "")).lower()
@@ -1083,6 +1308,20 @@ class Subconscious:
                 except Exception:
                     pass  # Fallback to default FTS order
 
+            # Fill remaining slots with semantic matches FTS missed
+            if query and len(fts_results) < max_results and stats.get("chunks", 0) > 0:
+                try:
+                    from agent.threads.linking_core.query import get_query_analysis
+                    seen = {r.get("path") for r in fts_results}
+                    for r in semantic_search_files(
+                        query, limit=max_results,
+                        vector=get_query_analysis(query).embedding,
+                    ):
+                        if r["path"] not in seen and len(fts_results) < max_results:
+                            fts_results.append(r)
+                except Exception:
+                    pass
+
             if fts_results:
                 # L3 — we have direct query matches: summaries + snippets
                 for r in fts_results:
@@ -1139,10 +1378,14 @@ class Subconscious:
         - L1: recent convo names + turn counts
         - L2: + summaries
         - L3: + search-matched message snippets
+        
+        Search = keyword matches, then conversations whose turns are
+        nearest to the query in the convo_turns vector index.
         """
         try:
             from chat.schema import (
                 list_conversations, search_conversations,
+                semantic_search_conversations,
             )
             
             min_weight = threshold / 10.0
@@ -1155,6 +1398,18 @@ class Subconscious:
                     search_results = search_conversations(query, limit=max_results)
                 except Exception:
                     search_results = []
+                if len(search_results) < max_results:
+                    try:
+                        from agent.threads.linking_core.query import get_query_analysis
+                        seen = {r.get("session_id") for r in search_results}
+                        for r in semantic_search_conversations(
+                            query, limit=max_results,
+                            vector=get_query_analysis(query).embedding,
+                        ):
+                            if r["session_id"] not in seen and len(search_results) < max_results:
+                                search_results.append(r)
+                    except Exception:
+                        pass
             
             if search_results:
                 for r in search_results:
@@ -1205,34 +1460,23 @@ class Subconscious:
         L1: stable references only.
         L2: + a few recent edits.
         L3: + first-heading preview, more recent edits, all READMEs.
+
+        Reads from the docs index (agent/subconscious/docs_index.py),
+        which the docs_index loop keeps in sync with the filesystem.
         """
         try:
-            import os as _os
-            from pathlib import Path as _Path
             from datetime import datetime as _dt
+            from agent.subconscious import docs_index
 
-            root = _Path(__file__).resolve().parents[2]
-            md_files: List[tuple] = []  # (rel_path, mtime, size)
-            for dp, dns, fns in _os.walk(root):
-                dns[:] = [d for d in dns if d not in ("_archive", "__pycache__", ".git", "node_modules", ".venv", "venv", "dist", "build", ".next")]
-                for fn in fns:
-                    if fn.lower().endswith(".md"):
-                        fp = _os.path.join(dp, fn)
-                        try:
-                            st = _os.stat(fp)
-                            md_files.append((_os.path.relpath(fp, root), st.st_mtime, st.st_size))
-                        except Exception:
-                            pass
-
-            if not md_files:
-                return []
+            docs_index.ensure_docs_index()
 
             now_ts = _dt.now().timestamp()
             facts: List[str] = []
             seen: set = set()
 
-            def _emit(rel: str, mt: float, sz: int, with_title: bool = False) -> None:
+            def _emit(row: tuple, with_title: bool = False) -> None:
                 """Append one doc fact and (optionally) its title. Dedupe by path."""
+                rel, mt, sz, title = row
                 if rel in seen:
                     return
                 seen.add(rel)
@@ -1244,18 +1488,8 @@ class Subconscious:
                 else:
                     age_s = f"{age_min // (60 * 24)}d"
                 facts.append(f"  docs.{rel}: {sz}B ({age_s} ago)")
-                if with_title:
-                    try:
-                        with open(root / rel, "r", encoding="utf-8", errors="ignore") as fh:
-                            head = fh.read(400).strip().splitlines()
-                            first = next(
-                                (ln.strip("# ").strip() for ln in head if ln.strip().startswith("#")),
-                                "",
-                            )
-                            if first:
-                                facts.append(f"  docs.{rel}.title: {first[:120]}")
-                    except Exception:
-                        pass
+                if with_title and title:
+                    facts.append(f"  docs.{rel}.title: {title[:120]}")
 
             # ---- Stable references (always shown) ----
             # Root architecture-class docs.
@@ -1267,45 +1501,37 @@ class Subconscious:
                 "docs/RESEARCH_PAPER.md",
                 "CONTRIBUTING.md",
             )
-            by_path = {rel: (rel, mt, sz) for rel, mt, sz in md_files}
+            by_path = docs_index.get_docs(ROOT_PRIORITY)
             for p in ROOT_PRIORITY:
                 if p in by_path:
-                    rel, mt, sz = by_path[p]
-                    _emit(rel, mt, sz, with_title=(level >= 2))
+                    _emit(by_path[p], with_title=(level >= 2))
 
             # All module READMEs (every <module>/README.md). These ARE
             # the source of truth for adapters per scripts/sync_docs.py.
-            module_readmes = [
-                (rel, mt, sz)
-                for rel, mt, sz in md_files
-                if rel.endswith("/README.md") and rel != "README.md"
-            ]
-            module_readmes.sort(key=lambda x: x[0])
-            for rel, mt, sz in module_readmes:
-                _emit(rel, mt, sz, with_title=(level >= 3))
+            for row in docs_index.module_readmes():
+                _emit(row, with_title=(level >= 3))
 
             # ---- Recent edits, query-ranked, fill remaining budget ----
-            q_terms = [t.lower() for t in (query or "").split() if len(t) > 2]
-
-            def _score(item):
-                rel, mt, _sz = item
-                # 30-day half-window
-                recency = max(0.0, 1.0 - (now_ts - mt) / (60 * 60 * 24 * 30))
-                hit = 0.0
-                low = rel.lower()
-                for t in q_terms:
-                    if t in low:
-                        hit += 1.0
-                return recency + hit * 2.0 if q_terms else recency
-
             recent_extra = {1: 0, 2: 4, 3: max_results}.get(level, max_results)
             if recent_extra > 0:
-                ranked = sorted(md_files, key=_score, reverse=True)
+                from agent.threads.linking_core.query import get_query_analysis
+                q_terms = get_query_analysis(query).tokens if query else set()
+                # Candidates: every doc sharing a query term, plus the most
+                # recent ones (recency alone can win when nothing matches).
+                overlap = {row: score for row, score in docs_index.search_docs(q_terms)}
+                candidates = list(overlap)
+                candidates += docs_index.recent_docs(recent_extra + len(seen))
+
+                def _score(row):
+                    # 30-day half-window
+                    recency = max(0.0, 1.0 - (now_ts - row[1]) / (60 * 60 * 24 * 30))
+                    return recency + overlap.get(row, 0.0) * 2.0
+
                 emitted = 0
-                for rel, mt, sz in ranked:
-                    if rel in seen:
+                for row in sorted(candidates, key=_score, reverse=True):
+                    if row[0] in seen:
                         continue
-                    _emit(rel, mt, sz, with_title=(level >= 3))
+                    _emit(row, with_title=(level >= 3))
                     emitted += 1
                     if emitted >= recent_extra:
                         break
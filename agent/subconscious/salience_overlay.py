@@ -28,6 +28,8 @@ from typing import List, Dict, Any, Optional
 
 from data.db import get_connection
 
+from agent.subconscious.meditation import LIVE_ACTIVATION
+
 
 # In-process state for readiness volatility tracking.
 _LAST_TOP_SALIENCE: float = 0.0
@@ -50,13 +52,13 @@ def goal_salience(limit: int = 20) -> List[Dict[str, Any]]:
     try:
         with closing(get_connection(readonly=True)) as conn:
             rows = conn.execute(
-                """
+                f"""
                 SELECT
                     g.id, g.goal, g.priority, g.urgency, g.status,
                     COALESCE((
-                        SELECT MAX(ca.activation)
-                        FROM concept_activation ca
-                        WHERE INSTR(LOWER(g.goal), ca.concept) > 0
+                        SELECT MAX({LIVE_ACTIVATION})
+                        FROM concept_activation
+                        WHERE INSTR(LOWER(g.goal), concept) > 0
                     ), 0.0) AS lift
                 FROM proposed_goals g
                 WHERE g.status IN ('pending','approved','in_progress')
@@ -102,7 +104,7 @@ def readiness() -> Dict[str, Any]:
     try:
         with closing(get_connection(readonly=True)) as conn:
             act = conn.execute(
-                "SELECT COALESCE(MAX(activation), 0.0) AS mx, COUNT(*) AS n "
+                f"SELECT COALESCE(MAX({LIVE_ACTIVATION}), 0.0) AS mx, COUNT(*) AS n "
                 "FROM concept_activation"
             ).fetchone()
             sal = conn.execute(
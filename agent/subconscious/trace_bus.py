@@ -14,37 +14,198 @@ to any connected client, so the phone / dashboard / debugger can watch
 the system think in real time.
 
 Design notes:
-  • Lock-guarded deque.  No asyncio, no external deps, no Redis.
+  • Lock-guarded ring.  No external deps, no Redis.
   • Publishing is best-effort and never raises.
   • A monotonic sequence lets subscribers resume after a dropped
     connection without losing anything that's still in the buffer.
+    Sequences are contiguous, so event ``seq`` lives in slot
+    ``seq % _MAX_EVENTS`` and a resume point is found in O(1).
   • Default buffer is 2000 events (~a few minutes of live orchestration).
+  • Readers don't poll.  `subscribe()` registers a bounded queue that
+    `publish()` pushes matching events into (optionally filtered by event
+    type) and wakes: a threading.Condition for blocking readers, an
+    asyncio.Event set via call_soon_threadsafe for `watch()`.  A full
+    queue counts the event as dropped and the reader refills the gap from
+    the ring; only events that aged out of the ring too are lost.
 
 Goal #26.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
 import threading
 import time
 from collections import deque
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
 # How many events to keep in memory at once.  Raise if the UI needs a
 # longer replay window; lower if memory becomes a concern.
 _MAX_EVENTS = 2000
 
+# Events queued per subscriber before it starts dropping (and later
+# refilling from the ring).
+SUBSCRIBER_QUEUE = 1000
+
+# After delivering a batch, watch() readers wait this long before the
+# next one: a few ms of latency for one wakeup per interval instead of
+# one per event on a busy stream.
+WATCH_COALESCE_S = float(os.getenv("AIOS_TRACE_COALESCE_S", "0.02"))
+
 # All state lives in module-level singletons.  Safe because the server
 # is a single process; if AI_OS ever runs multi-process the bus would
 # need to move to redis/sqlite.
 _LOCK = threading.Lock()
-_BUFFER: "deque[Dict[str, Any]]" = deque(maxlen=_MAX_EVENTS)
+_COND = threading.Condition(_LOCK)   # blocking Subscription.get()
+_RING: List[Optional[Dict[str, Any]]] = [None] * _MAX_EVENTS
 _NEXT_SEQ = 1
+_SUBSCRIBERS: "set[Subscription]" = set()
 
 # Counter of all events ever published — useful for the /stats endpoint.
 _TOTAL_PUBLISHED = 0
 
 
+# asyncio readers to wake, per event loop: one call_soon_threadsafe per
+# loop per publish instead of one per reader.
+_WAKE: "Dict[asyncio.AbstractEventLoop, List[Subscription]]" = {}
+
+
+def _wake_later(sub: "Subscription") -> None:
+    """Queue ``sub``'s asyncio.Event to be set on its loop.  Under _LOCK."""
+    pending = _WAKE.setdefault(sub._loop, [])
+    pending.append(sub)
+    if len(pending) == 1:
+        try:
+            sub._loop.call_soon_threadsafe(_wake, sub._loop)
+        except RuntimeError:
+            del _WAKE[sub._loop]  # loop closed — its readers are gone
+
+
+def _wake(loop: asyncio.AbstractEventLoop) -> None:
+    with _LOCK:
+        subs = _WAKE.pop(loop, ())
+    for sub in subs:
+        sub._ready.set()
+
+
+class Subscription:
+    """One reader's view of the bus: a bounded queue of new events.
+
+    Create with `subscribe()`; read with `get()` (blocking) or `aget()`
+    (asyncio); `close()` when done (also a context manager).
+    """
+
+    def __init__(self, types: Optional[Iterable[str]], maxsize: int, since: Optional[int]):
+        self.types = frozenset(types) if types else None
+        self.maxsize = max(1, maxsize)
+        self.dropped = 0      # events that didn't fit in the queue
+        self.lost = 0         # seqs that left the ring before a refill reached them
+        self.delivered = 0
+        self._queue: "deque[Dict[str, Any]]" = deque()
+        self._cursor = 0      # highest seq handed out or queued
+        self._behind = False  # ring holds events the queue doesn't
+        self._overflowed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._signalled = True    # wake already pending, or not waiting
+        if since is not None:
+            self._cursor = since
+            self._behind = True   # replay what the ring still has
+
+    def accepts(self, event_type: str) -> bool:
+        return self.types is None or event_type in self.types
+
+    # Called by publish() under _LOCK
+    def _push(self, ev: Dict[str, Any]) -> None:
+        if not self._behind and len(self._queue) >= self.maxsize:
+            self._behind = self._overflowed = True
+        if self._behind:
+            # the reader refills from the ring; replaying ?since= isn't a drop
+            self.dropped += self._overflowed
+        else:
+            self._queue.append(ev)
+            self._cursor = ev["seq"]
+        if self._ready is not None and not self._signalled:
+            self._signalled = True
+            _wake_later(self)
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        """Queued events, then (if it overflowed) the rest from the ring.  Under _LOCK."""
+        out: List[Dict[str, Any]] = []
+        while self._queue and len(out) < limit:
+            out.append(self._queue.popleft())
+        if self._behind and not self._queue and len(out) < limit:
+            last = out[-1]["seq"] if out else self._cursor
+            oldest = max(1, _NEXT_SEQ - _MAX_EVENTS)
+            if last + 1 < oldest:
+                self.lost += oldest - (last + 1)   # seqs gone, whatever their type
+            seq = max(last + 1, oldest)
+            while seq < _NEXT_SEQ and len(out) < limit:
+                ev = _RING[seq % _MAX_EVENTS]
+                if self.accepts(ev["type"]):
+                    out.append(ev)
+                seq += 1
+            self._cursor = seq - 1
+            self._behind = seq < _NEXT_SEQ
+            self._overflowed = self._overflowed and self._behind
+        self.delivered += len(out)
+        return out
+
+    def get(self, timeout: Optional[float] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Wait up to ``timeout`` seconds for events; [] on timeout."""
+        with _COND:
+            out = self._take(limit)
+            if not out:
+                _COND.wait_for(lambda: self._queue or self._behind or self not in _SUBSCRIBERS,
+                               timeout)
+                out = self._take(limit)
+            return out
+
+    async def aget(self, timeout: Optional[float] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """`get()` for the event loop: awaits a publish instead of blocking."""
+        if self._ready is None:
+            self._loop = asyncio.get_running_loop()
+            self._ready = asyncio.Event()
+        with _LOCK:
+            out = self._take(limit)
+            if out:
+                return out
+            self._signalled = False  # waiting: the next push wakes us
+            self._ready.clear()
+        # a timer on the same Event, not wait_for(): no task per wait
+        timer = None if timeout is None else self._loop.call_later(timeout, self._ready.set)
+        try:
+            await self._ready.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+        with _LOCK:
+            self._signalled = True   # not waiting: pushes needn't wake us
+            return self._take(limit)
+
+    def close(self) -> None:
+        with _COND:
+            _SUBSCRIBERS.discard(self)
+            _COND.notify_all()
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with _LOCK:
+            return {
+                "types": sorted(self.types) if self.types else None,
+                "queued": len(self._queue),
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "lost": self.lost,
+            }
+
+
 def publish(event_type: str, **fields: Any) -> Optional[int]:
     """Publish one event to the trace bus.
 
@@ -68,43 +229,94 @@ def publish(event_type: str, **fields: Any) -> Optional[int]:
         }
         with _LOCK:
             ev["seq"] = _NEXT_SEQ
+            _RING[_NEXT_SEQ % _MAX_EVENTS] = ev
             _NEXT_SEQ += 1
             _TOTAL_PUBLISHED += 1
-            _BUFFER.append(ev)
+            if _SUBSCRIBERS:
+                pushed = False
+                for sub in _SUBSCRIBERS:
+                    if sub.accepts(event_type):
+                        sub._push(ev)
+                        pushed = True
+                if pushed:
+                    _COND.notify_all()
         return ev["seq"]
     except Exception:
         return None
 
 
-def events_since(last_seq: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
-    """Return events with seq > last_seq, oldest first, up to `limit`."""
+def events_since(last_seq: int = 0, limit: int = 500,
+                 types: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Return events with seq > last_seq, oldest first, up to `limit`.
+
+    ``types`` keeps only those event types.
+    """
+    wanted = frozenset(types) if types else None
     with _LOCK:
-        # deque → list copy is fine for a 2000-item buffer.
-        snap = list(_BUFFER)
-    out: List[Dict[str, Any]] = []
-    for ev in snap:
-        if ev["seq"] > last_seq:
-            out.append(ev)
-            if len(out) >= limit:
-                break
-    return out
+        seq = max(last_seq + 1, _NEXT_SEQ - _MAX_EVENTS, 1)
+        if wanted is None:
+            end = min(_NEXT_SEQ, seq + limit)
+            return [_RING[s % _MAX_EVENTS] for s in range(seq, end)]
+        out: List[Dict[str, Any]] = []
+        while seq < _NEXT_SEQ and len(out) < limit:
+            ev = _RING[seq % _MAX_EVENTS]
+            if ev["type"] in wanted:
+                out.append(ev)
+            seq += 1
+        return out
+
+
+def subscribe(types: Optional[Iterable[str]] = None, since: Optional[int] = None,
+              maxsize: int = SUBSCRIBER_QUEUE) -> Subscription:
+    """Register a reader.  ``since`` replays buffered events after that seq
+    first; ``types`` filters by event type; ``maxsize`` bounds its queue."""
+    sub = Subscription(types, maxsize, since)
+    with _LOCK:
+        _SUBSCRIBERS.add(sub)
+    return sub
+
+
+async def watch(since: int = 0, types: Optional[Iterable[str]] = None,
+                idle_s: float = 15.0, limit: int = 200,
+                coalesce_s: float = WATCH_COALESCE_S) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Async iterator of event batches for one reader (the SSE endpoint).
+
+    The first batch is what the ring holds after ``since`` (possibly [],
+    right away); after that it yields as events are published, and []
+    after ``idle_s`` seconds without any so the caller can send a
+    keep-alive.  After a batch it waits ``coalesce_s`` before reading
+    again, so a busy stream costs a wakeup per interval rather than per
+    event.  Unsubscribes when closed or cancelled.
+    """
+    sub = subscribe(types=types, since=since)
+    try:
+        yield sub.get(timeout=0, limit=limit)
+        while True:
+            batch = await sub.aget(timeout=idle_s, limit=limit)
+            yield batch
+            if batch and coalesce_s > 0:
+                await asyncio.sleep(coalesce_s)
+    finally:
+        sub.close()
 
 
 def latest_seq() -> int:
     """Highest sequence number currently in the buffer (or 0 if empty)."""
     with _LOCK:
-        if not _BUFFER:
-            return 0
-        return _BUFFER[-1]["seq"]
+        return _NEXT_SEQ - 1
 
 
 def stats() -> Dict[str, int]:
     with _LOCK:
+        subs = list(_SUBSCRIBERS)
         return {
-            "buffer_size": len(_BUFFER),
+            "buffer_size": min(_NEXT_SEQ - 1, _MAX_EVENTS),
             "max_events": _MAX_EVENTS,
             "total_published": _TOTAL_PUBLISHED,
             "next_seq": _NEXT_SEQ,
+            "subscribers": len(subs),
+            "dropped": sum(s.dropped for s in subs),
+            "lost": sum(s.lost for s in subs),
         }
 
 
@@ -112,14 +324,21 @@ def clear() -> None:
     """Drop everything.  Debug / test use only."""
     global _NEXT_SEQ, _TOTAL_PUBLISHED
     with _LOCK:
-        _BUFFER.clear()
+        _RING[:] = [None] * _MAX_EVENTS
         _NEXT_SEQ = 1
         _TOTAL_PUBLISHED = 0
+        for sub in _SUBSCRIBERS:
+            sub._queue.clear()
+            sub._cursor = 0
+            sub._behind = sub._overflowed = False
 
 
 __all__ = [
+    "Subscription",
     "publish",
     "events_since",
+    "subscribe",
+    "watch",
     "latest_seq",
     "stats",
     "clear",
@@ -244,21 +244,10 @@ class BaseThreadAdapter:
         relevant_concepts: set = set()
         if query:
             try:
-                from agent.threads.linking_core.schema import (
-                    spread_activate,
-                    extract_concepts_from_text,
-                )
-                query_concepts = extract_concepts_from_text(query)
-                if query_concepts:
-                    activated = spread_activate(
-                        input_concepts=query_concepts,
-                        activation_threshold=0.1,
-                        max_hops=1,
-                        limit=20,
-                    )
-                    relevant_concepts = set(query_concepts)
-                    for a in activated:
-                        relevant_concepts.add(a.get("concept", ""))
+                from agent.threads.linking_core.query import get_query_analysis
+                analysis = get_query_analysis(query)
+                if analysis.concepts:
+                    relevant_concepts = analysis.relevant(threshold=0.1, limit=20)
             except Exception:
                 pass
 
@@ -332,32 +321,20 @@ class BaseThreadAdapter:
     ) -> tuple:
         """Boost weights of query-relevant facts so _budget_fill prioritises them.
 
-        Uses LinkingCore spread_activate to find concepts related to the
-        query, then bumps the weight of any raw_fact whose path / values
-        mention one of those concepts.
+        Uses the turn's QueryAnalysis (LinkingCore spread activation) to
+        find concepts related to the query, then bumps the weight of any
+        raw_fact whose path / values mention one of those concepts.
 
         Returns (raw_facts, relevant_concepts).
         Falls back to (raw_facts, []) if LinkingCore is unavailable.
         """
         try:
-            from agent.threads.linking_core.schema import (
-                spread_activate,
-                extract_concepts_from_text,
-            )
+            from agent.threads.linking_core.query import get_query_analysis
 
-            query_concepts = extract_concepts_from_text(query)
-            if not query_concepts:
+            analysis = get_query_analysis(query)
+            if not analysis.concepts:
                 return raw_facts, []
-
-            activated = spread_activate(
-                input_concepts=query_concepts,
-                activation_threshold=0.1,
-                max_hops=1,
-                limit=20,
-            )
-            relevant = set(query_concepts)
-            for a in activated:
-                relevant.add(a.get("concept", ""))
+            relevant = analysis.relevant(threshold=0.1, limit=20)
 
             for fact in raw_facts:
                 text = (
@@ -453,28 +430,13 @@ class BaseThreadAdapter:
         Returns (filtered_items, relevant_concepts)
         """
         try:
-            from agent.threads.linking_core.schema import (
-                spread_activate, 
-                extract_concepts_from_text
-            )
-            
-            # Extract concepts from query
-            query_concepts = extract_concepts_from_text(query)
-            if not query_concepts:
+            from agent.threads.linking_core.query import get_query_analysis
+
+            # Query concepts + spread activation, shared across the turn
+            analysis = get_query_analysis(query)
+            if not analysis.concepts:
                 return items, []
-            
-            # Spread activation to find related concepts
-            activated = spread_activate(
-                input_concepts=query_concepts,
-                activation_threshold=0.1,
-                max_hops=1,
-                limit=20
-            )
-            
-            # Build set of relevant concepts
-            relevant = set(query_concepts)
-            for a in activated:
-                relevant.add(a.get("concept", ""))
+            relevant = analysis.relevant(threshold=0.1, limit=20)
             
             # Filter items that match relevant concepts
             filtered = []
@@ -357,14 +357,11 @@ def cleanup(
 
 
 def get_stats() -> Dict[str, int]:
-    with closing(get_connection(readonly=True)) as conn:
-        out = {}
-        for t in ("field_environments", "field_observations", "field_presences", "field_alerts"):
-            try:
-                out[t] = conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
-            except Exception:
-                out[t] = 0
-        out["unack_alerts"] = conn.execute(
-            "SELECT COUNT(*) FROM field_alerts WHERE acknowledged = 0"
-        ).fetchone()[0]
-        return out
+    from data.db.table_stats import get_column_counts, get_table_counts
+    counts = get_table_counts()
+    out = {
+        t: counts.get(t, 0)
+        for t in ("field_environments", "field_observations", "field_presences", "field_alerts")
+    }
+    out["unack_alerts"] = get_column_counts("field_alerts", "acknowledged").get("0", 0)
+    return out
@@ -291,58 +291,59 @@ class FormThreadAdapter(BaseThreadAdapter):
 
             # Trace stats
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute(
-                    "SELECT COUNT(*) as cnt, AVG(CASE WHEN success THEN 1.0 ELSE 0.0 END) as rate "
-                    "FROM tool_traces"
-                ).fetchone()
-                cnt = row["cnt"] if row else 0
-                rate = row["rate"] if row and row["rate"] is not None else 0
-                if cnt > 0:
-                    lines.append(f"  executions: {cnt} (success_rate: {rate:.0%})")
-
-                # Per-tool success rates for the 5 most-recently used tools
-                # (last 100 executions).  Shows WHICH tool is failing.
-                try:
-                    rows = conn.execute("""
-                        SELECT tool,
-                               COUNT(*) as cnt,
-                               AVG(CASE WHEN success THEN 1.0 ELSE 0.0 END) as rate
-                        FROM (
-                            SELECT tool, success FROM tool_traces
-                            ORDER BY id DESC LIMIT 100
-                        )
-                        GROUP BY tool
-                        ORDER BY cnt DESC
-                        LIMIT 5
-                    """).fetchall()
-                    if rows and len(rows) > 0:
-                        parts = [
-                            f"{r['tool']}={r['rate']:.0%}({r['cnt']})"
-                            for r in rows
-                        ]
-                        lines.append(f"  per_tool_recent: {', '.join(parts)}")
-                except Exception:
-                    pass
-
-                # Last tool call — immediate "did that just work?" signal
-                try:
-                    last = conn.execute("""
-                        SELECT tool, action, success, duration_ms, output, created_at
-                        FROM tool_traces
-                        ORDER BY id DESC LIMIT 1
-                    """).fetchone()
-                    if last:
-                        status = "ok" if last["success"] else "FAIL"
-                        dur = last["duration_ms"] or 0
-                        out = (last["output"] or "")[:60].replace("\n", " ").strip()
-                        lines.append(
-                            f"  last_call: {last['tool']}.{last['action']} "
-                            f"[{status}] {dur}ms → {out}"
-                        )
-                except Exception:
-                    pass
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute(
+                        "SELECT COUNT(*) as cnt, AVG(CASE WHEN success THEN 1.0 ELSE 0.0 END) as rate "
+                        "FROM tool_traces"
+                    ).fetchone()
+                    cnt = row["cnt"] if row else 0
+                    rate = row["rate"] if row and row["rate"] is not None else 0
+                    if cnt > 0:
+                        lines.append(f"  executions: {cnt} (success_rate: {rate:.0%})")
+
+                    # Per-tool success rates for the 5 most-recently used tools
+                    # (last 100 executions).  Shows WHICH tool is failing.
+                    try:
+                        rows = conn.execute("""
+                            SELECT tool,
+                                   COUNT(*) as cnt,
+                                   AVG(CASE WHEN success THEN 1.0 ELSE 0.0 END) as rate
+                            FROM (
+                                SELECT tool, success FROM tool_traces
+                                ORDER BY id DESC LIMIT 100
+                            )
+                            GROUP BY tool
+                            ORDER BY cnt DESC
+                            LIMIT 5
+                        """).fetchall()
+                        if rows and len(rows) > 0:
+                            parts = [
+                                f"{r['tool']}={r['rate']:.0%}({r['cnt']})"
+                                for r in rows
+                            ]
+                            lines.append(f"  per_tool_recent: {', '.join(parts)}")
+                    except Exception:
+                        pass
+
+                    # Last tool call — immediate "did that just work?" signal
+                    try:
+                        last = conn.execute("""
+                            SELECT tool, action, success, duration_ms, output, created_at
+                            FROM tool_traces
+                            ORDER BY id DESC LIMIT 1
+                        """).fetchone()
+                        if last:
+                            status = "ok" if last["success"] else "FAIL"
+                            dur = last["duration_ms"] or 0
+                            out = (last["output"] or "")[:60].replace("\n", " ").strip()
+                            lines.append(
+                                f"  last_call: {last['tool']}.{last['action']} "
+                                f"[{status}] {dur}ms → {out}"
+                            )
+                    except Exception:
+                        pass
             except Exception:
                 pass
             return lines
@@ -489,29 +490,30 @@ class FormThreadAdapter(BaseThreadAdapter):
 
         # Tool traces — recent weighted executions from tool_traces table
         try:
+            from contextlib import closing
             from data.db import get_connection
-            conn = get_connection(readonly=True)
-            rows = conn.execute(
-                """SELECT tool, action, success, output, weight, created_at
-                   FROM tool_traces
-                   WHERE weight >= ?
-                   ORDER BY weight DESC, created_at DESC
-                   LIMIT 10""",
-                (min_weight,)
-            ).fetchall()
-            for r in rows:
-                tool = r["tool"]
-                action = r["action"]
-                ok = "✓" if r["success"] else "✗"
-                w = r["weight"]
-                output = (r["output"] or "")[:100]
-                raw.append({
-                    "path": f"form.traces.{tool}.{action}",
-                    "l1_value": f"{tool}.{action} {ok}",
-                    "l2_value": f"{tool}.{action} {ok} (w={w:.2f})",
-                    "l3_value": f"{tool}.{action} {ok} (w={w:.2f}) {output}".strip(),
-                    "weight": w,
-                })
+            with closing(get_connection(readonly=True)) as conn:
+                rows = conn.execute(
+                    """SELECT tool, action, success, output, weight, created_at
+                       FROM tool_traces
+                       WHERE weight >= ?
+                       ORDER BY weight DESC, created_at DESC
+                       LIMIT 10""",
+                    (min_weight,)
+                ).fetchall()
+                for r in rows:
+                    tool = r["tool"]
+                    action = r["action"]
+                    ok = "✓" if r["success"] else "✗"
+                    w = r["weight"]
+                    output = (r["output"] or "")[:100]
+                    raw.append({
+                        "path": f"form.traces.{tool}.{action}",
+                        "l1_value": f"{tool}.{action} {ok}",
+                        "l2_value": f"{tool}.{action} {ok} (w={w:.2f})",
+                        "l3_value": f"{tool}.{action} {ok} (w={w:.2f}) {output}".strip(),
+                        "weight": w,
+                    })
         except Exception:
             pass
 
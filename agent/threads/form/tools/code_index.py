@@ -0,0 +1,524 @@
+"""
+Code Index
+==========
+
+Trigram index over the workspace for the regex_search tool.
+
+`regex_search.search` used to walk the whole tree and run the regex over
+every line of every text file on each call, and the task planner calls
+it several times per plan.  This module keeps, per file, the sorted set
+of byte trigrams of its case-folded text.  A search pulls the literal
+runs a match must contain out of the parsed regex (`foo.*bar` needs
+"foo" and "bar"; `a|b` needs either), keeps only files holding all their
+trigrams, and runs the regex over just those.  Patterns with no literal
+of three or more ASCII characters scan every file, as before.
+
+The index is one uint32 array of every file's trigrams, back to back,
+snapshotted to ``<db dir>/code_index/<db stem>.<root>.npy`` (memory-mapped
+on the next start) with the file list and (mtime, size) per file in a
+``.json`` beside it.  `refresh()` walks the tree, re-reads only files
+whose (mtime, size) changed, and drops vanished ones.  Every search
+refreshes first (a stat walk, ~20 ms for this repo), so results are as
+fresh as a full scan; AIOS_CODE_INDEX_MAX_AGE > 0 lets searches within
+that many seconds reuse the last walk.  The write tools call
+`mark_stale()` after writing, which forces the next search to re-stat
+and re-read that file even inside that window or when a rewrite kept
+the same (mtime, size).  The first build reads every file once; builds
+and refreshes run outside the module lock (one at a time per root) and
+swap the finished index in, so other roots and index_stats() don't wait.
+
+Candidate sets larger than AIOS_CODE_SEARCH_PROC_MIN files (default 256)
+are verified on a process pool (AIOS_CODE_SEARCH_PROCS workers; 0 or 1
+keeps it in-process).  AIOS_CODE_INDEX=0 turns the index off.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Collection, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:  # Python 3.11+
+    from re import _constants as _sre_c, _parser as _sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants as _sre_c
+    import sre_parse as _sre_parse
+
+ENABLED = os.getenv("AIOS_CODE_INDEX", "1") != "0"
+MAX_AGE_S = float(os.getenv("AIOS_CODE_INDEX_MAX_AGE", "0"))
+PROCS = int(os.getenv("AIOS_CODE_SEARCH_PROCS", str(min(4, os.cpu_count() or 1))))
+PROC_MIN = int(os.getenv("AIOS_CODE_SEARCH_PROC_MIN", "256"))
+
+# Directories to skip during file search
+SKIP_DIRS = {
+    ".git", "__pycache__", "node_modules", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", "dist", "build",
+}
+
+# Binary extensions to skip
+SKIP_EXTS = {
+    ".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe",
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg",
+    ".woff", ".woff2", ".ttf", ".eot",
+    ".zip", ".tar", ".gz", ".bz2",
+    ".db", ".sqlite", ".sqlite3",
+    ".dmg", ".app",
+}
+
+# Case folding for indexed text.  Besides lower(), these are the only
+# non-ASCII characters re.IGNORECASE matches to an ASCII letter (ſ ~ s,
+# ı/İ ~ i, Kelvin sign ~ k); İ is mapped before lower(), which would
+# otherwise add a combining dot after the i.
+_FOLD = str.maketrans({"ſ": "s", "ı": "i", "İ": "i", "K": "k"})
+
+
+def fold(text: str) -> bytes:
+    return text.translate(_FOLD).lower().encode("utf-8")
+
+
+def trigrams(data: bytes) -> np.ndarray:
+    """Sorted unique byte trigrams of ``data`` as uint32 (b0 << 16 | b1 << 8 | b2)."""
+    if len(data) < 3:
+        return np.zeros(0, dtype=np.uint32)
+    b = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+    return np.unique((b[:-2] << 16) | (b[1:-1] << 8) | b[2:])
+
+
+# ── Regex → required literals ───────────────────────────────
+
+_REPEATS = {_sre_c.MAX_REPEAT, _sre_c.MIN_REPEAT}
+if hasattr(_sre_c, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(_sre_c.POSSESSIVE_REPEAT)
+_STRING_ANCHORS = {_sre_c.AT_BEGINNING_STRING, _sre_c.AT_END_STRING}
+
+
+def _runs(items) -> List[str]:
+    """ASCII literal runs every match of the sequence ``items`` contains."""
+    runs: List[str] = []
+    cur: List[str] = []
+    for op, av in items:
+        if op is _sre_c.LITERAL and av < 128:
+            cur.append(chr(av))
+            continue
+        if cur:
+            runs.append("".join(cur))
+            cur = []
+        if op is _sre_c.SUBPATTERN:
+            runs += _runs(av[-1])
+        elif op in _REPEATS and av[0] >= 1:
+            runs += _runs(av[2])
+        elif getattr(_sre_c, "ATOMIC_GROUP", None) is op:
+            runs += _runs(av)
+        # BRANCH, IN, ANY, lookarounds, …: nothing required
+    if cur:
+        runs.append("".join(cur))
+    return runs
+
+
+def _has_line_sensitive(items) -> bool:
+    """Lookarounds or \\A / \\Z — a whole-file prefilter could disagree per line."""
+    for op, av in items:
+        if op in (_sre_c.ASSERT, _sre_c.ASSERT_NOT):
+            return True
+        if op is _sre_c.AT and av in _STRING_ANCHORS:
+            return True
+        if op is _sre_c.BRANCH and any(_has_line_sensitive(b) for b in av[1]):
+            return True
+        if op is _sre_c.SUBPATTERN and _has_line_sensitive(av[-1]):
+            return True
+        if op in _REPEATS and _has_line_sensitive(av[2]):
+            return True
+        if getattr(_sre_c, "ATOMIC_GROUP", None) is op and _has_line_sensitive(av):
+            return True
+    return False
+
+
+def required_trigrams(pattern: str, flags: int = 0) -> Optional[List[np.ndarray]]:
+    """Trigram sets a file must hold one of all of (OR of ANDs), or None = no filter.
+
+    A top-level alternation gives one set per branch; any branch without
+    a usable literal disables filtering.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is _sre_c.BRANCH:
+        branches = items[0][1][1]
+    else:
+        branches = [items]
+    out = []
+    for branch in branches:
+        grams = [trigrams(fold(run)) for run in _runs(branch) if len(run) >= 3]
+        if not grams:
+            return None
+        out.append(np.unique(np.concatenate(grams)))
+    return out
+
+
+# ── Tree walk ───────────────────────────────────────────────
+
+def scan_tree(root: Path, skip: Sequence[str] = ()) -> Dict[str, Tuple[float, int]]:
+    """rel_path → (mtime, size) for every searchable file under ``root``.
+
+    ``skip``: absolute directory paths left out (the snapshot directory, so
+    saving a snapshot doesn't mark the index stale).
+    """
+    found: Dict[str, Tuple[float, int]] = {}
+    stack = [str(root)]
+    root_s = str(root)
+    while stack:
+        top = stack.pop()
+        try:
+            entries = os.scandir(top)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and entry.path not in skip:
+                            stack.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() not in SKIP_EXTS:
+                        st = entry.stat()
+                        rel = os.path.relpath(entry.path, root_s).replace(os.sep, "/")
+                        found[rel] = (st.st_mtime, st.st_size)
+                except OSError:
+                    continue
+    return found
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(errors="replace")
+    except Exception:
+        return ""
+
+
+# ── Index ───────────────────────────────────────────────────
+
+class _Index:
+    """Files (sorted) and their trigram sets, concatenated in file order."""
+
+    def __init__(self, root: Path, paths: List[str], stats: List[Tuple[float, int]],
+                 grams: np.ndarray, counts: np.ndarray):
+        self.root = root
+        self.paths = paths
+        self.stats = dict(zip(paths, map(tuple, stats)))
+        self.grams = grams                       # may be a read-only memmap
+        self.offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        # (file number << 32 | trigram): sorted, so one searchsorted
+        # answers "does file f hold trigram g" for many (f, g) at once
+        fids = np.repeat(np.arange(len(paths), dtype=np.uint64), counts)
+        self.keys = (fids << np.uint64(32)) | grams.astype(np.uint64)
+        self.refreshed_at = 0.0
+
+    def slice(self, i: int) -> np.ndarray:
+        return self.grams[self.offsets[i]:self.offsets[i + 1]]
+
+    def candidates(self, fids: np.ndarray, required: Optional[List[np.ndarray]]) -> np.ndarray:
+        """Subset of ``fids`` whose files hold every trigram of some required set."""
+        if required is None or not len(fids) or not len(self.keys):
+            return fids
+        keep = np.zeros(len(fids), dtype=bool)
+        base = fids.astype(np.uint64)[:, None] << np.uint64(32)
+        for grams in required:
+            probes = (base | grams.astype(np.uint64)[None, :]).ravel()
+            pos = np.minimum(np.searchsorted(self.keys, probes), len(self.keys) - 1)
+            keep |= (self.keys[pos] == probes).reshape(len(fids), len(grams)).all(axis=1)
+        return fids[keep]
+
+
+_indexes: Dict[Tuple[str, str], _Index] = {}
+# Files written since the key's last refresh started (see invalidate_paths)
+_stale: Dict[Tuple[str, str], Set[str]] = {}
+# One build/refresh at a time per key, outside _lock
+_build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_lock = threading.RLock()
+_stats = {"builds": 0, "refreshes": 0, "reindexed": 0, "searches": 0}
+
+
+def _snapshot_path(db_path: str, root: Path) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(root)).strip("_")
+    return Path(db_path).parent / "code_index" / f"{Path(db_path).stem}.{slug}"
+
+
+def _load_snapshot(base: Path, root: Path) -> Optional[_Index]:
+    try:
+        meta = json.loads(base.with_suffix(base.suffix + ".json").read_text())
+        grams = np.load(base.with_suffix(base.suffix + ".npy"), mmap_mode="r")
+        counts = np.asarray(meta["counts"], dtype=np.int64)
+        if meta["root"] != str(root) or int(counts.sum()) != len(grams):
+            return None
+        return _Index(root, meta["paths"], meta["stats"], grams, counts)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_snapshot(base: Path, index: _Index) -> None:
+    meta = {
+        "root": str(index.root),
+        "paths": index.paths,
+        "stats": [index.stats[p] for p in index.paths],
+        "counts": np.diff(index.offsets).tolist(),
+    }
+    try:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        tmp = base.with_suffix(base.suffix + ".tmp.npy")
+        np.save(tmp, np.ascontiguousarray(index.grams))
+        os.replace(tmp, base.with_suffix(base.suffix + ".npy"))
+        base.with_suffix(base.suffix + ".json").write_text(json.dumps(meta))
+    except OSError:
+        pass
+
+
+def refresh(root: Path, index: Optional[_Index] = None, skip: Sequence[str] = (),
+            stale: Collection[str] = ()) -> _Index:
+    """Bring ``index`` (or an empty one) in line with the tree under ``root``.
+
+    ``stale``: relative paths re-read even if their (mtime, size) matches.
+    """
+    found = scan_tree(root, skip)
+    old = index.stats if index else {}
+    changed = {rel for rel, st in found.items() if old.get(rel) != st or rel in stale}
+    if index is not None and not changed and len(found) == len(old):
+        index.refreshed_at = time.time()
+        return index
+
+    paths = sorted(found)
+    position = {p: i for i, p in enumerate(index.paths)} if index else {}
+    parts = [
+        trigrams(fold(_read(root / rel))) if rel in changed else index.slice(position[rel])
+        for rel in paths
+    ]
+    counts = np.array([len(p) for p in parts], dtype=np.int64)
+    grams = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint32)
+    fresh = _Index(root, paths, [found[p] for p in paths], grams.astype(np.uint32), counts)
+    fresh.refreshed_at = time.time()
+    with _lock:
+        _stats["reindexed"] += len(changed)
+    return fresh
+
+
+def get_index(root: Path) -> _Index:
+    """The index for ``root``: loaded, built, or refreshed when older than MAX_AGE_S."""
+    from data.db import get_db_path
+
+    db_path = str(get_db_path())
+    key = (db_path, str(root))
+    with _lock:
+        index = _indexes.get(key)
+        if _recent(index, key):
+            return index
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        with _lock:
+            index = _indexes.get(key)
+            if _recent(index, key):
+                return index  # refreshed while we waited
+            stale = _stale.pop(key, set())
+        base = _snapshot_path(db_path, root)
+        built = False
+        if index is None:
+            index = _load_snapshot(base, root)
+            built = index is None
+        fresh = refresh(root, index, skip=(str(base.parent),), stale=stale)
+        if fresh is not index:
+            _save_snapshot(base, fresh)
+        with _lock:
+            _stats["builds"] += built
+            _stats["refreshes"] += 1
+            _indexes[key] = fresh
+        return fresh
+
+
+def _recent(index: Optional[_Index], key: Tuple[str, str]) -> bool:
+    """Within MAX_AGE_S of its last walk, with nothing written since (under _lock)."""
+    return (index is not None and MAX_AGE_S > 0 and not _stale.get(key)
+            and time.time() - index.refreshed_at <= MAX_AGE_S)
+
+
+def invalidate() -> None:
+    """Drop in-memory indexes (snapshots stay; the next search re-stats the tree)."""
+    with _lock:
+        _indexes.clear()
+
+
+def invalidate_paths(paths: Sequence[os.PathLike]) -> None:
+    """Mark written files stale for every index root covering them.
+
+    The next search re-stats the tree and re-reads these files, even when
+    the write kept their (mtime, size).  A refresh already running keeps
+    the mark for the one after it.
+    """
+    targets = [os.path.abspath(p) for p in paths]
+    with _lock:
+        for key in _build_locks:
+            root = key[1]
+            for target in targets:
+                rel = os.path.relpath(target, root).replace(os.sep, "/")
+                if rel.startswith("../") or rel == "..":
+                    continue
+                _stale.setdefault(key, set()).add(rel)
+
+
+def mark_stale(path: os.PathLike) -> None:
+    """Tell the index a write tool just changed ``path``."""
+    invalidate_paths([path])
+
+
+def index_stats() -> Dict[str, object]:
+    with _lock:
+        return {
+            **_stats,
+            "indexes": {
+                root: {"files": len(ix.paths), "trigrams": int(len(ix.grams)),
+                       "memory_mapped": isinstance(ix.grams, np.memmap)}
+                for (_db, root), ix in _indexes.items()
+            },
+        }
+
+
+# ── Search ──────────────────────────────────────────────────
+
+def _file_pattern_matcher(file_pattern: str):
+    pats = [p.strip() for p in file_pattern.split(",") if p.strip()] or ["*"]
+    if pats == ["*"]:
+        return lambda rel: True
+    # Same as Path.glob("**/<pattern>"): match from the right
+    return lambda rel: any(
+        PurePosixPath(rel).match(p) if "/" in p else fnmatchcase(rel.rsplit("/", 1)[-1], p)
+        for p in pats
+    )
+
+
+def _candidate_lines(whole: re.Pattern, text: str, lines: List[str]):
+    """Indexes of lines that may match, found by searching the whole text.
+
+    A match inside one line is also a match of the MULTILINE pattern on
+    the whole text at the same offset, so the lines before the first
+    whole-text match from a position can be skipped.
+    """
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line) + 1)
+    pos = 0
+    while pos < len(text):
+        m = whole.search(text, pos)
+        if m is None:
+            return
+        i = bisect_right(starts, m.start()) - 1
+        yield i
+        pos = starts[i + 1]
+
+
+def scan_files(root: str, rels: Sequence[str], pattern: str, flags: int,
+               context_lines: int, max_matches: int, prefilter: bool) -> List[dict]:
+    """Run the regex line by line over ``rels``; up to ``max_matches`` matches, in order."""
+    regex = re.compile(pattern, flags)
+    whole = re.compile(pattern, flags | re.MULTILINE) if prefilter else None
+    matches: List[dict] = []
+    for rel in rels:
+        text = _read(Path(root) / rel)
+        lines = text.splitlines()
+        hits = range(len(lines))
+        # Only when lines are split on "\n" alone (not \f, \x1c, \u2028, …)
+        if whole is not None and sum(map(len, lines)) + text.count("\n") == len(text):
+            hits = _candidate_lines(whole, text, lines)
+        for i in hits:
+            line = lines[i]
+            if regex.search(line):
+                matches.append({
+                    "file": rel,
+                    "line": i + 1,
+                    "match": line.strip(),
+                    "context": lines[max(0, i - context_lines):min(len(lines), i + context_lines + 1)],
+                })
+                if len(matches) >= max_matches:
+                    return matches
+    return matches
+
+
+_proc_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_proc_pool() -> ProcessPoolExecutor:
+    global _proc_pool
+    with _lock:
+        if _proc_pool is None:
+            import multiprocessing
+            _proc_pool = ProcessPoolExecutor(
+                max_workers=PROCS, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _proc_pool
+
+
+def search(root: Path, pattern: str, flags: int, directory: str, file_pattern: str,
+           context_lines: int, max_matches: int) -> Tuple[List[dict], int]:
+    """(matches, files in scope) for ``pattern`` under ``root / directory``.
+
+    Same matches as scanning every file in path order; only files whose
+    trigrams can hold a match are read.
+    """
+    root = Path(root)
+    index = get_index(root)
+    prefix = os.path.relpath(root / directory, root).replace(os.sep, "/")
+    prefix = "" if prefix == "." else prefix + "/"
+    matcher = _file_pattern_matcher(file_pattern)
+    scope = np.array(
+        [i for i, p in enumerate(index.paths)
+         if p.startswith(prefix) and matcher(p[len(prefix):])],
+        dtype=np.int64,
+    )
+    fids = index.candidates(scope, required_trigrams(pattern, flags))
+    rels = [index.paths[i] for i in fids]
+    prefilter = not _has_line_sensitive(list(_sre_parse.parse(pattern, flags)))
+    with _lock:
+        _stats["searches"] += 1
+
+    if PROCS > 1 and len(rels) >= PROC_MIN:
+        try:
+            pool = _get_proc_pool()
+            step = max(1, -(-len(rels) // (PROCS * 4)))
+            chunks = [rels[i:i + step] for i in range(0, len(rels), step)]
+            futures = [
+                pool.submit(scan_files, str(root), chunk, pattern, flags,
+                            context_lines, max_matches, prefilter)
+                for chunk in chunks
+            ]
+            matches: List[dict] = []
+            for fut in futures:
+                if len(matches) >= max_matches:
+                    fut.cancel()
+                    continue
+                matches += fut.result()
+            return matches[:max_matches], len(scope)
+        except Exception:
+            pass  # no process pool here — scan in-process
+    return scan_files(str(root), rels, pattern, flags, context_lines,
+                      max_matches, prefilter), len(scope)
+
+
+__all__ = [
+    "SKIP_DIRS",
+    "SKIP_EXTS",
+    "required_trigrams",
+    "scan_tree",
+    "get_index",
+    "refresh",
+    "search",
+    "invalidate",
+    "invalidate_paths",
+    "mark_stale",
+    "index_stats",
+]
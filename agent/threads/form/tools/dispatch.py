@@ -0,0 +1,134 @@
+"""
+Tool Call Dispatch
+==================
+
+Runs the tool calls of one LLM round.
+
+A model often asks for several reads at once (a file, a regex search, a
+web search).  Executed one after another, the round takes the sum of
+their latencies.  `run_tool_actions` instead runs each stretch of
+consecutive read-only calls (ToolDefinition.read_only) concurrently on a
+bounded pool (AIOS_TOOL_WORKERS, default 4).  Every other call is a
+barrier: it runs alone, on the calling thread, after the calls before
+it and before the ones after it — so a read requested after a write
+still sees the write.
+
+Pooled calls are bounded by AIOS_TOOL_CALL_TIMEOUT_S (default 60): a
+late call gets a "timeout" result.  Its thread can't be cancelled; it
+finishes in the background and its output is discarded.
+
+Results come back in call order, as execute_tool_action dicts.
+AIOS_TOOL_WORKERS=1 keeps the sequential loop.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+TOOL_WORKERS = int(os.getenv("AIOS_TOOL_WORKERS", "4"))
+TOOL_CALL_TIMEOUT_S = float(os.getenv("AIOS_TOOL_CALL_TIMEOUT_S", "60"))
+
+ToolCall = Tuple[str, str, Dict[str, Any]]   # (tool, action, params)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    """The shared pool for read-only tool calls (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, TOOL_WORKERS),
+                thread_name_prefix="tool-call",
+            )
+        return _pool
+
+
+def _failed(tool: str, action: str, status: str, error: str, duration_ms: int = 0) -> Dict[str, Any]:
+    return {
+        "tool_name": tool, "action": action, "status": status,
+        "output": None, "error": error, "duration_ms": duration_ms,
+        "timestamp": datetime.utcnow().isoformat(), "success": False,
+    }
+
+
+def _execute(tool: str, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    from agent.threads.form.schema import execute_tool_action
+    try:
+        return execute_tool_action(tool, action, params)
+    except Exception as e:
+        return _failed(tool, action, "error", f"Execution error: {e}")
+
+
+def _batches(calls: Sequence[ToolCall]) -> List[List[int]]:
+    """Indexes of ``calls`` grouped into runs of read-only calls and lone barriers."""
+    from agent.threads.form.tools.registry import is_action_read_only
+    batches: List[List[int]] = []
+    run: List[int] = []
+    for i, (tool, action, _params) in enumerate(calls):
+        if is_action_read_only(tool, action):
+            run.append(i)
+            continue
+        if run:
+            batches.append(run)
+            run = []
+        batches.append([i])
+    if run:
+        batches.append(run)
+    return batches
+
+
+def run_tool_actions(calls: Sequence[ToolCall]) -> List[Dict[str, Any]]:
+    """execute_tool_action for each (tool, action, params); results in call order."""
+    from agent.subconscious import trace_bus
+    t0 = time.perf_counter()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+    parallel = 0
+    for batch in _batches(calls):
+        if len(batch) == 1 or TOOL_WORKERS <= 1:
+            for i in batch:
+                results[i] = _execute(*calls[i])
+            continue
+        parallel += len(batch)
+        pool = get_tool_pool()
+        start = time.perf_counter()
+        futures = {
+            i: pool.submit(contextvars.copy_context().run, _execute, *calls[i])
+            for i in batch
+        }
+        deadline = start + TOOL_CALL_TIMEOUT_S
+        for i, fut in futures.items():
+            try:
+                results[i] = fut.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FuturesTimeout:
+                results[i] = _failed(
+                    calls[i][0], calls[i][1], "timeout",
+                    f"Timed out after {TOOL_CALL_TIMEOUT_S:g}s",
+                    int((time.perf_counter() - start) * 1000),
+                )
+                trace_bus.publish("tool_timeout", tool=calls[i][0], action=calls[i][1])
+    if calls:
+        trace_bus.publish(
+            "tool_round",
+            calls=len(calls),
+            parallel=parallel,
+            wall_ms=round((time.perf_counter() - t0) * 1000, 1),
+            sum_ms=sum(r.get("duration_ms", 0) for r in results),
+        )
+    return results
+
+
+__all__ = [
+    "TOOL_WORKERS",
+    "TOOL_CALL_TIMEOUT_S",
+    "get_tool_pool",
+    "run_tool_actions",
+]
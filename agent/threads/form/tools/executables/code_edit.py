@@ -15,6 +15,8 @@ Write operations are restricted to source files (no binaries, no .env, no DB).
 import re
 from pathlib import Path
 
+from agent.threads.form.tools.code_index import mark_stale
+
 WORKSPACE_ROOT = Path(__file__).resolve().parents[5]  # → AI_OS/
 
 # Files that must never be edited
@@ -96,6 +98,7 @@ def _edit_file(params: dict) -> str:
 
     new_content = content.replace(old_text, new_text, 1)
     path.write_text(new_content)
+    mark_stale(path)
 
     rel = path.relative_to(WORKSPACE_ROOT)
     return f"Edited {rel}: replaced {len(old_text)} chars with {len(new_text)} chars"
@@ -12,6 +12,8 @@ All paths are sandboxed to the workspace root.
 
 from pathlib import Path
 
+from agent.threads.form.tools.code_index import mark_stale
+
 WORKSPACE_ROOT = Path(__file__).resolve().parents[5]  # → AI_OS/
 
 
@@ -51,6 +53,7 @@ def _write_file(params: dict) -> str:
     
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content)
+    mark_stale(path)
     
     rel = path.relative_to(WORKSPACE_ROOT)
     return f"Wrote {len(content)} bytes to {rel}"
@@ -63,6 +66,7 @@ def _append_file(params: dict) -> str:
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, 'a') as f:
         f.write(content)
+    mark_stale(path)
     
     rel = path.relative_to(WORKSPACE_ROOT)
     return f"Appended {len(content)} bytes to {rel}"
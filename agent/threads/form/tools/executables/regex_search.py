@@ -11,32 +11,22 @@ Actions:
 Combines structural search (files/code) with reality search (memory/logs)
 so the task planner gets full context retrieval in one tool.
 
+File search goes through the trigram index in tools/code_index.py, which
+only reads files that can hold a match (AIOS_CODE_INDEX=0 walks the tree).
+
 Output truncated at 20KB.
 """
 
 import re
 from pathlib import Path
 
+from agent.threads.form.tools import code_index
+from agent.threads.form.tools.code_index import SKIP_DIRS, SKIP_EXTS
+
 WORKSPACE_ROOT = Path(__file__).resolve().parents[5]  # → AI_OS/
 MAX_OUTPUT = 20_000
 MAX_MATCHES = 50
 
-# Directories to skip during file search
-SKIP_DIRS = {
-    ".git", "__pycache__", "node_modules", ".venv", "venv",
-    ".mypy_cache", ".pytest_cache", ".ruff_cache", "dist", "build",
-}
-
-# Binary extensions to skip
-SKIP_EXTS = {
-    ".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe",
-    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg",
-    ".woff", ".woff2", ".ttf", ".eot",
-    ".zip", ".tar", ".gz", ".bz2",
-    ".db", ".sqlite", ".sqlite3",
-    ".dmg", ".app",
-}
-
 
 def run(action: str, params: dict) -> str:
     """Execute a regex_search action."""
@@ -84,6 +74,19 @@ def _search_files(params: dict) -> str:
     if not search_dir.is_dir():
         return f"Not a directory: {directory}"
 
+    rel_dir = search_dir.relative_to(WORKSPACE_ROOT)
+    if code_index.ENABLED and not SKIP_DIRS.intersection(rel_dir.parts):
+        matches, files_searched = code_index.search(
+            WORKSPACE_ROOT, pattern_str, flags, str(rel_dir), file_pattern,
+            context_lines, MAX_MATCHES,
+        )
+    else:
+        matches, files_searched = _scan_walk(search_dir, regex, file_pattern, context_lines)
+    return _format_matches(matches, files_searched, pattern_str, directory)
+
+
+def _scan_walk(search_dir: Path, regex, file_pattern: str, context_lines: int):
+    """Unindexed search: walk ``search_dir`` and scan every file."""
     matches = []
     files_searched = 0
 
@@ -113,7 +116,10 @@ def _search_files(params: dict) -> str:
                     break
         if len(matches) >= MAX_MATCHES:
             break
+    return matches, files_searched
+
 
+def _format_matches(matches: list, files_searched: int, pattern_str: str, directory: str) -> str:
     if not matches:
         return f"No matches for /{pattern_str}/ in {directory} ({files_searched} files searched)"
 
@@ -12,6 +12,8 @@ Each tool has:
     - actions: Available actions
     - run_file: Path to executable (relative to executables/)
     - run_type: "python" | "shell" | "module"
+    - read_only: Actions with no side effects; calls to them in the same
+      LLM round may run concurrently (see tools/dispatch.py)
 """
 
 from typing import List, Dict, Any, Optional
@@ -55,6 +57,7 @@ class ToolDefinition:
     requires_env: List[str] = field(default_factory=list)
     weight: float = 0.5
     enabled: bool = True
+    read_only: List[str] = field(default_factory=list)  # side-effect-free actions
     
     @property
     def path(self) -> Path:
@@ -82,6 +85,7 @@ class ToolDefinition:
             "requires_env": self.requires_env,
             "weight": self.weight,
             "enabled": self.enabled,
+            "read_only": self.read_only,
         }
 
 
@@ -162,6 +166,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["search", "get_results"],
     ),
     
     # --- Memory Tools ---
@@ -174,6 +179,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.8,
+        read_only=["get_identity", "list_keys"],
     ),
     ToolDefinition(
         name="memory_philosophy",
@@ -184,6 +190,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.7,
+        read_only=["get_beliefs", "list_values"],
     ),
     ToolDefinition(
         name="memory_log",
@@ -194,6 +201,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["search_logs", "get_recent", "get_session"],
     ),
     ToolDefinition(
         name="memory_linking",
@@ -204,6 +212,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.7,
+        read_only=["find_related"],
     ),
     
     # --- File Tools ---
@@ -216,6 +225,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["read_file", "list_directory", "search_files"],
     ),
     ToolDefinition(
         name="file_write",
@@ -238,6 +248,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["read_file", "list_directory", "search_files"],
     ),
     ToolDefinition(
         name="workspace_write",
@@ -324,6 +335,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.7,
+        read_only=["search", "search_memory", "search_logs", "search_concepts"],
     ),
     ToolDefinition(
         name="cli_command",
@@ -334,6 +346,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.7,
+        read_only=["list_commands", "help"],
     ),
     
     # --- Internal Tools ---
@@ -346,6 +359,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["read_file", "search_code", "list_files"],
     ),
     ToolDefinition(
         name="ask_llm",
@@ -366,6 +380,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.8,
+        read_only=["get_context", "get_recent_thoughts", "get_active_threads"],
     ),
     ToolDefinition(
         name="notify",
@@ -388,6 +403,7 @@ TOOLS: List[ToolDefinition] = [
         run_type=RunType.PYTHON,
         requires_env=[],
         weight=0.6,
+        read_only=["services", "tools", "threads", "recent", "self", "goals", "errors", "surface"],
         enabled=True,
     ),
 ]
@@ -470,6 +486,16 @@ BLOCKED_ACTIONS: Dict[str, List[str]] = {
 }
 
 
+def is_action_read_only(tool_name: str, action: str) -> bool:
+    """Check if a tool action is declared side-effect-free (ToolDefinition.read_only).
+
+    Read-only calls in the same round may run concurrently; anything
+    else — including tools not in TOOLS, e.g. MCP — runs one at a time.
+    """
+    tool = get_tool(tool_name)
+    return tool is not None and action in tool.read_only
+
+
 def is_action_safe(tool_name: str, action: str) -> bool:
     """Check if a tool action can auto-execute.
     
@@ -739,6 +765,7 @@ __all__ = [
     "SAFE_ACTIONS",
     "BLOCKED_ACTIONS",
     "is_action_safe",
+    "is_action_read_only",
     "to_ollama_tools",
     "ensure_tools_in_db",
 ]
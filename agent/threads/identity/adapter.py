@@ -247,29 +247,30 @@ class IdentityThreadAdapter(BaseThreadAdapter):
                 pass
             # Staleness — oldest un-updated fact (detects rotten identity data)
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute("""
-                    SELECT profile_id, key, updated_at
-                    FROM profile_facts
-                    WHERE protected = 0
-                    ORDER BY updated_at ASC
-                    LIMIT 1
-                """).fetchone()
-                if row and row["updated_at"]:
-                    from datetime import datetime as _dt, timezone as _tz
-                    try:
-                        ts = str(row["updated_at"]).replace("T", " ").split(".")[0]
-                        dt = _dt.fromisoformat(ts.replace("Z", "+00:00"))
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=_tz.utc)
-                        age_days = (_dt.now(_tz.utc) - dt).total_seconds() / 86400
-                        if age_days >= 30:
-                            lines.append(
-                                f"  oldest_fact: {row['profile_id']}.{row['key']} ({int(age_days)}d old)"
-                            )
-                    except Exception:
-                        pass
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute("""
+                        SELECT profile_id, key, updated_at
+                        FROM profile_facts
+                        WHERE protected = 0
+                        ORDER BY updated_at ASC
+                        LIMIT 1
+                    """).fetchone()
+                    if row and row["updated_at"]:
+                        from datetime import datetime as _dt, timezone as _tz
+                        try:
+                            ts = str(row["updated_at"]).replace("T", " ").split(".")[0]
+                            dt = _dt.fromisoformat(ts.replace("Z", "+00:00"))
+                            if dt.tzinfo is None:
+                                dt = dt.replace(tzinfo=_tz.utc)
+                            age_days = (_dt.now(_tz.utc) - dt).total_seconds() / 86400
+                            if age_days >= 30:
+                                lines.append(
+                                    f"  oldest_fact: {row['profile_id']}.{row['key']} ({int(age_days)}d old)"
+                                )
+                        except Exception:
+                            pass
             except Exception:
                 pass
             return lines
@@ -384,43 +385,38 @@ class IdentityThreadAdapter(BaseThreadAdapter):
         Non-relevant facts still appear if budget allows, just at L1.
         """
         try:
-            from agent.threads.linking_core.schema import (
-                spread_activate,
-                extract_concepts_from_text,
-            )
-
-            query_concepts = extract_concepts_from_text(query)
-            relevant = set(query_concepts)
+            from agent.threads.linking_core.query import get_query_analysis
 
-            if query_concepts:
-                activated = spread_activate(
-                    input_concepts=query_concepts,
-                    activation_threshold=0.1,
-                    max_hops=1,
-                    limit=20,
-                )
-                for a in activated:
-                    relevant.add(a.get("concept", ""))
+            analysis = get_query_analysis(query)
+            relevant = analysis.relevant(threshold=0.1, limit=20)
 
             # Literal-token fallback: when the concept graph hasn't yet
             # learned a query word (new fact, no edges), still let raw
             # query tokens score against fact text. Keeps newly-written
             # facts surfaceable on their first mention.
-            import re as _re
-            literal_tokens = {
-                t for t in _re.findall(r"\b[a-z][a-z0-9]{2,}\b", query.lower())
-                if t not in {"the", "and", "for", "what", "who", "how",
-                             "does", "are", "was", "they", "this", "that",
-                             "with", "from", "into", "run", "work", "you",
-                             "your", "have", "has"}
-            }
-            relevant.update(literal_tokens)
+            relevant.update(analysis.tokens)
+
+            # Semantic neighbours: facts nearest the query in the
+            # profile_facts vector index, even with no word in common.
+            near = set()
+            try:
+                from agent.threads.linking_core.vector_index import search
+                near = {
+                    item_id for item_id, score in search(
+                        "profile_facts", query, k=10, vector=analysis.embedding,
+                    ) if score >= 0.3
+                }
+            except Exception:
+                pass
 
             # Boost weight of matching facts so they sort first.
             # Boost EXCEEDS the natural 1.0 ceiling on purpose: query-
             # relevant facts must rank above pre-existing weight-1.0 facts
             # to win the tight budget that the orchestrator imposes.
             for fact in raw_facts:
+                if f"{fact.get('profile_id', '')}:{fact.get('key', '')}" in near:
+                    fact["weight"] = fact.get("weight", 0.5) + 0.5
+                    continue
                 text = f"{fact.get('profile_id', '')} {fact.get('key', '')} " \
                        f"{fact.get('l1_value', '')} {fact.get('l2_value', '')}".lower()
                 for concept in relevant:
@@ -440,25 +436,12 @@ class IdentityThreadAdapter(BaseThreadAdapter):
     ) -> tuple:
         """Filter items by relevance to query using LinkingCore."""
         try:
-            from agent.threads.linking_core.schema import (
-                spread_activate, 
-                extract_concepts_from_text
-            )
-            
-            query_concepts = extract_concepts_from_text(query)
-            if not query_concepts:
+            from agent.threads.linking_core.query import get_query_analysis
+
+            analysis = get_query_analysis(query)
+            if not analysis.concepts:
                 return items, []
-            
-            activated = spread_activate(
-                input_concepts=query_concepts,
-                activation_threshold=0.1,
-                max_hops=1,
-                limit=20
-            )
-            
-            relevant = set(query_concepts)
-            for a in activated:
-                relevant.add(a.get("concept", ""))
+            relevant = analysis.relevant(threshold=0.1, limit=20)
             
             # Filter items - check profile_id, key, AND value
             filtered = []
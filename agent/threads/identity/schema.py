@@ -174,6 +174,7 @@ def init_profile_facts(conn: Optional[sqlite3.Connection] = None) -> None:
     
     cur.execute("CREATE INDEX IF NOT EXISTS idx_profile_facts_weight ON profile_facts(weight DESC)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_profile_facts_type ON profile_facts(fact_type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_profile_facts_key ON profile_facts(key)")
     
     # Migration: Add protected column if it doesn't exist (for existing databases)
     cur.execute("PRAGMA table_info(profile_facts)")
@@ -482,6 +483,8 @@ def push_profile_fact(
                         ELSE CURRENT_TIMESTAMP
                     END
             """, (profile_id, key, fact_type, l1_value, l2_value, l3_value, weight))
+    from agent.threads.linking_core.vector_index import mark_dirty_safe
+    mark_dirty_safe("profile_facts", f"{profile_id}:{key}")
 
 
 def pull_profile_facts(
@@ -566,6 +569,9 @@ def delete_profile_fact(profile_id: str, key: str) -> bool:
         cur.execute("DELETE FROM profile_facts WHERE profile_id = ? AND key = ?", (profile_id, key))
         conn.commit()
         deleted = cur.rowcount > 0
+    if deleted:
+        from agent.threads.linking_core.vector_index import mark_dirty_safe
+        mark_dirty_safe("profile_facts", f"{profile_id}:{key}")
     return deleted
 
 
@@ -725,6 +731,11 @@ def decay_learned_facts(
         if not dry_run:
             conn.commit()
 
+    if not dry_run:
+        from agent.threads.linking_core.vector_index import mark_dirty_safe
+        mark_dirty_safe("profile_facts", *(
+            f"{r['profile_id']}:{r['key']}" for r in out["pruned"] + out["floor_deleted"]
+        ))
     return out
 
 
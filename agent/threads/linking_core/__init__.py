@@ -18,6 +18,7 @@ from .scoring import (
     score_relevance,
     rank_items,
     get_embedding,
+    get_embeddings,
     cosine_similarity,
     keyword_fallback_score,
     cache_stats,
@@ -37,13 +38,16 @@ from .schema import (
     init_cooccurrence_table,
     # Hebbian learning
     link_concepts,
+    link_concepts_batch,
     decay_concept_links,
     # Spread activation
     spread_activate,
     # Concept extraction
     extract_concepts_from_text,
     extract_concepts_from_value,
+    extract_concepts_batch,
     # Co-occurrence
+    cooccurrence_scores,
     get_cooccurrence_score,
     record_cooccurrence,
     record_cooccurrence_batch,
@@ -52,6 +56,7 @@ from .schema import (
     get_keys_for_concepts,
     # Graph indexing
     index_key_in_concept_graph,
+    index_keys_in_concept_graph,
     # CRUD for API
     get_concepts, get_all_links, get_links_for_concept,
     create_link, delete_link, update_link_strength,
@@ -66,6 +71,7 @@ __all__ = [
     "score_relevance",
     "rank_items", 
     "get_embedding",
+    "get_embeddings",
     "cosine_similarity",
     "keyword_fallback_score",
     "cache_stats",
@@ -77,16 +83,20 @@ __all__ = [
     # Schema - core functions
     "init_concept_links_table",
     "link_concepts",
+    "link_concepts_batch",
     "decay_concept_links",
     "spread_activate",
     "extract_concepts_from_text",
     "extract_concepts_from_value",
+    "extract_concepts_batch",
+    "cooccurrence_scores",
     "get_cooccurrence_score",
     "record_cooccurrence",
     "record_cooccurrence_batch",
     "record_concept_cooccurrence",
     "get_keys_for_concepts",
     "index_key_in_concept_graph",
+    "index_keys_in_concept_graph",
     # Schema - API CRUD
     "get_concepts", "get_all_links", "get_links_for_concept",
     "create_link", "delete_link", "update_link_strength",
@@ -11,6 +11,8 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 import os
 
+import numpy as np
+
 # Import existing relevance module
 try:
     from agent.relevance import score_topic_relevance, embed_text
@@ -125,27 +127,31 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
     def get_section_metadata(self) -> List[str]:
         """Permanent linking_core metadata for STATE section header."""
         try:
+            from contextlib import closing
             from data.db import get_connection
-            conn = get_connection(readonly=True)
-            link_row = conn.execute("SELECT COUNT(*) as cnt, AVG(strength) as avg FROM concept_links").fetchone()
-            link_count = link_row["cnt"] if link_row else 0
-            avg_strength = link_row["avg"] if link_row and link_row["avg"] else 0
-            concept_row = conn.execute(
-                "SELECT COUNT(*) as cnt FROM ("
-                "SELECT concept_a AS c FROM concept_links UNION "
-                "SELECT concept_b FROM concept_links)"
-            ).fetchone()
-            concept_count = concept_row["cnt"] if concept_row else 0
-            long_row = conn.execute(
-                "SELECT COUNT(*) as cnt FROM concept_links WHERE potentiation='LONG'"
-            ).fetchone()
-            long_count = long_row["cnt"] if long_row else 0
-            lines = [
-                f"  concepts: {concept_count}",
-                f"  links: {link_count} (avg_strength: {avg_strength:.2f})",
-                f"  long_potentiated: {long_count}",
-            ]
-            return lines
+            from .schema import STRENGTH_SQL
+            with closing(get_connection(readonly=True)) as conn:
+                link_row = conn.execute(
+                    f"SELECT COUNT(*) as cnt, AVG({STRENGTH_SQL}) as avg FROM concept_links"
+                ).fetchone()
+                link_count = link_row["cnt"] if link_row else 0
+                avg_strength = link_row["avg"] if link_row and link_row["avg"] else 0
+                concept_row = conn.execute(
+                    "SELECT COUNT(*) as cnt FROM ("
+                    "SELECT concept_a AS c FROM concept_links UNION "
+                    "SELECT concept_b FROM concept_links)"
+                ).fetchone()
+                concept_count = concept_row["cnt"] if concept_row else 0
+                long_row = conn.execute(
+                    "SELECT COUNT(*) as cnt FROM concept_links WHERE potentiation='LONG'"
+                ).fetchone()
+                long_count = long_row["cnt"] if long_row else 0
+                lines = [
+                    f"  concepts: {concept_count}",
+                    f"  links: {link_count} (avg_strength: {avg_strength:.2f})",
+                    f"  long_potentiated: {long_count}",
+                ]
+                return lines
         except Exception:
             return []
 
@@ -179,11 +185,12 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
         relevant_concepts = []
         if query:
             try:
-                from .schema import extract_concepts_from_text, spread_activate, update_focus
-                query_concepts = extract_concepts_from_text(query)
-                if query_concepts:
-                    update_focus(query_concepts)
-                    activated = spread_activate(query_concepts, activation_threshold=0.1, max_hops=1, limit=10)
+                from .query import get_query_analysis
+                from .schema import update_focus
+                analysis = get_query_analysis(query)
+                if analysis.concepts:
+                    update_focus(analysis.concepts)
+                    activated = analysis.activations(threshold=0.1, limit=10)
                     relevant_concepts = [a.get('concept', '') for a in activated]
             except Exception:
                 pass
@@ -258,10 +265,11 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
             # Show activated concepts if query provided
             if query:
                 try:
-                    from .schema import extract_concepts_from_text, spread_activate
-                    concepts = extract_concepts_from_text(query)
+                    from .query import get_query_analysis
+                    analysis = get_query_analysis(query)
+                    concepts = analysis.concepts
                     if concepts:
-                        activated = spread_activate(concepts, activation_threshold=0.3, max_hops=1, limit=5)
+                        activated = analysis.activations(threshold=0.3, limit=5)
                         if activated:
                             # Show concept AND activation strength — this is
                             # the "why was this retrieved?" signal.
@@ -315,47 +323,49 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
             # Fallback: keyword matching
             return self._keyword_score(input_text, facts, top_k)
         
-        # Embed input
-        input_emb = self._embed(input_text)
-        if not input_emb:
+        # Embed input + all facts in one batch (dedup + embedding store)
+        from .scoring import get_embeddings
+        vecs = get_embeddings([input_text] + list(facts))
+        input_emb = vecs[0]
+        if input_emb is None:
             return self._keyword_score(input_text, facts, top_k)
         
-        # Score each fact
-        scored = []
-        for fact in facts:
-            fact_emb = self._embed(fact)
-            if fact_emb:
-                base_score = self._cosine_similarity(input_emb, fact_emb)
-                
-                # Apply co-occurrence boost (Hebbian learning)
-                cooccur_boost = self._get_cooccurrence_boost(fact, context_keys)
-                final_score = base_score * (1 + cooccur_boost)
-                
-                scored.append((fact, final_score))
-            else:
-                scored.append((fact, 0.0))
+        # Cosine for every embedded fact in one matrix-vector product
+        sims = np.zeros(len(facts))
+        idx = [i for i, v in enumerate(vecs[1:]) if v is not None and v.shape == input_emb.shape]
+        if idx:
+            mat = np.stack([vecs[i + 1] for i in idx])
+            norms = np.linalg.norm(mat, axis=1) * np.linalg.norm(input_emb)
+            dots = mat @ input_emb
+            sims[idx] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        
+        # Apply co-occurrence boost (Hebbian learning), one lookup for all
+        boosts = self._get_cooccurrence_boosts(facts, context_keys)
+        scored = [
+            (fact, float(sims[i]) * (1 + boosts[i]) if sims[i] else 0.0)
+            for i, fact in enumerate(facts)
+        ]
         
         # Sort and return top_k
         scored.sort(key=lambda x: x[1], reverse=True)
         return scored[:top_k]
     
-    def _get_cooccurrence_boost(self, fact: str, context_keys: List[str] = None) -> float:
+    def _get_cooccurrence_boosts(self, facts: List[str], context_keys: List[str] = None) -> List[float]:
         """
-        Get co-occurrence boost for a fact based on context.
+        Get co-occurrence boosts for facts based on context.
         
-        Returns 0.0 - 0.3 boost based on how often this fact
-        has appeared with current context in past conversations.
+        Returns a 0.0 - 0.3 boost per fact based on how often it has
+        appeared with current context in past conversations.
         """
         if not context_keys:
-            return 0.0
+            return [0.0] * len(facts)
         
         try:
-            from agent.threads.linking_core.schema import get_cooccurrence_score
+            from agent.threads.linking_core.cooccurrence import cooccurrence_scores
             # Use first 50 chars as key (matching recording)
-            fact_key = fact[:50].strip()
-            return get_cooccurrence_score(fact_key, context_keys)
+            return cooccurrence_scores([f[:50].strip() for f in facts], context_keys)
         except Exception:
-            return 0.0
+            return [0.0] * len(facts)
     
     def activate_memories(
         self,
@@ -545,8 +555,9 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
         # Get focus bias from self-attention
         focus_bias = 0.0
         try:
-            from .schema import extract_concepts_from_text, get_focus_bias
-            query_concepts = extract_concepts_from_text(feeds)
+            from .query import get_query_analysis
+            from .schema import get_focus_bias
+            query_concepts = get_query_analysis(feeds).concepts
             focus_bias = get_focus_bias(query_concepts, max_bias=1.5)
         except Exception:
             pass
@@ -706,16 +717,46 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
         
         # Extract concepts from feeds for mapping
         try:
-            from agent.threads.linking_core.schema import extract_concepts_from_text, get_cooccurrence_score
-            input_concepts = extract_concepts_from_text(feeds)
+            from agent.threads.linking_core.schema import extract_concepts_from_text
+            from agent.threads.linking_core.cooccurrence import cooccurrence_scores
+            from agent.threads.linking_core.query import get_query_analysis
+            analysis = get_query_analysis(feeds)
+            input_concepts = analysis.concepts
+            # One spread for all facts, not one per fact
+            activated_concepts = {
+                a['concept']: a['activation']
+                for a in analysis.activations(threshold=0.1, limit=20)
+            }
         except:
             input_concepts = []
             use_cooccurrence = False
             use_spread_activation = False
         
+        # Concepts per fact, and co-occurrence scores for the top 3 of each
+        # against the input concepts in one batched lookup.
+        fact_concepts_all = [[] for _ in facts]
+        cooccur_by_fact = [[] for _ in facts]
+        if (use_cooccurrence and context_keys) or (use_spread_activation and input_concepts):
+            for i, fact in enumerate(facts):
+                try:
+                    fact_concepts_all[i] = extract_concepts_from_text(fact)
+                except Exception:
+                    pass
+        if use_cooccurrence and context_keys and input_concepts:
+            try:
+                owners = [i for i, fc in enumerate(fact_concepts_all) for _ in fc[:3]]
+                scores = cooccurrence_scores(
+                    [c for fc in fact_concepts_all for c in fc[:3]], input_concepts,
+                )
+                for i, score in zip(owners, scores):
+                    if score > 0:
+                        cooccur_by_fact[i].append(score)
+            except Exception:
+                pass
+        
         scored = []
         
-        for fact in facts:
+        for fact, fact_concepts, cooccur_scores in zip(facts, fact_concepts_all, cooccur_by_fact):
             total_score = 0.0
             components = {}
             
@@ -732,35 +773,16 @@ class LinkingCoreThreadAdapter(BaseThreadAdapter):
                     pass
             
             # 2. Co-occurrence scoring (concepts that appear together)
-            if use_cooccurrence and context_keys:
-                try:
-                    # Extract concepts from this fact
-                    fact_concepts = extract_concepts_from_text(fact)
-                    if fact_concepts and input_concepts:
-                        # Average co-occurrence score across fact concepts
-                        cooccur_scores = []
-                        for fact_concept in fact_concepts[:3]:  # Top 3 concepts
-                            score = get_cooccurrence_score(fact_concept, input_concepts)
-                            if score > 0:
-                                cooccur_scores.append(score)
-                        
-                        if cooccur_scores:
-                            avg_cooccur = sum(cooccur_scores) / len(cooccur_scores)
-                            components['cooccurrence'] = avg_cooccur
-                            total_score += avg_cooccur * 0.3  # 30% weight
-                except:
-                    pass
+            if cooccur_scores:
+                # Average co-occurrence score across the fact's top 3 concepts
+                avg_cooccur = sum(cooccur_scores) / len(cooccur_scores)
+                components['cooccurrence'] = avg_cooccur
+                total_score += avg_cooccur * 0.3  # 30% weight
             
             # 3. Spread activation (concept graph)
             if use_spread_activation and input_concepts:
                 try:
-                    from agent.threads.linking_core.schema import spread_activate
-                    # Activate concepts from input
-                    activated = spread_activate(input_concepts, activation_threshold=0.1, max_hops=1, limit=20)
-                    activated_concepts = {a['concept']: a['activation'] for a in activated}
-                    
                     # Check if fact concepts are in activated set
-                    fact_concepts = extract_concepts_from_text(fact)
                     activation_scores = [activated_concepts.get(c, 0) for c in fact_concepts]
                     if activation_scores:
                         max_activation = max(activation_scores)
@@ -282,7 +282,7 @@ async def get_cooccurrence(
 
 @router.get("/stats")
 async def get_linking_stats():
-    """Get linking core statistics."""
+    """Get linking core statistics (cached counters and the in-memory graph; see schema.get_stats)."""
     stats = get_stats()
     
     # Add adapter health info
@@ -316,6 +316,23 @@ async def introspect_linking(level: int = 2, query: Optional[str] = None):
     return result.to_dict()
 
 
+@router.get("/vectors")
+async def get_vector_index_stats():
+    """Vector index size / kind / pending rows per corpus."""
+    from .vector_index import index_stats
+    return index_stats()
+
+
+@router.get("/vectors/{corpus}/search")
+async def search_vector_index(corpus: str, q: str, k: int = 10):
+    """Top-k items in a corpus (profile_facts, workspace_chunks, convo_turns)."""
+    from .vector_index import CORPORA, search
+    if corpus not in CORPORA:
+        raise HTTPException(status_code=404, detail=f"Unknown corpus: {corpus}")
+    hits = search(corpus, q, k=k)
+    return {"corpus": corpus, "results": [{"id": i, "score": s} for i, s in hits]}
+
+
 @router.get("/health")
 async def get_linking_health():
     """Get linking core thread health status."""
@@ -330,7 +347,7 @@ async def reindex_concept_graph():
     
     Scans identity and philosophy facts and creates/updates concept links.
     """
-    from .schema import index_key_in_concept_graph, get_stats
+    from .schema import index_keys_in_concept_graph, get_stats
     
     try:
         # Import profile facts from identity and philosophy
@@ -339,23 +356,18 @@ async def reindex_concept_graph():
         
         total_indexed = 0
         
-        # Index identity facts
-        identity_facts = pull_profile_facts()
-        for fact in identity_facts:
-            key = fact.get('key', '')
-            l3 = fact.get('l3_value', '') or fact.get('l2_value', '')
-            if key and l3:
-                index_key_in_concept_graph(key, l3, learning_rate=0.15, thread="identity")
-                total_indexed += 1
-        
-        # Index philosophy facts
-        philosophy_facts = pull_philosophy_profile_facts()
-        for fact in philosophy_facts:
-            key = fact.get('key', '')
-            l3 = fact.get('l3_value', '') or fact.get('l2_value', '')
-            if key and l3:
-                index_key_in_concept_graph(key, l3, learning_rate=0.15, thread="philosophy")
-                total_indexed += 1
+        for thread, facts in (
+            ("identity", pull_profile_facts()),
+            ("philosophy", pull_philosophy_profile_facts()),
+        ):
+            items = []
+            for fact in facts:
+                key = fact.get('key', '')
+                l3 = fact.get('l3_value', '') or fact.get('l2_value', '')
+                if key and l3:
+                    items.append((key, l3))
+            index_keys_in_concept_graph(items, learning_rate=0.15, thread=thread)
+            total_indexed += len(items)
         
         stats = get_stats()
         return {
@@ -3,7 +3,9 @@ Graph attention over the concept connectome — for STATE shaping.
 
 This is matrix attention, not BFS graph-walk. Where `spread_activate` walks edges
 hop by hop, this multiplies a query activation vector against the full
-(num_heads, V, V) attention bias tensor and returns per-head salience.
+(num_heads, V, V) attention bias tensor and returns per-head salience. The
+tensor is stored per-head CSR and memory-mapped, so load and attend scale with
+edge count rather than V².
 
 The 6 heads have learned semantics (identity / log / form / philosophy / reflex
 / association). Per-head output tells the orchestrator which threads should
@@ -17,8 +19,9 @@ Pipeline:
         → head_priorities() → {thread_name: weight} for STATE budget allocation
         → top_concepts_per_head() → which concepts to materialize as facts
 
-The npy assets are produced by research/hebbian_attention/graph_to_matrix.py
-and refreshed by a nightly loop (TODO).
+The assets are produced by research/hebbian_attention/graph_to_matrix.py
+and refreshed by a nightly loop (TODO). `attention_bias_csr.npz` is preferred;
+a dense `attention_bias.npy` is still accepted when that's all there is.
 
 Usage:
     from agent.threads.linking_core.attention import get_graph_attention
@@ -58,6 +61,44 @@ HEAD_TO_THREAD: Tuple[str, ...] = (
 logger = logging.getLogger(__name__)
 
 
+def _load_npz_mmap(path: Path) -> Dict[str, np.ndarray]:
+    """Memory-map every member of an uncompressed .npz (np.savez output).
+
+    np.load ignores mmap_mode for archives, so locate each stored .npy
+    inside the zip and map it directly. Compressed members fall back to a
+    regular in-memory read.
+    """
+    import zipfile
+
+    arrays: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            # Local file header: 30 fixed bytes + name + extra field
+            fh.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(fh.read(4), dtype="<u2")
+            fh.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(fh)
+            if dtype.hasobject or not shape or 0 in shape:
+                # np.memmap can't map empty or object arrays
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=fh.tell(), shape=shape,
+                order="F" if fortran else "C",
+            )
+    return arrays
+
+
 @dataclass
 class GraphAttentionResult:
     """Output of a single attention pass."""
@@ -76,7 +117,12 @@ class GraphAttention:
 
     def __init__(self, data_dir: Optional[Path] = None) -> None:
         self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
-        self.bias: Optional[np.ndarray] = None  # (num_heads, V, V)
+        self.bias: Optional[np.ndarray] = None  # dense (num_heads, V, V), legacy assets only
+        # Per-head CSR: head h, row i spans indices/data[indptr[h, i]:indptr[h, i + 1]]
+        self.indptr: Optional[np.ndarray] = None  # (num_heads, V + 1)
+        self.indices: Optional[np.ndarray] = None  # (nnz,) column ids
+        self.data: Optional[np.ndarray] = None  # (nnz,) weights
+        self._rows: Optional[np.ndarray] = None  # (nnz,) row id per entry
         self.position: Optional[np.ndarray] = None  # (V,)
         self.vocab: List[str] = []
         self.concept_to_idx: Dict[str, int] = {}
@@ -90,11 +136,12 @@ class GraphAttention:
             return
         self._load_attempted = True
 
+        csr_path = self.data_dir / "attention_bias_csr.npz"
         bias_path = self.data_dir / "attention_bias.npy"
         vocab_path = self.data_dir / "vocab.json"
         pos_path = self.data_dir / "position_encoding.npy"
 
-        if not bias_path.exists() or not vocab_path.exists():
+        if not (csr_path.exists() or bias_path.exists()) or not vocab_path.exists():
             logger.info(
                 "graph_attention: assets missing in %s — falling back to spread_activate",
                 self.data_dir,
@@ -102,7 +149,11 @@ class GraphAttention:
             return
 
         try:
-            self.bias = np.load(str(bias_path))
+            if csr_path.exists():
+                self._load_csr(csr_path)
+            else:
+                self.bias = np.load(str(bias_path))
+                self.num_heads, self.vocab_size, _ = self.bias.shape
             raw = json.loads(vocab_path.read_text())
             # vocab.json may be either a flat list of concepts (legacy) or
             # {"concept_to_idx": {...}, "vocab_size": N} (current).
@@ -116,20 +167,48 @@ class GraphAttention:
                 self.concept_to_idx = {c: i for i, c in enumerate(self.vocab)}
             else:
                 raise ValueError(f"unexpected vocab.json shape: {type(raw)}")
-            self.num_heads, self.vocab_size, _ = self.bias.shape
             if pos_path.exists():
                 self.position = np.load(str(pos_path))
             self.available = True
             logger.info(
-                "graph_attention: loaded %d heads, vocab=%d, position=%s",
+                "graph_attention: loaded %d heads, vocab=%d, %s, position=%s",
                 self.num_heads,
                 self.vocab_size,
+                f"csr nnz={len(self.data)}" if self.data is not None else "dense",
                 "present" if self.position is not None else "absent",
             )
         except Exception as e:
             logger.warning("graph_attention: failed to load assets: %s", e)
             self.available = False
 
+    def _load_csr(self, path: Path) -> None:
+        arrays = _load_npz_mmap(path)
+        self.num_heads, self.vocab_size = int(arrays["shape"][0]), int(arrays["shape"][1])
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.data = arrays["data"]
+        if self.indptr.shape != (self.num_heads, self.vocab_size + 1):
+            raise ValueError(f"indptr shape {self.indptr.shape} != heads x (V+1)")
+        # Row id per stored entry, so a head's mat-vec is one bincount
+        self._rows = np.empty(len(self.data), dtype=np.int32)
+        for h in range(self.num_heads):
+            lo, hi = int(self.indptr[h, 0]), int(self.indptr[h, -1])
+            self._rows[lo:hi] = np.repeat(
+                np.arange(self.vocab_size, dtype=np.int32),
+                np.diff(self.indptr[h]),
+            )
+
+    def _propagate(self, head_state: np.ndarray) -> np.ndarray:
+        """bias_h @ head_state_h for every head → (num_heads, V)."""
+        if self.bias is not None:
+            return np.einsum("hij,hj->hi", self.bias, head_state)
+        out = np.empty_like(head_state)
+        for h in range(self.num_heads):
+            lo, hi = int(self.indptr[h, 0]), int(self.indptr[h, -1])
+            weights = self.data[lo:hi] * head_state[h, self.indices[lo:hi]]
+            out[h] = np.bincount(self._rows[lo:hi], weights=weights, minlength=self.vocab_size)
+        return out
+
     # ── encoding ──────────────────────────────────────────────────────
 
     def encode_query(
@@ -214,7 +293,7 @@ class GraphAttention:
         seed_residual = np.tile(qv[None, :], (self.num_heads, 1))
 
         for _ in range(steps):
-            propagated = np.einsum("hij,hj->hi", self.bias, head_state)
+            propagated = self._propagate(head_state)
             norms = np.maximum(propagated.sum(axis=1, keepdims=True), 1e-8)
             propagated = propagated / norms
             if temperature != 1.0:
@@ -320,7 +399,7 @@ def get_graph_attention(data_dir: Optional[Path] = None) -> GraphAttention:
 
 
 def reload_graph_attention() -> GraphAttention:
-    """Force reload — call after rebuilding the .npy assets."""
+    """Force reload — call after rebuilding the attention assets."""
     global _INSTANCE
     with _LOCK:
         _INSTANCE = GraphAttention()
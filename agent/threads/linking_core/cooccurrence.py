@@ -0,0 +1,178 @@
+"""
+In-memory key co-occurrence counts — a read cache over ``key_cooccurrence``.
+
+`get_cooccurrence_score` used to run one SELECT per context key for every
+scored fact. This module keeps sparse ``key → {other_key: count}`` maps
+instead, one shard per namespace (the key's parent:
+``identity.primary_user.name`` → ``identity.primary_user``; a dotless
+concept is its own namespace). A shard is loaded the first time one of
+its keys is looked up and holds every pair that touches its keys, from
+either side of the canonical (key_a < key_b) row.
+
+``record_cooccurrence[_batch]`` write through to loaded shards, so scoring
+in the same process sees its own writes at once. A TTL reload
+(``AIOS_COOCCUR_TTL``, seconds) picks up writes made by other processes
+(the coma loop records pairs from its own process).
+
+Usage:
+    from agent.threads.linking_core.cooccurrence import cooccurrence_scores
+    cooccurrence_scores(["identity.user.name", ...], context_keys)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing
+from threading import RLock
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+_TTL = float(os.getenv("AIOS_COOCCUR_TTL", "300"))
+PAIR_BOOST = 0.15    # cap on one context key's contribution
+TOTAL_BOOST = 0.3    # cap on the summed boost
+
+
+def namespace(key: str) -> str:
+    return key.rsplit(".", 1)[0] if "." in key else key
+
+
+class _Shard:
+    __slots__ = ("counts", "loaded_at")
+
+    def __init__(self, counts: Dict[str, Dict[str, int]]):
+        self.counts = counts
+        self.loaded_at = time.time()
+
+
+def _load(conn, ns: str) -> _Shard:
+    """Every pair with a key in ``ns``: ``ns`` itself (dotless) or ``ns.<leaf>``."""
+    bounds = (ns, ns + ".", ns + "/")   # '/' sorts right after '.'
+    counts: Dict[str, Dict[str, int]] = {}
+    try:
+        rows = conn.execute(
+            """
+            SELECT key_a, key_b, count FROM key_cooccurrence
+            WHERE key_a = ? OR (key_a >= ? AND key_a < ?)
+            """,
+            bounds,
+        ).fetchall()
+        rows += [
+            (b, a, n) for a, b, n in conn.execute(
+                """
+                SELECT key_a, key_b, count FROM key_cooccurrence
+                WHERE key_b = ? OR (key_b >= ? AND key_b < ?)
+                """,
+                bounds,
+            )
+        ]
+    except sqlite3.OperationalError:
+        rows = []  # table not created yet
+    for k, other, n in rows:
+        if namespace(k) == ns:  # the range also spans deeper descendants
+            counts.setdefault(k, {})[other] = int(n or 0)
+    return _Shard(counts)
+
+
+# ── process-wide shards (per DB path, per namespace) ─────────────────
+
+_SHARDS: Dict[str, Dict[str, _Shard]] = {}
+_LOCK = RLock()
+_stats = {"loads": 0, "lookups": 0}
+
+
+def _rows(keys: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """``key → {other: count}`` for ``keys``, loading missing or stale shards."""
+    from data.db import get_connection, get_db_path
+
+    shards = _SHARDS.setdefault(str(get_db_path()), {})
+    now = time.time()
+    out: Dict[str, Dict[str, int]] = {}
+    conn = None
+    try:
+        for key in keys:
+            if key in out:
+                continue
+            ns = namespace(key)
+            shard = shards.get(ns)
+            if shard is None or now - shard.loaded_at > _TTL:
+                if conn is None:
+                    conn = get_connection(readonly=True)
+                shard = shards[ns] = _load(conn, ns)
+                _stats["loads"] += 1
+            out[key] = shard.counts.get(key, {})
+    finally:
+        if conn is not None:
+            conn.close()
+    return out
+
+
+def cooccurrence_scores(keys: Sequence[str], context_keys: Sequence[str]) -> List[float]:
+    """Co-occurrence boost (0.0 – 0.3) for each key against ``context_keys``.
+
+    Per context key seen with a key: min(log(count + 1) * 0.03, 0.15),
+    summed and capped at 0.3 — the old `get_cooccurrence_score`, for all
+    keys in one call. Aligned with ``keys``.
+    """
+    out = [0.0] * len(keys)
+    if not keys or not context_keys:
+        return out
+    index: Dict[str, List[int]] = {}
+    for i, k in enumerate(keys):
+        index.setdefault(k, []).append(i)
+    with _LOCK:  # rows are the live shard maps; note_pairs mutates them
+        rows = _rows(context_keys)
+        _stats["lookups"] += len(keys)
+        for ctx in context_keys:
+            row = rows[ctx]
+            hits = (
+                ((k, row.get(k)) for k in index) if len(index) < len(row)
+                else ((k, n) for k, n in row.items() if k in index)
+            )
+            for k, n in hits:
+                if n:
+                    boost = min(math.log(n + 1) * 0.03, PAIR_BOOST)
+                    for i in index[k]:
+                        out[i] += boost
+    return [min(b, TOTAL_BOOST) for b in out]
+
+
+def note_pairs(pairs: Iterable[Tuple[str, str]]) -> None:
+    """Write-through for recorded pairs: +1 in every loaded shard they touch."""
+    from data.db import get_db_path
+
+    with _LOCK:
+        shards = _SHARDS.get(str(get_db_path()))
+        if not shards:
+            return
+        for a, b in pairs:
+            for k, other in ((a, b), (b, a)):
+                shard = shards.get(namespace(k))
+                if shard is not None:
+                    row = shard.counts.setdefault(k, {})
+                    row[other] = row.get(other, 0) + 1
+
+
+def invalidate_cooccurrence() -> None:
+    """Drop cached shards — call after bulk writes to key_cooccurrence."""
+    with _LOCK:
+        _SHARDS.clear()
+
+
+def cooccurrence_stats() -> Dict[str, int]:
+    with _LOCK:
+        shards = [s for per_db in _SHARDS.values() for s in per_db.values()]
+        return {
+            **_stats,
+            "shards": len(shards),
+            "keys": sum(len(s.counts) for s in shards),
+        }
+
+
+__all__ = [
+    "cooccurrence_scores",
+    "note_pairs",
+    "invalidate_cooccurrence",
+    "cooccurrence_stats",
+]
@@ -0,0 +1,186 @@
+"""
+Embedding Store
+===============
+
+Persistent, content-addressed embedding cache behind
+`scoring.get_embeddings`.
+
+    embedding_store (hash, provider, model, dim, vec)
+
+`hash` is a digest of the exact text; `vec` is the float32 vector as raw
+bytes.  Every row is tagged with the provider and model that produced it,
+and lookups only match the active tag — switching AIOS_EMBED_PROVIDER /
+AIOS_EMBED_MODEL misses cleanly instead of mixing vector spaces.
+`purge_stale()` deletes rows from other tags.
+
+In front of the table sits a bounded in-memory LRU (AIOS_EMBED_CACHE_SIZE
+entries, default 4096) so hot texts never touch SQLite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from data.db import get_connection, get_db_path, writer
+
+MEMORY_ENTRIES = int(os.getenv("AIOS_EMBED_CACHE_SIZE", "4096"))
+_LOOKUP_CHUNK = 500
+
+Tag = Tuple[str, str]  # (provider, model)
+
+_lru: "OrderedDict[Tuple[Tag, str], np.ndarray]" = OrderedDict()
+_lock = threading.Lock()
+_ready: set = set()    # DB paths whose table exists
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0}
+
+
+def text_hash(text: str) -> str:
+    """Content address for one text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def init_embedding_store_table(conn: Optional[sqlite3.Connection] = None) -> None:
+    """Create the embedding_store table."""
+    own_conn = conn is None
+    conn = conn or get_connection()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS embedding_store (
+            hash TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vec BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (hash, provider, model)
+        ) WITHOUT ROWID
+    """)
+    if own_conn:
+        conn.commit()
+        conn.close()
+
+
+def _ensure_table() -> None:
+    path = str(get_db_path())
+    if path not in _ready:
+        with writer() as conn:
+            init_embedding_store_table(conn)
+        _ready.add(path)
+
+
+def _remember(tag: Tag, h: str, vec: np.ndarray) -> None:
+    """Insert into the LRU (caller holds _lock)."""
+    _lru[(tag, h)] = vec
+    _lru.move_to_end((tag, h))
+    while len(_lru) > MEMORY_ENTRIES:
+        _lru.popitem(last=False)
+
+
+def lookup(tag: Tag, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Cached vectors for ``hashes`` under ``tag`` (memory, then disk)."""
+    found: Dict[str, np.ndarray] = {}
+    missing: List[str] = []
+    with _lock:
+        for h in hashes:
+            vec = _lru.get((tag, h))
+            if vec is None:
+                missing.append(h)
+            else:
+                _lru.move_to_end((tag, h))
+                found[h] = vec
+        _stats["memory_hits"] += len(found)
+    if not missing:
+        return found
+
+    try:
+        _ensure_table()
+        rows = []
+        with closing(get_connection(readonly=True)) as conn:
+            for i in range(0, len(missing), _LOOKUP_CHUNK):
+                chunk = missing[i:i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT hash, vec FROM embedding_store "
+                    f"WHERE provider = ? AND model = ? AND hash IN ({marks})",
+                    (*tag, *chunk),
+                ).fetchall())
+    except sqlite3.Error:
+        rows = []
+
+    with _lock:
+        for h, blob in rows:
+            vec = np.frombuffer(blob, dtype=np.float32)
+            found[h] = vec
+            _remember(tag, h, vec)
+        _stats["disk_hits"] += len(rows)
+        _stats["misses"] += len(missing) - len(rows)
+    return found
+
+
+def store(tag: Tag, vectors: Dict[str, np.ndarray]) -> None:
+    """Persist freshly computed vectors and add them to the LRU."""
+    if not vectors:
+        return
+    now = time.time()
+    rows = []
+    with _lock:
+        for h, vec in vectors.items():
+            vec = np.ascontiguousarray(vec, dtype=np.float32)
+            _remember(tag, h, vec)
+            rows.append((h, tag[0], tag[1], int(vec.shape[0]), vec.tobytes(), now))
+        _stats["stored"] += len(rows)
+    try:
+        _ensure_table()
+        with writer() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_store "
+                "(hash, provider, model, dim, vec, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+    except sqlite3.Error:
+        pass  # memory tier still has them
+
+
+def clear_memory() -> int:
+    """Drop the in-memory tier. Returns entries cleared."""
+    with _lock:
+        n = len(_lru)
+        _lru.clear()
+    return n
+
+
+def purge_stale(tag: Tag) -> int:
+    """Delete persisted vectors from any provider/model other than ``tag``."""
+    _ensure_table()
+    with writer() as conn:
+        cur = conn.execute(
+            "DELETE FROM embedding_store WHERE NOT (provider = ? AND model = ?)", tag,
+        )
+        return cur.rowcount
+
+
+def store_stats(tag: Optional[Tag] = None) -> Dict[str, object]:
+    """LRU size, hit/miss counters and persisted row count."""
+    with _lock:
+        out: Dict[str, object] = {**_stats, "memory_entries": len(_lru),
+                                  "memory_max": MEMORY_ENTRIES}
+    try:
+        _ensure_table()
+        with closing(get_connection(readonly=True)) as conn:
+            if tag is None:
+                out["disk_entries"] = conn.execute("SELECT COUNT(*) FROM embedding_store").fetchone()[0]
+            else:
+                out["disk_entries"] = conn.execute(
+                    "SELECT COUNT(*) FROM embedding_store WHERE provider = ? AND model = ?", tag,
+                ).fetchone()[0]
+    except sqlite3.Error:
+        out["disk_entries"] = 0
+    return out
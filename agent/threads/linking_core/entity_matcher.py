@@ -0,0 +1,476 @@
+"""
+Entity Matcher
+==============
+
+Finds the known entities (fact keys, stance keys, profiles, tools) a
+piece of text mentions — the lookup behind ``extract_concepts_from_text``.
+
+Entity names are split into tokens on '.', '_' and whitespace; a text
+mentions an entity when one of its words is one of the entity's tokens
+(``"coffee"`` → ``user.preferences.likes_coffee``).  Matching is on whole
+words, so the automaton is a word-level one: a token → entities table
+probed with the text's words in a single C-level set intersection, plus
+a phrase table (first word → phrases) for multi-word names none of whose
+words is a usable token on its own.  ``EntityMatcher.add`` / ``remove``
+update both tables in place.
+
+The process-wide matcher per DB is built once, then kept current from
+``entity_changes``: triggers on the four source tables log the name of
+every entity row inserted, deleted or renamed, and each lookup first
+applies the log since its watermark — re-checking just those names
+against the sources (REPLACE's implicit delete fires no trigger, so the
+log says *which* names to look at, not what happened to them).  The log
+is read at most every AIOS_ENTITY_SYNC_S seconds (default 1), so a new
+entity is matchable within that.  It prunes itself to its last LOG_KEEP
+entries; a matcher that fell further behind (or whose DB was replaced)
+rebuilds.
+
+Usage:
+    from agent.threads.linking_core.entity_matcher import extract_entities_batch
+    extract_entities_batch(["Betsy liked the coffee", "deploy went fine"])
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from data.db import get_connection, get_db_path, writer
+
+SYNC_S = float(os.getenv("AIOS_ENTITY_SYNC_S", "1"))
+LOG_KEEP = 10_000
+_PRUNE_EVERY = 1_000
+
+# Words of a text: a letter, then letters/digits ("sarah", "k8s").
+_WORD_RE = re.compile(r'\b[a-z][a-z0-9]{1,}\b')
+_SPLIT_RE = re.compile(r'[._\s]+')
+
+# Tokens too generic to trigger entity matching on their own.
+# Skipped when indexing names, so compound keys can't make English
+# stopwords a trigger: without this, 'constraint.do_not_match_performance'
+# would index 'not', and any query containing it would activate the
+# constraint.  The full key is still an entity.  Anything that's a real
+# entity (jake, betsy, sarah, etc.) must NOT be in this set.
+NOISE_TOKENS = frozenset({
+    # generic schema words
+    'user', 'general', 'preference', 'preferences', 'action', 'identity',
+    'process', 'system', 'assistant', 'information', 'query', 'goal',
+    'project', 'type', 'status', 'name', 'value', 'data', 'method',
+    'source', 'level', 'meta', 'item', 'items', 'thing', 'things',
+    'note', 'notes', 'detail', 'details', 'context', 'state',
+    # articles / prepositions / conjunctions
+    'the', 'and', 'for', 'but', 'nor', 'yet', 'with', 'from', 'into',
+    'onto', 'upon', 'over', 'under', 'about', 'around', 'between',
+    'through', 'against', 'before', 'after', 'during', 'within',
+    # be / aux verbs
+    'are', 'was', 'were', 'been', 'being', 'have', 'has', 'had', 'having',
+    'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might',
+    'must', 'does', 'did', 'doing',
+    # pronouns
+    'you', 'your', 'yours', 'they', 'them', 'their', 'theirs',
+    'his', 'her', 'hers', 'him', 'who', 'whom', 'whose', 'which',
+    'this', 'that', 'these', 'those', 'what', 'whatever',
+    'when', 'where', 'why', 'how', 'whenever', 'wherever',
+    # generic verbs from conversation
+    'know', 'knows', 'knew', 'tell', 'tells', 'told', 'say', 'says', 'said',
+    'show', 'shows', 'showed', 'get', 'got', 'make', 'made', 'use', 'used',
+    'using', 'see', 'saw', 'seen', 'look', 'looking', 'think', 'thought',
+    'happened', 'happening', 'happen', 'actually', 'really',
+    # negation / common adverbs
+    'not', 'never', 'always', 'often', 'sometimes', 'maybe',
+    # connecting words leftover
+    'just', 'only', 'also', 'still', 'then', 'than',
+})
+
+
+def name_tokens(name: str) -> List[str]:
+    """The words of ``name`` that trigger it: "user.likes_coffee" → ["likes", "coffee"].
+
+    Min length 3 (kills 'do', 'me', 'we', 'us' etc.), no NOISE_TOKENS.
+    """
+    return [
+        t for t in dict.fromkeys(_SPLIT_RE.split(name.lower()))
+        if len(t) >= 3 and t not in NOISE_TOKENS
+    ]
+
+
+# =============================================================================
+# Matcher
+# =============================================================================
+
+class EntityMatcher:
+    """Word-level multi-pattern matcher over a mutable set of entity names.
+
+    Not thread-safe; the module-level registry guards it with a lock.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._tokens: Dict[str, Dict[str, None]] = {}    # token → {name}
+        self._phrases: Dict[str, Dict[str, str]] = {}    # first word → {name: " w1 w2 "}
+        self._names: set = set()
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def add(self, name: str) -> bool:
+        """Index ``name``; False if it was already there."""
+        if not name or name in self._names:
+            return False
+        self._names.add(name)
+        tokens = name_tokens(name)
+        for token in tokens:
+            bucket = self._tokens.get(token)
+            if bucket is None:
+                self._tokens[token] = {name: None}
+            else:
+                bucket[name] = None
+        if not tokens:
+            words = _WORD_RE.findall(name.lower())
+            if len(words) >= 2:
+                self._phrases.setdefault(words[0], {})[name] = f" {' '.join(words)} "
+        return True
+
+    def remove(self, name: str) -> bool:
+        """Drop ``name``; False if it wasn't indexed."""
+        if name not in self._names:
+            return False
+        self._names.discard(name)
+        tokens = name_tokens(name)
+        for token in tokens:
+            bucket = self._tokens.get(token)
+            if bucket is not None:
+                bucket.pop(name, None)
+                if not bucket:
+                    del self._tokens[token]
+        if not tokens:
+            words = _WORD_RE.findall(name.lower())
+            bucket = self._phrases.get(words[0]) if len(words) >= 2 else None
+            if bucket is not None:
+                bucket.pop(name, None)
+                if not bucket:
+                    del self._phrases[words[0]]
+        return True
+
+    def match(self, text: str) -> List[str]:
+        """Entity names ``text`` mentions (unordered)."""
+        if not text:
+            return []
+        words = _WORD_RE.findall(text.lower())
+        hits = self._tokens.keys() & words
+        found: set = set()
+        for token in hits:
+            found.update(self._tokens[token])
+        if self._phrases:
+            heads = self._phrases.keys() & words
+            if heads:
+                joined = f" {' '.join(words)} "
+                for head in heads:
+                    found.update(n for n, p in self._phrases[head].items() if p in joined)
+        return list(found)
+
+    def match_many(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self.match(t) for t in texts]
+
+
+# =============================================================================
+# Change log
+# =============================================================================
+
+# table → ((column, is display name), ...), plus the condition (on one
+# of its columns) a row must meet to be an entity.  Display names are
+# matched lowercased.
+SOURCES: Dict[str, Tuple[Tuple[Tuple[str, int], ...], str]] = {
+    "profile_facts": ((("key", 0),), ""),
+    "philosophy_profile_facts": ((("key", 0),), ""),
+    "profiles": ((("profile_id", 0), ("display_name", 1)), ""),
+    "form_tools": ((("name", 0),), "enabled = 1"),
+}
+
+_LOG_SQL = """
+    CREATE TABLE IF NOT EXISTS entity_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        display INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+
+def _log(row: str, table: str) -> str:
+    columns, where = SOURCES[table]
+    cond = f" AND {row}.{where}" if where else ""
+    return " ".join(
+        f"INSERT INTO entity_changes (name, display) SELECT {row}.{col}, {display} "
+        f"WHERE {row}.{col} IS NOT NULL{cond};"
+        for col, display in columns
+    )
+
+
+def _trigger_sql(table: str) -> List[str]:
+    columns, where = SOURCES[table]
+    watched = [col for col, _ in columns] + (["enabled"] if "enabled" in where else [])
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS ec_{table}_ins AFTER INSERT ON {table} "
+        f"BEGIN {_log('NEW', table)} END",
+        f"CREATE TRIGGER IF NOT EXISTS ec_{table}_del AFTER DELETE ON {table} "
+        f"BEGIN {_log('OLD', table)} END",
+        f"CREATE TRIGGER IF NOT EXISTS ec_{table}_upd AFTER UPDATE OF {', '.join(watched)} "
+        f"ON {table} BEGIN {_log('OLD', table)} {_log('NEW', table)} END",
+    ]
+
+
+_PRUNE_SQL = f"""
+    CREATE TRIGGER IF NOT EXISTS ec_prune AFTER INSERT ON entity_changes
+    WHEN NEW.id % {_PRUNE_EVERY} = 0
+    BEGIN DELETE FROM entity_changes WHERE id <= NEW.id - {LOG_KEEP}; END
+"""
+
+
+def _untracked(conn) -> List[str]:
+    """Source tables that exist but have no change-log triggers yet."""
+    tables, triggers = set(), set()
+    for kind, name in conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+    ):
+        (tables if kind == "table" else triggers).add(name)
+    missing = [t for t in SOURCES if t in tables and f"ec_{t}_ins" not in triggers]
+    if "entity_changes" not in tables and not missing:
+        missing = ["entity_changes"]
+    return missing
+
+
+def ensure_entity_log() -> List[str]:
+    """Install change-log triggers on every source table that exists; returns those added."""
+    added: List[str] = []
+    with writer() as conn:
+        conn.execute(_LOG_SQL)
+        conn.execute(_PRUNE_SQL)
+        for table in _untracked(conn):
+            if table not in SOURCES:
+                continue
+            for sql in _trigger_sql(table):
+                conn.execute(sql)
+            added.append(table)
+    return added
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def _chunks(items: List[str], size: int = 500) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _rows(conn, sql: str, params: Sequence = ()) -> List[tuple]:
+    try:
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError:
+        return []  # table may not exist yet
+
+
+def _load_names(conn) -> set:
+    """Every entity name in the source tables."""
+    names: set = set()
+    for table, (columns, where) in SOURCES.items():
+        cond = f" WHERE {where}" if where else ""
+        for col, display in columns:
+            for (value,) in _rows(conn, f"SELECT DISTINCT {col} FROM {table}{cond}"):
+                if value:
+                    names.add(value.lower() if display else value)
+    return names
+
+
+def _present(conn, names: List[str]) -> set:
+    """The subset of ``names`` still in some source table."""
+    found: set = set()
+    for table, (columns, where) in SOURCES.items():
+        cond = f" AND {where}" if where else ""
+        for col, display in columns:
+            if display:
+                wanted = set(names)
+                found.update(
+                    v.lower() for (v,) in _rows(conn, f"SELECT {col} FROM {table} WHERE {col} IS NOT NULL{cond}")
+                    if v.lower() in wanted
+                )
+                continue
+            for chunk in _chunks(names):
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    v for (v,) in _rows(conn, f"SELECT {col} FROM {table} WHERE {col} IN ({marks}){cond}", chunk)
+                )
+    return found
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+class _Registry:
+    __slots__ = ("matcher", "watermark", "tracked", "checked", "lock", "synced_at")
+
+    def __init__(self):
+        self.matcher: Optional[EntityMatcher] = None
+        self.watermark = 0
+        self.tracked = False
+        self.checked = False
+        self.lock = threading.Lock()
+        self.synced_at = 0.0
+
+
+_REGISTRIES: Dict[str, _Registry] = {}
+_lock = threading.Lock()
+_stats = {"builds": 0, "build_ms": 0.0, "syncs": 0, "changes": 0, "texts": 0}
+
+
+def _build(reg: _Registry) -> None:
+    t0 = time.perf_counter()
+    with closing(get_connection(readonly=True)) as conn:
+        conn.execute("BEGIN")   # names and watermark from one snapshot
+        try:
+            tracked = not _untracked(conn)
+            watermark = _rows(conn, "SELECT MAX(id) FROM entity_changes") if tracked else []
+            names = _load_names(conn)
+        finally:
+            conn.rollback()
+    reg.matcher = EntityMatcher(names)
+    reg.watermark = (watermark[0][0] or 0) if watermark else 0
+    reg.tracked = tracked and bool(watermark)
+    reg.synced_at = time.monotonic()
+    with _lock:
+        _stats["builds"] += 1
+        _stats["build_ms"] = (time.perf_counter() - t0) * 1000
+
+
+def _sync(reg: _Registry) -> None:
+    """Apply entity_changes since the watermark."""
+    reg.synced_at = time.monotonic()
+    with closing(get_connection(readonly=True)) as conn:
+        conn.execute("BEGIN")
+        try:
+            top = conn.execute("SELECT MAX(id) FROM entity_changes").fetchone()[0] or 0
+            if top == reg.watermark:
+                return
+            rows = conn.execute(
+                "SELECT id, name, display FROM entity_changes WHERE id > ? ORDER BY id",
+                (reg.watermark,),
+            ).fetchall() if top > reg.watermark else []
+            if not rows or rows[0][0] != reg.watermark + 1:
+                stale = True    # pruned past us, or a different DB
+            else:
+                stale = False
+                names = list({(n.lower() if d else n) for _, n, d in rows})
+                present = _present(conn, names)
+        finally:
+            conn.rollback()
+    if stale:
+        _build(reg)
+        return
+    matcher = reg.matcher
+    for name in names:
+        if name in present:
+            matcher.add(name)
+        else:
+            matcher.remove(name)
+    reg.watermark = rows[-1][0]
+    with _lock:
+        _stats["syncs"] += 1
+        _stats["changes"] += len(rows)
+
+
+def _registry() -> _Registry:
+    key = str(get_db_path())
+    with _lock:
+        reg = _REGISTRIES.get(key)
+        if reg is None:
+            reg = _REGISTRIES[key] = _Registry()
+    if not reg.checked:
+        # Outside reg.lock: a writer holding the write lock may be
+        # waiting on it to extract concepts.
+        reg.checked = True
+        try:
+            with closing(get_connection(readonly=True)) as conn:
+                missing = _untracked(conn)
+            if missing:
+                ensure_entity_log()
+        except sqlite3.Error:
+            pass  # read-only DB: built once, refreshed by invalidate_entities()
+    return reg
+
+
+def _current(reg: _Registry) -> EntityMatcher:
+    """reg.matcher brought up to date; call with reg.lock held."""
+    if reg.matcher is None:
+        _build(reg)
+    elif reg.tracked and time.monotonic() - reg.synced_at >= SYNC_S:
+        try:
+            _sync(reg)
+        except sqlite3.OperationalError:
+            _build(reg)    # log table gone: DB replaced
+    return reg.matcher
+
+
+def extract_entities(text: str) -> List[str]:
+    """Known entity names ``text`` mentions."""
+    return extract_entities_batch([text])[0]
+
+
+def extract_entities_batch(texts: Sequence[str]) -> List[List[str]]:
+    """``extract_entities`` for each text, against one refresh of the matcher."""
+    if not texts:
+        return []
+    reg = _registry()
+    with reg.lock:
+        matcher = _current(reg)
+        out = [matcher.match(t) if t else [] for t in texts]
+    with _lock:
+        _stats["texts"] += len(texts)
+    return out
+
+
+def invalidate_entities() -> None:
+    """Rebuild every matcher from the source tables on next use."""
+    with _lock:
+        regs = list(_REGISTRIES.values())
+    for reg in regs:
+        with reg.lock:
+            reg.matcher = None
+            reg.checked = False
+
+
+def entity_matcher_stats() -> Dict[str, float]:
+    key = str(get_db_path())
+    with _lock:
+        reg = _REGISTRIES.get(key)
+        out = dict(_stats)
+    matcher = reg.matcher if reg else None
+    out.update({
+        "entities": len(matcher) if matcher else 0,
+        "tokens": len(matcher._tokens) if matcher else 0,
+        "phrases": sum(map(len, matcher._phrases.values())) if matcher else 0,
+        "tracked": bool(reg and reg.tracked),
+        "watermark": reg.watermark if reg else 0,
+    })
+    return out
+
+
+__all__ = [
+    "NOISE_TOKENS",
+    "EntityMatcher",
+    "name_tokens",
+    "ensure_entity_log",
+    "extract_entities",
+    "extract_entities_batch",
+    "invalidate_entities",
+    "entity_matcher_stats",
+]
@@ -0,0 +1,544 @@
+"""
+In-memory concept graph — CSR adjacency over ``concept_links``.
+
+`spread_activate` used to issue one UNION query per frontier node per hop,
+plus a ``LIKE concept || '.%'`` scan per input concept for hierarchical
+children. This module keeps a process-wide snapshot of the graph instead:
+
+    _names / _ids       concept ↔ int id
+    _ea, _eb, _ew, _et  edge arrays (endpoint ids, strength, strength_at)
+    _indptr, _nbr, _eid CSR over both edge directions (row = node id)
+    _sorted             sorted concept names (dot-notation prefix index)
+
+Edge strengths are read through ``_eid`` at query time, so the Hebbian
+writers in schema.py update them in place (O(1) per edge). Strengths
+decay lazily: an edge stores the value written at ``strength_at`` and
+queries see ``strength * LINK_DECAY ** (age / LINK_DECAY_PERIOD_S)``, the
+same curve SQL readers get from ``decayed()`` (see data.db). Edges added
+after the last CSR build live in a small overlay and are folded in when
+the overlay grows past a threshold. Deleted edges are tombstoned with a
+negative strength. A TTL reload (``AIOS_CONCEPT_GRAPH_TTL``, seconds)
+picks up writes made by other processes.
+
+Usage:
+    from agent.threads.linking_core.graph import get_concept_graph
+    g = get_concept_graph()
+    g.spread(["sarah", "coffee"], threshold=0.1, max_hops=2, limit=20)
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import sqlite3
+import time
+from contextlib import closing
+from threading import RLock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Max neighbors followed per node per hop (matches the old SQL LIMIT 20)
+FANOUT = 20
+# Hierarchical children get this fraction of full activation
+CHILD_ACTIVATION = 0.8
+# Fold the overlay into the CSR once it holds this many edges (or 5% of E)
+_OVERLAY_MAX = 1024
+_TTL = float(os.getenv("AIOS_CONCEPT_GRAPH_TTL", "300"))
+# Link strength decays by LINK_DECAY every LINK_DECAY_PERIOD_S seconds
+LINK_DECAY = float(os.getenv("AIOS_LINK_DECAY", "0.97"))
+LINK_DECAY_PERIOD_S = float(os.getenv("AIOS_LINK_DECAY_PERIOD_S", str(6 * 3600)))
+
+_DELETED = -1.0
+
+
+class ConceptGraph:
+    """Process-wide adjacency snapshot of ``concept_links``.
+
+    Obtain via :func:`get_concept_graph`; all public methods are
+    thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sorted: List[str] = []
+        self._n_edges = 0
+        self._ea = np.zeros(0, dtype=np.int32)
+        self._eb = np.zeros(0, dtype=np.int32)
+        self._ew = np.zeros(0, dtype=np.float64)
+        self._et = np.zeros(0, dtype=np.float64)
+        self._indexed = np.zeros(0, dtype=bool)  # edge reachable via CSR/overlay
+        self._edge_at: Dict[Tuple[int, int], int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._nbr = np.zeros(0, dtype=np.int32)
+        self._eid = np.zeros(0, dtype=np.int64)
+        self._overlay: Dict[int, List[int]] = {}
+        self._overlay_edges = 0
+        self.loaded_at = 0.0
+
+    # ── loading ───────────────────────────────────────────────────────
+
+    def load(self, conn: sqlite3.Connection) -> "ConceptGraph":
+        """(Re)build the snapshot from ``concept_links``.
+
+        Arrays are built before the lock is taken, so queries keep running
+        against the previous snapshot until the swap.
+        """
+        now = time.time()
+        try:
+            rows = conn.execute(
+                "SELECT concept_a, concept_b, strength, strength_at FROM concept_links"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            try:  # table predates strength_at
+                rows = conn.execute(
+                    "SELECT concept_a, concept_b, strength, NULL FROM concept_links"
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = []  # table not created yet
+        # concept_links has PRIMARY KEY (concept_a, concept_b): no dup rows
+        col_a = [r[0] for r in rows]
+        col_b = [r[1] for r in rows]
+        names = list(dict.fromkeys(col_a + col_b))
+        ids = {name: i for i, name in enumerate(names)}
+        n = len(rows)
+        ea = np.fromiter((ids[a] for a in col_a), dtype=np.int32, count=n)
+        eb = np.fromiter((ids[b] for b in col_b), dtype=np.int32, count=n)
+        ew = np.fromiter(
+            (0.5 if r[2] is None else r[2] for r in rows), dtype=np.float64, count=n,
+        )
+        et = np.fromiter(
+            (now if r[3] is None else r[3] for r in rows), dtype=np.float64, count=n,
+        )
+        edge_at = dict(zip(zip(ea.tolist(), eb.tolist()), range(n)))
+        ordered = sorted(names)
+        with self._lock:
+            self._names, self._ids, self._sorted = names, ids, ordered
+            self._ea, self._eb, self._ew, self._et = ea, eb, ew, et
+            self._edge_at = edge_at
+            self._indexed = np.zeros(n, dtype=bool)
+            self._n_edges = n
+            self._build_csr()
+            self.loaded_at = time.time()
+        return self
+
+    def _intern(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = len(self._names)
+            self._names.append(name)
+            self._ids[name] = i
+            bisect.insort(self._sorted, name)
+        return i
+
+    def _build_csr(self) -> None:
+        """CSR over both directions of every live edge."""
+        n_nodes = len(self._names)
+        live = np.nonzero(self._ew[: self._n_edges] != _DELETED)[0]
+        src = np.concatenate([self._ea[live], self._eb[live]])
+        dst = np.concatenate([self._eb[live], self._ea[live]])
+        eid = np.concatenate([live, live]).astype(np.int64)
+        self._indexed[:] = False
+        self._indexed[live] = True
+        order = np.argsort(src, kind="stable")
+        self._nbr = dst[order].astype(np.int32)
+        self._eid = eid[order]
+        counts = np.bincount(src, minlength=n_nodes)
+        self._indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._indptr[1:])
+        self._overlay = {}
+        self._overlay_edges = 0
+
+    # ── incremental updates ───────────────────────────────────────────
+
+    def set_edges(self, edges: Iterable[Tuple[str, str, float]]) -> None:
+        """Insert or overwrite (concept_a, concept_b, strength) edges.
+
+        ``strength`` is the value just written, so it is timestamped now.
+        Links are undirected: an edge already stored as (b, a) is updated
+        in place rather than duplicated.
+        """
+        now = time.time()
+        with self._lock:
+            for a, b, s in edges:
+                ia, ib = self._intern(a), self._intern(b)
+                k = self._edge_at.get((ia, ib))
+                if k is None:
+                    k = self._edge_at.get((ib, ia))
+                if k is None:
+                    k = self._append_edge(ia, ib)
+                self._ew[k] = float(s)
+                self._et[k] = now
+                if self._indexed[k]:
+                    continue  # strength is read through _eid at query time
+                self._indexed[k] = True
+                self._overlay.setdefault(ia, []).append(k)
+                self._overlay.setdefault(ib, []).append(k)
+                self._overlay_edges += 1
+            if self._overlay_edges > max(_OVERLAY_MAX, self._n_edges // 20):
+                self._build_csr()
+
+    def _append_edge(self, ia: int, ib: int) -> int:
+        k = self._n_edges
+        if k >= len(self._ew):
+            cap = max(1024, 2 * len(self._ew))
+            self._ea = np.resize(self._ea, cap)
+            self._eb = np.resize(self._eb, cap)
+            self._ew = np.resize(self._ew, cap)
+            self._et = np.resize(self._et, cap)
+            self._indexed = np.resize(self._indexed, cap)
+            self._indexed[k:] = False
+        self._ea[k], self._eb[k] = ia, ib
+        self._edge_at[(ia, ib)] = k
+        self._n_edges += 1
+        return k
+
+    def remove_edge(self, a: str, b: str) -> None:
+        """Tombstone the a–b link in either stored order."""
+        with self._lock:
+            ia, ib = self._ids.get(a), self._ids.get(b)
+            if ia is None or ib is None:
+                return
+            for key in ((ia, ib), (ib, ia)):
+                k = self._edge_at.get(key)
+                if k is not None:
+                    self._ew[k] = _DELETED
+
+    def scale(self, factor: float, min_strength: float = 0.0) -> None:
+        """Multiply every current strength by ``factor`` and drop those
+        below ``min_strength`` (``factor=1.0`` only prunes)."""
+        now = time.time()
+        with self._lock:
+            n = self._n_edges
+            w = self._ew[:n]
+            live = w != _DELETED
+            w[live] = self._live(np.nonzero(live)[0], now) * factor
+            self._et[:n][live] = now
+            w[live & (w < min_strength)] = _DELETED
+
+    def _live(self, eids: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """Decayed strengths of edges ``eids`` (tombstones stay _DELETED)."""
+        w = self._ew[eids]
+        age = (time.time() if now is None else now) - self._et[eids]
+        out = w * np.power(LINK_DECAY, np.maximum(age, 0.0) / LINK_DECAY_PERIOD_S)
+        out[w == _DELETED] = _DELETED
+        return out
+
+    # ── queries ───────────────────────────────────────────────────────
+
+    @property
+    def edge_count(self) -> int:
+        with self._lock:
+            return int(np.count_nonzero(self._ew[: self._n_edges] != _DELETED))
+
+    def summary(self) -> Dict[str, float]:
+        """Live links, ~concepts ((distinct a + distinct b) // 2), mean
+        current strength, and links at >= 0.7 both stored and decayed."""
+        with self._lock:
+            live = np.nonzero(self._ew[: self._n_edges] != _DELETED)[0]
+            w = self._live(live)
+            n_names = len(self._names)
+            distinct = sum(
+                int(np.count_nonzero(np.bincount(ends[live], minlength=n_names)))
+                for ends in (self._ea, self._eb)
+            )
+            return {
+                "links": int(len(live)),
+                "concepts": distinct // 2,
+                "avg_strength": float(w.mean()) if len(w) else 0.0,
+                "potentiated": int(np.count_nonzero((self._ew[live] >= 0.7) & (w >= 0.7))),
+            }
+
+    def _has_live_edge(self, i: int) -> bool:
+        """Node ``i`` still has an untombstoned edge (CSR or overlay)."""
+        if i + 1 < len(self._indptr):
+            eids = self._eid[self._indptr[i]:self._indptr[i + 1]]
+            if np.any(self._ew[eids] != _DELETED):
+                return True
+        return any(
+            self._ew[k] != _DELETED for k in self._overlay.get(i, ())
+        )
+
+    def concept_count(self) -> int:
+        """Distinct concepts with at least one live link."""
+        with self._lock:
+            live = np.nonzero(self._ew[: self._n_edges] != _DELETED)[0]
+            ends = np.concatenate([self._ea[live], self._eb[live]])
+            return int(np.count_nonzero(np.bincount(ends, minlength=len(self._names))))
+
+    def children(self, concept: str) -> List[str]:
+        """Concepts under ``concept.`` in dot notation (sorted-prefix scan).
+
+        Names stay in ``_sorted`` after their last link is removed or
+        pruned; only those with a live link are returned, as the SQL
+        ``LIKE`` over ``concept_links`` did.
+        """
+        with self._lock:
+            lo = bisect.bisect_left(self._sorted, concept + ".")
+            hi = bisect.bisect_left(self._sorted, concept + "/")  # '/' follows '.'
+            return [
+                name for name in self._sorted[lo:hi]
+                if self._has_live_edge(self._ids[name])
+            ]
+
+    def _gather(
+        self, rows: np.ndarray, threshold: float, fanout: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Top-``fanout`` neighbors (strength >= threshold) for each row.
+
+        Returns (row_position, neighbor_id, strength) arrays.
+        """
+        n_csr = len(self._indptr) - 1
+        in_csr = rows < n_csr
+        csr_pos = np.nonzero(in_csr)[0]
+        starts = self._indptr[rows[in_csr]]
+        lens = self._indptr[rows[in_csr] + 1] - starts
+        total = int(lens.sum())
+        if total:
+            offsets = np.repeat(starts - np.cumsum(lens) + lens, lens)
+            flat = offsets + np.arange(total)
+            pos = np.repeat(csr_pos, lens)
+            nbr = self._nbr[flat]
+            eid = self._eid[flat]
+        else:
+            pos = np.zeros(0, dtype=np.int64)
+            nbr = np.zeros(0, dtype=np.int32)
+            eid = np.zeros(0, dtype=np.int64)
+
+        if self._overlay:
+            o_pos, o_nbr, o_eid = [], [], []
+            for p, r in enumerate(rows.tolist()):
+                for k in self._overlay.get(r, ()):
+                    o_pos.append(p)
+                    o_nbr.append(int(self._eb[k]) if self._ea[k] == r else int(self._ea[k]))
+                    o_eid.append(k)
+            if o_pos:
+                pos = np.concatenate([pos, np.asarray(o_pos, dtype=np.int64)])
+                nbr = np.concatenate([nbr, np.asarray(o_nbr, dtype=np.int32)])
+                eid = np.concatenate([eid, np.asarray(o_eid, dtype=np.int64)])
+
+        w = self._live(eid)
+        keep = (w >= threshold) & (w != _DELETED)
+        pos, nbr, w = pos[keep], nbr[keep], w[keep]
+        if not len(pos):
+            return pos, nbr, w
+        # Rank within each row by strength desc; keep the first `fanout`
+        order = np.lexsort((-w, pos))
+        pos, nbr, w = pos[order], nbr[order], w[order]
+        first = np.r_[0, np.nonzero(np.diff(pos))[0] + 1]
+        group_start = np.repeat(first, np.diff(np.r_[first, len(pos)]))
+        rank = np.arange(len(pos)) - group_start
+        keep = rank < fanout
+        return pos[keep], nbr[keep], w[keep]
+
+    def neighbors(
+        self, concept: str, min_strength: float = 0.0, limit: int = FANOUT,
+    ) -> List[Tuple[str, float]]:
+        """Strongest neighbors of one concept, strength-descending."""
+        with self._lock:
+            i = self._ids.get(concept)
+            if i is None:
+                return []
+            _pos, nbr, w = self._gather(np.asarray([i]), min_strength, limit)
+            return [(self._names[n], float(s)) for n, s in zip(nbr.tolist(), w.tolist())]
+
+    def spread_step(
+        self,
+        activations: Dict[str, float],
+        factor: float,
+        min_strength: float = 0.0,
+        fanout: int = FANOUT,
+        floor: float = 0.0,
+    ) -> Tuple[Dict[str, float], int]:
+        """One hop of diffusion from many sources in a single gather.
+
+        Each source pushes ``factor * activation * strength`` along its
+        ``fanout`` strongest links (strength >= ``min_strength``); pushes
+        below ``floor`` and self-links are dropped. Returns the largest
+        push per target and the number of pushes kept.
+        """
+        with self._lock:
+            known = [c for c in activations if c in self._ids]
+            if not known:
+                return {}, 0
+            rows = np.asarray([self._ids[c] for c in known], dtype=np.int64)
+            act = np.asarray([activations[c] for c in known], dtype=np.float64)
+            pos, nbr, w = self._gather(rows, min_strength, fanout)
+            push = factor * act[pos] * w
+            keep = (push >= floor) & (nbr != rows[pos])
+            nbr, push = nbr[keep], push[keep]
+            if not len(nbr):
+                return {}, 0
+            order = np.lexsort((-push, nbr))
+            uniq, first = np.unique(nbr[order], return_index=True)
+            best = push[order][first]
+            names = self._names
+            return (
+                {names[i]: v for i, v in zip(uniq.tolist(), best.tolist())},
+                int(len(push)),
+            )
+
+    def spread(
+        self,
+        input_concepts: List[str],
+        threshold: float = 0.1,
+        max_hops: int = 1,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Multi-hop spread activation; same contract as schema.spread_activate.
+
+        Activation of a node is the best product of link strengths over
+        paths of up to ``max_hops`` hops, following at most FANOUT
+        strongest links per node and pruning partial products below
+        ``threshold``. Dot-notation children of the inputs get 0.8.
+        """
+        with self._lock:
+            known = [self._ids[c] for c in dict.fromkeys(input_concepts) if c in self._ids]
+            hop_ids = [np.asarray(known, dtype=np.int64)]
+            hop_act = [np.ones(len(known))]
+            hop_parent = [np.full(len(known), -1, dtype=np.int64)]
+
+            for _hop in range(max_hops):
+                frontier, act = hop_ids[-1], hop_act[-1]
+                if not len(frontier):
+                    break
+                pos, nbr, w = self._gather(frontier, threshold, FANOUT)
+                val = act[pos] * w
+                ok = val >= threshold
+                pos, nbr, val = pos[ok], nbr[ok], val[ok]
+                if not len(nbr):
+                    break
+                # Best incoming value per target node
+                order = np.lexsort((-val, nbr))
+                nbr, val, pos = nbr[order], val[order], pos[order]
+                uniq, first = np.unique(nbr, return_index=True)
+                hop_ids.append(uniq.astype(np.int64))
+                hop_act.append(val[first])
+                hop_parent.append(frontier[pos[first]])
+
+            # Merge hops: max activation per node, earliest hop on ties
+            ids = np.concatenate(hop_ids)
+            acts = np.concatenate(hop_act)
+            hops = np.concatenate([np.full(len(h), n) for n, h in enumerate(hop_ids)])
+            order = np.lexsort((hops, -acts, ids))
+            ids, acts, hops = ids[order], acts[order], hops[order]
+            ids, first = np.unique(ids, return_index=True)
+            acts, hops = acts[first], hops[first]
+
+            # Hierarchical children (sarah → sarah.likes.*) — first parent wins
+            child_paths: Dict[int, List[str]] = {}
+            extra: List[int] = []
+            for concept in input_concepts:
+                for child in self.children(concept):
+                    c = self._ids[child]
+                    if c in child_paths:
+                        continue
+                    k = int(np.searchsorted(ids, c))
+                    if k < len(ids) and ids[k] == c:
+                        if acts[k] >= CHILD_ACTIVATION:
+                            continue
+                        acts[k] = CHILD_ACTIVATION
+                    else:
+                        extra.append(c)
+                    child_paths[c] = [concept, child]
+            if extra:
+                ids = np.concatenate([ids, np.asarray(extra, dtype=np.int64)])
+                acts = np.concatenate([acts, np.full(len(extra), CHILD_ACTIVATION)])
+                hops = np.concatenate([hops, np.zeros(len(extra), dtype=hops.dtype)])
+
+            input_ids = [self._ids[c] for c in input_concepts if c in self._ids]
+            keep = ~np.isin(ids, input_ids)
+            ids, acts, hops = ids[keep], acts[keep], hops[keep]
+            top = np.argsort(-acts, kind="stable")[:limit]
+            ids, acts, hops = ids[top], acts[top], hops[top]
+
+            paths = self._trace(ids, hops, hop_ids, hop_parent)
+            names = self._names
+            return [
+                {
+                    "concept": names[i],
+                    "activation": a,
+                    "path": child_paths.get(i) or path,
+                }
+                for i, a, path in zip(ids.tolist(), acts.tolist(), paths)
+            ]
+
+    def _trace(
+        self,
+        ids: np.ndarray,
+        hops: np.ndarray,
+        hop_ids: List[np.ndarray],
+        hop_parent: List[np.ndarray],
+    ) -> List[List[str]]:
+        """Walk parent pointers back from each (node, hop) to an input."""
+        max_hop = len(hop_ids) - 1
+        origin = hops.tolist()
+        nodes, hops = ids.copy(), hops.copy()
+        # steps[t] = node positions after t back-steps (hop max_hop-t+1 resolved)
+        steps = [nodes.tolist()]
+        for h in range(max_hop, 0, -1):
+            m = hops == h
+            if m.any():
+                nodes = nodes.copy()
+                nodes[m] = hop_parent[h][np.searchsorted(hop_ids[h], nodes[m])]
+                hops[m] -= 1
+            steps.append(nodes.tolist())
+        names = self._names
+        paths = []
+        for n, h in enumerate(origin):
+            chain = [steps[0][n]] + [steps[t][n] for t in range(max_hop - h + 1, max_hop + 1)]
+            paths.append([names[i] for i in reversed(chain)])
+        return paths
+
+
+# ── process-wide instances (one per DB path) ─────────────────────────
+
+_GRAPHS: Dict[str, ConceptGraph] = {}
+_LOCK = RLock()
+
+
+def get_concept_graph() -> ConceptGraph:
+    """Cached graph for the active DB, (re)loaded on first use or after TTL."""
+    from data.db import get_connection, get_db_path
+
+    key = str(get_db_path())
+    with _LOCK:
+        graph = _GRAPHS.get(key)
+        if graph is None:
+            graph = ConceptGraph()
+            with closing(get_connection(readonly=True)) as conn:
+                graph.load(conn)
+            _GRAPHS[key] = graph
+            return graph
+        stale = time.time() - graph.loaded_at > _TTL
+        if stale:
+            graph.loaded_at = time.time()  # one caller reloads; others keep going
+    if stale:
+        with closing(get_connection(readonly=True)) as conn:
+            graph.load(conn)
+    return graph
+
+
+def loaded_concept_graph() -> Optional[ConceptGraph]:
+    """The active DB's graph if one is loaded, without triggering a load.
+
+    Write paths use this so updates never pay for a full snapshot.
+    """
+    from data.db import get_db_path
+    return _GRAPHS.get(str(get_db_path()))
+
+
+def invalidate_concept_graph() -> None:
+    """Drop cached graphs — call after bulk writes to concept_links."""
+    with _LOCK:
+        _GRAPHS.clear()
+
+
+__all__ = [
+    "ConceptGraph",
+    "get_concept_graph",
+    "loaded_concept_graph",
+    "invalidate_concept_graph",
+]
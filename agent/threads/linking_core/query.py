@@ -0,0 +1,129 @@
+"""
+Per-turn query analysis, shared by scoring and STATE assembly.
+
+One `build_state` used to extract concepts from the query and run
+`spread_activate` separately in every adapter that wanted relevance
+(`_budget_fill`, `_relevance_boost`, `score_threads`, workspace re-rank…),
+each with its own limit.  `QueryAnalysis` does that work once per turn:
+
+    concepts    – extract_concepts_from_text(query)
+    activated   – 1-hop spread from those concepts, widest limit any caller uses
+    tokens      – lowercase literal tokens (stopwords removed)
+    embedding   – query embedding, fetched lazily on first access
+
+The orchestrator computes it in `score()` and installs it with
+`use_query_analysis()` for the rest of the turn.  Callers ask for it with
+`get_query_analysis(query)`, which returns the installed analysis when the
+query matches and a fresh one otherwise, so helpers behave the same when
+called outside a turn.  Narrower views (`activations(threshold, limit)`,
+`relevant(...)`) are prefixes of the shared spread, which is what a
+separate 1-hop `spread_activate` call with those arguments would return.
+
+Set AIOS_SHARED_QUERY_ANALYSIS=0 to ignore the installed analysis (every
+caller recomputes, the old behaviour).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+# Widest 1-hop spread any consumer asks for (workspace FTS re-rank)
+SPREAD_THRESHOLD = 0.1
+SPREAD_LIMIT = 30
+
+SHARED = os.getenv("AIOS_SHARED_QUERY_ANALYSIS", "1") != "0"
+
+_STOPWORDS = frozenset({
+    "the", "and", "for", "what", "who", "how", "does", "are", "was", "they",
+    "this", "that", "with", "from", "into", "run", "work", "you", "your",
+    "have", "has",
+})
+_TOKEN_RE = re.compile(r"\b[a-z][a-z0-9]{2,}\b")
+
+_UNSET = object()
+
+
+@dataclass
+class QueryAnalysis:
+    """Everything relevance code derives from the query text alone."""
+    query: str
+    concepts: List[str] = field(default_factory=list)
+    activated: List[Dict[str, Any]] = field(default_factory=list)
+    tokens: Set[str] = field(default_factory=set)
+    _embedding: Any = field(default=_UNSET, repr=False)
+
+    def activations(
+        self, threshold: float = SPREAD_THRESHOLD, limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """spread_activate(concepts, threshold, max_hops=1, limit) results."""
+        return [a for a in self.activated if a["activation"] >= threshold][:limit]
+
+    def relevant(self, threshold: float = SPREAD_THRESHOLD, limit: int = 20) -> Set[str]:
+        """Query concepts plus their activated neighbours."""
+        out = set(self.concepts)
+        out.update(a.get("concept", "") for a in self.activations(threshold, limit))
+        return out
+
+    @property
+    def embedding(self):
+        """Query embedding (numpy array) or None when embeddings are unavailable."""
+        if self._embedding is _UNSET:
+            try:
+                from .scoring import get_embedding
+                self._embedding = get_embedding(self.query) if self.query else None
+            except Exception:
+                self._embedding = None
+        return self._embedding
+
+
+def analyze_query(query: str) -> QueryAnalysis:
+    """Run concept extraction and one spread for ``query``."""
+    from . import schema
+
+    analysis = QueryAnalysis(query=query or "")
+    if not query:
+        return analysis
+    analysis.tokens = {t for t in _TOKEN_RE.findall(query.lower()) if t not in _STOPWORDS}
+    try:
+        analysis.concepts = schema.extract_concepts_from_text(query)
+        if analysis.concepts:
+            analysis.activated = schema.spread_activate(
+                analysis.concepts,
+                activation_threshold=SPREAD_THRESHOLD,
+                max_hops=1,
+                limit=SPREAD_LIMIT,
+            )
+    except Exception:
+        pass
+    return analysis
+
+
+_CURRENT: ContextVar[Optional[QueryAnalysis]] = ContextVar("query_analysis", default=None)
+
+
+def current_query_analysis() -> Optional[QueryAnalysis]:
+    """The analysis installed for this turn, if any."""
+    return _CURRENT.get() if SHARED else None
+
+
+def get_query_analysis(query: str) -> QueryAnalysis:
+    """This turn's analysis when it is for ``query``, else a fresh one."""
+    current = current_query_analysis()
+    if current is not None and current.query == (query or ""):
+        return current
+    return analyze_query(query)
+
+
+@contextmanager
+def use_query_analysis(analysis: Optional[QueryAnalysis]) -> Iterator[Optional[QueryAnalysis]]:
+    """Install ``analysis`` for code running in this context."""
+    token = _CURRENT.set(analysis)
+    try:
+        yield analysis
+    finally:
+        _CURRENT.reset(token)
@@ -11,9 +11,9 @@ This is SELF-CONTAINED - all concept graph operations are defined here.
 
 import sqlite3
 import re
-import math
+import time
 from contextlib import closing
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -21,7 +21,14 @@ from datetime import datetime, timezone
 # Database Connection
 # ─────────────────────────────────────────────────────────────
 
-from data.db import get_connection
+from data.db import get_connection, writer
+
+from .cooccurrence import cooccurrence_scores, note_pairs
+from .graph import LINK_DECAY, LINK_DECAY_PERIOD_S, loaded_concept_graph
+
+# concept_links stores strength as of strength_at (unix seconds); readers
+# see it decayed to now. Same curve as ConceptGraph.
+STRENGTH_SQL = f"decayed(strength, strength_at, {LINK_DECAY!r}, {LINK_DECAY_PERIOD_S!r})"
 
 
 # ─────────────────────────────────────────────────────────────
@@ -50,6 +57,7 @@ def init_concept_links_table(conn: Optional[sqlite3.Connection] = None) -> None:
             last_fired TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             potentiation TEXT DEFAULT 'SHORT',
+            strength_at REAL DEFAULT ((julianday('now') - 2440587.5) * 86400.0),
             PRIMARY KEY (concept_a, concept_b)
         )
     """)
@@ -59,6 +67,32 @@ def init_concept_links_table(conn: Optional[sqlite3.Connection] = None) -> None:
         cur.execute("ALTER TABLE concept_links ADD COLUMN potentiation TEXT DEFAULT 'SHORT'")
     except sqlite3.OperationalError:
         pass  # Column already exists
+    # Lazy decay: strengths are stored as of strength_at.  ADD COLUMN
+    # can't take the CREATE TABLE's julianday('now') default, so migrated
+    # tables get a trigger stamping rows inserted without one (a NULL
+    # strength_at would never decay).  Existing strengths were kept
+    # current by the old in-place decay pass, so they count as of now;
+    # the backfill runs once, with the trigger, and also catches rows an
+    # older process wrote after the column was added.
+    try:
+        cur.execute("ALTER TABLE concept_links ADD COLUMN strength_at REAL")
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+    if cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_concept_links_strength_at'"
+    ).fetchone() is None:
+        cur.execute("""
+            CREATE TRIGGER trg_concept_links_strength_at
+            AFTER INSERT ON concept_links WHEN NEW.strength_at IS NULL
+            BEGIN
+                UPDATE concept_links
+                SET strength_at = (julianday('now') - 2440587.5) * 86400.0
+                WHERE rowid = NEW.rowid;
+            END
+        """)
+        cur.execute(
+            "UPDATE concept_links SET strength_at = ? WHERE strength_at IS NULL", (time.time(),)
+        )
     
     # Indexes for fast spread activation queries
     cur.execute("CREATE INDEX IF NOT EXISTS idx_concept_a ON concept_links(concept_a)")
@@ -86,6 +120,8 @@ def init_cooccurrence_table(conn: Optional[sqlite3.Connection] = None) -> None:
             PRIMARY KEY (key_a, key_b)
         )
     """)
+    # key_b side of the per-namespace loads in cooccurrence.py
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_cooccurrence_b ON key_cooccurrence(key_b)")
     
     if own_conn:
         conn.commit()
@@ -96,71 +132,135 @@ def init_cooccurrence_table(conn: Optional[sqlite3.Connection] = None) -> None:
 # Concept Linking (Hebbian Learning)
 # ─────────────────────────────────────────────────────────────
 
+_LINK_UPSERT_SQL = f"""
+    INSERT INTO concept_links (concept_a, concept_b, strength, fire_count, strength_at)
+    VALUES (?, ?, ?, 1, ?)
+    ON CONFLICT(concept_a, concept_b) DO UPDATE SET
+        strength = {STRENGTH_SQL} + (1.0 - {STRENGTH_SQL}) * excluded.strength,
+        strength_at = excluded.strength_at,
+        fire_count = fire_count + 1,
+        last_fired = CURRENT_TIMESTAMP
+    RETURNING strength, fire_count
+"""
+
+
+def _apply_link_updates(
+    conn: sqlite3.Connection,
+    pairs: Iterable[Tuple[Any, ...]],
+    learning_rate: float,
+) -> List[Tuple[str, str, float, int]]:
+    """
+    Apply the Hebbian upsert for each pair on ``conn`` (no commit).
+
+    A new link starts at its learning rate (carried in ``excluded.strength``);
+    an existing one moves its decayed strength asymptotically toward 1.0
+    and is re-stamped ``strength_at`` = now. Pairs are applied in
+    order, so a pair repeated in the batch is reinforced once per repeat,
+    exactly as sequential link_concepts() calls would.
+
+    Returns (concept_a, concept_b, new_strength, fire_count) per applied pair.
+    """
+    cur = conn.cursor()
+    now = time.time()
+    applied = []
+    for pair in pairs:
+        a, b = pair[0], pair[1]
+        if not a or not b:
+            continue
+        lr = pair[2] if len(pair) > 2 else learning_rate
+        # Canonical ordering for consistency
+        if a > b:
+            a, b = b, a
+        strength, fire_count = cur.execute(_LINK_UPSERT_SQL, (a, b, lr, now)).fetchone()
+        applied.append((a, b, strength, fire_count))
+    return applied
+
+
+def _graph_set_edges(applied: Iterable[Tuple[Any, ...]]) -> None:
+    """Mirror committed (concept_a, concept_b, strength, ...) rows into the
+    in-memory graph, if one is loaded for this DB."""
+    graph = loaded_concept_graph()
+    if graph is not None:
+        graph.set_edges((row[0], row[1], row[2]) for row in applied)
+
+
 def link_concepts(concept_a: str, concept_b: str, learning_rate: float = 0.1) -> float:
     """
     Strengthen the link between two concepts (Hebbian learning).
     
     strength += (1 - strength) * learning_rate
     
-    Returns the new strength.
+    Returns the new strength. For more than one pair use
+    link_concepts_batch(), which shares a single transaction.
     """
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
+    with writer() as conn:
         init_concept_links_table(conn)
-        
-        # Canonical ordering for consistency
-        if concept_a > concept_b:
-            concept_a, concept_b = concept_b, concept_a
-        
-        # Check existing
-        cur.execute("""
-            SELECT strength, fire_count FROM concept_links 
-            WHERE concept_a = ? AND concept_b = ?
-        """, (concept_a, concept_b))
-        row = cur.fetchone()
-        
-        if row:
-            old_strength = row[0]
-            fire_count = row[1]
-            # Hebbian update: asymptotic approach to 1.0
-            new_strength = old_strength + (1.0 - old_strength) * learning_rate
-            cur.execute("""
-                UPDATE concept_links 
-                SET strength = ?, fire_count = ?, last_fired = CURRENT_TIMESTAMP
-                WHERE concept_a = ? AND concept_b = ?
-            """, (new_strength, fire_count + 1, concept_a, concept_b))
-        else:
-            # New link starts at learning_rate
-            new_strength = learning_rate
-            cur.execute("""
-                INSERT INTO concept_links (concept_a, concept_b, strength, fire_count)
-                VALUES (?, ?, ?, 1)
-            """, (concept_a, concept_b, new_strength))
-        
-        conn.commit()
-    return new_strength
+        applied = _apply_link_updates(conn, [(concept_a, concept_b)], learning_rate)
+    _graph_set_edges(applied)
+    return applied[0][2] if applied else 0.0
 
 
-def decay_concept_links(decay_rate: float = 0.95, min_strength: float = 0.05) -> int:
+def link_concepts_batch(
+    pairs: Iterable[Tuple[Any, ...]],
+    learning_rate: float = 0.1,
+) -> Dict[str, int]:
     """
-    Apply decay to all concept links.
+    Strengthen many concept links in one transaction.
     
-    Run periodically (e.g., daily) to let old associations fade.
-    Links below min_strength are pruned.
+    Args:
+        pairs: (concept_a, concept_b) tuples, or (concept_a, concept_b, lr)
+            to override learning_rate for that pair. Order is normalised.
+        learning_rate: Default Hebbian rate for pairs without their own.
+    
+    Returns:
+        {"linked": pairs applied, "created": new links, "strengthened": existing}
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return {"linked": 0, "created": 0, "strengthened": 0}
+    with writer() as conn:
+        init_concept_links_table(conn)
+        applied = _apply_link_updates(conn, pairs, learning_rate)
+    _graph_set_edges(applied)
+    created = sum(1 for _a, _b, _s, fires in applied if fires == 1)
+    return {
+        "linked": len(applied),
+        "created": created,
+        "strengthened": len(applied) - created,
+    }
+
+
+def decay_concept_links(
+    decay_rate: Optional[float] = None, min_strength: float = 0.05,
+) -> int:
+    """
+    Prune concept links whose decayed strength fell below min_strength.
+    
+    Decay itself is lazy: every reader sees strength * LINK_DECAY **
+    (age / LINK_DECAY_PERIOD_S) (SQL ``decayed()``, ConceptGraph), so
+    nothing has to rewrite the table for links to fade. This pass only
+    deletes the rows under the threshold.
+    
+    Args:
+        decay_rate: Optional extra one-off factor applied now on top of the
+            lazy decay. This rewrites every row — manual use only.
+        min_strength: Prune threshold on the current strength.
     
     Returns number of links pruned.
     """
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        
-        # Decay all links
-        cur.execute("UPDATE concept_links SET strength = strength * ?", (decay_rate,))
-        
-        # Prune weak links
-        cur.execute("DELETE FROM concept_links WHERE strength < ?", (min_strength,))
-        pruned = cur.rowcount
-        
-        conn.commit()
+    with writer() as conn:
+        init_concept_links_table(conn)
+        if decay_rate is not None:
+            conn.execute(
+                f"UPDATE concept_links SET strength = {STRENGTH_SQL} * ?, strength_at = ?",
+                (decay_rate, time.time()),
+            )
+        pruned = conn.execute(
+            f"DELETE FROM concept_links WHERE {STRENGTH_SQL} < ?", (min_strength,),
+        ).rowcount
+    graph = loaded_concept_graph()
+    if graph is not None:
+        graph.scale(1.0 if decay_rate is None else decay_rate, min_strength)
     return pruned
 
 
@@ -190,7 +290,8 @@ def consolidate_links(fire_threshold: int = 5, strength_threshold: float = 0.5)
             WHERE potentiation = 'SHORT' 
               AND fire_count >= ? 
               AND strength >= ?
-        """, (fire_threshold, strength_threshold))
+              AND {STRENGTH_SQL} >= ?
+        """.format(STRENGTH_SQL=STRENGTH_SQL), (fire_threshold, strength_threshold, strength_threshold))
         promoted = cur.rowcount
         
         # Count totals
@@ -218,11 +319,11 @@ def get_long_links(limit: int = 500) -> List[Dict[str, Any]]:
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
-        cur.execute("""
-            SELECT concept_a, concept_b, strength, fire_count, last_fired, created_at
+        cur.execute(f"""
+            SELECT concept_a, concept_b, {STRENGTH_SQL} AS live, fire_count, last_fired, created_at
             FROM concept_links
             WHERE potentiation = 'LONG'
-            ORDER BY strength DESC, fire_count DESC
+            ORDER BY live DESC, fire_count DESC
             LIMIT ?
         """, (limit,))
         
@@ -246,8 +347,8 @@ def get_potentiation_stats() -> Dict[str, Any]:
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
-        cur.execute("""
-            SELECT potentiation, COUNT(*), AVG(strength), AVG(fire_count)
+        cur.execute(f"""
+            SELECT potentiation, COUNT(*), AVG({STRENGTH_SQL}), AVG(fire_count)
             FROM concept_links
             GROUP BY potentiation
         """)
@@ -279,6 +380,11 @@ def spread_activate(
     """
     Spread activation from input concepts to find related concepts.
     
+    Runs on the process-wide in-memory graph (see graph.py): each hop
+    follows the 20 strongest links above threshold from every frontier
+    node, activation diminishing by link strength per hop; dot-notation
+    children of the inputs get 0.8.
+    
     Args:
         input_concepts: List of concepts extracted from user input
         activation_threshold: Minimum link strength to follow
@@ -288,6 +394,28 @@ def spread_activate(
     Returns:
         List of {concept, activation, path} sorted by activation descending
     """
+    from .graph import get_concept_graph
+    return get_concept_graph().spread(
+        input_concepts,
+        threshold=activation_threshold,
+        max_hops=max_hops,
+        limit=limit,
+    )
+
+
+def _spread_activate_sql(
+    input_concepts: List[str],
+    activation_threshold: float = 0.1,
+    max_hops: int = 1,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Reference implementation of spread_activate against SQLite.
+    
+    One UNION query per frontier node per hop plus a LIKE scan per input
+    for hierarchical children. Kept for benchmarks and equivalence tests;
+    the live path runs on the in-memory ConceptGraph.
+    """
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
@@ -311,13 +439,13 @@ def spread_activate(
                 
                 if hop < max_hops:
                     # Find linked concepts
-                    cur.execute("""
-                        SELECT concept_b, strength FROM concept_links 
-                        WHERE concept_a = ? AND strength >= ?
+                    cur.execute(f"""
+                        SELECT concept_b, {STRENGTH_SQL} AS live FROM concept_links 
+                        WHERE concept_a = ? AND {STRENGTH_SQL} >= ?
                         UNION
-                        SELECT concept_a, strength FROM concept_links 
-                        WHERE concept_b = ? AND strength >= ?
-                        ORDER BY strength DESC
+                        SELECT concept_a, {STRENGTH_SQL} AS live FROM concept_links 
+                        WHERE concept_b = ? AND {STRENGTH_SQL} >= ?
+                        ORDER BY live DESC
                         LIMIT 20
                     """, (concept, activation_threshold, concept, activation_threshold))
                     
@@ -361,130 +489,15 @@ def spread_activate(
 # Concept Extraction
 # ─────────────────────────────────────────────────────────────
 
-# Cached registry of known entities.  Populated once per process from DB.
-_entity_registry: Optional[Dict[str, List[str]]] = None  # token → [entity_name, ...]
-_entity_names: Optional[set] = None                       # full canonical names
-
-
-def _build_entity_registry() -> Tuple[Dict[str, List[str]], set]:
-    """
-    Build a lookup from tokens → entity names.
-
-    Sources of truth (anything with a weighted row):
-      - profile_facts.key   (e.g. "deployment_status", "user.preferences.likes_coffee")
-      - profiles.profile_id (e.g. "primary_user", "family.mom")
-      - profiles.display_name (e.g. "Betsy", "John Doe")
-      - form_tools.name     (e.g. "search_web")
-
-    Each entity name is split on '.' and '_' into tokens.
-    The full name is also kept as its own token so exact matches work.
-    """
-    token_map: Dict[str, List[str]] = {}
-    names: set = set()
-
-    with closing(get_connection(readonly=True)) as conn:
-        # Fact keys
-        rows = conn.execute("SELECT DISTINCT key FROM profile_facts").fetchall()
-        for (key,) in rows:
-            names.add(key)
-
-        # Philosophy stance keys (parallel first-class thread)
-        try:
-            rows = conn.execute(
-                "SELECT DISTINCT key FROM philosophy_profile_facts"
-            ).fetchall()
-            for (key,) in rows:
-                names.add(key)
-        except Exception:
-            pass  # table may not exist yet
-
-        # Profiles
-        rows = conn.execute("SELECT profile_id, display_name FROM profiles").fetchall()
-        for pid, dname in rows:
-            names.add(pid)
-            if dname:
-                names.add(dname.lower())
-
-        # Tools
-        try:
-            rows = conn.execute("SELECT name FROM form_tools WHERE enabled = 1").fetchall()
-            for (tname,) in rows:
-                names.add(tname)
-        except Exception:
-            pass  # table may not exist yet
-
-    # Build token → entity_name mapping
-    for name in names:
-        # Tokenise: "user.preferences.likes_coffee" → ["user","preferences","likes","coffee"]
-        tokens = re.split(r'[._\s]+', name.lower())
-        # Min length 3 (kills 'do', 'me', 'we', 'us' etc.) and reject
-        # noise tokens at registry-build time. Without this filter, a
-        # key like 'constraint.do_not_match_performance' would index
-        # 'do' and 'not' as triggers for that entity, so any query
-        # containing the word 'do' would falsely activate the
-        # constraint. We still keep the FULL key as an entity, just
-        # don't make English stopwords a backdoor into it.
-        tokens = [t for t in tokens if len(t) >= 3 and t not in _NOISE_TOKENS]
-
-        # Full name is also a token (for exact matching)
-        for token in tokens:
-            token_map.setdefault(token, [])
-            if name not in token_map[token]:
-                token_map[token].append(name)
-
-    return token_map, names
-
-
-def _get_entity_registry() -> Tuple[Dict[str, List[str]], set]:
-    """Return cached registry, building it on first call."""
-    global _entity_registry, _entity_names
-    if _entity_registry is None:
-        _entity_registry, _entity_names = _build_entity_registry()
-    return _entity_registry, _entity_names
-
+# Known entities (fact keys, stance keys, profiles, tools) are matched by
+# entity_matcher: built once per DB, then kept current from a trigger-fed
+# change log, so new facts/tools/profiles show up without a rebuild.
 
 def invalidate_entity_registry() -> None:
-    """Force rebuild on next extraction (call after adding facts/tools/profiles)."""
-    global _entity_registry, _entity_names
-    _entity_registry = None
-    _entity_names = None
-
-
-# Tokens too generic to trigger entity matching on their own.
-# Two roles: (1) skipped during query extraction, (2) skipped during
-# registry build so compound keys can't index English stopwords as
-# triggers. Anything that's a real entity (jake, betsy, sarah, etc.)
-# must NOT be in this set.
-_NOISE_TOKENS = {
-    # generic schema words
-    'user', 'general', 'preference', 'preferences', 'action', 'identity',
-    'process', 'system', 'assistant', 'information', 'query', 'goal',
-    'project', 'type', 'status', 'name', 'value', 'data', 'method',
-    'source', 'level', 'meta', 'item', 'items', 'thing', 'things',
-    'note', 'notes', 'detail', 'details', 'context', 'state',
-    # articles / prepositions / conjunctions
-    'the', 'and', 'for', 'but', 'nor', 'yet', 'with', 'from', 'into',
-    'onto', 'upon', 'over', 'under', 'about', 'around', 'between',
-    'through', 'against', 'before', 'after', 'during', 'within',
-    # be / aux verbs
-    'are', 'was', 'were', 'been', 'being', 'have', 'has', 'had', 'having',
-    'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might',
-    'must', 'does', 'did', 'doing',
-    # pronouns
-    'you', 'your', 'yours', 'they', 'them', 'their', 'theirs',
-    'his', 'her', 'hers', 'him', 'who', 'whom', 'whose', 'which',
-    'this', 'that', 'these', 'those', 'what', 'whatever',
-    'when', 'where', 'why', 'how', 'whenever', 'wherever',
-    # generic verbs from conversation
-    'know', 'knows', 'knew', 'tell', 'tells', 'told', 'say', 'says', 'said',
-    'show', 'shows', 'showed', 'get', 'got', 'make', 'made', 'use', 'used',
-    'using', 'see', 'saw', 'seen', 'look', 'looking', 'think', 'thought',
-    'happened', 'happening', 'happen', 'actually', 'really',
-    # negation / common adverbs
-    'not', 'never', 'always', 'often', 'sometimes', 'maybe',
-    # connecting words leftover
-    'just', 'only', 'also', 'still', 'then', 'than',
-}
+    """Force a full rebuild on next extraction (normally not needed: adds
+    and removes in the source tables are picked up incrementally)."""
+    from .entity_matcher import invalidate_entities
+    invalidate_entities()
 
 
 def extract_concepts_from_text(text: str) -> List[str]:
@@ -499,23 +512,18 @@ def extract_concepts_from_text(text: str) -> List[str]:
         text mentions "deployment" → returns ['deployment_status']
         text mentions "Betsy" → returns ['betsy', 'family.mom']
     """
-    token_map, entity_names = _get_entity_registry()
-    if not token_map:
-        return []
+    return extract_concepts_batch([text])[0]
 
-    text_lower = text.lower()
-    text_words = set(re.findall(r'\b[a-z][a-z0-9]{1,}\b', text_lower))
 
-    matched: set = set()
-
-    for word in text_words:
-        if word in _NOISE_TOKENS:
-            continue
-        if word in token_map:
-            for entity_name in token_map[word]:
-                matched.add(entity_name)
+def extract_concepts_batch(texts: List[str]) -> List[List[str]]:
+    """
+    ``extract_concepts_from_text`` for many texts at once.
 
-    return list(matched)
+    One matcher refresh and lock for the whole batch — use it wherever
+    texts are processed in a loop (meditation, backfills, reindexing).
+    """
+    from .entity_matcher import extract_entities_batch
+    return extract_entities_batch(texts)
 
 
 def extract_concepts_from_value(value: str) -> List[str]:
@@ -537,51 +545,14 @@ def get_cooccurrence_score(key: str, context_keys: List[str]) -> float:
     
     Returns a value 0.0 - 0.3 based on how often this key
     has appeared with the context keys in past conversations.
+    Scoring many keys? Use ``cooccurrence_scores`` — one call for all.
     """
-    if not context_keys:
-        return 0.0
-    
-    with closing(get_connection(readonly=True)) as conn:
-        cur = conn.cursor()
-        init_cooccurrence_table(conn)
-        
-        total_boost = 0.0
-        
-        for ctx_key in context_keys:
-            # Check both orderings
-            a, b = (key, ctx_key) if key < ctx_key else (ctx_key, key)
-            
-            cur.execute("""
-                SELECT count FROM key_cooccurrence
-                WHERE key_a = ? AND key_b = ?
-            """, (a, b))
-            
-            row = cur.fetchone()
-            if row:
-                count = row[0]
-                boost = min(math.log(count + 1) * 0.03, 0.15)
-                total_boost += boost
-    
-    return min(total_boost, 0.3)
+    return cooccurrence_scores([key], context_keys)[0]
 
 
 def record_cooccurrence(key_a: str, key_b: str) -> None:
     """Record that two keys appeared together in a conversation."""
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        init_cooccurrence_table(conn)
-        
-        # Canonical ordering
-        if key_a > key_b:
-            key_a, key_b = key_b, key_a
-        
-        cur.execute("""
-            INSERT INTO key_cooccurrence (key_a, key_b, count)
-            VALUES (?, ?, 1)
-            ON CONFLICT(key_a, key_b) DO UPDATE SET 
-                count = count + 1,
-                last_seen = CURRENT_TIMESTAMP
-        """, (key_a, key_b))
+    record_cooccurrence_batch([(key_a, key_b)])
 
 
 def record_cooccurrence_batch(pairs):
@@ -620,6 +591,7 @@ def record_cooccurrence_batch(pairs):
             canonical,
         )
         conn.commit()
+    note_pairs(canonical)
     return len(canonical)
 
 
@@ -632,14 +604,12 @@ def record_concept_cooccurrence(concepts: List[str], learning_rate: float = 0.1)
         return 0
     
     unique = list(set(concepts))
-    count = 0
-    
-    for i, a in enumerate(unique):
-        for b in unique[i+1:]:
-            link_concepts(a, b, learning_rate)
-            count += 1
-    
-    return count
+    pairs = [
+        (a, b)
+        for i, a in enumerate(unique)
+        for b in unique[i+1:]
+    ]
+    return link_concepts_batch(pairs, learning_rate)["linked"]
 
 
 def extract_and_record_conversation_concepts(
@@ -665,34 +635,49 @@ def extract_and_record_conversation_concepts(
     Returns:
         {"concepts": [...], "links_created": int, "turn_count": int}
     """
-    # Build aggregate text from all turns
+    return extract_and_record_conversations_concepts([turns], learning_rate)[0]
+
+
+def extract_and_record_conversations_concepts(
+    conversations: List[List[Dict[str, str]]],
+    learning_rate: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """
+    ``extract_and_record_conversation_concepts`` for many conversations:
+    concepts for all of them come from one extraction batch.  Returns
+    one result dict per conversation, in order.
+    """
+    aggregates = [_conversation_text(turns) for turns in conversations]
+    extracted = iter(extract_concepts_batch([a for a in aggregates if a]))
+    results: List[Dict[str, Any]] = []
+    for turns, aggregate in zip(conversations, aggregates):
+        if not aggregate:
+            results.append({"concepts": [], "links_created": 0, "turn_count": 0})
+            continue
+        concepts = next(extracted)
+        # Cap at 60 concepts to keep O(n²) manageable
+        if len(concepts) > 60:
+            # Prefer concepts by frequency in the text
+            text_lower = aggregate.lower()
+            concepts.sort(key=lambda c: text_lower.count(c), reverse=True)
+            concepts = concepts[:60]
+        results.append({
+            "concepts": concepts,
+            "links_created": record_concept_cooccurrence(concepts, learning_rate=learning_rate),
+            "turn_count": len(turns),
+        })
+    return results
+
+
+def _conversation_text(turns: List[Dict[str, str]]) -> str:
+    """All user and assistant messages of a conversation, space-joined."""
     chunks: List[str] = []
     for turn in turns:
         if turn.get("user"):
             chunks.append(turn["user"])
         if turn.get("assistant"):
             chunks.append(turn["assistant"])
-
-    if not chunks:
-        return {"concepts": [], "links_created": 0, "turn_count": 0}
-
-    aggregate = " ".join(chunks)
-    concepts = extract_concepts_from_text(aggregate)
-
-    # Cap at 60 concepts to keep O(n²) manageable
-    if len(concepts) > 60:
-        # Prefer concepts by frequency in the text
-        text_lower = aggregate.lower()
-        concepts.sort(key=lambda c: text_lower.count(c), reverse=True)
-        concepts = concepts[:60]
-
-    links_created = record_concept_cooccurrence(concepts, learning_rate=learning_rate)
-
-    return {
-        "concepts": concepts,
-        "links_created": links_created,
-        "turn_count": len(turns),
-    }
+    return " ".join(chunks)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -771,40 +756,59 @@ def index_key_in_concept_graph(key: str, value: str, learning_rate: float = 0.15
                 When provided, creates a strong link from thread root → key,
                 placing this concept in the correct graph region.
     """
-    links_created = 0
+    pairs = _index_pairs(key, extract_concepts_from_value(value), learning_rate, thread)
+    return link_concepts_batch(pairs, learning_rate)["linked"]
+
+
+def index_keys_in_concept_graph(
+    items: List[Tuple[str, str]], learning_rate: float = 0.15, thread: str = "",
+) -> int:
+    """
+    ``index_key_in_concept_graph`` for many (key, value) pairs: one
+    concept-extraction batch and one link transaction for all of them.
+    """
+    items = [(k, v) for k, v in items if k]
+    if not items:
+        return 0
+    value_concepts = extract_concepts_batch([v or "" for _, v in items])
+    pairs: List[Tuple[str, str, float]] = []
+    for (key, _), concepts in zip(items, value_concepts):
+        pairs.extend(_index_pairs(key, concepts, learning_rate, thread))
+    return link_concepts_batch(pairs, learning_rate)["linked"]
+
+
+def _index_pairs(
+    key: str, value_concepts: List[str], learning_rate: float, thread: str,
+) -> List[Tuple[str, str, float]]:
+    """The links indexing ``key`` adds, given its value's concepts."""
+    pairs: List[Tuple[str, str, float]] = []
     
     # 0. Link thread root → key (thread-region topology)
     if thread:
-        link_concepts(thread, key, learning_rate=0.3)
-        links_created += 1
+        pairs.append((thread, key, 0.3))
     
     # 1. Link parent↔child along the key hierarchy
     parts = key.split('.')
     for i in range(len(parts) - 1):
         parent = '.'.join(parts[:i+1])
         child = '.'.join(parts[:i+2])
-        link_concepts(parent, child, learning_rate=0.3)
-        links_created += 1
+        pairs.append((parent, child, 0.3))
     
-    # 2. Extract concepts from the value and link to the full key
-    value_concepts = extract_concepts_from_value(value)
+    # 2. Link the value's concepts to the full key
     for concept in value_concepts:
-        link_concepts(key, concept, learning_rate=learning_rate)
-        links_created += 1
+        pairs.append((key, concept, learning_rate))
         
         leaf = parts[-1] if parts else key
         if leaf != concept:
-            link_concepts(leaf, concept, learning_rate=learning_rate)
-            links_created += 1
+            pairs.append((leaf, concept, learning_rate))
     
     # 3. Link sibling concepts from the value together
     if len(value_concepts) >= 2:
         for i, a in enumerate(value_concepts):
             for b in value_concepts[i+1:]:
-                link_concepts(a, b, learning_rate=learning_rate * 0.5)
-                links_created += 1
+                pairs.append((a, b, learning_rate * 0.5))
     
-    return links_created
+    return pairs
 
 
 # ─────────────────────────────────────────────────────────────
@@ -833,10 +837,10 @@ def get_all_links(limit: int = 500) -> List[Dict[str, Any]]:
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
-        cur.execute("""
-            SELECT concept_a, concept_b, strength, created_at
+        cur.execute(f"""
+            SELECT concept_a, concept_b, {STRENGTH_SQL} AS live, created_at
             FROM concept_links
-            ORDER BY strength DESC
+            ORDER BY live DESC
             LIMIT ?
         """, (limit,))
         
@@ -858,11 +862,11 @@ def get_links_for_concept(concept: str, limit: int = 50) -> List[Dict[str, Any]]
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
-        cur.execute("""
-            SELECT concept_a, concept_b, strength
+        cur.execute(f"""
+            SELECT concept_a, concept_b, {STRENGTH_SQL} AS live
             FROM concept_links
             WHERE concept_a = ? OR concept_b = ?
-            ORDER BY strength DESC
+            ORDER BY live DESC
             LIMIT ?
         """, (concept, concept, limit))
         
@@ -895,11 +899,21 @@ def create_link(
             concept_a, concept_b = concept_b, concept_a
         
         try:
+            # Upsert rather than REPLACE: REPLACE's implicit delete fires
+            # no trigger, which would throw off the concept_links counter
             cur.execute("""
-                INSERT OR REPLACE INTO concept_links (concept_a, concept_b, strength)
-                VALUES (?, ?, ?)
-            """, (concept_a, concept_b, strength))
+                INSERT INTO concept_links (concept_a, concept_b, strength, strength_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (concept_a, concept_b) DO UPDATE SET
+                    strength = excluded.strength,
+                    strength_at = excluded.strength_at,
+                    fire_count = 1,
+                    last_fired = CURRENT_TIMESTAMP,
+                    created_at = CURRENT_TIMESTAMP,
+                    potentiation = 'SHORT'
+            """, (concept_a, concept_b, strength, time.time()))
             conn.commit()
+            _graph_set_edges([(concept_a, concept_b, strength)])
             return True
         except Exception as e:
             print(f"Error creating link: {e}")
@@ -919,6 +933,9 @@ def delete_link(concept_a: str, concept_b: str) -> bool:
         
         deleted = cur.rowcount > 0
         conn.commit()
+    graph = loaded_concept_graph()
+    if deleted and graph is not None:
+        graph.remove_edge(concept_a, concept_b)
     return deleted
 
 
@@ -929,13 +946,16 @@ def update_link_strength(concept_a: str, concept_b: str, strength: float) -> boo
         
         cur.execute("""
             UPDATE concept_links 
-            SET strength = ?
+            SET strength = ?, strength_at = ?
             WHERE (concept_a = ? AND concept_b = ?)
                OR (concept_a = ? AND concept_b = ?)
-        """, (strength, concept_a, concept_b, concept_b, concept_a))
+        """, (strength, time.time(), concept_a, concept_b, concept_b, concept_a))
         
         updated = cur.rowcount > 0
         conn.commit()
+    graph = loaded_concept_graph()
+    if updated and graph is not None:
+        graph.set_edges([(concept_a, concept_b, strength)])
     return updated
 
 
@@ -1164,13 +1184,13 @@ def get_structural_graph(
 
             with closing(get_connection(readonly=True)) as conn:
                 cur = conn.cursor()
-                cur.execute("""
-                    SELECT concept_a, concept_b, strength, fire_count
+                cur.execute(f"""
+                    SELECT concept_a, concept_b, {STRENGTH_SQL} AS live, fire_count
                     FROM concept_links
-                    WHERE strength >= ?
-                    ORDER BY strength DESC
+                    WHERE strength >= ? AND {STRENGTH_SQL} >= ?
+                    ORDER BY live DESC
                     LIMIT ?
-                """, (min_cross_strength, max_cross_links * 4))
+                """, (min_cross_strength, min_cross_strength, max_cross_links * 4))
 
                 for row in cur.fetchall():
                     ca, cb, strength, fire_count = row[0].lower(), row[1].lower(), row[2], row[3]
@@ -1287,21 +1307,21 @@ def get_graph_data(center_concept: str = None, max_nodes: int = 100, min_strengt
             # Get links between these concepts
             placeholders = ",".join("?" for _ in concepts)
             cur.execute(f"""
-                SELECT concept_a, concept_b, strength, fire_count, last_fired
+                SELECT concept_a, concept_b, {STRENGTH_SQL} AS live, fire_count, last_fired
                 FROM concept_links
                 WHERE concept_a IN ({placeholders}) AND concept_b IN ({placeholders})
-                  AND strength >= ?
-                ORDER BY strength DESC
+                  AND {STRENGTH_SQL} >= ?
+                ORDER BY live DESC
             """, concepts + concepts + [min_strength])
         else:
             # Get top links globally
-            cur.execute("""
-                SELECT concept_a, concept_b, strength, fire_count, last_fired
+            cur.execute(f"""
+                SELECT concept_a, concept_b, {STRENGTH_SQL} AS live, fire_count, last_fired
                 FROM concept_links
-                WHERE strength >= ?
-                ORDER BY strength DESC
+                WHERE strength >= ? AND {STRENGTH_SQL} >= ?
+                ORDER BY live DESC
                 LIMIT ?
-            """, (min_strength, max_nodes * 4))
+            """, (min_strength, min_strength, max_nodes * 4))
         
         # Build nodes and links
         nodes_set = set()
@@ -1392,28 +1412,22 @@ def get_activation_path(source: str, target: str, max_hops: int = 3) -> Optional
 
 
 def get_stats() -> Dict[str, Any]:
-    """Get linking core statistics."""
-    with closing(get_connection(readonly=True)) as conn:
-        cur = conn.cursor()
-        
-        # Count concepts
-        cur.execute("""
-            SELECT COUNT(DISTINCT concept) FROM (
-                SELECT concept_a as concept FROM concept_links
-                UNION
-                SELECT concept_b as concept FROM concept_links
-            )
-        """)
-        concept_count = cur.fetchone()[0] or 0
-        
-        # Count links
-        cur.execute("SELECT COUNT(*) FROM concept_links")
-        link_count = cur.fetchone()[0] or 0
-        
-        # Average strength
-        cur.execute("SELECT AVG(strength) FROM concept_links")
-        avg_strength = cur.fetchone()[0] or 0
-    
+    """Get linking core statistics, without scanning concept_links.
+
+    ``link_count`` is the trigger-kept counter (data/db/table_stats.py),
+    cached for AIOS_TABLE_COUNTS_TTL seconds.  ``concept_count`` and
+    ``average_strength`` (current, i.e. decayed, strength) come from the
+    in-memory concept graph, which sees other processes' writes after
+    AIOS_CONCEPT_GRAPH_TTL seconds.
+    """
+    from .graph import get_concept_graph
+    from data.db.table_stats import get_table_counts
+
+    graph = get_concept_graph()
+    concept_count = graph.concept_count()
+    avg_strength = graph.summary()["avg_strength"]
+    link_count = get_table_counts(["concept_links"]).get("concept_links", 0)
+
     return {
         "concept_count": concept_count,
         "link_count": link_count,
@@ -1486,34 +1500,18 @@ def extract_and_link_concepts(text: str, learning_rate: float = 0.1) -> Dict[str
     if len(concepts) < 2:
         return {"concepts": concepts, "links_created": 0, "links_strengthened": 0}
     
-    links_created = 0
-    links_strengthened = 0
-    
-    # Link all concept pairs
-    for i, c1 in enumerate(concepts):
-        for c2 in concepts[i+1:]:
-            # Check if link exists
-            conn = get_connection(readonly=True)
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT strength FROM concept_links 
-                WHERE (concept_a = ? AND concept_b = ?) OR (concept_a = ? AND concept_b = ?)
-            """, (c1, c2, c2, c1))
-            existing = cur.fetchone()
-            conn.close()
-            
-            if existing:
-                links_strengthened += 1
-            else:
-                links_created += 1
-            
-            # Create or strengthen link
-            link_concepts(c1, c2, learning_rate)
+    # Link all concept pairs in one transaction
+    pairs = [
+        (c1, c2)
+        for i, c1 in enumerate(concepts)
+        for c2 in concepts[i+1:]
+    ]
+    result = link_concepts_batch(pairs, learning_rate)
     
     return {
         "concepts": concepts,
-        "links_created": links_created,
-        "links_strengthened": links_strengthened
+        "links_created": result["created"],
+        "links_strengthened": result["strengthened"]
     }
 
 
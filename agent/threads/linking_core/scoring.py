@@ -21,14 +21,21 @@ The ``sentence_transformers`` provider runs a small CPU model locally
 (default all-MiniLM-L6-v2, ~80MB on disk, ~150MB resident, dim=384).
 It's the right choice on a low-RAM VM where local Ollama can't host
 an embed model and the OpenAI key isn't available.
+
+Vectors are cached in `embedding_store` (content hash → float32, tagged
+with provider + model, LRU memory tier in front).  `get_embeddings(texts)`
+dedups a batch, serves hits from the store and sends the misses to the
+provider AIOS_EMBED_BATCH (default 64) texts per request.
 """
 
 import os
 from typing import List, Dict, Any, Tuple, Optional
 import numpy as np
 
-# Cache for embeddings during a session
-_EMBEDDING_CACHE: Dict[str, np.ndarray] = {}
+from . import embedding_store
+
+EMBED_BATCH = int(os.getenv("AIOS_EMBED_BATCH", "64"))
+
 # (provider, available) memo \u2014 set on first probe.
 _PROBE_DONE: bool = False
 _PROBE_OK: bool = False
@@ -85,6 +92,15 @@ def _probe() -> bool:
     return _PROBE_OK
 
 
+def _st_model(model: str) -> Any:
+    """Lazy-load the sentence-transformers model."""
+    global _ST_MODEL
+    if _ST_MODEL is None:
+        from sentence_transformers import SentenceTransformer
+        _ST_MODEL = SentenceTransformer(model)
+    return _ST_MODEL
+
+
 def _embed_raw(text: str) -> Optional[np.ndarray]:
     """Provider-dispatched embedding call. No cache, no probe \u2014 just
     raw call. Returns None on any failure."""
@@ -107,45 +123,104 @@ def _embed_raw(text: str) -> Optional[np.ndarray]:
             resp = client.embeddings.create(model=model, input=text)
             return np.array(resp.data[0].embedding)
         if p in ("sentence_transformers", "st", "sbert"):
-            global _ST_MODEL
-            if _ST_MODEL is None:
-                from sentence_transformers import SentenceTransformer
-                _ST_MODEL = SentenceTransformer(model)
-            vec = _ST_MODEL.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            vec = _st_model(model).encode(text, convert_to_numpy=True, show_progress_bar=False)
             return np.asarray(vec)
     except Exception:
         return None
     return None
 
 
+def _embed_batch_raw(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """One provider request for a batch of texts.
+
+    Falls back to per-text `_embed_raw` calls when the provider (or an
+    older client library) can't take a list.
+    """
+    p = _provider()
+    if not p or not texts:
+        return [None] * len(texts)
+    model = _model_for(p)
+    try:
+        if p == "ollama":
+            import ollama
+            if hasattr(ollama, "embed"):
+                resp = ollama.embed(model=model, input=texts)
+                vecs = resp["embeddings"]
+                if len(vecs) == len(texts):
+                    return [np.asarray(v, dtype=np.float32) for v in vecs]
+        elif p == "openai":
+            from openai import OpenAI
+            api_key = os.getenv("OPENAI_API_KEY", "").strip()
+            if not api_key:
+                return [None] * len(texts)
+            client = OpenAI(api_key=api_key)
+            resp = client.embeddings.create(model=model, input=texts)
+            by_index = {d.index: d.embedding for d in resp.data}
+            return [
+                np.asarray(by_index[i], dtype=np.float32) if i in by_index else None
+                for i in range(len(texts))
+            ]
+        elif p in ("sentence_transformers", "st", "sbert"):
+            mat = _st_model(model).encode(texts, convert_to_numpy=True, show_progress_bar=False)
+            return [np.asarray(v, dtype=np.float32) for v in mat]
+    except Exception:
+        pass
+    return [_embed_raw(t) for t in texts]
+
+
+def _active_tag() -> Tuple[str, str]:
+    p = _provider()
+    return (p, _model_for(p))
+
+
+def get_embeddings(texts: List[str], use_cache: bool = True) -> List[Optional[np.ndarray]]:
+    """
+    Embeddings for a batch of texts, aligned with the input.
+
+    Duplicate texts are embedded once; cached vectors (memory LRU, then
+    the on-disk store) are reused; the rest go to the provider in batches
+    of EMBED_BATCH.  Entries are None for empty texts or when embeddings
+    are unavailable.
+    """
+    if not texts:
+        return []
+    if not _provider():
+        return [None] * len(texts)
+    tag = _active_tag()
+    unique = {t: embedding_store.text_hash(t) for t in texts if t}
+    found: Dict[str, np.ndarray] = {}
+    if use_cache and unique:
+        found = embedding_store.lookup(tag, unique.values())
+
+    todo = [t for t, h in unique.items() if h not in found]
+    if todo and _probe():
+        fresh: Dict[str, np.ndarray] = {}
+        for i in range(0, len(todo), max(1, EMBED_BATCH)):
+            chunk = todo[i:i + EMBED_BATCH]
+            for t, vec in zip(chunk, _embed_batch_raw(chunk)):
+                if vec is not None and len(vec):
+                    fresh[unique[t]] = np.asarray(vec, dtype=np.float32)
+        found.update(fresh)
+        if use_cache:
+            embedding_store.store(tag, fresh)
+
+    return [found.get(unique[t]) if t else None for t in texts]
+
+
 def get_embedding(text: str, use_cache: bool = True) -> Optional[np.ndarray]:
     """
     Get embedding for a text string.
     
     Args:
         text: Text to embed
-        use_cache: Whether to use/update the session cache
+        use_cache: Whether to use/update the embedding store
     
     Returns:
         Numpy array of embedding, or None if unavailable
     """
     if not text:
         return None
-    
-    # Check cache
-    if use_cache and text in _EMBEDDING_CACHE:
-        return _EMBEDDING_CACHE[text]
-    
-    if not _probe():
-        return None
-
-    embedding = _embed_raw(text)
-    if embedding is None:
-        return None
-
-    if use_cache:
-        _EMBEDDING_CACHE[text] = embedding
-    return embedding
+    return get_embeddings([text], use_cache=use_cache)[0]
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -225,6 +300,34 @@ def _item_to_text(item: Dict[str, Any]) -> str:
     return " ".join(parts)
 
 
+def _score_items(query: str, items: List[Dict[str, Any]], use_embeddings: bool = True) -> np.ndarray:
+    """Scores aligned with ``items``: 70% similarity + 30% weight.
+
+    Similarity is cosine between the query and each item's text, computed
+    as one matrix-vector product over the batch; items without an
+    embedding (or every item, when the query has none) use keyword overlap.
+    """
+    texts = [_item_to_text(item) for item in items]
+    weights = np.array([float(item.get("weight", 0.5)) for item in items])
+    sims = np.full(len(items), np.nan)
+
+    if use_embeddings:
+        vecs = get_embeddings([query] + texts)
+        query_emb, item_embs = vecs[0], vecs[1:]
+        if query_emb is not None:
+            idx = [i for i, v in enumerate(item_embs)
+                   if v is not None and v.shape == query_emb.shape]
+            if idx:
+                mat = np.stack([item_embs[i] for i in idx])
+                norms = np.linalg.norm(mat, axis=1) * np.linalg.norm(query_emb)
+                dots = mat @ query_emb
+                sims[idx] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    for i in np.flatnonzero(np.isnan(sims)):
+        sims[i] = keyword_fallback_score(query, texts[i])
+    return 0.7 * sims + 0.3 * weights
+
+
 def score_relevance(
     query: str,
     items: List[Dict[str, Any]],
@@ -249,37 +352,9 @@ def score_relevance(
         # No query = all items equal score based on weight
         return [(item.get("key", ""), item.get("weight", 0.5)) for item in items]
     
-    scores = []
-    
-    # Try embedding-based scoring
-    query_emb = None
-    if use_embeddings:
-        query_emb = get_embedding(query)
-    
-    for item in items:
-        key = item.get("key", "unknown")
-        text = _item_to_text(item)
-        weight = item.get("weight", 0.5)
-        
-        if query_emb is not None:
-            # Embedding-based scoring
-            item_emb = get_embedding(text)
-            if item_emb is not None:
-                sim = cosine_similarity(query_emb, item_emb)
-                # Blend with weight: 70% similarity, 30% weight
-                score = 0.7 * sim + 0.3 * weight
-            else:
-                # Fallback for this item
-                score = keyword_fallback_score(query, text) * 0.7 + weight * 0.3
-        else:
-            # Pure keyword fallback
-            score = keyword_fallback_score(query, text) * 0.7 + weight * 0.3
-        
-        scores.append((key, score))
-    
-    # Sort by score descending
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores
+    scores = _score_items(query, items, use_embeddings)
+    order = np.argsort(-scores, kind="stable")
+    return [(items[i].get("key", "unknown"), float(scores[i])) for i in order]
 
 
 def rank_items(
@@ -303,38 +378,35 @@ def rank_items(
     if not items:
         return []
     
-    # Score all items
-    scores = score_relevance(query, items)
-    score_map = {key: score for key, score in scores}
-    
-    # Add scores to items and filter
-    result = []
-    for item in items:
-        key = item.get("key", "")
-        score = score_map.get(key, 0.0)
-        
-        if score >= threshold:
-            item_with_score = {**item, "score": score}
-            result.append(item_with_score)
-    
-    # Sort by score and limit
-    result.sort(key=lambda x: x.get("score", 0), reverse=True)
+    if query:
+        scores = _score_items(query, items)
+    else:
+        scores = np.array([float(item.get("weight", 0.5)) for item in items])
+    
+    order = np.argsort(-scores, kind="stable")
+    result = [
+        {**items[i], "score": float(scores[i])}
+        for i in order
+        if scores[i] >= threshold
+    ]
     return result[:limit]
 
 
 def clear_cache() -> int:
-    """Clear the embedding cache. Returns number of entries cleared."""
-    global _EMBEDDING_CACHE
-    count = len(_EMBEDDING_CACHE)
-    _EMBEDDING_CACHE.clear()
-    return count
+    """Clear the in-memory embedding tier. Returns number of entries cleared."""
+    return embedding_store.clear_memory()
 
 
 def cache_stats() -> Dict[str, Any]:
     """Get embedding cache statistics."""
+    tag = _active_tag()
+    stats = embedding_store.store_stats(tag)
     return {
-        "size": len(_EMBEDDING_CACHE),
-        "ollama_available": _OLLAMA_AVAILABLE if _OLLAMA_CHECKED else "unknown",
+        "size": stats["memory_entries"],
+        **stats,
+        "provider": tag[0],
+        "model": tag[1],
+        "available": _PROBE_OK if _PROBE_DONE else "unknown",
     }
 
 
@@ -268,14 +268,17 @@ def export_training_data(
 
 def get_export_stats() -> Dict[str, Any]:
     """Get stats about exportable linking data (count-only, no row fetch)."""
-    from .schema import get_connection, get_potentiation_stats
+    from .schema import STRENGTH_SQL, get_connection, get_potentiation_stats
     from contextlib import closing
 
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         cur.execute("SELECT COUNT(*) FROM concept_links WHERE potentiation = 'LONG'")
         long_count = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM concept_links WHERE potentiation = 'LONG' AND strength >= 0.5 AND fire_count >= 3")
+        cur.execute(
+            "SELECT COUNT(*) FROM concept_links WHERE potentiation = 'LONG' "
+            f"AND strength >= 0.5 AND {STRENGTH_SQL} >= 0.5 AND fire_count >= 3"
+        )
         exportable = cur.fetchone()[0]
 
     stats = get_potentiation_stats()
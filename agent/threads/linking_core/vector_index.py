@@ -0,0 +1,542 @@
+"""
+Vector Index
+============
+
+Local top-k retrieval over the text the agent keeps around:
+
+    profile_facts   – "<profile_id>:<key>"  →  "key: l2 (or l1) value"
+    workspace_chunks – chunk id              →  chunk text
+    convo_turns      – turn id               →  user + assistant message
+
+Each corpus is one in-memory index per (database, provider, model).
+Vectors come from `embedding_store`, so they survive restarts and a model
+switch simply builds a new index.  Rows are L2-normalised float32, so a
+search is one matrix-vector product:
+
+    flat  – below AIOS_VECTOR_IVF_MIN rows (default 50000) every row is
+            scored.  The matrix is snapshotted to <db dir>/vectors/*.npy
+            (the .json next to it names the current one) and
+            memory-mapped on the next start.
+    IVF   – above it, rows are bucketed under sqrt(N) k-means centroids and
+            a query scores only the AIOS_VECTOR_NPROBE (default 16) nearest
+            buckets.  Retrained when the corpus doubles.
+
+Writers (`push_profile_fact`, `chunk_file`, `add_turn`, …) only call
+`mark_dirty_safe()`, which is a set insert.  The next `search()` re-reads those
+rows, embeds changed text in one batch and upserts / deletes them.  A
+missing index is built on a background thread; until it is ready `search`
+returns [] and callers keep their keyword path.  `ensure_index()` builds
+synchronously.
+
+Rows are append-only with an alive mask; replaced or deleted rows are
+compacted away when they pass a quarter of the matrix.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from data.db import get_connection, get_db_path
+
+from . import embedding_store
+
+IVF_MIN = int(os.getenv("AIOS_VECTOR_IVF_MIN", "50000"))
+NPROBE = int(os.getenv("AIOS_VECTOR_NPROBE", "16"))
+SYNC_FLUSH_MAX = int(os.getenv("AIOS_VECTOR_SYNC_FLUSH", "256"))
+MAX_CHARS = 2000
+_ID_CHUNK = 500
+
+# corpus → (SQL yielding (item_id, text) for every row, id expression for lookups)
+CORPORA: Dict[str, Tuple[str, str]] = {
+    "profile_facts": (
+        "SELECT profile_id || ':' || key, "
+        "key || ': ' || COALESCE(NULLIF(l2_value, ''), l1_value, '') FROM profile_facts",
+        "profile_id || ':' || key",
+    ),
+    "workspace_chunks": (
+        "SELECT CAST(id AS TEXT), content FROM workspace_chunks",
+        "CAST(id AS TEXT)",
+    ),
+    "convo_turns": (
+        "SELECT CAST(id AS TEXT), "
+        "COALESCE(user_message, '') || '\n' || COALESCE(assistant_message, '') FROM convo_turns",
+        "CAST(id AS TEXT)",
+    ),
+}
+
+Tag = Tuple[str, str]
+_Key = Tuple[str, str, Tag]  # (db path, corpus, tag)
+
+_indexes: Dict[_Key, "_Index"] = {}
+_building: Set[_Key] = set()
+_dirty: Dict[Tuple[str, str], Set[str]] = {}
+_lock = threading.Lock()
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    mat = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    return np.divide(mat, norms, out=np.zeros_like(mat), where=norms > 0)
+
+
+class _IVF:
+    """Inverted lists over spherical k-means centroids."""
+
+    def __init__(self, mat: np.ndarray, alive: np.ndarray, seed: int = 0):
+        rows = np.flatnonzero(alive)
+        nlist = int(np.clip(np.sqrt(len(rows)), 16, 4096))
+        rng = np.random.default_rng(seed)
+        sample = mat[rng.choice(rows, min(len(rows), nlist * 40), replace=False)]
+        cent = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(8):
+            assign = _nearest(sample, cent)
+            sums = np.zeros_like(cent)
+            np.add.at(sums, assign, sample)
+            filled = np.bincount(assign, minlength=nlist) > 0
+            cent[filled] = _normalize(sums[filled])
+        self.centroids = cent
+        assign = _nearest(mat if len(rows) == len(mat) else mat[rows], cent)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self.lists: List[np.ndarray] = [
+            rows[order[bounds[i]:bounds[i + 1]]] for i in range(nlist)
+        ]
+        self.trained_rows = len(rows)
+
+    def add(self, row: int, vec: np.ndarray) -> None:
+        p = int(np.argmax(self.centroids @ vec))
+        self.lists[p] = np.append(self.lists[p], row)
+
+    def candidates(self, q: np.ndarray, nprobe: int) -> np.ndarray:
+        probe = np.argsort(-(self.centroids @ q))[:nprobe]
+        return np.concatenate([self.lists[p] for p in probe])
+
+
+def _nearest(mat: np.ndarray, cent: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    out = np.empty(len(mat), dtype=np.int64)
+    for i in range(0, len(mat), chunk):
+        out[i:i + chunk] = np.argmax(mat[i:i + chunk] @ cent.T, axis=1)
+    return out
+
+
+class _Index:
+    """Normalised vectors for one corpus under one embedding tag."""
+
+    def __init__(self, ids: List[str], hashes: List[str], mat: np.ndarray):
+        self.ids = list(ids)
+        self.hashes = list(hashes)
+        self.mat = mat                          # may be a read-only memmap
+        self.n = len(ids)
+        self.alive = np.ones(self.n, dtype=bool)
+        self.pos = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.ivf: Optional[_IVF] = None
+        self.lock = threading.Lock()
+        self._maybe_train()
+
+    @property
+    def size(self) -> int:
+        return len(self.pos)
+
+    def _maybe_train(self) -> None:
+        if self.size < IVF_MIN:
+            self.ivf = None
+        elif self.ivf is None or self.size > 2 * self.ivf.trained_rows:
+            self.ivf = _IVF(self.mat[:self.n], self.alive[:self.n])
+
+    def _writable(self, extra: int) -> None:
+        """Own the matrix (drop any memmap) with room for ``extra`` rows."""
+        need = self.n + extra
+        if isinstance(self.mat, np.memmap) or need > len(self.mat):
+            cap = max(need, int(len(self.mat) * 1.5), 64)
+            grown = np.zeros((cap, self.mat.shape[1]), dtype=np.float32)
+            grown[:self.n] = self.mat[:self.n]
+            self.mat = grown
+            alive = np.zeros(cap, dtype=bool)
+            alive[:self.n] = self.alive[:self.n]
+            self.alive = alive
+
+    def upsert(self, items: Dict[str, Tuple[str, np.ndarray]]) -> None:
+        """Replace/insert ``item_id → (hash, vector)``."""
+        items = {i: hv for i, hv in items.items() if self.hash_of(i) != hv[0]}
+        if not items:
+            return
+        if not self.n:
+            self.mat = np.zeros((0, next(iter(items.values()))[1].shape[0]), np.float32)
+        dim = self.mat.shape[1]
+        items = {i: hv for i, hv in items.items() if hv[1].shape[0] == dim}
+        if not items:
+            return
+        self.remove(items)
+        self._writable(len(items))
+        vecs = _normalize(np.stack([v for _, v in items.values()]))
+        for (item_id, (h, _)), vec in zip(items.items(), vecs):
+            row = self.n
+            self.mat[row] = vec
+            self.alive[row] = True
+            self.ids.append(item_id)
+            self.hashes.append(h)
+            self.pos[item_id] = row
+            self.n += 1
+            if self.ivf is not None:
+                self.ivf.add(row, vec)
+        self._maybe_train()
+
+    def remove(self, item_ids: Iterable[str]) -> None:
+        rows = [self.pos.pop(i) for i in item_ids if i in self.pos]
+        if not rows:
+            return
+        self.alive[rows] = False
+        if self.n - self.size > max(64, self.n // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.alive[:self.n])
+        self.mat = np.ascontiguousarray(self.mat[keep])
+        self.ids = [self.ids[i] for i in keep]
+        self.hashes = [self.hashes[i] for i in keep]
+        self.n = len(keep)
+        self.alive = np.ones(self.n, dtype=bool)
+        self.pos = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.ivf = None
+        self._maybe_train()
+
+    def hash_of(self, item_id: str) -> Optional[str]:
+        row = self.pos.get(item_id)
+        return None if row is None else self.hashes[row]
+
+    def search(self, q: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if not self.size or q.shape[0] != self.mat.shape[1]:
+            return []
+        if self.ivf is not None:
+            rows = self.ivf.candidates(q, NPROBE)
+            rows = rows[self.alive[rows]]
+            scores = self.mat[rows] @ q
+        else:
+            rows = np.arange(self.n)
+            scores = self.mat[:self.n] @ q
+            scores[~self.alive[:self.n]] = -np.inf
+        k = min(k, self.size, len(rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[rows[i]], float(scores[i])) for i in top]
+
+    def search_many(self, Q: np.ndarray, k: int, chunk: int = 256) -> List[List[Tuple[str, float]]]:
+        """``search`` for every row of ``Q``; flat indexes score a chunk of
+        queries with one matrix product."""
+        if self.ivf is not None or not self.size or Q.shape[1] != self.mat.shape[1]:
+            return [self.search(q, k) for q in Q]
+        k = min(k, self.size)
+        dead = ~self.alive[:self.n]
+        out: List[List[Tuple[str, float]]] = []
+        for i in range(0, len(Q), chunk):
+            scores = Q[i:i + chunk] @ self.mat[:self.n].T
+            scores[:, dead] = -np.inf
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, cols in zip(scores, top):
+                cols = cols[np.argsort(-row[cols], kind="stable")]
+                out.append([(self.ids[c], float(row[c])) for c in cols])
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Source rows, snapshots
+# ---------------------------------------------------------------------------
+
+def _tag() -> Optional[Tag]:
+    from .scoring import _active_tag, _probe, _provider
+    return _active_tag() if _provider() and _probe() else None
+
+
+def read_rows(corpus: str, ids: Optional[Sequence[str]] = None) -> Dict[str, str]:
+    """``item_id → text`` for a corpus (all rows, or just ``ids``)."""
+    select, id_expr = CORPORA[corpus]
+    out: Dict[str, str] = {}
+    try:
+        with closing(get_connection(readonly=True)) as conn:
+            if ids is None:
+                out.update(conn.execute(select).fetchall())
+            else:
+                ids = list(ids)
+                for i in range(0, len(ids), _ID_CHUNK):
+                    chunk = ids[i:i + _ID_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    out.update(conn.execute(
+                        f"{select} WHERE {id_expr} IN ({marks})", chunk,
+                    ).fetchall())
+    except sqlite3.Error:
+        pass
+    return {k: (v or "")[:MAX_CHARS] for k, v in out.items() if (v or "").strip()}
+
+
+def _snapshot_path(db_path: str, corpus: str, tag: Tag) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{tag[0]}.{tag[1]}")
+    return Path(db_path).parent / "vectors" / f"{Path(db_path).stem}.{corpus}.{slug}"
+
+
+def _load_snapshot(base: Path) -> Optional[_Index]:
+    try:
+        meta = json.loads(base.with_suffix(base.suffix + ".json").read_text())
+        matrix = meta.get("matrix") or base.name + ".npy"
+        mat = np.load(base.parent / matrix, mmap_mode="r")
+        if len(meta["ids"]) != len(mat):
+            return None
+        return _Index(meta["ids"], meta["hashes"], mat)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_snapshot(base: Path, index: _Index) -> None:
+    """Write the matrix under a fresh name, then swap in the .json naming it.
+
+    The .json is the commit marker: a reader sees either the old pair or
+    the new one, never new ids over an old matrix.  Superseded matrices
+    are removed afterwards (best effort — one may still be memory-mapped).
+    """
+    if not index.size:
+        return
+    with index.lock:
+        rows = np.flatnonzero(index.alive[:index.n])
+        mat = np.ascontiguousarray(index.mat[rows])
+        ids = [index.ids[i] for i in rows]
+        hashes = [index.hashes[i] for i in rows]
+    matrix = f"{base.name}.{uuid.uuid4().hex[:12]}.npy"
+    meta = {"matrix": matrix, "ids": ids, "hashes": hashes}
+    try:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        np.save(base.parent / matrix, mat)
+        tmp = base.with_suffix(base.suffix + ".json.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, base.with_suffix(base.suffix + ".json"))
+    except OSError:
+        return
+    for old in base.parent.glob(base.name + "*.npy"):
+        if old.name != matrix:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _embed_rows(rows: Dict[str, str], tag: Tag) -> Dict[str, Tuple[str, np.ndarray]]:
+    from .scoring import get_embeddings
+    ids = list(rows)
+    vecs = get_embeddings([rows[i] for i in ids])
+    return {
+        i: (embedding_store.text_hash(rows[i]), v)
+        for i, v in zip(ids, vecs) if v is not None
+    }
+
+
+def _apply(index: _Index, corpus: str, ids: Iterable[str], tag: Tag) -> None:
+    """Re-read ``ids`` from the source and upsert/remove them."""
+    ids = list(ids)
+    rows = read_rows(corpus, ids)
+    changed = {
+        i: t for i, t in rows.items()
+        if index.hash_of(i) != embedding_store.text_hash(t)
+    }
+    fresh = _embed_rows(changed, tag) if changed else {}
+    with index.lock:
+        index.remove([i for i in ids if i not in rows])
+        index.upsert(fresh)
+
+
+def _build(key: _Key) -> _Index:
+    db_path, corpus, tag = key
+    base = _snapshot_path(db_path, corpus, tag)
+    index = _load_snapshot(base)
+    rows = read_rows(corpus)
+    if index is None:
+        fresh = _embed_rows(rows, tag)
+        ids = list(fresh)
+        mat = _normalize(np.stack([fresh[i][1] for i in ids])) if ids else np.zeros((0, 1), np.float32)
+        index = _Index(ids, [fresh[i][0] for i in ids], mat)
+        _save_snapshot(base, index)
+    else:
+        # Reconcile the snapshot with rows written since it was taken
+        stale = [i for i in index.pos if i not in rows]
+        changed = [i for i, t in rows.items() if index.hash_of(i) != embedding_store.text_hash(t)]
+        if stale or changed:
+            _apply(index, corpus, stale + changed, tag)
+            _save_snapshot(base, index)
+    return index
+
+
+def _build_in_background(key: _Key) -> None:
+    def run():
+        try:
+            index = _build(key)
+            with _lock:
+                _indexes[key] = index
+        except Exception:
+            pass
+        finally:
+            with _lock:
+                _building.discard(key)
+
+    threading.Thread(target=run, name=f"vector-index-{key[1]}", daemon=True).start()
+
+
+def _get(corpus: str, build: bool) -> Tuple[Optional[_Index], Optional[_Key]]:
+    if corpus not in CORPORA:
+        raise ValueError(f"unknown corpus: {corpus}")
+    tag = _tag()
+    if tag is None:
+        return None, None
+    db_path = str(get_db_path())
+    key = (db_path, corpus, tag)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None or not build:
+            return index, key
+        if key in _building:
+            return None, key
+        _building.add(key)
+        # Rows marked before the build started are covered by it
+        _dirty.pop((db_path, corpus), None)
+    _build_in_background(key)
+    return None, key
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def mark_dirty(corpus: str, *item_ids: str) -> None:
+    """Note that rows changed (or were deleted); applied on the next search."""
+    if not item_ids:
+        return
+    with _lock:
+        _dirty.setdefault((str(get_db_path()), corpus), set()).update(map(str, item_ids))
+
+
+def mark_dirty_safe(corpus: str, *item_ids: str) -> None:
+    """mark_dirty() for writers: never raises, so a write can't fail on it."""
+    try:
+        mark_dirty(corpus, *item_ids)
+    except Exception:
+        pass
+
+
+def flush(corpus: str) -> int:
+    """Apply pending dirty rows to a loaded index. Returns rows applied."""
+    index, key = _get(corpus, build=False)
+    if index is None:
+        return 0
+    with _lock:
+        ids = _dirty.pop((key[0], corpus), set())
+    if ids:
+        _apply(index, corpus, ids, key[2])
+    return len(ids)
+
+
+def ensure_index(corpus: str) -> bool:
+    """Build (or load) the index for ``corpus`` now. False without embeddings."""
+    index, key = _get(corpus, build=False)
+    if key is None:
+        return False
+    if index is None:
+        index = _build(key)
+        with _lock:
+            _indexes[key] = index
+            _dirty.pop((key[0], corpus), None)
+    flush(corpus)
+    return True
+
+
+def _ready(corpus: str) -> Optional[_Index]:
+    """Loaded index with pending rows applied (in the background when
+    there are many), or None while it builds."""
+    index, key = _get(corpus, build=True)
+    if index is None:
+        return None
+    with _lock:
+        pending = len(_dirty.get((key[0], corpus), ()))
+    if pending:
+        if pending <= SYNC_FLUSH_MAX:
+            flush(corpus)
+        else:
+            threading.Thread(target=flush, args=(corpus,), daemon=True).start()
+    return index
+
+
+def search(
+    corpus: str,
+    query: str = "",
+    k: int = 10,
+    vector: Optional[np.ndarray] = None,
+) -> List[Tuple[str, float]]:
+    """Top-``k`` ``(item_id, cosine)`` for ``query`` (or a precomputed
+    ``vector``).  [] while the index is still building or when embeddings
+    are unavailable.
+    """
+    index = _ready(corpus)
+    if index is None:
+        return []
+    if vector is None:
+        from .scoring import get_embedding
+        vector = get_embedding(query) if query else None
+    if vector is None:
+        return []
+    q = _normalize(np.asarray(vector, dtype=np.float32))
+    with index.lock:
+        return index.search(q, k)
+
+
+def search_batch(corpus: str, vectors: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+    """``search`` for each row of ``vectors`` (n, dim) in one pass.
+    Empty lists while the index is still building."""
+    index = _ready(corpus)
+    if index is None or not len(vectors):
+        return [[] for _ in range(len(vectors))]
+    Q = _normalize(np.asarray(vectors, dtype=np.float32))
+    with index.lock:
+        return index.search_many(Q, k)
+
+
+def save(corpus: str) -> bool:
+    """Snapshot a loaded index so the next process can memory-map it."""
+    index, key = _get(corpus, build=False)
+    if index is None:
+        return False
+    _save_snapshot(_snapshot_path(*key), index)
+    return True
+
+
+def reset() -> None:
+    """Drop every in-memory index and pending dirty set."""
+    with _lock:
+        _indexes.clear()
+        _dirty.clear()
+
+
+def index_stats() -> Dict[str, Dict[str, object]]:
+    """Per-corpus size, kind and pending rows for the active database/tag."""
+    tag = _tag()
+    db_path = str(get_db_path())
+    out: Dict[str, Dict[str, object]] = {}
+    with _lock:
+        for corpus in CORPORA:
+            key = (db_path, corpus, tag)
+            index = _indexes.get(key)
+            out[corpus] = {
+                "loaded": index is not None,
+                "building": key in _building,
+                "size": index.size if index else 0,
+                "kind": ("ivf" if index.ivf else "flat") if index else None,
+                "memory_mapped": isinstance(index.mat, np.memmap) if index else False,
+                "pending": len(_dirty.get((db_path, corpus), ())),
+            }
+    return out
@@ -391,124 +391,128 @@ class LogThreadAdapter(BaseThreadAdapter):
             # below. If a coder/agent forgets to pass a summary, this is
             # missing — that absence itself is signal.
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute("""
-                    SELECT data, timestamp FROM unified_events
-                    WHERE event_type = 'agent_turn'
-                    ORDER BY id DESC LIMIT 1
-                """).fetchone()
-                if row and row["data"]:
-                    txt = str(row["data"]).strip()
-                    if txt.startswith("VS Code coding turn: "):
-                        txt = txt[len("VS Code coding turn: "):]
-                    txt = txt[:160]
-                    ts = str(row["timestamp"] or "").split(".")[0]
-                    # Compute age so the reader knows if this is now or stale.
-                    age_str = ""
-                    try:
-                        dt = datetime.fromisoformat(
-                            ts.replace(" ", "T").replace("Z", "+00:00")
-                        )
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        age_s = (datetime.now(timezone.utc) - dt).total_seconds()
-                        if age_s < 60:
-                            age_str = f" ({int(age_s)}s ago)"
-                        elif age_s < 3600:
-                            age_str = f" ({int(age_s // 60)}m ago)"
-                        else:
-                            age_str = f" ({age_s / 3600:.1f}h ago)"
-                    except Exception:
-                        pass
-                    lines.append(f"  current_intent: {txt}{age_str}")
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute("""
+                        SELECT data, timestamp FROM unified_events
+                        WHERE event_type = 'agent_turn'
+                        ORDER BY id DESC LIMIT 1
+                    """).fetchone()
+                    if row and row["data"]:
+                        txt = str(row["data"]).strip()
+                        if txt.startswith("VS Code coding turn: "):
+                            txt = txt[len("VS Code coding turn: "):]
+                        txt = txt[:160]
+                        ts = str(row["timestamp"] or "").split(".")[0]
+                        # Compute age so the reader knows if this is now or stale.
+                        age_str = ""
+                        try:
+                            dt = datetime.fromisoformat(
+                                ts.replace(" ", "T").replace("Z", "+00:00")
+                            )
+                            if dt.tzinfo is None:
+                                dt = dt.replace(tzinfo=timezone.utc)
+                            age_s = (datetime.now(timezone.utc) - dt).total_seconds()
+                            if age_s < 60:
+                                age_str = f" ({int(age_s)}s ago)"
+                            elif age_s < 3600:
+                                age_str = f" ({int(age_s // 60)}m ago)"
+                            else:
+                                age_str = f" ({age_s / 3600:.1f}h ago)"
+                        except Exception:
+                            pass
+                        lines.append(f"  current_intent: {txt}{age_str}")
             except Exception:
                 pass
             # Idle time since last event (answers "is the world still moving?")
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute(
-                    "SELECT timestamp FROM unified_events ORDER BY id DESC LIMIT 1"
-                ).fetchone()
-                if row and row["timestamp"]:
-                    last_ts = str(row["timestamp"]).replace("T", " ").split(".")[0]
-                    try:
-                        # Robust parse — handle 'YYYY-MM-DD HH:MM:SS' or ISO
-                        dt = datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        idle = (datetime.now(timezone.utc) - dt).total_seconds()
-                        if idle < 60:
-                            idle_str = f"{int(idle)}s"
-                        elif idle < 3600:
-                            idle_str = f"{int(idle // 60)}m"
-                        else:
-                            idle_str = f"{idle / 3600:.1f}h"
-                        lines.append(f"  idle_since_last_event: {idle_str}")
-                    except Exception:
-                        pass
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute(
+                        "SELECT timestamp FROM unified_events ORDER BY id DESC LIMIT 1"
+                    ).fetchone()
+                    if row and row["timestamp"]:
+                        last_ts = str(row["timestamp"]).replace("T", " ").split(".")[0]
+                        try:
+                            # Robust parse — handle 'YYYY-MM-DD HH:MM:SS' or ISO
+                            dt = datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
+                            if dt.tzinfo is None:
+                                dt = dt.replace(tzinfo=timezone.utc)
+                            idle = (datetime.now(timezone.utc) - dt).total_seconds()
+                            if idle < 60:
+                                idle_str = f"{int(idle)}s"
+                            elif idle < 3600:
+                                idle_str = f"{int(idle // 60)}m"
+                            else:
+                                idle_str = f"{idle / 3600:.1f}h"
+                            lines.append(f"  idle_since_last_event: {idle_str}")
+                        except Exception:
+                            pass
             except Exception:
                 pass
             # Event type distribution last hour (triage signal)
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                rows = conn.execute("""
-                    SELECT event_type, COUNT(*) as cnt
-                    FROM unified_events
-                    WHERE timestamp >= datetime('now', '-1 hour')
-                    GROUP BY event_type
-                    ORDER BY cnt DESC
-                    LIMIT 5
-                """).fetchall()
-                if rows:
-                    parts = [f"{r['event_type']}={r['cnt']}" for r in rows]
-                    lines.append(f"  last_hour: {', '.join(parts)}")
+                with closing(get_connection(readonly=True)) as conn:
+                    rows = conn.execute("""
+                        SELECT event_type, COUNT(*) as cnt
+                        FROM unified_events
+                        WHERE timestamp >= datetime('now', '-1 hour')
+                        GROUP BY event_type
+                        ORDER BY cnt DESC
+                        LIMIT 5
+                    """).fetchall()
+                    if rows:
+                        parts = [f"{r['event_type']}={r['cnt']}" for r in rows]
+                        lines.append(f"  last_hour: {', '.join(parts)}")
             except Exception:
                 pass
             # Recent agent turns — "where was I" trail for the coding
             # agent (VS Code / future-me).  Answers: what did my prior
             # selves work on, before this turn?
             try:
+                from contextlib import closing
                 from data.db import get_connection
                 import json as _json
-                conn = get_connection(readonly=True)
-                rows = conn.execute("""
-                    SELECT data, metadata_json, timestamp
-                    FROM unified_events
-                    WHERE event_type = 'agent_turn'
-                    ORDER BY id DESC
-                    LIMIT 5
-                """).fetchall()
-                if rows:
-                    lines.append("  recent_agent_turns:")
-                    for r in rows:
-                        txt = (r["data"] or "").strip()
-                        if txt.startswith("VS Code coding turn: "):
-                            txt = txt[len("VS Code coding turn: "):]
-                        txt = txt[:80]
-                        fcount = ""
-                        if r["metadata_json"]:
-                            try:
-                                md = _json.loads(r["metadata_json"]) or {}
-                                # New rows carry the exact count; old rows
-                                # only have a capped list.  Prefer the count.
-                                n = md.get("files_touched_count")
-                                if n is None:
-                                    files = md.get("files_touched") or []
-                                    n = len(files) if files else 0
-                                if n:
-                                    fcount = f" ({n} files)"
-                                # Grade tag (written by turn_start's
-                                # _grade_prior_turn on the NEXT turn).
-                                g = md.get("graded_status")
-                                if g:
-                                    fcount += f" [{g}]"
-                            except Exception:
-                                pass
-                        ts = str(r["timestamp"] or "").split(".")[0]
-                        lines.append(f"    - {ts}  {txt}{fcount}")
+                with closing(get_connection(readonly=True)) as conn:
+                    rows = conn.execute("""
+                        SELECT data, metadata_json, timestamp
+                        FROM unified_events
+                        WHERE event_type = 'agent_turn'
+                        ORDER BY id DESC
+                        LIMIT 5
+                    """).fetchall()
+                    if rows:
+                        lines.append("  recent_agent_turns:")
+                        for r in rows:
+                            txt = (r["data"] or "").strip()
+                            if txt.startswith("VS Code coding turn: "):
+                                txt = txt[len("VS Code coding turn: "):]
+                            txt = txt[:80]
+                            fcount = ""
+                            if r["metadata_json"]:
+                                try:
+                                    md = _json.loads(r["metadata_json"]) or {}
+                                    # New rows carry the exact count; old rows
+                                    # only have a capped list.  Prefer the count.
+                                    n = md.get("files_touched_count")
+                                    if n is None:
+                                        files = md.get("files_touched") or []
+                                        n = len(files) if files else 0
+                                    if n:
+                                        fcount = f" ({n} files)"
+                                    # Grade tag (written by turn_start's
+                                    # _grade_prior_turn on the NEXT turn).
+                                    g = md.get("graded_status")
+                                    if g:
+                                        fcount += f" [{g}]"
+                                except Exception:
+                                    pass
+                            ts = str(r["timestamp"] or "").split(".")[0]
+                            lines.append(f"    - {ts}  {txt}{fcount}")
             except Exception:
                 pass
             # [consequences] — working-tree state surfaced inside STATE so
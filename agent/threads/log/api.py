@@ -4,6 +4,8 @@ Log Thread API
 Endpoints for event logging, timeline, and session management.
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -251,7 +253,8 @@ async def list_server_logs(
     - errors_only: Only 4xx and 5xx responses
     - since: ISO timestamp
     """
-    logs = get_server_logs(
+    logs = await asyncio.to_thread(
+        get_server_logs,
         level=level,
         method=method,
         path_prefix=path_prefix,
@@ -270,8 +273,11 @@ async def server_statistics(since: Optional[str] = None):
     
     Returns request counts, error rates, avg duration, top paths.
     Use `since` to limit time window (e.g., last hour).
+    `sink` reports the background log writer: queue depth, drops, flush latency.
     """
-    stats = get_server_stats(since=since)
+    from .sink import sink_stats
+    stats = await asyncio.to_thread(get_server_stats, since=since)
+    stats["sink"] = sink_stats()
     return stats
 
 
@@ -369,7 +375,7 @@ async def list_sources():
 
 @router.get("/stats")
 async def get_stats():
-    """Get log statistics."""
+    """Get log statistics (event counts are cached for up to AIOS_TABLE_COUNTS_TTL s)."""
     return get_log_stats()
 
 
@@ -412,7 +418,8 @@ async def get_function_call_logs(
 ):
     """Query function call trace logs."""
     from .schema import get_function_calls
-    calls = get_function_calls(
+    calls = await asyncio.to_thread(
+        get_function_calls,
         function_name=function_name,
         module=module,
         limit=limit,
@@ -495,6 +502,7 @@ class LLMLogCreate(BaseModel):
     provider: str = "local"
     session_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    ttft_ms: Optional[float] = None
 
 
 @router.get("/llm")
@@ -507,8 +515,8 @@ async def list_llm_calls(
 ):
     """Query LLM inference logs."""
     from .schema import get_llm_calls
-    calls = get_llm_calls(
-        model=model, caller=caller,
+    calls = await asyncio.to_thread(
+        get_llm_calls, model=model, caller=caller,
         success_only=success_only, since=since, limit=limit,
     )
     return {"calls": calls, "count": len(calls)}
@@ -529,6 +537,8 @@ async def create_llm_log(entry: LLMLogCreate):
         provider=entry.provider,
         session_id=entry.session_id,
         metadata=entry.metadata,
+        ttft_ms=entry.ttft_ms,
+        inline=True,
     )
     return {"status": "created", "log_id": log_id}
 
@@ -540,7 +550,7 @@ async def llm_statistics(since: Optional[str] = None):
     Use for self-diagnosis and model switching decisions.
     """
     from .schema import get_llm_stats
-    return get_llm_stats(since=since)
+    return await asyncio.to_thread(get_llm_stats, since=since)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -569,8 +579,8 @@ async def list_activations(
 ):
     """Query concept activation logs."""
     from .schema import get_activations
-    acts = get_activations(
-        concept=concept, activation_type=activation_type,
+    acts = await asyncio.to_thread(
+        get_activations, concept=concept, activation_type=activation_type,
         trigger=trigger, since=since, limit=limit,
     )
     return {"activations": acts, "count": len(acts)}
@@ -590,6 +600,7 @@ async def create_activation_log(entry: ActivationLogCreate):
         hops=entry.hops,
         session_id=entry.session_id,
         metadata=entry.metadata,
+        inline=True,
     )
     return {"status": "created", "log_id": log_id}
 
@@ -598,7 +609,7 @@ async def create_activation_log(entry: ActivationLogCreate):
 async def activation_statistics(since: Optional[str] = None):
     """Activation statistics — top concepts, type breakdown."""
     from .schema import get_activation_stats
-    return get_activation_stats(since=since)
+    return await asyncio.to_thread(get_activation_stats, since=since)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -26,6 +26,9 @@ from datetime import datetime
 # Database connection from central location
 from data.db import get_connection
 
+# Batched background writer for the high-volume log tables
+from . import sink as _sink
+
 
 # ============================================================================
 # Table Initialization
@@ -771,7 +774,13 @@ def get_active_sessions() -> List[Dict]:
 # ============================================================================
 
 def get_log_stats() -> Dict[str, Any]:
-    """Get log statistics."""
+    """Get log statistics.
+
+    ``total_events``, ``events_by_type`` and ``events_by_source`` are
+    trigger-kept counters (data/db/table_stats.py) cached for
+    AIOS_TABLE_COUNTS_TTL seconds (default 10), so they can trail the
+    newest events by that long; ``recent_activity`` is counted live.
+    """
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         
@@ -787,17 +796,11 @@ def get_log_stats() -> Dict[str, Any]:
         }
         
         try:
-            # Total events
-            cur.execute("SELECT COUNT(*) FROM unified_events")
-            stats["total_events"] = cur.fetchone()[0]
-            
-            # By type
-            cur.execute("SELECT event_type, COUNT(*) FROM unified_events GROUP BY event_type")
-            stats["events_by_type"] = dict(cur.fetchall())
-            
-            # By source
-            cur.execute("SELECT source, COUNT(*) FROM unified_events GROUP BY source")
-            stats["events_by_source"] = dict(cur.fetchall())
+            # Totals, by type and by source: trigger-kept counters
+            from data.db.table_stats import get_column_counts, get_table_counts
+            stats["total_events"] = get_table_counts(["unified_events"]).get("unified_events", 0)
+            stats["events_by_type"] = get_column_counts("unified_events", "event_type")
+            stats["events_by_source"] = get_column_counts("unified_events", "source")
             
             # Sessions
             sessions = pull_log_events("sessions", limit=1000)
@@ -999,7 +1002,7 @@ def log_server_request(
     error: str = None,
     level: str = None,
     metadata: Dict[str, Any] = None
-) -> int:
+) -> Optional[int]:
     """
     Log an HTTP request.
     
@@ -1015,32 +1018,29 @@ def log_server_request(
         metadata: Additional context
     
     Returns:
-        Log entry ID
+        Log entry ID when writing inline (AIOS_LOG_ASYNC=0); None when the
+        row was queued for the background log sink.
     """
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        init_server_log_table(conn)
-        
-        # Auto-determine level from status code
-        if level is None:
-            if status_code >= 500:
-                level = "error"
-            elif status_code >= 400:
-                level = "warning"
-            else:
-                level = "info"
-        
-        metadata_json = json.dumps(metadata) if metadata else None
-        
-        cur.execute("""
-            INSERT INTO log_server 
-            (level, method, path, status_code, duration_ms, client_ip, user_agent, error, metadata_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (level, method, path, status_code, duration_ms, client_ip, user_agent, error, metadata_json))
-        
-        log_id = cur.lastrowid
-        conn.commit()
-    return log_id
+    # Auto-determine level from status code
+    if level is None:
+        if status_code >= 500:
+            level = "error"
+        elif status_code >= 400:
+            level = "warning"
+        else:
+            level = "info"
+
+    metadata_json = json.dumps(metadata) if metadata else None
+    return _sink.submit("server", (
+        level, method, path, status_code, duration_ms, client_ip, user_agent, error, metadata_json,
+    ))
+
+
+_sink.register("server", """
+    INSERT INTO log_server
+    (level, method, path, status_code, duration_ms, client_ip, user_agent, error, metadata_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+""", init_server_log_table)
 
 
 def get_server_logs(
@@ -1067,6 +1067,7 @@ def get_server_logs(
     Returns:
         List of log dicts
     """
+    _sink.flush(_sink.READ_FLUSH_S)  # rows still queued in the log sink
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         init_server_log_table(conn)
@@ -1126,6 +1127,7 @@ def get_server_stats(since: str = None) -> Dict[str, Any]:
     Returns:
         Dict with request counts, error rates, avg duration
     """
+    _sink.flush(_sink.READ_FLUSH_S)
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
         init_server_log_table(conn)
@@ -1238,7 +1240,8 @@ def log_function_call(
     """
     Log a function call. Deduplicates identical calls within dedup_hours window.
 
-    Returns log ID or None if deduped away.
+    Returns log ID when writing inline (AIOS_LOG_ASYNC=0) or None if deduped
+    away; always None when queued for the background log sink.
     """
     # Build dedup hash from function name + args
     hash_input = function_name
@@ -1246,29 +1249,36 @@ def log_function_call(
         hash_input += json.dumps(args_summary, sort_keys=True, default=str)
     dedup_hash = _hashlib.sha256(hash_input.encode()).hexdigest()[:16]
 
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        init_function_log_table(conn)
+    args_json = json.dumps(args_summary, default=str) if args_summary else None
+    row = (function_name, module, args_json, result_summary, duration_ms,
+           1 if success else 0, error, dedup_hash)
+    if dedup_hours > 0:
+        # The duplicate check runs inside the insert, so it also sees rows
+        # written earlier in the same batch.
+        return _sink.submit("function_call_dedup", row + (dedup_hash, f"-{int(dedup_hours)} hours"))
+    return _sink.submit("function_call", row)
 
-        # Check for recent duplicate
-        if dedup_hours > 0:
-            cur.execute("""
-                SELECT id FROM log_function_calls
-                WHERE dedup_hash = ? AND timestamp > datetime('now', ?)
-                LIMIT 1
-            """, (dedup_hash, f"-{int(dedup_hours)} hours"))
-            if cur.fetchone():
-                return None  # Already logged recently
-
-        args_json = json.dumps(args_summary, default=str) if args_summary else None
-        cur.execute("""
-            INSERT INTO log_function_calls
-            (function_name, module, args_json, result_summary, duration_ms, success, error, dedup_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (function_name, module, args_json, result_summary, duration_ms, 1 if success else 0, error, dedup_hash))
-        log_id = cur.lastrowid
-        conn.commit()
-    return log_id
+
+_FUNCTION_CALL_COLUMNS = """
+    INSERT INTO log_function_calls
+    (function_name, module, args_json, result_summary, duration_ms, success, error, dedup_hash)
+"""
+_sink.register(
+    "function_call",
+    _FUNCTION_CALL_COLUMNS + "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    init_function_log_table,
+)
+_sink.register(
+    "function_call_dedup",
+    _FUNCTION_CALL_COLUMNS + """
+    SELECT ?, ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM log_function_calls
+        WHERE dedup_hash = ? AND timestamp > datetime('now', ?)
+    )
+    """,
+    init_function_log_table,
+)
 
 
 def get_function_calls(
@@ -1278,6 +1288,7 @@ def get_function_calls(
     since: str = None,
 ) -> List[Dict[str, Any]]:
     """Query function call logs."""
+    _sink.flush(_sink.READ_FLUSH_S)
     # Ensure table exists (writable)
     init_function_log_table()
 
@@ -1492,9 +1503,19 @@ def init_llm_inference_table(conn: sqlite3.Connection = None) -> None:
             error TEXT,
             caller TEXT,
             session_id TEXT,
-            metadata_json TEXT DEFAULT '{}'
+            metadata_json TEXT DEFAULT '{}',
+            ttft_ms REAL,
+            cached_tokens INTEGER
         )
     """)
+    # Idempotent migrations: time-to-first-token (streamed calls only),
+    # prompt tokens served from the provider's prompt cache
+    cur.execute("PRAGMA table_info(log_llm_inference)")
+    cols = {row[1] for row in cur.fetchall()}
+    if "ttft_ms" not in cols:
+        cur.execute("ALTER TABLE log_llm_inference ADD COLUMN ttft_ms REAL")
+    if "cached_tokens" not in cols:
+        cur.execute("ALTER TABLE log_llm_inference ADD COLUMN cached_tokens INTEGER")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_model ON log_llm_inference(model)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_ts ON log_llm_inference(timestamp DESC)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_caller ON log_llm_inference(caller)")
@@ -1515,29 +1536,35 @@ def log_llm_call(
     provider: str = "local",
     session_id: str = None,
     metadata: Dict[str, Any] = None,
-) -> int:
+    ttft_ms: float = None,
+    cached_tokens: int = None,
+    inline: bool = False,
+) -> Optional[int]:
     """
     Log an LLM inference call.
 
-    Returns log ID.
+    ttft_ms is the time to the first streamed token (None for calls that
+    were not streamed).  cached_tokens is how many of the prompt tokens
+    the provider served from its prompt cache (None when it does not
+    say).  Returns log ID when writing inline (``inline`` or
+    AIOS_LOG_ASYNC=0), None when queued for the background log sink.
     """
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        init_llm_inference_table(conn)
-        metadata_json = json.dumps(metadata, default=str) if metadata else None
-        cur.execute("""
-            INSERT INTO log_llm_inference
-            (model, provider, prompt_tokens, completion_tokens, total_tokens,
-             latency_ms, success, error, caller, session_id, metadata_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            model, provider, prompt_tokens, completion_tokens,
-            prompt_tokens + completion_tokens, latency_ms,
-            1 if success else 0, error, caller, session_id, metadata_json,
-        ))
-        log_id = cur.lastrowid
-        conn.commit()
-    return log_id
+    metadata_json = json.dumps(metadata, default=str) if metadata else None
+    return _sink.submit("llm", (
+        model, provider, prompt_tokens, completion_tokens,
+        prompt_tokens + completion_tokens, latency_ms,
+        1 if success else 0, error, caller, session_id, metadata_json, ttft_ms,
+        cached_tokens,
+    ), inline=inline)
+
+
+_sink.register("llm", """
+    INSERT INTO log_llm_inference
+    (model, provider, prompt_tokens, completion_tokens, total_tokens,
+     latency_ms, success, error, caller, session_id, metadata_json, ttft_ms,
+     cached_tokens)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""", init_llm_inference_table)
 
 
 def get_llm_calls(
@@ -1548,6 +1575,7 @@ def get_llm_calls(
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """Query LLM inference logs."""
+    _sink.flush(_sink.READ_FLUSH_S)
     init_llm_inference_table()
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
@@ -1590,6 +1618,7 @@ def get_llm_stats(since: str = None) -> Dict[str, Any]:
     Get LLM usage statistics — total calls, tokens, cost estimate, error rate.
     Enables self-diagnosis: which model is failing? which caller is expensive?
     """
+    _sink.flush(_sink.READ_FLUSH_S)
     init_llm_inference_table()
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
@@ -1612,7 +1641,8 @@ def get_llm_stats(since: str = None) -> Dict[str, Any]:
 
             cur.execute(
                 f"SELECT SUM(total_tokens), SUM(prompt_tokens), SUM(completion_tokens), "
-                f"AVG(latency_ms) FROM log_llm_inference{time_clause}",
+                f"AVG(latency_ms), AVG(ttft_ms), SUM(cached_tokens) "
+                f"FROM log_llm_inference{time_clause}",
                 params,
             )
             row = cur.fetchone()
@@ -1620,6 +1650,8 @@ def get_llm_stats(since: str = None) -> Dict[str, Any]:
             prompt_tokens = row[1] or 0
             completion_tokens = row[2] or 0
             avg_latency = row[3] or 0
+            avg_ttft = row[4]
+            cached_tokens = row[5] or 0
 
             cur.execute(
                 f"SELECT model, COUNT(*) as cnt, SUM(total_tokens) as tok, AVG(latency_ms) as lat "
@@ -1638,7 +1670,9 @@ def get_llm_stats(since: str = None) -> Dict[str, Any]:
                 "total_tokens": total_tokens,
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
+                "cached_tokens": cached_tokens,
                 "avg_latency_ms": round(avg_latency, 2),
+                "avg_ttft_ms": round(avg_ttft, 2) if avg_ttft is not None else None,
                 "by_model": by_model,
             }
         except sqlite3.OperationalError:
@@ -1694,33 +1728,33 @@ def log_activation(
     hops: int = 1,
     session_id: str = None,
     metadata: Dict[str, Any] = None,
-) -> int:
+    inline: bool = False,
+) -> Optional[int]:
     """
     Log a concept activation event.
 
     activation_type: "spread" | "strengthen" | "weaken" | "create" | "prune"
     trigger: what caused it — "conversation", "memory_loop", "reflex", etc.
+    Returns log ID when writing inline (``inline`` or AIOS_LOG_ASYNC=0),
+    None when queued for the background log sink.
     """
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        init_activation_log_table(conn)
-        delta = None
-        if strength_before is not None and strength_after is not None:
-            delta = strength_after - strength_before
-        metadata_json = json.dumps(metadata, default=str) if metadata else None
-        cur.execute("""
-            INSERT INTO log_activations
-            (concept_a, concept_b, activation_type, strength_before, strength_after,
-             strength_delta, trigger, hops, session_id, metadata_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            concept_a, concept_b, activation_type,
-            strength_before, strength_after, delta,
-            trigger, hops, session_id, metadata_json,
-        ))
-        log_id = cur.lastrowid
-        conn.commit()
-    return log_id
+    delta = None
+    if strength_before is not None and strength_after is not None:
+        delta = strength_after - strength_before
+    metadata_json = json.dumps(metadata, default=str) if metadata else None
+    return _sink.submit("activation", (
+        concept_a, concept_b, activation_type,
+        strength_before, strength_after, delta,
+        trigger, hops, session_id, metadata_json,
+    ), inline=inline)
+
+
+_sink.register("activation", """
+    INSERT INTO log_activations
+    (concept_a, concept_b, activation_type, strength_before, strength_after,
+     strength_delta, trigger, hops, session_id, metadata_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""", init_activation_log_table)
 
 
 def get_activations(
@@ -1731,6 +1765,7 @@ def get_activations(
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """Query activation logs."""
+    _sink.flush(_sink.READ_FLUSH_S)
     init_activation_log_table()
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
@@ -1771,6 +1806,7 @@ def get_activations(
 
 def get_activation_stats(since: str = None) -> Dict[str, Any]:
     """Activation statistics — top concepts, type breakdown."""
+    _sink.flush(_sink.READ_FLUSH_S)
     init_activation_log_table()
     with closing(get_connection(readonly=True)) as conn:
         cur = conn.cursor()
@@ -0,0 +1,256 @@
+"""
+Log Sink — batched background writer for high-volume log tables
+===============================================================
+
+`log_server_request` runs in the `finally` of every HTTP request, and
+`log_llm_call` / `log_activation` / `log_function_call` fire from hot
+paths too.  Each used to open a connection, INSERT and COMMIT inline —
+one fsync per row, on whatever thread happened to log (for HTTP requests
+that is the event loop).
+
+Instead those functions `submit()` a row here.  Rows go on a bounded
+in-memory queue; one writer thread drains it every AIOS_LOG_FLUSH_MS
+(default 200 ms) or as soon as AIOS_LOG_BATCH rows (default 500) are
+waiting, and writes each table's rows with one `executemany` inside a
+single `writer()` transaction.
+
+When the queue is full (AIOS_LOG_QUEUE_MAX, default 10000) a submit waits
+up to AIOS_LOG_FULL_WAIT_MS (default 0) and then drops the row — logging
+never stalls the caller.  Waits and drops are counted in `sink_stats()`.
+
+Readers call `flush(READ_FLUSH_S)` first, so a row logged before a query
+is visible to it.  They wait at most AIOS_LOG_READ_FLUSH_MS (default
+200 ms) and then read what is on disk; a backed-up sink never stalls them
+longer.  The async /api/log routes run them with `asyncio.to_thread`, so
+that wait (and the query) stays off the event loop.  Explicit API
+posts that return a row id write inline (`submit(..., inline=True)`).
+AIOS_LOG_ASYNC=0 writes every row inline (the old behaviour).
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data.db import get_db_path, writer
+
+ASYNC = os.getenv("AIOS_LOG_ASYNC", "1") != "0"
+FLUSH_MS = float(os.getenv("AIOS_LOG_FLUSH_MS", "200"))
+BATCH = int(os.getenv("AIOS_LOG_BATCH", "500"))
+QUEUE_MAX = int(os.getenv("AIOS_LOG_QUEUE_MAX", "10000"))
+FULL_WAIT_MS = float(os.getenv("AIOS_LOG_FULL_WAIT_MS", "0"))
+FLUSH_TIMEOUT_S = 5.0
+READ_FLUSH_S = float(os.getenv("AIOS_LOG_READ_FLUSH_MS", "200")) / 1000
+
+# kind → (insert SQL, table initializer taking a connection)
+_specs: Dict[str, Tuple[str, Callable[[Any], None]]] = {}
+_ready: set = set()                      # (db_path, kind) already initialised
+
+_queue: "queue.Queue[Tuple[str, str, Sequence[Any]]]" = queue.Queue(maxsize=max(1, QUEUE_MAX))
+_wake = threading.Event()
+_done = threading.Condition()
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+_submitted = 0                           # rows accepted onto the queue
+_settled = 0                             # rows written or lost to a failed batch
+_stats = {
+    "written": 0, "dropped": 0, "waited": 0, "failed": 0,
+    "batches": 0, "max_depth": 0,
+    "last_flush_ms": 0.0, "max_flush_ms": 0.0, "total_flush_ms": 0.0,
+}
+
+
+def register(kind: str, sql: str, init: Callable[[Any], None]) -> None:
+    """Declare a row kind: its INSERT statement and table initializer."""
+    _specs[kind] = (sql, init)
+
+
+def submit(kind: str, row: Sequence[Any], inline: bool = False) -> Optional[int]:
+    """Queue one row for ``kind``.
+
+    Returns the row id when writing inline (``inline`` or
+    AIOS_LOG_ASYNC=0), else None.
+    """
+    path = str(get_db_path())
+    if inline or not ASYNC:
+        return _write(path, {kind: [row]})
+    global _submitted
+    _ensure_thread()
+    try:
+        _queue.put_nowait((path, kind, row))
+    except queue.Full:
+        if FULL_WAIT_MS <= 0:
+            _drop()
+            return None
+        _bump("waited")
+        try:
+            _queue.put((path, kind, row), timeout=FULL_WAIT_MS / 1000)
+        except queue.Full:
+            _drop()
+            return None
+    with _done:
+        _submitted += 1
+    depth = _queue.qsize()
+    if depth > _stats["max_depth"]:
+        _stats["max_depth"] = depth
+    if depth >= BATCH:
+        _wake.set()
+    return None
+
+
+def flush(timeout: float = FLUSH_TIMEOUT_S) -> bool:
+    """Block until every row submitted so far is written. False on timeout."""
+    if not ASYNC or _thread is None:
+        return True
+    with _done:
+        target = _submitted
+        if _settled >= target:
+            return True
+        _wake.set()
+        return _done.wait_for(lambda: _settled >= target, timeout=timeout)
+
+
+def sink_stats() -> Dict[str, Any]:
+    """Queue depth, drop/wait counters and flush latency."""
+    with _done:
+        out = dict(_stats)
+    batches = out.pop("total_flush_ms")
+    out["avg_flush_ms"] = round(batches / out["batches"], 2) if out["batches"] else 0.0
+    out["last_flush_ms"] = round(out["last_flush_ms"], 2)
+    out["max_flush_ms"] = round(out["max_flush_ms"], 2)
+    out["queue_depth"] = _queue.qsize()
+    out["queue_max"] = QUEUE_MAX
+    out["async"] = ASYNC
+    out["flush_interval_ms"] = FLUSH_MS
+    out["batch_size"] = BATCH
+    return out
+
+
+# ── internals ──────────────────────────────────────────────────────────
+
+def _bump(key: str, n: int = 1) -> None:
+    with _done:
+        _stats[key] += n
+
+
+def _drop() -> None:
+    _bump("dropped")
+
+
+def _ensure_thread() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="log-sink", daemon=True)
+            _thread.start()
+
+
+def _write(path: str, by_kind: Dict[str, List[Sequence[Any]]]) -> Optional[int]:
+    """Insert grouped rows into the DB at ``path`` in one transaction."""
+    last_id = None
+    if path == str(get_db_path()):
+        ctx = writer()
+    else:
+        # Rows queued before a DB switch (demo/live mode, tests) still
+        # land in the database they were logged against.
+        ctx = _direct(path)
+    with ctx as conn:
+        for kind, rows in by_kind.items():
+            sql, init = _specs[kind]
+            if (path, kind) not in _ready:
+                init(conn)
+                _ready.add((path, kind))
+            if len(rows) == 1:
+                cur = conn.execute(sql, rows[0])
+                last_id = cur.lastrowid if cur.rowcount else None
+            else:
+                conn.executemany(sql, rows)
+    return last_id
+
+
+class _direct:
+    """One-off write transaction on a DB other than the current one."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        import sqlite3
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            self.conn.close()
+        return False
+
+
+def _drain() -> int:
+    """Write everything currently queued. Returns rows handled."""
+    global _settled
+    items = []
+    try:
+        while True:
+            items.append(_queue.get_nowait())
+    except queue.Empty:
+        pass
+    if not items:
+        return 0
+    grouped: Dict[str, Dict[str, List[Sequence[Any]]]] = defaultdict(lambda: defaultdict(list))
+    for path, kind, row in items:
+        grouped[path][kind].append(row)
+    t0 = time.perf_counter()
+    failed = 0
+    for path, by_kind in grouped.items():
+        try:
+            _write(path, by_kind)
+        except Exception:
+            # Table may have vanished under us (DB replaced) — re-init once
+            _ready.difference_update({(path, k) for k in by_kind})
+            try:
+                _write(path, by_kind)
+            except Exception:
+                failed += sum(len(r) for r in by_kind.values())
+    ms = (time.perf_counter() - t0) * 1000
+    with _done:
+        _stats["written"] += len(items) - failed
+        _stats["failed"] += failed
+        _stats["batches"] += 1
+        _stats["last_flush_ms"] = ms
+        _stats["total_flush_ms"] += ms
+        _stats["max_flush_ms"] = max(_stats["max_flush_ms"], ms)
+        _settled += len(items)
+        _done.notify_all()
+    return len(items)
+
+
+def _run() -> None:
+    while True:
+        _wake.wait(FLUSH_MS / 1000)
+        _wake.clear()
+        try:
+            while _drain() >= BATCH:
+                pass
+        except Exception:
+            pass
+
+
+def _flush_at_exit() -> None:
+    if _thread is not None:
+        _drain()
+
+
+atexit.register(_flush_at_exit)
@@ -22,6 +22,7 @@ try:
         get_philosophy_profiles,
     )
     from agent.threads.linking_core.schema import extract_concepts_from_text
+    from agent.threads.linking_core.query import get_query_analysis
 except ImportError:
     from ..base import BaseThreadAdapter, HealthReport, IntrospectionResult
     from .schema import (
@@ -29,6 +30,7 @@ except ImportError:
         get_philosophy_profiles,
     )
     from ..linking_core.schema import extract_concepts_from_text
+    from ..linking_core.query import get_query_analysis
 
 
 class PhilosophyThreadAdapter(BaseThreadAdapter):
@@ -100,18 +102,11 @@ class PhilosophyThreadAdapter(BaseThreadAdapter):
             return facts[:top_k]
 
         try:
-            query_concepts = extract_concepts_from_text(query)
-            query_concept_set = set(query_concepts)
+            analysis = get_query_analysis(query)
+            query_concept_set = set(analysis.concepts)
 
             # Literal-token fallback for newly-written facts
-            import re as _re
-            literal_tokens = {
-                t for t in _re.findall(r"\b[a-z][a-z0-9]{2,}\b", query.lower())
-                if t not in {"the", "and", "for", "what", "who", "how",
-                             "does", "are", "was", "they", "this", "that",
-                             "with", "from", "into", "run", "work", "you",
-                             "your", "have", "has"}
-            }
+            literal_tokens = analysis.tokens
 
             scored = []
             for fact in facts:
@@ -156,22 +151,23 @@ class PhilosophyThreadAdapter(BaseThreadAdapter):
             # Recently-invoked stances (access_count + last_accessed)
             # Shows which values are *live* vs dormant.
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                rows = conn.execute("""
-                    SELECT profile_id, key, access_count
-                    FROM philosophy_profile_facts
-                    WHERE last_accessed IS NOT NULL
-                      AND last_accessed >= datetime('now', '-7 days')
-                    ORDER BY last_accessed DESC
-                    LIMIT 5
-                """).fetchall()
-                if rows:
-                    parts = [
-                        f"{r['profile_id']}.{r['key']}"
-                        for r in rows
-                    ]
-                    lines.append(f"  recently_invoked: {', '.join(parts)}")
+                with closing(get_connection(readonly=True)) as conn:
+                    rows = conn.execute("""
+                        SELECT profile_id, key, access_count
+                        FROM philosophy_profile_facts
+                        WHERE last_accessed IS NOT NULL
+                          AND last_accessed >= datetime('now', '-7 days')
+                        ORDER BY last_accessed DESC
+                        LIMIT 5
+                    """).fetchall()
+                    if rows:
+                        parts = [
+                            f"{r['profile_id']}.{r['key']}"
+                            for r in rows
+                        ]
+                        lines.append(f"  recently_invoked: {', '.join(parts)}")
             except Exception:
                 pass
             # Contradictions: same key, different value across profiles.
@@ -221,7 +217,7 @@ class PhilosophyThreadAdapter(BaseThreadAdapter):
         if query:
             all_facts = self._filter_by_relevance(all_facts, query)
             try:
-                relevant_concepts = extract_concepts_from_text(query)
+                relevant_concepts = list(get_query_analysis(query).concepts)
             except Exception:
                 pass
 
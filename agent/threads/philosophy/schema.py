@@ -89,6 +89,7 @@ def init_philosophy_profile_facts(conn: sqlite3.Connection = None) -> None:
             UNIQUE(profile_id, key)
         )
     """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_philosophy_facts_key ON philosophy_profile_facts(key)")
     conn.commit()
 
 
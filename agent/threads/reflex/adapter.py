@@ -178,46 +178,48 @@ class ReflexThreadAdapter(BaseThreadAdapter):
             lines = [f"  patterns: {patterns}"]
             # Trigger stats from DB
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute(
-                    "SELECT COUNT(*) as total, "
-                    "SUM(CASE WHEN enabled THEN 1 ELSE 0 END) as active "
-                    "FROM reflex_triggers"
-                ).fetchone()
-                total = row["total"] if row else 0
-                active = row["active"] if row else 0
-                if total > 0:
-                    lines.append(f"  triggers: {total} ({active} active)")
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute(
+                        "SELECT COUNT(*) as total, "
+                        "SUM(CASE WHEN enabled THEN 1 ELSE 0 END) as active "
+                        "FROM reflex_triggers"
+                    ).fetchone()
+                    total = row["total"] if row else 0
+                    active = row["active"] if row else 0
+                    if total > 0:
+                        lines.append(f"  triggers: {total} ({active} active)")
             except Exception:
                 pass
             # Meta-thoughts stats (cognitive residue)
             try:
+                from contextlib import closing
                 from data.db import get_connection
-                conn = get_connection(readonly=True)
-                row = conn.execute(
-                    "SELECT COUNT(*) as total, "
-                    "SUM(CASE WHEN kind='expected' AND graded=1 THEN 1 ELSE 0 END) as graded_expected, "
-                    "SUM(CASE WHEN kind='expected' THEN 1 ELSE 0 END) as total_expected "
-                    "FROM reflex_meta_thoughts"
-                ).fetchone()
-                if row and row["total"]:
-                    total = row["total"]
-                    ge = row["graded_expected"] or 0
-                    te = row["total_expected"] or 0
-                    if te > 0:
-                        lines.append(f"  meta_thoughts: {total} (graded: {ge}/{te} expectations)")
-                    else:
-                        lines.append(f"  meta_thoughts: {total}")
-                # Pending expectations that are aging — prompts self-grading
-                pending = conn.execute("""
-                    SELECT COUNT(*) as cnt FROM reflex_meta_thoughts
-                    WHERE kind = 'expected'
-                      AND graded = 0
-                      AND created_at <= datetime('now', '-5 minutes')
-                """).fetchone()
-                if pending and pending["cnt"]:
-                    lines.append(f"  pending_expectations: {pending['cnt']}")
+                with closing(get_connection(readonly=True)) as conn:
+                    row = conn.execute(
+                        "SELECT COUNT(*) as total, "
+                        "SUM(CASE WHEN kind='expected' AND graded=1 THEN 1 ELSE 0 END) as graded_expected, "
+                        "SUM(CASE WHEN kind='expected' THEN 1 ELSE 0 END) as total_expected "
+                        "FROM reflex_meta_thoughts"
+                    ).fetchone()
+                    if row and row["total"]:
+                        total = row["total"]
+                        ge = row["graded_expected"] or 0
+                        te = row["total_expected"] or 0
+                        if te > 0:
+                            lines.append(f"  meta_thoughts: {total} (graded: {ge}/{te} expectations)")
+                        else:
+                            lines.append(f"  meta_thoughts: {total}")
+                    # Pending expectations that are aging — prompts self-grading
+                    pending = conn.execute("""
+                        SELECT COUNT(*) as cnt FROM reflex_meta_thoughts
+                        WHERE kind = 'expected'
+                          AND graded = 0
+                          AND created_at <= datetime('now', '-5 minutes')
+                    """).fetchone()
+                    if pending and pending["cnt"]:
+                        lines.append(f"  pending_expectations: {pending['cnt']}")
             except Exception:
                 pass
             return lines
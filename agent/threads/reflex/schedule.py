@@ -263,6 +263,7 @@ def start_schedule_loop(interval_seconds: int = 60) -> None:
             enabled=True,
             max_errors=5,
             error_backoff=2.0,
+            priority=10,  # cron ticks should fire on time
         )
         _loop_instance = BackgroundLoop(config, _schedule_tick)
         _loop_instance.start()
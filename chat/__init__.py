@@ -26,6 +26,7 @@ from .schema import (
     get_unindexed_high_weight_convos,
     mark_conversation_indexed,
 )
+from .state_store import get_turn_state, get_turn_states
 
 __all__ = [
     "router",
@@ -44,4 +45,6 @@ __all__ = [
     "increment_conversation_weight",
     "get_unindexed_high_weight_convos",
     "mark_conversation_indexed",
+    "get_turn_state",
+    "get_turn_states",
 ]
@@ -739,9 +739,12 @@ class WebSocketManager:
     MAX_CONNECTIONS = 50
 
     def __init__(self):
-        from typing import Dict
+        from typing import Dict, Set
         from fastapi import WebSocket
         self.active_connections: Dict[str, WebSocket] = {}
+        # Running chat turns per client — cancelled on disconnect
+        self._turns: Dict[str, Set[asyncio.Task]] = {}
+        self._turn_locks: Dict[str, asyncio.Lock] = {}
         
     async def connect(self, websocket, client_id: str):
         if len(self.active_connections) >= self.MAX_CONNECTIONS:
@@ -755,6 +758,28 @@ class WebSocketManager:
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             print(f"WebSocket client {client_id} disconnected")
+        for task in self._turns.pop(client_id, set()):
+            task.cancel()
+        self._turn_locks.pop(client_id, None)
+
+    def _start_turn(self, websocket, client_id: str, data: dict) -> None:
+        """Run a chat turn as a task so the receive loop keeps reading.
+
+        Turns from one client still run one at a time (per-client lock),
+        and AgentService.send_message serializes turns across clients
+        (shared history); disconnect() cancels whatever is running or
+        waiting.
+        """
+        lock = self._turn_locks.setdefault(client_id, asyncio.Lock())
+
+        async def _run():
+            async with lock:
+                await self.handle_chat_message(websocket, client_id, data)
+
+        task = asyncio.create_task(_run())
+        tasks = self._turns.setdefault(client_id, set())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
             
     async def send_personal_message(self, message: dict, client_id: str):
         if client_id in self.active_connections:
@@ -773,7 +798,7 @@ class WebSocketManager:
             message_type = data.get("type")
             
             if message_type == "chat_message":
-                await self.handle_chat_message(websocket, client_id, data)
+                self._start_turn(websocket, client_id, data)
             elif message_type == "typing_start":
                 await self.handle_typing_status(client_id, True)
             elif message_type == "typing_stop":
@@ -810,6 +835,20 @@ class WebSocketManager:
             def on_tool_event(event: dict):
                 asyncio.run_coroutine_threadsafe(_tool_event(event), loop)
 
+            # Chunks carry only the new text; the client appends them.
+            # The id is the stored message's, so edits/feedback find it.
+            message_id = f"assistant_{datetime.now().timestamp()}"
+            streamed = []
+
+            async def on_delta(delta: str):
+                streamed.append(delta)
+                await self.send_personal_message({
+                    "type": "agent_response_chunk",
+                    "content": delta,
+                    "message_id": message_id,
+                    "is_final": False,
+                }, client_id)
+
             from agent.services.agent_service import get_agent_service
             agent_service = get_agent_service()
             response_message = await agent_service.send_message(
@@ -817,9 +856,23 @@ class WebSocketManager:
                 provider_override=data.get("provider"),
                 model_override=data.get("model"),
                 endpoint_override=data.get("endpoint"),
+                on_delta=on_delta,
+                reply_id=message_id,
             )
-            
-            await self.stream_response(client_id, response_message.content, response_message.id)
+
+            # The final chunk reconciles the client with what was stored:
+            # empty when the streamed text is the reply, else the whole
+            # stored reply with ``replace`` (tool-round narration, error
+            # fallbacks, demo commands that never streamed).
+            final = {
+                "type": "agent_response_chunk",
+                "content": "",
+                "message_id": response_message.id,
+                "is_final": True,
+            }
+            if response_message.content != "".join(streamed):
+                final.update(content=response_message.content, replace=True)
+            await self.send_personal_message(final, client_id)
             await self.send_personal_message({"type": "agent_typing_stop"}, client_id)
             
         except Exception as e:
@@ -830,23 +883,6 @@ class WebSocketManager:
                 "content": "Sorry, I encountered an error processing your message."
             }, client_id)
             
-    async def stream_response(self, client_id: str, full_response: str, message_id: str):
-        """Stream response word by word"""
-        words = full_response.split()
-        current_content = ""
-        
-        for i, word in enumerate(words):
-            current_content += word + " "
-            
-            await self.send_personal_message({
-                "type": "agent_response_chunk",
-                "content": current_content.strip(),
-                "message_id": message_id,
-                "is_final": i == len(words) - 1
-            }, client_id)
-            
-            await asyncio.sleep(0.05)
-            
     async def handle_typing_status(self, client_id: str, is_typing: bool):
         """Handle typing status updates"""
         message = {
@@ -22,6 +22,7 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from data.db import get_connection
+from chat.state_store import init_state_store, pack_snapshot, prune_state_sections
 
 
 # =============================================================================
@@ -94,6 +95,9 @@ def init_convos_tables():
             CREATE INDEX IF NOT EXISTS idx_turns_convo 
             ON convo_turns(convo_id, turn_index)
         """)
+
+        # Per-turn STATE text, stored once per section (chat/state_store.py)
+        init_state_store(cur)
         
         conn.commit()
 
@@ -162,7 +166,9 @@ def add_turn(
         state_snapshot: Optional STATE-at-generation snapshot for this turn.
             Captured per-turn (not just per-convo) so each (user, assistant)
             pair can be replayed with the exact context the model saw —
-            high-value training signal for fine-tuning later.
+            high-value training signal for fine-tuning later.  Its
+            ``state_block`` text goes to the section store; read it back
+            with ``get_turn_state(turn_id)``.
     
     Returns:
         Turn index (0-based)
@@ -187,11 +193,12 @@ def add_turn(
         
         # Add the turn
         metadata_json = json.dumps(metadata) if metadata else None
-        state_json = json.dumps(state_snapshot) if state_snapshot else None
+        state_json, state_sections = pack_snapshot(cur, state_snapshot)
         cur.execute("""
-            INSERT INTO convo_turns (convo_id, turn_index, user_message, assistant_message, feed_type, context_level, metadata_json, state_snapshot_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (convo_id, turn_index, user_message, assistant_message, feed_type, context_level, metadata_json, state_json))
+            INSERT INTO convo_turns (convo_id, turn_index, user_message, assistant_message, feed_type, context_level, metadata_json, state_snapshot_json, state_sections)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (convo_id, turn_index, user_message, assistant_message, feed_type, context_level, metadata_json, state_json, state_sections))
+        turn_id = cur.lastrowid
         
         # Update conversation metadata
         cur.execute("""
@@ -202,6 +209,8 @@ def add_turn(
         """, (convo_id,))
         
         conn.commit()
+    from agent.threads.linking_core.vector_index import mark_dirty_safe
+    mark_dirty_safe("convo_turns", turn_id)
     return turn_index
 
 
@@ -385,6 +394,8 @@ def delete_conversation(session_id: str) -> bool:
         cur.execute("DELETE FROM convos WHERE session_id = ?", (session_id,))
         deleted = cur.rowcount > 0
         conn.commit()
+    if deleted:
+        prune_state_sections()
     return deleted
 
 
@@ -401,6 +412,8 @@ def delete_conversations_by_source(source: str) -> int:
         cur.execute("DELETE FROM convos WHERE source = ?", (source,))
         deleted = cur.rowcount
         conn.commit()
+    if deleted:
+        prune_state_sections()
     return deleted
 
 
@@ -505,6 +518,79 @@ def search_conversations(
     return conversations
 
 
+def semantic_search_conversations(
+    query: str,
+    limit: int = 8,
+    archived: bool = False,
+    vector=None,
+) -> List[Dict[str, Any]]:
+    """
+    Find conversations by meaning via the convo_turns vector index.
+    
+    Each conversation appears once, ranked by its best-matching turn,
+    with that turn as the preview.  Returns [] when embeddings are
+    unavailable or the index is still building — callers fall back to
+    search_conversations().
+    
+    Args:
+        query: Search text
+        limit: Max conversations to return
+        archived: Filter by archived status
+        vector: Precomputed query embedding (skips embedding the query)
+    """
+    try:
+        from agent.threads.linking_core.vector_index import search
+        hits = search("convo_turns", query, k=limit * 4, vector=vector)
+    except Exception:
+        return []
+    if not hits:
+        return []
+    
+    scores = {int(turn_id): score for turn_id, score in hits}
+    marks = ",".join("?" * len(scores))
+    with closing(get_connection(readonly=True)) as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT t.id, t.user_message, t.assistant_message,
+                   c.session_id, c.name, c.started, c.last_updated,
+                   c.archived, c.weight, c.turn_count, c.summary, c.source
+            FROM convo_turns t JOIN convos c ON t.convo_id = c.id
+            WHERE t.id IN ({marks}) AND c.archived = ?
+        """, (*scores, archived))
+        rows = cur.fetchall()
+    
+    found = {row[0] for row in rows}
+    missing = [t for t in scores if t not in found]
+    if missing:
+        from agent.threads.linking_core.vector_index import mark_dirty_safe
+        mark_dirty_safe("convo_turns", *missing)  # deleted since indexed
+    
+    conversations: Dict[str, Dict[str, Any]] = {}
+    for row in sorted(rows, key=lambda r: scores[r[0]], reverse=True):
+        session_id = row[3]
+        if session_id in conversations:
+            continue
+        preview = row[1] or row[2] or ""
+        if len(preview) > 200:
+            preview = preview[:197] + "..."
+        conversations[session_id] = {
+            "session_id": session_id,
+            "name": row[4] or _generate_fallback_name(session_id),
+            "started": row[5],
+            "last_updated": row[6],
+            "archived": bool(row[7]),
+            "weight": row[8],
+            "turn_count": row[9],
+            "preview": preview,
+            "summary": row[10],
+            "source": row[11] or "aios",
+            "score": round(scores[row[0]], 4),
+        }
+        if len(conversations) >= limit:
+            break
+    return list(conversations.values())
+
+
 def update_conversation_weight(session_id: str, weight: float) -> bool:
     """Update a conversation's weight. Returns True if found and updated."""
     with closing(get_connection()) as conn:
@@ -0,0 +1,282 @@
+"""
+Chat State Store - per-turn STATE, stored once per section
+-----------------------------------------------------------
+Every turn keeps the STATE block the model saw (for replay and finetune
+export).  Stored inline in ``convo_turns.state_snapshot_json`` that is
+several KB per turn, almost all of it identical to the previous turn's.
+
+Instead, ``add_turn`` splits the block into sections at blank lines
+(STATE's section separator), stores each distinct section once in
+``state_sections`` keyed by its hash, zlib-compressed, and keeps the
+turn's list of hashes in ``convo_turns.state_sections`` (16 bytes per
+section).  The rest of the snapshot dict stays in ``state_snapshot_json``.
+Joining the sections back with blank lines gives the exact text.
+
+Tables:
+- state_sections: hash (blake2b-128) → compressed section text
+
+Legacy rows (full block in ``state_snapshot_json``) still read back;
+``compact_turn_states()`` converts them.  Sections no turn refers to any
+more are removed by ``prune_state_sections()`` (run after deletes).
+
+Writers hold SQLite's write lock from the "which sections are stored"
+check to commit (``put_sections`` and the prune both start with BEGIN
+IMMEDIATE), so a prune can't delete a section a turn being added relies
+on.  A turn whose sections are missing anyway reads back without its
+``state_block`` instead of failing the whole batch.
+"""
+
+import hashlib
+import json
+import zlib
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data.db import get_connection, writer
+
+SEP = "\n\n"
+HASH_BYTES = 16
+ZLIB_LEVEL = 6
+
+
+# =============================================================================
+# Table Initialization
+# =============================================================================
+
+def init_state_store(cur) -> None:
+    """Create state_sections and the convo_turns.state_sections column."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS state_sections (
+            id INTEGER PRIMARY KEY,
+            hash BLOB NOT NULL UNIQUE,
+            codec TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL
+        )
+    """)
+    cur.execute("PRAGMA table_info(convo_turns)")
+    if "state_sections" not in [col[1] for col in cur.fetchall()]:
+        cur.execute("ALTER TABLE convo_turns ADD COLUMN state_sections BLOB")
+
+
+# =============================================================================
+# Sections
+# =============================================================================
+
+def split_sections(text: str) -> List[str]:
+    """STATE text → sections; ``SEP.join()`` of the result is ``text``."""
+    return text.split(SEP)
+
+
+def _hash(section: str) -> bytes:
+    return hashlib.blake2b(section.encode("utf-8"), digest_size=HASH_BYTES).digest()
+
+
+def _encode(section: str) -> Tuple[str, bytes, int]:
+    """(codec, body, uncompressed bytes)."""
+    raw = section.encode("utf-8")
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    return ("zlib", packed, len(raw)) if len(packed) < len(raw) else ("raw", raw, len(raw))
+
+
+def _decode(codec: str, body: bytes) -> str:
+    return (zlib.decompress(body) if codec == "zlib" else bytes(body)).decode("utf-8")
+
+
+def _unpack(refs: bytes) -> List[bytes]:
+    return [bytes(refs[i:i + HASH_BYTES]) for i in range(0, len(refs), HASH_BYTES)]
+
+
+def _chunks(items: List[Any], size: int = 500) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _begin_write(cur) -> None:
+    """Take the write lock now, before reading which sections exist."""
+    if not cur.connection.in_transaction:
+        cur.execute("BEGIN IMMEDIATE")
+
+
+def put_sections(cur, text: str) -> bytes:
+    """Store ``text``'s new sections; returns the turn's packed hash list.
+
+    Leaves ``cur``'s connection in a write transaction; the caller
+    commits once the turn row referring to the hashes is written.
+    """
+    _begin_write(cur)
+    sections = split_sections(text)
+    hashes = [_hash(s) for s in sections]
+    distinct = dict(zip(hashes, sections))
+    known = set()
+    for chunk in _chunks(list(distinct)):
+        cur.execute(
+            f"SELECT hash FROM state_sections WHERE hash IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        known.update(bytes(row[0]) for row in cur.fetchall())
+    new = [(h, *_encode(s)) for h, s in distinct.items() if h not in known]
+    if new:
+        cur.executemany(
+            "INSERT OR IGNORE INTO state_sections (hash, codec, body, size) VALUES (?, ?, ?, ?)",
+            new,
+        )
+    return b"".join(hashes)
+
+
+def get_sections(cur, hashes: Iterable[bytes]) -> Dict[bytes, str]:
+    """hash → section text for the stored ones among ``hashes``."""
+    out: Dict[bytes, str] = {}
+    for chunk in _chunks(list(set(hashes))):
+        cur.execute(
+            f"SELECT hash, codec, body FROM state_sections WHERE hash IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        for h, codec, body in cur.fetchall():
+            out[bytes(h)] = _decode(codec, body)
+    return out
+
+
+# =============================================================================
+# Turn snapshots
+# =============================================================================
+
+def pack_snapshot(cur, snapshot: Optional[Dict]) -> Tuple[Optional[str], Optional[bytes]]:
+    """(state_snapshot_json, state_sections) for a new convo_turns row.
+
+    A ``state_block`` string goes to the section store; everything else
+    in the snapshot stays in the JSON.
+    """
+    if not snapshot:
+        return None, None
+    block = snapshot.get("state_block")
+    if not isinstance(block, str) or not block:
+        return json.dumps(snapshot), None
+    rest = {k: v for k, v in snapshot.items() if k != "state_block"}
+    return json.dumps(rest), put_sections(cur, block)
+
+
+def _assemble(state_json: Optional[str], refs: Optional[bytes], sections: Dict[bytes, str]) -> Optional[Dict]:
+    """The turn's snapshot; no ``state_block`` if any of its sections is missing."""
+    snapshot = json.loads(state_json) if state_json else None
+    if refs is None:
+        return snapshot
+    hashes = _unpack(refs)
+    if any(h not in sections for h in hashes):
+        return snapshot
+    text = SEP.join(sections[h] for h in hashes)
+    return {"state_block": text, **(snapshot or {})}
+
+
+def get_turn_snapshots(turn_ids: Iterable[int]) -> Dict[int, Dict]:
+    """turn id → its STATE snapshot dict (``state_block`` rebuilt), for
+    the given turns that have one."""
+    ids = list(turn_ids)
+    rows: List[Tuple[int, Optional[str], Optional[bytes]]] = []
+    with closing(get_connection(readonly=True)) as conn:
+        cur = conn.cursor()
+        for chunk in _chunks(ids):
+            cur.execute(
+                f"SELECT id, state_snapshot_json, state_sections FROM convo_turns "
+                f"WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            rows.extend(cur.fetchall())
+        sections = get_sections(cur, (h for _, _, refs in rows if refs for h in _unpack(refs)))
+    out: Dict[int, Dict] = {}
+    for turn_id, state_json, refs in rows:
+        snapshot = _assemble(state_json, refs, sections)
+        if snapshot:
+            out[turn_id] = snapshot
+    return out
+
+
+def get_turn_states(turn_ids: Iterable[int]) -> Dict[int, str]:
+    """turn id → the exact STATE text the model saw, where recorded."""
+    return {
+        turn_id: snapshot["state_block"]
+        for turn_id, snapshot in get_turn_snapshots(turn_ids).items()
+        if isinstance(snapshot.get("state_block"), str)
+    }
+
+
+def get_turn_state(turn_id: int) -> Optional[str]:
+    """The exact STATE text turn ``turn_id`` was generated with, or None."""
+    return get_turn_states([turn_id]).get(turn_id)
+
+
+# =============================================================================
+# Maintenance
+# =============================================================================
+
+def compact_turn_states(batch: int = 500) -> int:
+    """Move legacy inline ``state_block``s into the section store.
+
+    Returns the number of turns converted.  The file only shrinks after
+    a VACUUM; until then SQLite reuses the freed pages.
+    """
+    converted = 0
+    last_id = 0
+    while True:
+        with closing(get_connection()) as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, state_snapshot_json FROM convo_turns
+                WHERE id > ? AND state_sections IS NULL
+                  AND state_snapshot_json LIKE '%"state_block"%'
+                ORDER BY id LIMIT ?
+            """, (last_id, batch))
+            rows = cur.fetchall()
+            if not rows:
+                return converted
+            for turn_id, state_json in rows:
+                last_id = turn_id
+                try:
+                    snapshot = json.loads(state_json)
+                except ValueError:
+                    continue
+                if not isinstance(snapshot, dict):
+                    continue
+                rest_json, refs = pack_snapshot(cur, snapshot)
+                if refs is None:
+                    continue
+                cur.execute(
+                    "UPDATE convo_turns SET state_snapshot_json = ?, state_sections = ? WHERE id = ?",
+                    (rest_json, refs, turn_id),
+                )
+                converted += 1
+            conn.commit()
+
+
+def prune_state_sections() -> int:
+    """Delete sections no turn refers to; returns how many.
+
+    Reads the references and deletes in one write transaction, so a
+    turn added meanwhile either commits first (and its sections are
+    seen as used) or waits for the prune and stores them again.
+    """
+    with writer() as conn:
+        cur = conn.cursor()
+        _begin_write(cur)
+        used = set()
+        for (refs,) in cur.execute(
+            "SELECT state_sections FROM convo_turns WHERE state_sections IS NOT NULL"
+        ).fetchall():
+            used.update(_unpack(refs))
+        cur.execute("SELECT hash FROM state_sections")
+        unused = [(h,) for (h,) in cur.fetchall() if bytes(h) not in used]
+        if unused:
+            cur.executemany("DELETE FROM state_sections WHERE hash = ?", unused)
+    return len(unused)
+
+
+def state_store_stats() -> Dict[str, int]:
+    """Section count and stored vs original bytes."""
+    with closing(get_connection(readonly=True)) as conn:
+        sections, stored, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0), COALESCE(SUM(size), 0) FROM state_sections"
+        ).fetchone()
+        turns = conn.execute(
+            "SELECT COUNT(*) FROM convo_turns WHERE state_sections IS NOT NULL"
+        ).fetchone()[0]
+    return {"sections": sections, "stored_bytes": stored, "section_bytes": size, "turns": turns}
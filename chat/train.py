@@ -54,7 +54,7 @@ SCHEMA_TABLES = [
     },
     {
         "name": "convo_turns",
-        "columns": "id, convo_id (FK), turn_index, timestamp, user_message, assistant_message, feed_type, context_level, metadata_json",
+        "columns": "id, convo_id (FK), turn_index, timestamp, user_message, assistant_message, feed_type, context_level, metadata_json, state_snapshot_json, state_sections",
         "description": "Individual turns within conversations",
     },
 ]
@@ -95,6 +95,7 @@ def export_training_data(
     """
     from data.db import get_connection
     from finetune.sections import build_api_examples, build_cli_examples, build_schema_examples
+    from chat.state_store import get_turn_states
 
     if sections is None:
         sections = ["data", "api", "cli", "schema"]
@@ -114,7 +115,7 @@ def export_training_data(
         with closing(get_connection(readonly=True)) as conn:
             cur = conn.cursor()
             cur.execute("""
-                SELECT ct.user_message, ct.assistant_message, c.channel, c.session_id
+                SELECT ct.id, ct.user_message, ct.assistant_message, c.channel, c.session_id
                 FROM convo_turns ct
                 JOIN convos c ON ct.convo_id = c.id
                 WHERE ct.user_message IS NOT NULL
@@ -125,10 +126,14 @@ def export_training_data(
                 LIMIT ?
             """, (limit,))
 
-            for user_msg, assistant_msg, channel, session_id in cur.fetchall():
-                # Build a real STATE block for this turn so the model
-                # learns to ground its answers in STATE context.
-                state_block = _build_training_state(user_msg)
+            rows = cur.fetchall()
+            recorded = get_turn_states(row[0] for row in rows)
+
+            for turn_id, user_msg, assistant_msg, channel, session_id in rows:
+                # The STATE the model actually saw on this turn; older
+                # turns without one get a real STATE built now, so the
+                # model learns to ground its answers in STATE context.
+                state_block = recorded.get(turn_id) or _build_training_state(user_msg)
                 examples.append({
                     "messages": [
                         {"role": "system", "content": state_block},
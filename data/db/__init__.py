@@ -11,10 +11,35 @@ Usage:
     conn = get_connection()  # Read/write
     conn = get_connection(readonly=True)  # Read-only
     
+    # Serialized write transaction (commits on exit, rolls back on error)
+    with writer() as conn:
+        conn.execute("INSERT ...")
+    
     # Switch modes at runtime
     set_demo_mode(True)   # Use state_demo.db
     set_demo_mode(False)  # Use state.db
 
+Pooling:
+    Connections are pooled per thread and keyed by the active DB path, so
+    ``with closing(get_connection()) as conn`` hands the handle back to the
+    pool instead of tearing it down. A returned handle has any open
+    transaction rolled back (same as a real close) and its row_factory
+    reset. Nested checkouts in one thread get distinct connections.
+
+    Tunables (env):
+        AIOS_DB_POOL=0             disable pooling (open/close per call)
+        AIOS_DB_POOL_IDLE=4        idle connections kept per thread per DB
+        AIOS_DB_STATEMENT_CACHE    prepared statements cached per connection
+        AIOS_DB_CACHE_SIZE         PRAGMA cache_size (negative = KiB)
+        AIOS_DB_MMAP_SIZE          PRAGMA mmap_size in bytes
+        AIOS_DB_SYNCHRONOUS        PRAGMA synchronous (NORMAL is safe in WAL)
+
+SQL functions:
+    Every connection registers ``decayed(value, at, rate, period_s)`` =
+    value * rate ** ((now - at) / period_s), with ``at`` in unix seconds
+    (NULL ``at`` = no decay). Tables that decay store the value as of
+    ``at`` and read it through this instead of rewriting every row.
+
 Files:
     data/db/state.db      - Personal/production database
     data/db/state_demo.db - Demo database (safe to reset)
@@ -23,7 +48,12 @@ Files:
 
 import sqlite3
 import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict, Iterator
 
 # Paths
 _DB_DIR = Path(__file__).parent.resolve()  # data/db/
@@ -81,11 +111,138 @@ def get_db_path() -> Path:
     return Path(os.getenv("STATE_DB_PATH", str(db_path)))
 
 
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+_POOL_ENABLED = os.getenv("AIOS_DB_POOL", "1") != "0"
+_POOL_MAX_IDLE = int(os.getenv("AIOS_DB_POOL_IDLE", "4"))
+_STATEMENT_CACHE = int(os.getenv("AIOS_DB_STATEMENT_CACHE", "256"))
+_CACHE_SIZE = int(os.getenv("AIOS_DB_CACHE_SIZE", "-16000"))     # 16 MB
+_MMAP_SIZE = int(os.getenv("AIOS_DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+_SYNCHRONOUS = os.getenv("AIOS_DB_SYNCHRONOUS", "NORMAL").strip().upper()
+if _SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    _SYNCHRONOUS = "NORMAL"
+
+_local = threading.local()
+_pool_lock = threading.Lock()
+_generation = 0                      # bumped by close_all_connections()
+_live: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+_writers: Dict[str, "PooledConnection"] = {}
+_writer_locks: Dict[str, threading.RLock] = {}
+_writer_depth: Dict[str, int] = {}
+_stats = {"opened": 0, "reused": 0, "discarded": 0, "writer_txns": 0}
+
+
+def _count(name: str) -> None:
+    with _pool_lock:
+        _stats[name] += 1
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection whose close() returns it to the per-thread pool.
+
+    Behaves exactly like a plain connection for every other call, so
+    existing ``closing(get_connection())`` call sites keep working.
+    """
+
+    _pool_key = None         # (db_path, readonly) while pooled
+    _pool_gen = 0
+    _checked_out = False
+    _is_writer = False
+    _discarded = False
+
+    def close(self) -> None:
+        if self._is_writer:
+            return  # owned by writer(); lives for the process
+        if self._pool_key is None:
+            super().close()
+            return
+        _release(self)
+
+    def _discard(self) -> None:
+        """Really close the underlying sqlite handle (owner thread only)."""
+        if self._discarded:
+            return
+        self._discarded = True
+        self._pool_key = None
+        try:
+            super().close()
+        except sqlite3.Error:
+            pass
+        _count("discarded")
+
+
+def _decayed(value, at, rate, period_s):
+    """Exponential decay of ``value`` stored at unix time ``at``."""
+    if value is None or at is None or not period_s:
+        return value
+    return value * rate ** (max(0.0, time.time() - at) / period_s)
+
+
+def _open(db_path: Path, readonly: bool) -> PooledConnection:
+    """Open and configure a new connection."""
+    if not readonly:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, timeout=30.0,
+            factory=PooledConnection, cached_statements=_STATEMENT_CACHE,
+        )
+    else:
+        uri = f"file:{db_path}?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=False, timeout=30.0,
+            factory=PooledConnection, cached_statements=_STATEMENT_CACHE,
+        )
+    
+    conn.row_factory = sqlite3.Row
+    conn.create_function("decayed", 4, _decayed)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA busy_timeout = 30000")  # 30 second timeout for locks
+    conn.execute("PRAGMA journal_mode = WAL")    # Write-Ahead Logging for better concurrency
+    conn.execute(f"PRAGMA synchronous = {_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {_CACHE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+    _count("opened")
+    return conn
+
+
+def _idle_list(key) -> list:
+    idle = getattr(_local, "idle", None)
+    if idle is None:
+        idle = _local.idle = {}
+    return idle.setdefault(key, [])
+
+
+def _release(conn: PooledConnection) -> None:
+    """Return a checked-out connection to the calling thread's idle list."""
+    if not conn._checked_out:
+        return  # double close — already back in the pool
+    conn._checked_out = False
+    try:
+        if conn.in_transaction:
+            conn.rollback()  # a real close would discard uncommitted work
+        conn.row_factory = sqlite3.Row
+        conn.text_factory = str
+        conn.isolation_level = ""
+    except sqlite3.Error:
+        conn._discard()
+        return
+    idle = _idle_list(conn._pool_key)
+    if conn._pool_gen != _generation or len(idle) >= _POOL_MAX_IDLE:
+        conn._discard()
+        return
+    idle.append(conn)
+
+
 def get_connection(readonly: bool = False) -> sqlite3.Connection:
     """
     Get a SQLite connection.
     
-    Uses dynamic DB path to support runtime mode switching.
+    Uses dynamic DB path to support runtime mode switching. Handles are
+    pooled per thread: close() returns the connection to the pool rather
+    than closing it, so callers keep using ``closing(get_connection())``.
     
     Args:
         readonly: If True, opens in read-only mode (faster, allows concurrent reads)
@@ -94,21 +251,128 @@ def get_connection(readonly: bool = False) -> sqlite3.Connection:
         sqlite3.Connection with row_factory set to sqlite3.Row
     """
     db_path = get_db_path()
-    
-    if not readonly:
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30.0)
-    else:
-        uri = f"file:{db_path}?mode=ro"
-        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=30.0)
-    
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.execute("PRAGMA busy_timeout = 30000")  # 30 second timeout for locks
-    conn.execute("PRAGMA journal_mode = WAL")    # Write-Ahead Logging for better concurrency
+    if not _POOL_ENABLED:
+        return _open(db_path, readonly)
+
+    key = (str(db_path), readonly)
+    idle = _idle_list(key)
+    while idle:
+        conn = idle.pop()
+        if conn._pool_gen == _generation:
+            conn._checked_out = True
+            _count("reused")
+            return conn
+        conn._discard()
+
+    conn = _open(db_path, readonly)
+    conn._pool_key = key
+    conn._pool_gen = _generation
+    conn._checked_out = True
+    with _pool_lock:
+        _live.add(conn)
     return conn
 
 
+@contextmanager
+def writer() -> Iterator[sqlite3.Connection]:
+    """
+    Serialized write transaction on the process-wide writer connection.
+
+    One writer connection exists per DB path; entry takes a per-path lock
+    so in-process writers queue instead of fighting over SQLite's
+    RESERVED lock. Commits on clean exit, rolls back on exception.
+    Re-entrant: nested ``writer()`` blocks in the same thread join the
+    outer transaction and only the outermost one commits.
+    """
+    key = str(get_db_path())
+    with _pool_lock:
+        lock = _writer_locks.setdefault(key, threading.RLock())
+    with lock:
+        conn = _writers.get(key)
+        if conn is not None and conn._pool_gen != _generation and not _writer_depth.get(key):
+            _retire_writer(conn)
+            conn = None
+        if conn is None:
+            conn = _open(Path(key), readonly=False)
+            conn._is_writer = True
+            conn._pool_gen = _generation
+            _writers[key] = conn
+        depth = _writer_depth.get(key, 0)
+        _writer_depth[key] = depth + 1
+        try:
+            yield conn
+            if depth == 0:
+                conn.commit()
+                _count("writer_txns")
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            raise
+        finally:
+            _writer_depth[key] = depth
+
+
+def _retire_writer(conn: PooledConnection) -> None:
+    conn._is_writer = False
+    conn._discard()
+
+
+def close_all_connections() -> None:
+    """
+    Invalidate every pooled connection (e.g. before deleting a DB file).
+
+    Bumps the pool generation and closes this thread's idle handles.
+    Other threads' handles are never touched from here: their idle ones
+    are closed the next time those threads touch the pool, checked-out
+    ones on release.  Writer connections are closed now unless a write
+    is in progress, in which case the next writer() replaces them.
+    """
+    global _generation
+    with _pool_lock:
+        _generation += 1
+        locks = list(_writer_locks.items())
+    for key, lock in locks:
+        with lock:
+            conn = _writers.get(key)
+            if conn is not None and not _writer_depth.get(key):
+                del _writers[key]
+                _retire_writer(conn)
+    idle = getattr(_local, "idle", None)
+    if idle:
+        for conns in idle.values():
+            for conn in conns:
+                conn._discard()
+        idle.clear()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Counters for connections opened/reused and pool configuration."""
+    idle = getattr(_local, "idle", None) or {}
+    with _pool_lock:
+        counts = dict(_stats)
+    return {
+        **counts,
+        "enabled": _POOL_ENABLED,
+        "live": len(_live),
+        "idle_this_thread": sum(len(v) for v in idle.values()),
+        "writers": len(_writers),
+        "cache_size": _CACHE_SIZE,
+        "mmap_size": _MMAP_SIZE,
+        "synchronous": _SYNCHRONOUS,
+        "statement_cache": _STATEMENT_CACHE,
+    }
+
+
+def configure_pool(enabled: bool = None, max_idle: int = None) -> None:
+    """Toggle pooling at runtime (benchmarks, tests, one-shot scripts)."""
+    global _POOL_ENABLED, _POOL_MAX_IDLE
+    if enabled is not None:
+        _POOL_ENABLED = bool(enabled)
+    if max_idle is not None:
+        _POOL_MAX_IDLE = max(0, int(max_idle))
+    close_all_connections()
+
+
 # For backwards compatibility
 DB_PATH = get_db_path()
 
@@ -119,6 +383,10 @@ if is_demo_mode():
 
 __all__ = [
     "get_connection",
+    "writer",
+    "close_all_connections",
+    "pool_stats",
+    "configure_pool",
     "get_db_path",
     "is_demo_mode",
     "set_demo_mode",
@@ -0,0 +1,315 @@
+"""
+Table Counters
+==============
+
+Row counts for the tables STATE and the stats endpoints report on,
+without a ``SELECT COUNT(*)`` per read.
+
+SQLite has no stored row count: ``COUNT(*)`` walks the smallest index of
+the table, so the self-awareness block at the top of STATE paid for every
+row of ``unified_events``, ``log_server``, ``concept_links``, … on every
+build, and more each day.  Instead, the tables in ``COUNTED`` carry
+triggers that keep a row in ``table_counts`` up to date on every
+INSERT / DELETE, plus one row per value of the listed columns (e.g. tasks
+per ``status``), moved on UPDATE of that column.
+
+Counters are installed lazily: the first read on a DB (or
+``ensure_table_counters()``, run by the schema migration) adds triggers
+to every counted table that exists and seeds its rows with one
+``COUNT(*)``, in the same write transaction.  ``SMALL`` tables are
+bounded and simply counted.
+
+Reads go through a per-DB snapshot cached for AIOS_TABLE_COUNTS_TTL
+seconds (default 10).  ``reconcile_table_counts()`` (run by coma every
+AIOS_TABLE_COUNTS_RECONCILE_S, default 6h) recounts each table in one
+read snapshot and corrects any drift — a dropped and recreated table, an
+import that bypassed SQLite, or REPLACE (whose implicit delete fires no
+trigger).
+
+Usage:
+    from data.db.table_stats import get_table_counts, get_column_counts
+    get_table_counts()["unified_events"]
+    get_column_counts("tasks", "status").get("pending", 0)
+
+NULL column values are counted under "".
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TTL_S = float(os.getenv("AIOS_TABLE_COUNTS_TTL", "10"))
+RECONCILE_S = float(os.getenv("AIOS_TABLE_COUNTS_RECONCILE_S", str(6 * 3600)))
+
+# Tables that grow without bound → columns counted per value.
+COUNTED: Dict[str, Tuple[str, ...]] = {
+    "unified_events": ("event_type", "source"),
+    "log_server": (),
+    "log_llm_inference": (),
+    "tool_traces": (),
+    "convo_turns": (),
+    "sensory_events": (),
+    "notifications": (),
+    "concept_links": (),
+    "profile_facts": (),
+    "reflex_meta_thoughts": (),
+    "field_observations": (),
+    "field_alerts": ("acknowledged",),
+    "workspace_files": (),
+    "temp_facts": ("status",),
+    "proposed_goals": ("status",),
+    "proposed_improvements": ("status",),
+    "tasks": ("status",),
+}
+
+# Bounded tables: a plain COUNT(*) is cheap.
+SMALL: Tuple[str, ...] = (
+    "profiles",
+    "philosophy_profile_facts",
+    "reflex_triggers",
+    "form_tools",
+    "field_environments",
+    "field_presences",
+)
+
+_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS table_counts (
+        tbl TEXT NOT NULL,
+        col TEXT NOT NULL DEFAULT '',   -- '' = the table's total
+        val TEXT NOT NULL DEFAULT '',
+        n INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (tbl, col, val)
+    )
+"""
+
+
+def _bump(table: str, col: str, row: str, delta: int) -> str:
+    val = f"COALESCE(CAST({row}.{col} AS TEXT), '')" if col else "''"
+    return (
+        f"INSERT INTO table_counts (tbl, col, val, n) VALUES ('{table}', '{col}', {val}, {delta}) "
+        f"ON CONFLICT (tbl, col, val) DO UPDATE SET n = n + {delta};"
+    )
+
+
+def _trigger_sql(table: str, columns: Iterable[str]) -> List[str]:
+    columns = tuple(columns)
+    ins = " ".join(_bump(table, c, "NEW", 1) for c in ("",) + columns)
+    dele = " ".join(_bump(table, c, "OLD", -1) for c in ("",) + columns)
+    out = [
+        f"CREATE TRIGGER IF NOT EXISTS tc_{table}_ins AFTER INSERT ON {table} BEGIN {ins} END",
+        f"CREATE TRIGGER IF NOT EXISTS tc_{table}_del AFTER DELETE ON {table} BEGIN {dele} END",
+    ]
+    for c in columns:
+        out.append(
+            f"CREATE TRIGGER IF NOT EXISTS tc_{table}_upd_{c} AFTER UPDATE OF {c} ON {table} "
+            f"WHEN OLD.{c} IS NOT NEW.{c} BEGIN "
+            f"{_bump(table, c, 'OLD', -1)} {_bump(table, c, 'NEW', 1)} END"
+        )
+    return out
+
+
+def _actual(conn, table: str, columns: Iterable[str]) -> Dict[Tuple[str, str], int]:
+    """(col, val) → n by counting ``table`` itself."""
+    out = {("", ""): conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]}
+    for c in columns:
+        for val, n in conn.execute(
+            f"SELECT COALESCE(CAST({c} AS TEXT), ''), COUNT(*) FROM {table} GROUP BY 1"
+        ):
+            out[(c, val)] = n
+    return out
+
+
+def _schema(conn) -> Tuple[set, set]:
+    """(existing tables, tables whose counter triggers are installed)."""
+    tables, triggers = set(), set()
+    for kind, name in conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+    ):
+        (tables if kind == "table" else triggers).add(name)
+    installed = {t for t in COUNTED if f"tc_{t}_ins" in triggers}
+    return tables, installed
+
+
+def ensure_table_counters() -> List[str]:
+    """Install counters on every counted table that exists; returns those added."""
+    from data.db import writer
+
+    added: List[str] = []
+    with writer() as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")  # no insert slips between seed and trigger
+        conn.execute(_TABLE_SQL)
+        tables, installed = _schema(conn)
+        for table, columns in COUNTED.items():
+            if table not in tables or table in installed:
+                continue
+            for sql in _trigger_sql(table, columns):
+                conn.execute(sql)
+            conn.execute("DELETE FROM table_counts WHERE tbl = ?", (table,))
+            conn.executemany(
+                "INSERT INTO table_counts (tbl, col, val, n) VALUES (?, ?, ?, ?)",
+                [(table, c, v, n) for (c, v), n in _actual(conn, table, columns).items()],
+            )
+            added.append(table)
+    if added:
+        _stats["installed"] += len(added)
+        invalidate_table_counts()
+    return added
+
+
+# ── cached reads ──────────────────────────────────────────────────────
+
+class _Snapshot:
+    __slots__ = ("totals", "columns", "taken_at")
+
+    def __init__(self, totals: Dict[str, int], columns: Dict[Tuple[str, str], Dict[str, int]]):
+        self.totals = totals
+        self.columns = columns
+        self.taken_at = time.time()
+
+
+_SNAPSHOTS: Dict[str, _Snapshot] = {}
+_lock = threading.Lock()
+_stats = {"reads": 0, "refreshes": 0, "installed": 0, "reconciled": 0, "drift_fixed": 0}
+
+
+def _take(conn) -> Tuple[_Snapshot, set]:
+    """Snapshot from the counters, plus existing counted tables not yet installed."""
+    tables, installed = _schema(conn)
+    totals: Dict[str, int] = {}
+    columns: Dict[Tuple[str, str], Dict[str, int]] = {}
+    if "table_counts" in tables and installed:
+        for tbl, col, val, n in conn.execute("SELECT tbl, col, val, n FROM table_counts"):
+            if tbl not in installed:
+                continue
+            if col:
+                if n:
+                    columns.setdefault((tbl, col), {})[val] = n
+            else:
+                totals[tbl] = n
+    missing = {t for t in COUNTED if t in tables and t not in installed}
+    # Not installed (read-only DB, install failed): count them directly
+    for table in SMALL + tuple(sorted(missing)):
+        if table not in tables:
+            continue
+        actual = _actual(conn, table, COUNTED.get(table, ()))
+        totals[table] = actual.pop(("", ""))
+        for (col, val), n in actual.items():
+            columns.setdefault((table, col), {})[val] = n
+    return _Snapshot(totals, columns), missing
+
+
+def _snapshot() -> _Snapshot:
+    from data.db import get_connection, get_db_path
+
+    key = str(get_db_path())
+    with _lock:
+        _stats["reads"] += 1
+        snap = _SNAPSHOTS.get(key)
+        if snap is not None and time.time() - snap.taken_at <= TTL_S:
+            return snap
+    with closing(get_connection(readonly=True)) as conn:
+        snap, missing = _take(conn)
+    if missing:
+        try:
+            ensure_table_counters()
+        except sqlite3.Error:
+            pass  # read-only DB: keep counting those tables directly
+        else:
+            with closing(get_connection(readonly=True)) as conn:
+                snap, _ = _take(conn)
+    with _lock:
+        _SNAPSHOTS[key] = snap
+        _stats["refreshes"] += 1
+    return snap
+
+
+def get_table_counts(tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Row count per table (COUNTED and SMALL tables that exist).
+
+    At most AIOS_TABLE_COUNTS_TTL seconds old.  ``tables`` limits the
+    result; tables that don't exist are left out.
+    """
+    totals = _snapshot().totals
+    if tables is None:
+        return dict(totals)
+    return {t: totals[t] for t in tables if t in totals}
+
+
+def get_column_counts(table: str, column: str) -> Dict[str, int]:
+    """Rows of ``table`` per value of ``column`` (a column listed in COUNTED)."""
+    return dict(_snapshot().columns.get((table, column), {}))
+
+
+def invalidate_table_counts() -> None:
+    """Drop cached snapshots; the next read goes to the counters."""
+    with _lock:
+        _SNAPSHOTS.clear()
+
+
+# ── reconciliation ───────────────────────────────────────────────────
+
+def reconcile_table_counts() -> int:
+    """Recount every installed table and correct drifted counters.
+
+    Counts and counters are read in one read transaction, so they see
+    the same rows; the differences are then applied as deltas, which
+    stay correct however many rows were written since.  Returns the
+    number of counters corrected.
+    """
+    from data.db import get_connection, writer
+
+    fixes: List[Tuple[str, str, str, int]] = []
+    with closing(get_connection(readonly=True)) as conn:
+        conn.execute("BEGIN")
+        try:
+            tables, installed = _schema(conn)
+            if "table_counts" not in tables:
+                return 0
+            stored: Dict[Tuple[str, str, str], int] = {
+                (t, c, v): n for t, c, v, n in
+                conn.execute("SELECT tbl, col, val, n FROM table_counts")
+            }
+            for table in sorted(installed):
+                actual = _actual(conn, table, COUNTED[table])
+                keys = {(c, v) for t, c, v in stored if t == table} | set(actual)
+                for c, v in keys:
+                    delta = actual.get((c, v), 0) - stored.get((table, c, v), 0)
+                    if delta:
+                        fixes.append((table, c, v, delta))
+        finally:
+            conn.rollback()
+    if fixes:
+        with writer() as conn:
+            conn.executemany(
+                "INSERT INTO table_counts (tbl, col, val, n) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (tbl, col, val) DO UPDATE SET n = n + excluded.n",
+                fixes,
+            )
+        invalidate_table_counts()
+    with _lock:
+        _stats["reconciled"] += 1
+        _stats["drift_fixed"] += len(fixes)
+    return len(fixes)
+
+
+def table_counts_stats() -> Dict[str, int]:
+    with _lock:
+        return {**_stats, "snapshots": len(_SNAPSHOTS)}
+
+
+__all__ = [
+    "COUNTED",
+    "SMALL",
+    "ensure_table_counters",
+    "get_table_counts",
+    "get_column_counts",
+    "invalidate_table_counts",
+    "reconcile_table_counts",
+    "table_counts_stats",
+]
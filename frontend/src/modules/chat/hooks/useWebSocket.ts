@@ -8,6 +8,9 @@ export const useWebSocket = () => {
   const [isConnected, setIsConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null);
   const [connectionAttempts, setConnectionAttempts] = useState(0);
+  // Response chunks carry deltas; accumulate here so consumers always see
+  // the full text so far, even if React batches several messages.
+  const streamText = useRef<Record<string, string>>({});
 
   const connect = useCallback(() => {
     if (IS_DEMO) return;
@@ -27,6 +30,20 @@ export const useWebSocket = () => {
       ws.current.onmessage = (event) => {
         try {
           const data: WebSocketMessage = JSON.parse(event.data);
+          if (data.type === 'agent_response_chunk' && data.message_id) {
+            const id = data.message_id;
+            // `replace` (final chunk only) carries the whole stored reply
+            const text = data.replace
+              ? (data.content ?? '')
+              : (streamText.current[id] ?? '') + (data.content ?? '');
+            if (data.is_final) {
+              delete streamText.current[id];
+            } else {
+              streamText.current[id] = text;
+            }
+            setLastMessage({ ...data, content: text });
+            return;
+          }
           setLastMessage(data);
         } catch (error) {
           console.error('Error parsing WebSocket message:', error);
@@ -29,6 +29,7 @@ export interface WebSocketMessage {
   content?: string;
   message_id?: string;
   is_final?: boolean;
+  replace?: boolean;
   provider?: string;
   model?: string;
   endpoint?: string;
@@ -165,6 +165,12 @@ def resolve_card(
 
     card = _row_to_dict(updated)
     _emit_resolution_event(card)
+    if status != "expired":
+        try:
+            from agent.subconscious.loops.scheduler import note_user_activity
+            note_user_activity("user")
+        except Exception:
+            pass
     return card
 
 
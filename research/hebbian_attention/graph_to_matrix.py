@@ -12,6 +12,7 @@ Output formats:
   1. Sparse adjacency matrix (COO format) — for attention bias initialization
   2. Concept vocabulary + embeddings — for the embedding layer
   3. Degree-weighted position encodings — graph distance from identity node
+  4. Per-head CSR attention bias — what GraphAttention loads at runtime
 """
 
 import sqlite3
@@ -291,6 +292,84 @@ def graph_to_attention_bias_with_vocab(
     return bias
 
 
+def graph_to_attention_csr(
+    vocab: List[str],
+    concept_to_idx: Dict[str, int],
+    edges: List[Tuple[int, int, float]],
+    num_heads: int = 6,
+    scale: float = 2.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Same head routing as graph_to_attention_bias_with_vocab, as per-head CSR.
+
+    Never materializes the dense (num_heads, V, V) tensor, so memory scales
+    with edge count. All heads share one indices/data array; head h, row i
+    spans indices[indptr[h, i]:indptr[h, i + 1]].
+
+    Returns:
+        {"indptr": (num_heads, V+1) int64, "indices": (nnz,) int32,
+         "data": (nnz,) float32, "shape": [num_heads, V, V]}
+    """
+    n = len(vocab)
+    if edges:
+        src = np.fromiter((e[0] for e in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((e[1] for e in edges), dtype=np.int64, count=len(edges))
+        strength = np.fromiter((e[2] for e in edges), dtype=np.float32, count=len(edges))
+    else:
+        src = dst = np.zeros(0, dtype=np.int64)
+        strength = np.zeros(0, dtype=np.float32)
+
+    def _classify(prefixes: List[str]) -> np.ndarray:
+        mask = np.zeros(n, dtype=bool)
+        for concept, idx in concept_to_idx.items():
+            if concept.lower().startswith(tuple(prefixes)):
+                mask[idx] = True
+        return mask
+
+    identity = _classify(["identity", "user", "name", "self"])
+    form = _classify(["form", "tool", "capability", "system"])
+    philosophy = _classify(["philosophy", "value", "belief", "ethic"])
+
+    scaled = strength * np.float32(scale)
+    everything = np.ones(len(src), dtype=bool)
+    # (mask, multiplier) per head, mirroring the dense builder
+    heads = [
+        (identity[src] | identity[dst], 1.2),
+        (everything, 0.8),
+        (form[src] | form[dst], 1.2),
+        (philosophy[src] | philosophy[dst], 1.2),
+        (strength > 0.7, 1.5),
+        (everything, 1.0),
+    ][:num_heads]
+
+    indptr = np.zeros((num_heads, n + 1), dtype=np.int64)
+    indices, data = [], []
+    offset = 0
+    for h, (mask, mult) in enumerate(heads):
+        rows, cols = src[mask], dst[mask]
+        vals = scaled[mask] * np.float32(mult) if mult != 1.0 else scaled[mask]
+        # Dense assignment is last-write-wins for repeated (i, j); keep the
+        # last occurrence so both layouts hold the same values.
+        order = np.lexsort((np.arange(len(rows)), cols, rows))
+        rows, cols, vals = rows[order], cols[order], vals[order]
+        if len(rows):
+            last = np.ones(len(rows), dtype=bool)
+            last[:-1] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            rows, cols, vals = rows[last], cols[last], vals[last]
+        indptr[h, 1:] = offset + np.cumsum(np.bincount(rows, minlength=n))
+        indptr[h, 0] = offset
+        offset += len(rows)
+        indices.append(cols.astype(np.int32))
+        data.append(vals.astype(np.float32))
+
+    return {
+        "indptr": indptr,
+        "indices": np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+        "data": np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+        "shape": np.array([num_heads, n, n], dtype=np.int64),
+    }
+
+
 # ─────────────────────────────────────────────────────────────
 # 4. Graph-distance position encoding
 # ─────────────────────────────────────────────────────────────
@@ -373,6 +452,7 @@ def export_graph_data(
     output_dir: str = "research/hebbian_attention/data",
     min_strength: float = 0.1,
     potentiation: Optional[str] = None,
+    dense_max_vocab: int = 4096,
 ) -> Dict[str, Any]:
     """
     Full export pipeline: load graph, compute all matrices, save to disk.
@@ -380,7 +460,10 @@ def export_graph_data(
     Produces:
       - vocab.json: concept vocabulary mapping
       - adjacency.npz: sparse adjacency matrix (COO)
-      - attention_bias.npy: (6, V, V) multi-head attention bias
+      - attention_bias_csr.npz: per-head CSR attention bias (uncompressed,
+        so GraphAttention can memory-map it)
+      - attention_bias.npy: (6, V, V) dense bias, only when
+        V <= dense_max_vocab (training experiments still read it)
       - position_encoding.npy: (V,) identity-distance encoding
       - graph_stats.json: summary statistics
     """
@@ -405,13 +488,22 @@ def export_graph_data(
     print(f"Adjacency: {len(rows)} nonzero entries, density={len(rows)/(n*n):.6f}")
 
     # Multi-head attention bias
-    attn_bias = graph_to_attention_bias_with_vocab(vocab, c2i, edges)
-    np.save(out / "attention_bias.npy", attn_bias)
-    print(f"Attention bias: shape={attn_bias.shape}")
-    for h in range(attn_bias.shape[0]):
-        nonzero = np.count_nonzero(attn_bias[h])
+    csr = graph_to_attention_csr(vocab, c2i, edges)
+    np.savez(out / "attention_bias_csr.npz", **csr)
+    head_nonzero = np.diff(csr["indptr"][:, [0, -1]], axis=1).ravel()
+    print(f"Attention bias (CSR): shape={tuple(csr['shape'])}, nnz={len(csr['data'])}")
+    for h, nonzero in enumerate(head_nonzero):
         print(f"  Head {h}: {nonzero} nonzero entries")
 
+    dense_path = out / "attention_bias.npy"
+    if n <= dense_max_vocab:
+        np.save(dense_path, graph_to_attention_bias_with_vocab(vocab, c2i, edges))
+    elif dense_path.exists():
+        # Don't leave a dense tensor from an older, smaller export behind
+        # for training scripts to pick up.
+        dense_path.unlink()
+        print(f"Skipped dense attention_bias.npy (vocab {n} > {dense_max_vocab})")
+
     # Position encoding (identity distance)
     pos = compute_identity_distance(vocab, c2i, edges)
     np.save(out / "position_encoding.npy", pos)
@@ -426,8 +518,7 @@ def export_graph_data(
         "avg_strength": float(np.mean(vals)) if len(vals) > 0 else 0,
         "reachable_from_identity": int(reachable),
         "head_nonzero": {
-            f"head_{h}": int(np.count_nonzero(attn_bias[h]))
-            for h in range(attn_bias.shape[0])
+            f"head_{h}": int(nonzero) for h, nonzero in enumerate(head_nonzero)
         },
     }
     with open(out / "graph_stats.json", "w") as f:
@@ -450,6 +541,7 @@ if __name__ == "__main__":
     parser.add_argument("--min-strength", type=float, default=0.1, help="Min link strength")
     parser.add_argument("--potentiation", choices=["LONG", "SHORT"], default=None, help="Filter by potentiation")
     parser.add_argument("--long-only", action="store_true", help="Only use LONG-potentiated links")
+    parser.add_argument("--dense-max-vocab", type=int, default=4096, help="Skip dense attention_bias.npy above this vocab size")
 
     args = parser.parse_args()
 
@@ -460,6 +552,7 @@ if __name__ == "__main__":
         output_dir=args.out,
         min_strength=args.min_strength,
         potentiation=pot,
+        dense_max_vocab=args.dense_max_vocab,
     )
 
     print(f"\nDone. Vocab={stats['vocab_size']}, Edges={stats['total_edges']}")
@@ -0,0 +1,132 @@
+"""Load test: /health latency while chat turns are in flight.
+
+Serves scripts.server's app with uvicorn in-process, points the CHAT role
+at a fake provider whose calls block for --llm-ms (like a blocking HTTP
+call to Ollama), then fires --chats concurrent POST /api/chat/message
+while polling GET /health every --poll-ms.  Runs twice:
+
+    inline   – AIOS_TURN_OFFLOAD=0 behaviour: the turn blocks the event loop
+    offload  – STATE assembly + generate on the turn executor
+
+and reports health p50/p99/max during chat, plus chat wall time.
+
+    python scripts/bench_chat_load.py [--chats 8] [--llm-ms 400]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+os.environ["AIOS_DEMO_ALLOW_LLM"] = "1"
+os.environ["AIOS_TOOL_MODE"] = "text"
+os.environ["AIOS_CHAT_PROVIDER"] = "benchslow"
+os.environ["AIOS_CHAT_MODEL"] = "slow-1"
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from agent.core.migrations import ensure_all_schemas  # noqa: E402
+from agent.services import llm, turn_executor  # noqa: E402
+from scripts.server import app  # noqa: E402
+
+LLM_SECONDS = 0.4
+
+
+class BenchSlowProvider(llm.LLMProvider):
+    name = "benchslow"
+    default_model = "slow-1"
+
+    def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+        time.sleep(LLM_SECONDS)
+        return "A reply from a slow model."
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pct(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def _run(base: str, chats: int, poll_s: float, headers: dict) -> dict:
+    health = []
+    async with httpx.AsyncClient(base_url=base, headers=headers, timeout=120) as client:
+        done = asyncio.Event()
+
+        async def poll():
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await client.get("/health")
+                health.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(poll_s)
+
+        async def chat(i: int):
+            r = await client.post("/api/chat/message", json={"content": f"load test message {i}"})
+            r.raise_for_status()
+
+        poller = asyncio.create_task(poll())
+        await asyncio.sleep(poll_s * 5)
+        t0 = time.perf_counter()
+        await asyncio.gather(*(chat(i) for i in range(chats)))
+        wall = time.perf_counter() - t0
+        done.set()
+        await poller
+    return {"health": health, "wall": wall}
+
+
+def main() -> int:
+    global LLM_SECONDS
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chats", type=int, default=8)
+    ap.add_argument("--llm-ms", type=int, default=400)
+    ap.add_argument("--poll-ms", type=int, default=10)
+    args = ap.parse_args()
+    LLM_SECONDS = args.llm_ms / 1000
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    ensure_all_schemas()
+    llm.PROVIDER_CLASSES["benchslow"] = BenchSlowProvider
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port,
+                                           log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    from agent.core.auth import _read_token_from_env
+    token = _read_token_from_env()
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    base = f"http://127.0.0.1:{port}"
+    limit = llm.provider_limit("benchslow")
+    print(f"{args.chats} concurrent chats, model call {args.llm_ms} ms, "
+          f"provider limit {limit}, {turn_executor.TURN_WORKERS} turn workers")
+    print(f"{'mode':<10}{'health n':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'chat wall s':>13}")
+    for mode in ("inline", "offload"):
+        turn_executor.OFFLOAD = mode == "offload"
+        res = asyncio.run(_run(base, args.chats, args.poll_ms / 1000, headers))
+        h = res["health"]
+        print(f"{mode:<10}{len(h):>10}{statistics.median(h):>9.1f}{_pct(h, 99):>9.1f}"
+              f"{max(h):>9.1f}{res['wall']:>13.2f}")
+    server.should_exit = True
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""Benchmark: regex_search file search, tree walk vs trigram index.
+
+Runs a fixed list of patterns over the repo through the regex_search
+tool, once walking and reading every file (AIOS_CODE_INDEX=0, the old
+path) and once through tools/code_index.py.  The index is timed cold (a
+full build into a temp DB dir), warm from its snapshot in a fresh
+process state, and hot (in memory).  Checks both paths find the same
+matches.
+
+    python scripts/bench_code_search.py [--runs 5]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.threads.form.tools import code_index  # noqa: E402
+from agent.threads.form.tools.executables import regex_search  # noqa: E402
+
+PATTERNS = [
+    r"def build_state",
+    r"trace_bus\.publish",
+    r"class \w+Index",
+    r"(?i)select .* from concept_links",
+    r"\bSKIP_(DIRS|EXTS)\b",
+    r"xyzzy_nothing",
+    r"\d{4}-\d{2}-\d{2}",
+]
+
+
+def _search(pattern):
+    return regex_search.run("search", {"pattern": pattern, "directory": ".", "context_lines": 0})
+
+
+def _timed(runs, pattern):
+    out, ms = None, []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = _search(pattern)
+        ms.append((time.perf_counter() - t0) * 1000)
+    return out, float(np.median(ms))
+
+
+def _hits(pattern):
+    """Every match (no MAX_MATCHES cut) found the same by both paths."""
+    rx = re.compile(pattern)
+    limit, regex_search.MAX_MATCHES = regex_search.MAX_MATCHES, 10**9
+    walked, _ = regex_search._scan_walk(regex_search.WORKSPACE_ROOT, rx, "*", 0)
+    regex_search.MAX_MATCHES = limit
+    indexed, _ = code_index.search(regex_search.WORKSPACE_ROOT, pattern, 0, ".", "*", 0, 10**9)
+    key = lambda m: (m["file"], m["line"])
+    return sorted(map(key, walked)) == sorted(map(key, indexed))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    root = regex_search.WORKSPACE_ROOT
+    t0 = time.perf_counter()
+    code_index.get_index(root)
+    cold = (time.perf_counter() - t0) * 1000
+    code_index.invalidate()
+    t0 = time.perf_counter()
+    code_index.get_index(root)
+    warm = (time.perf_counter() - t0) * 1000
+    stats = code_index.index_stats()["indexes"][str(root)]
+    print(f"{stats['files']} files, {stats['trigrams']} trigrams; "
+          f"cold build {cold:.0f} ms, snapshot load {warm:.0f} ms")
+
+    print(f"{'pattern':<36}{'walk ms':>10}{'index ms':>10}{'same':>6}")
+    for pattern in PATTERNS:
+        code_index.ENABLED = False
+        _, walk_ms = _timed(args.runs, pattern)
+        code_index.ENABLED = True
+        _, index_ms = _timed(args.runs, pattern)
+        print(f"{pattern[:34]:<36}{walk_ms:>10.1f}{index_ms:>10.1f}{'yes' if _hits(pattern) else 'NO':>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
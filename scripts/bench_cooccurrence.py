@@ -0,0 +1,123 @@
+"""Benchmark: key co-occurrence scoring, per-key SELECTs vs the shard cache.
+
+Seeds --pairs key_cooccurrence rows over --keys dotted fact keys, then
+scores --facts candidate keys against --context context keys:
+
+    legacy  – the old get_cooccurrence_score per fact: a connection,
+              init_cooccurrence_table, one SELECT per context key
+    cold    – cooccurrence_scores() for all facts, shards loaded in the call
+    warm    – the same call again (shards cached)
+    write   – record_cooccurrence_batch of one STATE's pairs, then warm
+
+Checks that every path returns the same boosts.
+
+    python scripts/bench_cooccurrence.py [--pairs 200000] [--facts 500] [--context 50]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.threads.linking_core.cooccurrence import (  # noqa: E402
+    cooccurrence_scores, cooccurrence_stats, invalidate_cooccurrence,
+)
+from agent.threads.linking_core.schema import (  # noqa: E402
+    init_cooccurrence_table, record_cooccurrence_batch,
+)
+from data.db import get_connection, writer  # noqa: E402
+
+NAMESPACES = ("identity", "philosophy", "form", "log", "reflex", "workspace", "goals", "chat")
+
+
+def _legacy(key, context_keys):
+    with closing(get_connection(readonly=True)) as conn:
+        cur = conn.cursor()
+        init_cooccurrence_table(conn)
+        total = 0.0
+        for ctx in context_keys:
+            a, b = (key, ctx) if key < ctx else (ctx, key)
+            cur.execute(
+                "SELECT count FROM key_cooccurrence WHERE key_a = ? AND key_b = ?", (a, b),
+            )
+            row = cur.fetchone()
+            if row:
+                total += min(math.log(row[0] + 1) * 0.03, 0.15)
+    return min(total, 0.3)
+
+
+def _timed(fn, runs=5):
+    out, ms = None, []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn()
+        ms.append((time.perf_counter() - t0) * 1000)
+    return out, float(np.median(ms))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--keys", type=int, default=20000)
+    ap.add_argument("--pairs", type=int, default=200000)
+    ap.add_argument("--facts", type=int, default=500)
+    ap.add_argument("--context", type=int, default=50)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    keys = [f"{rng.choice(NAMESPACES)}.k{i // 50}.f{i}" for i in range(args.keys)]
+    hot = keys[: args.keys // 20]   # STATE keeps seeing the same few keys
+    init_cooccurrence_table()
+    pairs = {}
+    while len(pairs) < args.pairs:
+        a = rng.choice(hot) if rng.random() < 0.5 else rng.choice(keys)
+        b = rng.choice(keys)
+        if a != b:
+            pairs[tuple(sorted((a, b)))] = rng.randint(1, 200)
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO key_cooccurrence (key_a, key_b, count) VALUES (?, ?, ?)",
+            [(a, b, n) for (a, b), n in pairs.items()],
+        )
+    facts = rng.sample(keys, args.facts)
+    context = rng.sample(hot, args.context)
+    print(f"{args.pairs} pairs over {args.keys} keys; {args.facts} facts x {args.context} context keys")
+    print(f"{'path':<8}{'ms':>10}")
+
+    expected, ms = _timed(lambda: [_legacy(k, context) for k in facts], runs=3)
+    print(f"{'legacy':<8}{ms:>10.1f}")
+
+    invalidate_cooccurrence()
+    t0 = time.perf_counter()
+    cold = cooccurrence_scores(facts, context)
+    print(f"{'cold':<8}{(time.perf_counter() - t0) * 1000:>10.1f}")
+    warm, ms = _timed(lambda: cooccurrence_scores(facts, context))
+    print(f"{'warm':<8}{ms:>10.2f}")
+
+    state = rng.sample(hot, 40)
+    record_cooccurrence_batch(
+        [(state[i], state[j]) for i in range(len(state)) for j in range(i + 1, len(state))]
+    )
+    after, ms = _timed(lambda: cooccurrence_scores(facts, context))
+    print(f"{'write':<8}{ms:>10.2f}")
+    fresh = [_legacy(k, context) for k in facts]
+
+    assert np.allclose(cold, expected) and np.allclose(warm, expected)
+    assert np.allclose(after, fresh)
+    print(f"boosts match legacy; nonzero {sum(b > 0 for b in warm)}/{len(warm)}; {cooccurrence_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
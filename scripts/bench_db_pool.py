@@ -0,0 +1,62 @@
+"""Benchmark: connections opened and wall time per Subconscious.get_state().
+
+Runs the same STATE builds with the connection pool disabled (one sqlite3
+connection + PRAGMAs per get_connection() call, the old behaviour) and
+enabled (per-thread pooled handles).
+
+    AIOS_MODE=demo python scripts/bench_db_pool.py [--runs 20]
+
+Co-activation recording is turned off so the benchmark doesn't write
+Hebbian counts into the DB; otherwise each iteration is get_state().
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("AIOS_MODE", "demo")
+
+from data.db import configure_pool, pool_stats  # noqa: E402
+
+QUERIES = [
+    "what do you know about dad",
+    "what tools can you use",
+    "summarize philosophy and values",
+    "show me workspace files",
+]
+
+
+def _run(sub, runs: int) -> tuple:
+    opened_before = pool_stats()["opened"]
+    t0 = time.perf_counter()
+    for i in range(runs):
+        q = QUERIES[i % len(QUERIES)]
+        sub.build_state(sub.score(q), q, record_activations=False)
+    elapsed = time.perf_counter() - t0
+    opened = pool_stats()["opened"] - opened_before
+    return opened / runs, elapsed * 1000 / runs
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    from agent.subconscious.orchestrator import get_subconscious
+    sub = get_subconscious()
+    sub.build_state(sub.score("warmup"), "warmup", record_activations=False)
+
+    print(f"{'mode':<10}{'conns/call':>12}{'ms/call':>12}")
+    for label, enabled in (("unpooled", False), ("pooled", True)):
+        configure_pool(enabled=enabled)
+        _run(sub, 2)  # fill the pool / warm OS caches
+        per_call, ms = _run(sub, args.runs)
+        print(f"{label:<10}{per_call:>12.1f}{ms:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
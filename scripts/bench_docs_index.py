@@ -0,0 +1,114 @@
+"""Benchmark: docs context from a full os.walk vs the SQLite docs index.
+
+Builds a synthetic tree (default 20k files, ~15% markdown, nested a few
+levels deep with data/ and frontend/-style bulk) and compares:
+
+    walk      – the old per-STATE path: os.walk + stat every .md + read
+                titles for the emitted docs
+    index     – Subconscious._get_docs_context at L3 reading the index
+    refresh   – the background loop's incremental refresh after touching
+                a handful of files
+
+    python scripts/bench_docs_index.py [--files 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+from agent.subconscious import docs_index  # noqa: E402
+from agent.subconscious.orchestrator import Subconscious  # noqa: E402
+
+WORDS = ("memory graph state thread linking concept identity loop docs "
+         "schema adapter workspace goal reflex sensory philosophy").split()
+
+
+def _build_tree(root: Path, n_files: int) -> list:
+    rng = random.Random(3)
+    dirs = [root]
+    for top in ("agent", "data", "frontend", "workspace", "docs"):
+        for i in range(40):
+            for j in range(5):
+                dirs.append(root / top / f"m{i}" / f"s{j}")
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+    md = []
+    for k in range(n_files):
+        d = rng.choice(dirs)
+        if rng.random() < 0.15:
+            name = "README.md" if rng.random() < 0.2 else f"{rng.choice(WORDS)}_{k}.md"
+            p = d / name
+            body = " ".join(rng.choice(WORDS) for _ in range(200))
+            p.write_text(f"# {rng.choice(WORDS).title()} {k}\n\n{body}\n")
+            md.append(p)
+        else:
+            (d / f"f{k}.json").write_text("{}")
+    return md
+
+
+def _legacy_walk(root: Path, level: int = 3, max_results: int = 8) -> int:
+    """The pre-index _get_docs_context file discovery + title reads."""
+    md_files = []
+    for dp, dns, fns in os.walk(root):
+        dns[:] = [d for d in dns if d not in docs_index.PRUNE_DIRS]
+        for fn in fns:
+            if fn.lower().endswith(".md"):
+                fp = os.path.join(dp, fn)
+                st = os.stat(fp)
+                md_files.append((os.path.relpath(fp, root), st.st_mtime, st.st_size))
+    readmes = [m for m in md_files if m[0].endswith("/README.md")]
+    ranked = sorted(md_files, key=lambda m: m[1], reverse=True)[:max_results]
+    for rel, _mt, _sz in readmes + ranked:
+        with open(root / rel, "r", encoding="utf-8", errors="ignore") as fh:
+            fh.read(400)
+    return len(md_files)
+
+
+def _time(fn, runs: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / runs
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=20_000)
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+
+    tree = _TMP / "tree"
+    md = _build_tree(tree, args.files)
+    docs_index.DOCS_ROOT = tree
+    print(f"tree: {args.files} files, {len(md)} markdown")
+
+    t0 = time.perf_counter()
+    stats = docs_index.refresh_docs_index(tree)
+    print(f"initial index build: {(time.perf_counter() - t0) * 1000:.0f} ms ({stats['added']} docs)")
+
+    for p in random.Random(5).sample(md, 10):
+        p.write_text(p.read_text() + "\nedited\n")
+    stats = docs_index.refresh_docs_index(tree)
+    print(f"incremental refresh: {stats['ms']} ms (updated {stats['updated']})")
+
+    sub = Subconscious()
+    query = "how does the concept graph linking work"
+    walk_ms = _time(lambda: _legacy_walk(tree), args.runs)
+    index_ms = _time(lambda: sub._get_docs_context(query, level=3), args.runs)
+    print(f"{'per STATE build':<18}{'ms':>8}")
+    print(f"{'walk':<18}{walk_ms:>8.1f}")
+    print(f"{'index':<18}{index_ms:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
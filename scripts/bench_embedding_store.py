@@ -0,0 +1,103 @@
+"""Benchmark: per-text embedding + Python-loop scoring vs the batched store.
+
+A fake provider stands in for Ollama/OpenAI: every request costs
+--request-ms plus --per-text-ms per text, and returns dim --dim vectors.
+Scores --items facts against a query with:
+
+    legacy    – the old path: one provider request per uncached text,
+                dict cache, cosine per item in a Python loop
+    store     – get_embeddings (one request per AIOS_EMBED_BATCH misses,
+                persisted) + one matrix-vector product
+
+cold = empty caches; warm = same process again; restart = memory tier
+dropped, vectors come back from the on-disk store.
+
+    python scripts/bench_embedding_store.py [--items 2000] [--dim 768]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+os.environ["AIOS_EMBED_PROVIDER"] = "benchfake"
+os.environ["AIOS_EMBED_MODEL"] = "fake-768"
+
+import numpy as np  # noqa: E402
+
+from agent.threads.linking_core import scoring  # noqa: E402
+
+ARGS = None
+_requests = [0]
+
+
+def _fake_vectors(texts):
+    _requests[0] += 1
+    time.sleep((ARGS.request_ms + ARGS.per_text_ms * len(texts)) / 1000)
+    return [np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(ARGS.dim).astype(np.float32)
+            for t in texts]
+
+
+def _legacy_score(query, items, cache):
+    """The pre-store score_relevance: per-item embed + cosine loop."""
+    def embed(text):
+        if text not in cache:
+            cache[text] = _fake_vectors([text])[0]
+        return cache[text]
+
+    q = embed(query)
+    scores = []
+    for item in items:
+        text = scoring._item_to_text(item)
+        sim = scoring.cosine_similarity(q, embed(text))
+        scores.append((item["key"], 0.7 * sim + 0.3 * item.get("weight", 0.5)))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
+
+
+def _timed(fn):
+    before = _requests[0]
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000, _requests[0] - before
+
+
+def main() -> int:
+    global ARGS
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=2000)
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--request-ms", type=float, default=5.0)
+    ap.add_argument("--per-text-ms", type=float, default=0.2)
+    ARGS = ap.parse_args()
+
+    scoring._probe = lambda: True
+    scoring._embed_batch_raw = _fake_vectors
+    items = [{"key": f"fact_{i}", "data": {"value": f"user fact number {i} about topic {i % 37}"},
+              "weight": (i % 10) / 10} for i in range(ARGS.items)]
+    query = "what topics does the user care about"
+
+    print(f"{ARGS.items} items, dim {ARGS.dim}, provider {ARGS.request_ms} ms/request "
+          f"+ {ARGS.per_text_ms} ms/text")
+    print(f"{'path':<18}{'ms':>10}{'requests':>10}")
+    cache = {}
+    for label in ("legacy cold", "legacy warm"):
+        ms, reqs = _timed(lambda: _legacy_score(query, items, cache))
+        print(f"{label:<18}{ms:>10.1f}{reqs:>10}")
+    for label in ("store cold", "store warm", "store restart"):
+        if label == "store restart":
+            scoring.clear_cache()
+        ms, reqs = _timed(lambda: scoring.score_relevance(query, items))
+        print(f"{label:<18}{ms:>10.1f}{reqs:>10}")
+    print(f"store: {scoring.cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
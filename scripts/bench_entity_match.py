@@ -0,0 +1,193 @@
+"""Benchmark: concept extraction against --entities known entities.
+
+Fills a temp DB with --entities fact keys (dot/underscore names over a
+--vocab word vocabulary, like "sarah.likes_blue_coffee") plus tools and
+profiles, then compares:
+
+  old     the pre-matcher registry: token → list built by a full scan
+          (list membership checks), per-text Python loop over the words,
+          invalidated and rebuilt after any fact/tool/profile change
+  single  extract_concepts_from_text() per text (change log read at most
+          every AIOS_ENTITY_SYNC_S)
+  batch   extract_concepts_batch() over all --texts texts
+
+Reports the full build, texts/sec, and the cost of picking up --changes
+new facts: a rebuild for the old registry, a change-log sync for the
+matcher.  Results of both are checked to be identical.
+
+    python scripts/bench_entity_match.py [--entities 100000] [--texts 5000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+from contextlib import closing  # noqa: E402
+
+from agent.core import migrations  # noqa: E402
+from agent.threads.linking_core import entity_matcher  # noqa: E402
+from agent.threads.linking_core.entity_matcher import NOISE_TOKENS  # noqa: E402
+from agent.threads.linking_core.schema import (  # noqa: E402
+    extract_concepts_batch, extract_concepts_from_text,
+)
+from data.db import get_connection, writer  # noqa: E402
+
+FILLER = ("so then we went over to the place and talked about how it was going "
+          "with everything after lunch i think it was fine but maybe not").split()
+
+
+class _OldRegistry:
+    """linking_core.schema's registry before entity_matcher."""
+
+    def __init__(self):
+        self.token_map, self.names = {}, set()
+
+    def build(self):
+        names = set()
+        with closing(get_connection(readonly=True)) as conn:
+            names.update(k for (k,) in conn.execute("SELECT DISTINCT key FROM profile_facts"))
+            names.update(k for (k,) in conn.execute("SELECT DISTINCT key FROM philosophy_profile_facts"))
+            for pid, dname in conn.execute("SELECT profile_id, display_name FROM profiles"):
+                names.add(pid)
+                if dname:
+                    names.add(dname.lower())
+            names.update(t for (t,) in conn.execute("SELECT name FROM form_tools WHERE enabled = 1"))
+        token_map = {}
+        for name in names:
+            tokens = re.split(r'[._\s]+', name.lower())
+            tokens = [t for t in tokens if len(t) >= 3 and t not in NOISE_TOKENS]
+            for token in tokens:
+                token_map.setdefault(token, [])
+                if name not in token_map[token]:
+                    token_map[token].append(name)
+        self.token_map, self.names = token_map, names
+
+    def extract(self, text):
+        text_words = set(re.findall(r'\b[a-z][a-z0-9]{1,}\b', text.lower()))
+        matched = set()
+        for word in text_words:
+            if word in NOISE_TOKENS:
+                continue
+            if word in self.token_map:
+                for entity_name in self.token_map[word]:
+                    matched.add(entity_name)
+        return list(matched)
+
+
+def _words(n, rnd):
+    out = set()
+    while len(out) < n:
+        w = "".join(rnd.choices("abcdefghijklmnoprstuvwyz", k=rnd.randint(4, 9)))
+        if w not in NOISE_TOKENS:
+            out.add(w)
+    return sorted(out)
+
+
+def _key(rnd, vocab):
+    parts = [rnd.choice(vocab) for _ in range(rnd.randint(2, 4))]
+    return f"{parts[0]}.{'_'.join(parts[1:])}" if rnd.random() < 0.7 else "_".join(parts)
+
+
+def _fill(args, rnd, vocab):
+    keys = set()
+    while len(keys) < args.entities:
+        keys.add(_key(rnd, vocab))
+    with writer() as conn:
+        conn.execute("INSERT OR IGNORE INTO profile_types (type_name) VALUES ('bench')")
+        conn.execute("INSERT OR IGNORE INTO fact_types (fact_type) VALUES ('bench')")
+        conn.executemany(
+            "INSERT OR IGNORE INTO profiles (profile_id, type_name, display_name) VALUES (?, 'bench', ?)",
+            ((f"bench.p{i}", f"{rnd.choice(vocab).title()} {rnd.choice(vocab).title()}") for i in range(200)),
+        )
+        conn.executemany(
+            "INSERT INTO profile_facts (profile_id, key, fact_type) VALUES (?, ?, 'bench')",
+            ((f"bench.p{i % 200}", k) for i, k in enumerate(sorted(keys))),
+        )
+
+
+def _texts(n, rnd, vocab):
+    return [
+        " ".join(rnd.choice(vocab) if rnd.random() < 0.15 else rnd.choice(FILLER)
+                 for _ in range(rnd.randint(10, 60)))
+        for _ in range(n)
+    ]
+
+
+def _rate(fn, texts):
+    t0 = time.perf_counter()
+    out = fn(texts)
+    return len(texts) / (time.perf_counter() - t0), out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entities", type=int, default=100_000)
+    ap.add_argument("--vocab", type=int, default=20_000)
+    ap.add_argument("--texts", type=int, default=5_000)
+    ap.add_argument("--changes", type=int, default=100)
+    args = ap.parse_args()
+
+    rnd = random.Random(7)
+    vocab = _words(args.vocab, rnd)
+    migrations.ensure_schema()
+    t0 = time.perf_counter()
+    _fill(args, rnd, vocab)
+    print(f"{args.entities:,} fact keys over {args.vocab:,} words filled in "
+          f"{time.perf_counter() - t0:.1f}s; {args.texts:,} texts of 10-60 words")
+    texts = _texts(args.texts, rnd, vocab)
+
+    old = _OldRegistry()
+    t0 = time.perf_counter()
+    old.build()
+    old_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    extract_concepts_from_text("warm up")
+    new_build = time.perf_counter() - t0
+    stats = entity_matcher.entity_matcher_stats()
+    print(f"entities {stats['entities']:,} ({stats['tokens']:,} tokens); "
+          f"build: old {old_build:.2f}s, matcher {new_build:.2f}s")
+
+    old_rate, old_out = _rate(lambda ts: [old.extract(t) for t in ts], texts)
+    single_rate, single_out = _rate(lambda ts: [extract_concepts_from_text(t) for t in ts], texts)
+    batch_rate, batch_out = _rate(extract_concepts_batch, texts)
+    print(f"{'path':<8}{'texts/s':>12}")
+    for name, rate in (("old", old_rate), ("single", single_rate), ("batch", batch_rate)):
+        print(f"{name:<8}{rate:>12,.0f}")
+    assert [sorted(o) for o in old_out] == [sorted(o) for o in single_out] == [sorted(o) for o in batch_out]
+    hits = sum(map(len, batch_out))
+    print(f"identical results: {hits:,} matches, {hits / len(texts):.1f} per text")
+
+    new_keys = [f"bench.new_{i}.{rnd.choice(vocab)}_zqxjk{i}" for i in range(args.changes)]
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO profile_facts (profile_id, key, fact_type) VALUES ('bench.p0', ?, 'bench')",
+            ((k,) for k in new_keys),
+        )
+    probe = [f"about zqxjk{i}" for i in range(args.changes)]
+    entity_matcher.SYNC_S = 0
+    t0 = time.perf_counter()
+    old.build()
+    old_found = [old.extract(t) for t in probe]
+    old_update = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new_found = extract_concepts_batch(probe)
+    new_update = time.perf_counter() - t0
+    assert new_found == [[k] for k in new_keys] == old_found
+    print(f"{args.changes} new facts visible: old rebuild {old_update * 1000:,.0f} ms, "
+          f"matcher sync {new_update * 1000:,.1f} ms "
+          f"(builds={entity_matcher.entity_matcher_stats()['builds']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
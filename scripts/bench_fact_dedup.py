@@ -0,0 +1,128 @@
+"""Benchmark: ConsolidationLoop triage dedup, per-fact scoring vs fact_dedup.
+
+Seeds --existing learned profile facts and scores --pending candidate
+facts (a quarter are near-copies of stored facts) against them:
+
+    legacy      – the old _calculate_confidence: two
+                  LinkingCoreThreadAdapter.score_relevance calls per
+                  pending fact (full list, then the first 50).  Timed on
+                  --legacy-sample facts and extrapolated.
+    shingles    – fact_dedup.nearest with embeddings off
+    embeddings  – fact_dedup.nearest with a local hashing embedder
+                  (no network; measures the index, not the provider)
+
+Each new path is run cold (index built inside the cycle) and warm (next
+cycle, indexes already current).
+
+    python scripts/bench_fact_dedup.py [--existing 10000] [--pending 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.subconscious import fact_dedup  # noqa: E402
+from agent.subconscious.loops.consolidation import ConsolidationLoop  # noqa: E402
+from agent.threads.identity import schema as identity  # noqa: E402
+from agent.threads.linking_core import scoring, vector_index  # noqa: E402
+from data.db import writer  # noqa: E402
+
+WORDS = ("coffee tea cat dog river city lisbon berlin python rust guitar piano "
+         "running cycling sister brother morning evening garden book film music "
+         "project deadline meeting travel japan spain cooking pasta bread sleep").split()
+
+
+def _sentence(rng, n=8):
+    return "User " + " ".join(rng.choice(WORDS) for _ in range(n)) + f" {rng.randrange(10**6)}"
+
+
+def _hash_embed(texts):
+    out = []
+    for t in texts:
+        v = np.zeros(384, dtype=np.float32)
+        for w in t.lower().split():
+            v[zlib.crc32(w.encode()) % 384] += 1
+        out.append(v)
+    return out
+
+
+def _legacy(loop, adapter, pending, existing_texts):
+    for text in pending:
+        scored = adapter.score_relevance(text, existing_texts, use_embeddings=True,
+                                         use_cooccurrence=False, use_spread_activation=False)
+        if scored and scored[0][1] >= loop.DUPLICATE_THRESHOLD:
+            continue
+        adapter.score_relevance(text, existing_texts[:50], use_embeddings=True,
+                                use_cooccurrence=True, use_spread_activation=True)
+
+
+def _cycle(loop, pending):
+    near = fact_dedup.nearest(pending, k=10)
+    return [loop._calculate_confidence(t, n) for t, n in zip(pending, near)]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--existing", type=int, default=10000)
+    ap.add_argument("--pending", type=int, default=1000)
+    ap.add_argument("--legacy-sample", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    identity.create_profile_type("human")
+    identity.create_fact_type("learned", "Auto-learned", 0.5)
+    identity.create_profile("primary_user", "human", "User")
+    stored = [_sentence(rng) for _ in range(args.existing)]
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO profile_facts (profile_id, key, fact_type, l1_value, weight) "
+            "VALUES ('primary_user', ?, 'learned', ?, 0.5)",
+            [(f"fact_{i}", t) for i, t in enumerate(stored)],
+        )
+    pending = [
+        rng.choice(stored).lower() if i % 4 == 0 else _sentence(rng)
+        for i in range(args.pending)
+    ]
+    loop = ConsolidationLoop.__new__(ConsolidationLoop)
+    print(f"{args.pending} pending x {args.existing} existing facts")
+    print(f"{'path':<22}{'cycle s':>10}{'dups':>8}")
+
+    os.environ["AIOS_EMBED_PROVIDER"] = "none"
+    from agent.threads.linking_core.adapter import LinkingCoreThreadAdapter
+    adapter = LinkingCoreThreadAdapter()
+    existing_texts = [f"fact_{i} {t}" for i, t in enumerate(stored)]
+    sample = pending[:args.legacy_sample]
+    t0 = time.perf_counter()
+    _legacy(loop, adapter, sample, existing_texts)
+    per_fact = (time.perf_counter() - t0) / len(sample)
+    print(f"{'legacy (extrapolated)':<22}{per_fact * args.pending:>10.1f}{'':>8}")
+
+    for label in ("shingles", "embeddings"):
+        if label == "embeddings":
+            os.environ["AIOS_EMBED_PROVIDER"] = "benchhash"
+            os.environ["AIOS_EMBED_MODEL"] = "hash-384"
+            scoring._probe = lambda: True
+            scoring._embed_batch_raw = _hash_embed
+        for phase in ("cold", "warm"):
+            t0 = time.perf_counter()
+            conf = _cycle(loop, pending)
+            dt = time.perf_counter() - t0
+            print(f"{label + ' ' + phase:<22}{dt:>10.2f}{sum(c < 0 for c in conf):>8}")
+    print(f"stats: {fact_dedup.dedup_stats()} {vector_index.index_stats()['profile_facts']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
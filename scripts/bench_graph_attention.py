@@ -0,0 +1,101 @@
+"""Benchmark: GraphAttention on per-head CSR assets vs the dense (H, V, V) tensor.
+
+Writes synthetic attention assets with graph_to_matrix's builders into a
+throwaway directory and times load + shape_state(). The dense tensor is
+only built where it fits in memory (--dense-max, default 4096 concepts);
+above that only the CSR numbers are reported, with the size the dense
+tensor would have needed.
+
+    python scripts/bench_graph_attention.py [--vocab 2000 50000] [--degree 10]
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from agent.threads.linking_core.attention import GraphAttention  # noqa: E402
+from research.hebbian_attention.graph_to_matrix import (  # noqa: E402
+    graph_to_attention_bias_with_vocab,
+    graph_to_attention_csr,
+)
+
+PREFIXES = ["identity", "user", "tool", "form", "value", "philosophy", "topic", "event"]
+
+
+def _graph(n: int, degree: int):
+    rng = random.Random(n)
+    vocab = [f"{rng.choice(PREFIXES)}.c{i}" for i in range(n)]
+    c2i = {c: i for i, c in enumerate(vocab)}
+    edges = []
+    for _ in range(n * degree // 2):
+        i, j = rng.randrange(n), rng.randrange(n)
+        if i != j:
+            s = rng.random()
+            edges += [(i, j, s), (j, i, s)]
+    return vocab, c2i, edges
+
+
+def _write(out: Path, vocab, c2i, edges, dense: bool) -> int:
+    out.mkdir(parents=True)
+    (out / "vocab.json").write_text(json.dumps({"concept_to_idx": c2i, "vocab_size": len(vocab)}))
+    if dense:
+        path = out / "attention_bias.npy"
+        np.save(path, graph_to_attention_bias_with_vocab(vocab, c2i, edges))
+    else:
+        path = out / "attention_bias_csr.npz"
+        np.savez(path, **graph_to_attention_csr(vocab, c2i, edges))
+    return path.stat().st_size
+
+
+def _time(data_dir: Path, vocab, runs: int):
+    t0 = time.perf_counter()
+    ga = GraphAttention(data_dir=data_dir)
+    ga._load()
+    load_ms = (time.perf_counter() - t0) * 1000
+    rng = random.Random(1)
+    qvs = [ga.encode_query("", rng.sample(vocab, 3)) for _ in range(runs)]
+    t0 = time.perf_counter()
+    for qv in qvs:
+        ga.head_priorities(ga.attend(qv)[1])
+    return ga, load_ms, (time.perf_counter() - t0) * 1000 / runs
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--vocab", type=int, nargs="+", default=[2000, 50_000])
+    ap.add_argument("--degree", type=int, default=10)
+    ap.add_argument("--dense-max", type=int, default=4096)
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+    print(f"{'vocab':>7}{'edges':>9}{'layout':>8}{'file MB':>10}{'load ms':>9}{'attend ms':>11}")
+    for n in args.vocab:
+        vocab, c2i, edges = _graph(n, args.degree)
+        results = {}
+        for layout in ("dense", "csr"):
+            if layout == "dense" and n > args.dense_max:
+                mb = 6 * n * n * 4 / 1e6
+                print(f"{n:>7}{len(edges):>9}{layout:>8}{mb:>10.0f}{'skipped':>9}")
+                continue
+            size = _write(tmp / f"{layout}_{n}", vocab, c2i, edges, layout == "dense")
+            ga, load_ms, attend_ms = _time(tmp / f"{layout}_{n}", vocab, args.runs)
+            results[layout] = ga
+            print(f"{n:>7}{len(edges):>9}{layout:>8}{size / 1e6:>10.1f}{load_ms:>9.1f}{attend_ms:>11.2f}")
+        if len(results) == 2:
+            qv = results["dense"].encode_query("", vocab[:3])
+            diff = np.abs(results["dense"].attend(qv)[0] - results["csr"].attend(qv)[0]).max()
+            print(f"{'':>7}max |dense - csr| = {diff:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
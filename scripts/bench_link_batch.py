@@ -0,0 +1,79 @@
+"""Benchmark: per-pair link_concepts() vs link_concepts_batch().
+
+Synthetic conversation turns of 10/50/200 concepts are linked all-pairs
+against a throwaway database, once with a link_concepts() call (and
+commit) per pair and once through record_concept_cooccurrence(), which
+routes the whole turn through link_concepts_batch() in one transaction.
+
+    python scripts/bench_link_batch.py
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = tempfile.mkdtemp(prefix="aios_bench_")
+os.environ["STATE_DB_PATH"] = str(Path(_TMP) / "bench.db")
+
+from agent.threads.linking_core.schema import (  # noqa: E402
+    link_concepts,
+    record_concept_cooccurrence,
+)
+from data.db import close_all_connections, get_connection  # noqa: E402
+
+
+def _reset() -> None:
+    close_all_connections()
+    for suffix in ("", "-wal", "-shm"):
+        p = Path(os.environ["STATE_DB_PATH"] + suffix)
+        if p.exists():
+            p.unlink()
+
+
+def _concepts(n: int, turn: int) -> list:
+    # Half the vocabulary repeats across turns so updates hit existing rows
+    return [f"c{i}" for i in range(n // 2)] + [f"t{turn}_{i}" for i in range(n - n // 2)]
+
+
+def _per_pair(concepts: list) -> int:
+    count = 0
+    for i, a in enumerate(concepts):
+        for b in concepts[i + 1:]:
+            link_concepts(a, b, 0.1)
+            count += 1
+    return count
+
+
+def main() -> int:
+    turns = 3
+    print(f"{'concepts':>8}{'pairs':>8}{'per-pair ms':>14}{'batched ms':>12}{'speedup':>9}")
+    for n in (10, 50, 200):
+        timings = {}
+        for label, fn in (("per_pair", _per_pair), ("batched", record_concept_cooccurrence)):
+            _reset()
+            t0 = time.perf_counter()
+            pairs = 0
+            for turn in range(turns):
+                pairs = fn(_concepts(n, turn))
+            timings[label] = (time.perf_counter() - t0) * 1000 / turns
+            with closing(get_connection(readonly=True)) as conn:
+                timings[label + "_rows"] = conn.execute(
+                    "SELECT COUNT(*) FROM concept_links"
+                ).fetchone()[0]
+        assert timings["per_pair_rows"] == timings["batched_rows"]
+        print(
+            f"{n:>8}{pairs:>8}{timings['per_pair']:>14.1f}"
+            f"{timings['batched']:>12.1f}"
+            f"{timings['per_pair'] / max(timings['batched'], 1e-9):>8.1f}x"
+        )
+    _reset()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""Benchmark: eager decay passes vs lazy decay-by-timestamp.
+
+Seeds --links concept_links (strength_at spread over the last --age-days)
+and --active concept_activation rows (set within the last tick), then
+compares, on identical copies
+of the DB, WAL bytes written and wall time of:
+
+    links eager   – the old coma pass: UPDATE strength = strength * 0.95
+                    over every row, then DELETE the weak ones
+    links lazy    – decay_concept_links(): DELETE WHERE decayed(...) < min
+    tick eager    – the old meditation step 4: UPDATE every activation,
+                    then DELETE floor rows
+    tick lazy     – step 4 now: DELETE WHERE LIVE_ACTIVATION < FLOOR
+
+and what lazy decay adds to reads: a ConceptGraph load and spread, and a
+SQL neighbor query, with decay applied.
+
+    python scripts/bench_link_decay.py [--links 1000000] [--active 5000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+_SEED = _TMP / "seed.db"
+os.environ["STATE_DB_PATH"] = str(_SEED)
+
+import numpy as np  # noqa: E402
+
+from agent.subconscious import meditation  # noqa: E402
+from agent.threads.linking_core.graph import get_concept_graph, invalidate_concept_graph  # noqa: E402
+from agent.threads.linking_core.schema import (  # noqa: E402
+    decay_concept_links, get_links_for_concept, init_concept_links_table,
+)
+from data.db import close_all_connections, get_connection, writer  # noqa: E402
+
+
+def _use(name: str) -> Path:
+    """Point data.db at a fresh copy of the seeded DB."""
+    close_all_connections()
+    invalidate_concept_graph()
+    path = _TMP / name
+    shutil.copy(_SEED, path)
+    os.environ["STATE_DB_PATH"] = str(path)
+    return path
+
+
+def _measure(path: Path, fn):
+    """(WAL bytes, ms, pruned) for fn(); autocheckpoint off so the WAL keeps every frame."""
+    wal = Path(str(path) + "-wal")
+    with closing(get_connection()) as conn:
+        conn.execute("PRAGMA wal_autocheckpoint = 0")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    t0 = time.perf_counter()
+    pruned = fn()
+    ms = (time.perf_counter() - t0) * 1000
+    size = wal.stat().st_size if wal.exists() else 0
+    close_all_connections()
+    return size, ms, pruned
+
+
+def _links_eager():
+    with writer() as conn:
+        conn.execute("UPDATE concept_links SET strength = strength * ?", (0.95,))
+        return conn.execute("DELETE FROM concept_links WHERE strength < ?", (0.04,)).rowcount
+
+
+def _tick_eager():
+    with writer() as conn:
+        conn.execute(
+            "UPDATE concept_activation SET activation = activation * ?, "
+            "updated_at = CURRENT_TIMESTAMP",
+            (meditation.DECAY,),
+        )
+        return conn.execute(
+            "DELETE FROM concept_activation WHERE activation < ?", (meditation.FLOOR,),
+        ).rowcount
+
+
+def _tick_lazy():
+    with writer() as conn:
+        return conn.execute(
+            f"DELETE FROM concept_activation WHERE {meditation.LIVE_ACTIVATION} < ?",
+            (meditation.FLOOR,),
+        ).rowcount
+
+
+def _rebase(seeded_at: float) -> None:
+    """Shift activated_at by the time since seeding, so ages are as seeded."""
+    with writer() as conn:
+        conn.execute(
+            "UPDATE concept_activation SET activated_at = activated_at + ?",
+            (time.time() - seeded_at,),
+        )
+
+
+def _row(label, wal, ms, pruned):
+    print(f"{label:<14}{wal / 2**20:>10.2f}{ms:>10.1f}{pruned:>10}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--links", type=int, default=1_000_000)
+    ap.add_argument("--nodes", type=int, default=100_000)
+    ap.add_argument("--active", type=int, default=5000)
+    ap.add_argument("--age-days", type=float, default=1.0)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+    names = [f"concept_{i}" for i in range(args.nodes)]
+    pairs = set()
+    while len(pairs) < args.links:
+        a, b = sorted(rng.sample(names, 2))
+        pairs.add((a, b))
+    init_concept_links_table()
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO concept_links (concept_a, concept_b, strength, strength_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(a, b, rng.uniform(0.03, 1.0), now - rng.uniform(0, args.age_days * 86400))
+             for a, b in pairs],
+        )
+    with closing(get_connection()) as conn:
+        meditation._ensure_schema(conn)
+        conn.executemany(
+            "INSERT INTO concept_activation (concept, activation, activated_at) VALUES (?, ?, ?)",
+            [(c, rng.uniform(0.02, 1.0), now - rng.uniform(0, meditation.DECAY_PERIOD_S))
+             for c in rng.sample(names, args.active)],
+        )
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    close_all_connections()
+    print(f"{args.links} links over {args.nodes} concepts, {args.active} active")
+
+    print(f"{'pass':<14}{'WAL MiB':>10}{'ms':>10}{'pruned':>10}")
+    path = _use("links_eager.db")
+    _row("links eager", *_measure(path, _links_eager))
+    path = _use("links_lazy.db")
+    _row("links lazy", *_measure(path, lambda: decay_concept_links(min_strength=0.04)))
+    path = _use("tick_eager.db")
+    _rebase(now)
+    _row("tick eager", *_measure(path, _tick_eager))
+    path = _use("tick_lazy.db")
+    _rebase(now)
+    _row("tick lazy", *_measure(path, _tick_lazy))
+
+    _use("reads.db")
+    t0 = time.perf_counter()
+    graph = get_concept_graph()
+    print(f"\ngraph load {time.perf_counter() - t0:.2f} s")
+    for label, fn in (
+        ("graph spread", lambda s: graph.spread(s, 0.1, 2, 50)),
+        ("sql neighbors", lambda s: get_links_for_concept(s[0])),
+    ):
+        runs = []
+        for _ in range(50):
+            seeds = rng.sample(names, 3)
+            t0 = time.perf_counter()
+            fn(seeds)
+            runs.append((time.perf_counter() - t0) * 1000)
+        print(f"{label:<14} p50 {np.percentile(runs, 50):.2f} ms  p99 {np.percentile(runs, 99):.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
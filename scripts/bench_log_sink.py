@@ -0,0 +1,126 @@
+"""Benchmark: HTTP request logging inline vs through the batched log sink.
+
+Two measurements:
+
+    calls     – log_server_request() in a tight loop (rows/s), inline
+                (AIOS_LOG_ASYNC=0 behaviour: one INSERT + COMMIT per row)
+                vs queued for the writer thread
+    requests  – a FastAPI app with scripts.server's HTTPLoggingMiddleware
+                served by uvicorn, hammered by --concurrency clients;
+                requests/s with logging off, inline and batched
+
+    python scripts/bench_log_sink.py [--rows 5000] [--requests 3000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from agent.threads.log import sink  # noqa: E402
+from agent.threads.log.schema import get_server_stats, log_server_request  # noqa: E402
+from scripts.server import HTTPLoggingMiddleware  # noqa: E402
+
+
+def _bench_calls(rows: int, batched: bool) -> float:
+    sink.ASYNC = batched
+    t0 = time.perf_counter()
+    for i in range(rows):
+        log_server_request("GET", f"/api/bench/{i % 50}", 200, duration_ms=1.5,
+                           client_ip="127.0.0.1", user_agent="bench")
+    sink.flush(timeout=60)
+    return rows / (time.perf_counter() - t0)
+
+
+def _make_app(logging_on: bool) -> FastAPI:
+    app = FastAPI()
+    if logging_on:
+        app.add_middleware(HTTPLoggingMiddleware)
+
+    @app.get("/api/bench/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _hammer(base: str, total: int, concurrency: int) -> float:
+    remaining = [total]
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        async def worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                r = await client.get("/api/bench/ping")
+                r.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - t0)
+
+
+def _bench_requests(mode: str, total: int, concurrency: int) -> float:
+    sink.ASYNC = mode == "batched"
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(_make_app(mode != "off"), host="127.0.0.1",
+                                           port=port, log_level="warning", lifespan="off"))
+    th = threading.Thread(target=server.run, daemon=True)
+    th.start()
+    while not server.started:
+        time.sleep(0.02)
+    try:
+        return asyncio.run(_hammer(f"http://127.0.0.1:{port}", total, concurrency))
+    finally:
+        server.should_exit = True
+        th.join()
+        sink.flush(timeout=60)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=5000)
+    ap.add_argument("--requests", type=int, default=3000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    log_server_request("GET", "/warmup", 200)  # create table
+    print(f"{'log_server_request':<22}{'rows/s':>10}")
+    for label, batched in (("inline", False), ("batched", True)):
+        print(f"{label:<22}{_bench_calls(args.rows, batched):>10.0f}")
+
+    print(f"\n{args.requests} requests, {args.concurrency} concurrent")
+    print(f"{'HTTP logging':<22}{'req/s':>10}")
+    for mode in ("off", "inline", "batched"):
+        print(f"{mode:<22}{_bench_requests(mode, args.requests, args.concurrency):>10.0f}")
+
+    st = sink.sink_stats()
+    print(f"\nsink: {st['written']} rows in {st['batches']} batches, "
+          f"avg flush {st['avg_flush_ms']} ms, max {st['max_flush_ms']} ms, "
+          f"max depth {st['max_depth']}, dropped {st['dropped']}")
+    print(f"log_server rows: {get_server_stats()['total_requests']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+"""Benchmark: background loops, per-loop timer threads vs the central scheduler.
+
+Runs --local local loops (--local-ms per tick every --local-every s)
+and --llm LLM-bound loops (--llm-ms per tick every --llm-every s; all
+on one provider) for --seconds under two models:
+
+  threads    the pre-scheduler model: a timer thread per loop submitting
+             to a 2-worker pool, every tick taking one global
+             single-flight lock (0.5s timeout, else skipped "busy") after
+             a MAX(timestamp) query on unified_events (--events rows)
+             for user activity (non-cheap loops)
+  scheduler  loops/scheduler.py: one dispatcher thread and heap, local
+             loops concurrent, LLM loops serialized on their provider
+             lane, user activity in memory
+
+Reports threads used, ticks run, skips, queue wait (due → start) of the
+local loops and LLM loops, and the cost of one user-activity check.
+
+    python scripts/bench_loop_scheduler.py [--seconds 10] [--local 6] [--llm 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+from contextlib import closing  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+from agent.core import migrations  # noqa: E402
+from agent.subconscious.loops import BackgroundLoop, LoopConfig, scheduler  # noqa: E402
+from data.db import get_connection, writer  # noqa: E402
+
+
+def _old_activity_seconds():
+    """loops/scheduler.py's user-activity check before the scheduler."""
+    with closing(get_connection(readonly=True)) as conn:
+        row = conn.execute(
+            "SELECT MAX(timestamp) FROM unified_events "
+            "WHERE source IN ('user', 'chat', 'cli', 'api') "
+            "AND timestamp >= datetime('now', '-30 minutes')"
+        ).fetchone()
+    return row[0]
+
+
+class _OldLoop:
+    """A BackgroundLoop before the scheduler, reduced to its timing."""
+
+    pool = None
+    flight = threading.Lock()
+
+    def __init__(self, name, every, cost, cheap):
+        self.name, self.every, self.cost, self.cheap = name, every, cost, cheap
+        self.stop_event = threading.Event()
+        self.waits, self.runs, self.skips = [], 0, 0
+
+    def start(self):
+        threading.Thread(target=self._run, name=f"loop-{self.name}", daemon=True).start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.every):
+            due = time.monotonic()
+            self.pool.submit(self._tick, due).result()
+
+    def _tick(self, due):
+        if not self.cheap:
+            _old_activity_seconds()
+        if not self.flight.acquire(timeout=0.5):
+            self.skips += 1
+            return
+        try:
+            self.waits.append(time.monotonic() - due)
+            self.runs += 1
+            time.sleep(self.cost)
+        finally:
+            self.flight.release()
+
+
+def _specs(args):
+    return ([(f"local_{i}", args.local_every, args.local_ms / 1000, True) for i in range(args.local)]
+            + [(f"llm_{i}", args.llm_every, args.llm_ms / 1000, False) for i in range(args.llm)])
+
+
+def _fill_events(n):
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO unified_events (event_type, source, data, timestamp) "
+            "VALUES ('bench', ?, 'x', datetime('now', ?))",
+            ((("system", "chat", "loop")[i % 3], f"-{i % 3600} seconds") for i in range(n)),
+        )
+
+
+def _run_threads(args):
+    _OldLoop.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="loop-worker")
+    base = threading.active_count()
+    loops = [_OldLoop(*spec) for spec in _specs(args)]
+    for loop in loops:
+        loop.start()
+    time.sleep(args.seconds)
+    threads = threading.active_count() - base
+    for loop in loops:
+        loop.stop_event.set()
+    _OldLoop.pool.shutdown(wait=True)
+    return threads, [(l.cheap, l.waits, l.runs, l.skips) for l in loops]
+
+
+def _run_scheduler(args):
+    scheduler._WAITS_KEPT = 10**7
+    scheduler._ACTIVITY_POLL_S = 0  # the filler events would read as user activity
+    base = threading.active_count()
+    loops = []
+    for name, every, cost, cheap in _specs(args):
+        if cheap:
+            scheduler._LOOP_PROVIDER_HINT[name] = ""
+        config = LoopConfig(interval_seconds=every, name=name, initial_delay=every)
+        loops.append((cheap, BackgroundLoop(config, lambda c=cost: time.sleep(c))))
+    for _, loop in loops:
+        loop.start()
+    time.sleep(args.seconds)
+    threads = threading.active_count() - base
+    for _, loop in loops:
+        loop.stop()
+    out = []
+    for cheap, loop in loops:
+        entry = scheduler._entries[loop]
+        out.append((cheap, list(entry.waits), loop.stats["run_count"], sum(entry.skips.values())))
+    return threads, out
+
+
+def _row(label, threads, results):
+    cols = [f"{label:<10}{threads:>8}"]
+    for cheap in (True, False):
+        rows = [r for r in results if r[0] == cheap]
+        waits = np.array([w for r in rows for w in r[1]] or [0.0]) * 1000
+        cols.append(f"{sum(r[2] for r in rows):>7}{sum(r[3] for r in rows):>7}"
+                    f"{np.median(waits):>9.1f}{np.percentile(waits, 99):>9.1f}")
+    print("".join(cols))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--local", type=int, default=6)
+    ap.add_argument("--local-every", type=float, default=0.2)
+    ap.add_argument("--local-ms", type=float, default=5.0)
+    ap.add_argument("--llm", type=int, default=10)
+    ap.add_argument("--llm-every", type=float, default=1.0)
+    ap.add_argument("--llm-ms", type=float, default=60.0)
+    ap.add_argument("--events", type=int, default=200_000)
+    args = ap.parse_args()
+
+    migrations.ensure_schema()
+    _fill_events(args.events)
+    n = 200
+    t0 = time.perf_counter()
+    for _ in range(n):
+        _old_activity_seconds()
+    old_check = (time.perf_counter() - t0) / n
+    scheduler._user_active()  # the throttled unified_events fallback runs here
+    t0 = time.perf_counter()
+    for _ in range(n):
+        scheduler._user_active()
+    new_check = (time.perf_counter() - t0) / n
+    print(f"{args.local} local loops ({args.local_ms:g} ms / {args.local_every:g}s), "
+          f"{args.llm} LLM loops ({args.llm_ms:g} ms / {args.llm_every:g}s), {args.seconds:g}s each")
+    print(f"user-activity check: unified_events query ({args.events:,} rows) "
+          f"{old_check * 1e6:,.0f} µs, in-memory {new_check * 1e6:.2f} µs")
+    print(f"{'':<18}{'local':-^32}{'llm':-^32}")
+    print(f"{'model':<10}{'threads':>8}" + f"{'runs':>7}{'skips':>7}{'p50 ms':>9}{'p99 ms':>9}" * 2)
+    _row("threads", *_run_threads(args))
+    _row("scheduler", *_run_scheduler(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""Benchmark: meditation state_cache refresh, substring cross product vs fact_concepts.
+
+Seeds --facts profile facts (dotted/snake_case keys, short values) and
+--concepts active concepts, then times the salience step of a tick:
+
+    legacy    – the old step 5: DELETE state_cache, then INSTR(key || value,
+                concept) for every fact against every active concept
+    backfill  – first-time fact_concepts build (all facts dirty)
+    index     – _sync_fact_concepts + _refresh_state_cache with nothing
+                dirty and activations changed (the steady-state tick)
+    edits     – same after --edits fact writes (triggers → dirty → retokenize)
+    tick      – a full meditation.tick() on top
+
+Also reports how many of the legacy top-K rows the indexed refresh agrees
+with (the matcher is token-based now, so substring-only hits differ).
+
+    python scripts/bench_meditation_salience.py [--facts 50000] [--concepts 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+from agent.subconscious import meditation  # noqa: E402
+from agent.threads.identity import schema as identity  # noqa: E402
+from agent.threads.log.schema import init_event_log_table  # noqa: E402
+from data.db import get_connection, writer  # noqa: E402
+
+_LEGACY = """
+    INSERT INTO state_cache (profile_id, key, value, weight, salience)
+    SELECT f.profile_id, f.key, f.l1_value, f.weight,
+        f.weight * (1.0 + ? * COALESCE((
+            SELECT MAX(ca.activation) FROM concept_activation ca
+            WHERE INSTR(LOWER(f.key) || ' ' || LOWER(COALESCE(f.l1_value,'')), ca.concept) > 0
+        ), 0.0))
+    FROM profile_facts f
+    WHERE f.weight >= 0.3
+    ORDER BY 5 DESC
+    LIMIT ?
+"""
+
+
+def _words(rng, n):
+    alpha = "abcdefghijklmnopqrstuvwxyz"
+    return list({"".join(rng.choice(alpha) for _ in range(rng.randint(4, 9))) for _ in range(n)})
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def _top(conn):
+    return {(r[0], r[1]) for r in conn.execute("SELECT profile_id, key FROM state_cache")}
+
+
+def _activate(conn, rng, concepts):
+    conn.execute("DELETE FROM concept_activation")
+    conn.executemany(
+        "INSERT INTO concept_activation (concept, activation) VALUES (?, ?)",
+        [(c, rng.uniform(0.05, 1.0)) for c in concepts],
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--facts", type=int, default=50000)
+    ap.add_argument("--concepts", type=int, default=1000)
+    ap.add_argument("--edits", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    vocab = _words(rng, 8000)
+    identity.create_profile_type("human")
+    identity.create_fact_type("learned", "Auto-learned", 0.5)
+    identity.create_profile("primary_user", "human", "User")
+    init_event_log_table()
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO profile_facts (profile_id, key, fact_type, l1_value, weight) "
+            "VALUES ('primary_user', ?, 'learned', ?, ?)",
+            [
+                (f"{rng.choice(vocab)}.{rng.choice(vocab)}_{rng.choice(vocab)}_{i}",
+                 " ".join(rng.choice(vocab) for _ in range(8)),
+                 round(rng.uniform(0.3, 0.9), 3))
+                for i in range(args.facts)
+            ],
+        )
+    concepts = rng.sample(vocab, args.concepts)
+    print(f"{args.facts} facts x {args.concepts} active concepts, top {meditation.TOP_SALIENT}")
+
+    with closing(get_connection()) as conn:
+        meditation._ensure_schema(conn)
+        _activate(conn, rng, concepts)
+        conn.commit()
+
+        def legacy():
+            conn.execute("DELETE FROM state_cache")
+            conn.execute(_LEGACY, (meditation.ALPHA, meditation.TOP_SALIENT))
+        print(f"{'legacy':<10}{_timed(legacy):>10.1f} ms")
+        legacy_top = _top(conn)
+        conn.rollback()
+
+        def backfill():
+            while meditation._sync_fact_concepts(conn):
+                pass
+        print(f"{'backfill':<10}{_timed(backfill):>10.1f} ms")
+        conn.commit()
+
+        meditation._refresh_state_cache(conn)
+        conn.commit()
+        runs = []
+        for _ in range(5):
+            _activate(conn, rng, concepts)
+            runs.append(_timed(lambda: (meditation._sync_fact_concepts(conn),
+                                        meditation._refresh_state_cache(conn))))
+            conn.commit()
+        print(f"{'index':<10}{sorted(runs)[2]:>10.1f} ms  (median of 5)")
+
+        conn.execute(
+            "UPDATE profile_facts SET l1_value = l1_value || ' ' || ? "
+            "WHERE rowid IN (SELECT rowid FROM profile_facts ORDER BY RANDOM() LIMIT ?)",
+            (rng.choice(concepts), args.edits),
+        )
+        ms = _timed(lambda: (meditation._sync_fact_concepts(conn),
+                             meditation._refresh_state_cache(conn)))
+        print(f"{'edits':<10}{ms:>10.1f} ms  ({args.edits} facts retokenized)")
+        conn.commit()
+
+    print(f"{'tick':<10}{meditation.tick()['elapsed_ms']:>10.1f} ms")
+
+    with closing(get_connection()) as conn:
+        _activate(conn, random.Random(1), concepts)
+        conn.commit()
+        legacy()
+        legacy_top = _top(conn)
+        conn.rollback()
+        meditation._refresh_state_cache(conn)
+        conn.commit()
+        agree = len(legacy_top & _top(conn)) / max(1, len(legacy_top))
+    print(f"top-{meditation.TOP_SALIENT} agreement with legacy: {agree:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
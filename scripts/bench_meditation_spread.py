@@ -0,0 +1,198 @@
+"""Benchmark: meditation spread step, and a 1 Hz meditator next to chat.
+
+Seeds --edges random concept_links over --nodes concepts and activates
+--active concepts, then times step 3 of a tick (top 100 sources, 8
+strongest links each, max-merged upsert):
+
+    sql      – one UNION neighbor query per source + one upsert per delta
+    loop     – ConceptGraph.neighbors per source + one upsert per delta
+    batched  – ConceptGraph.spread_step (one gather) + one executemany
+
+Then runs meditation.tick() at --hz in a separate process (as
+run_meditator.py does) for --seconds and measures, in this process, what a
+chat turn does against the same DB: an event INSERT through writer() and
+a graph spread() — with the meditator off and on.
+
+    python scripts/bench_meditation_spread.py [--edges 200000] [--seconds 10]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.subconscious import meditation  # noqa: E402
+from agent.threads.linking_core.graph import get_concept_graph  # noqa: E402
+from agent.threads.linking_core.schema import init_concept_links_table  # noqa: E402
+from agent.threads.log.schema import init_event_log_table  # noqa: E402
+from data.db import get_connection, writer  # noqa: E402
+
+_UPSERT = """
+    INSERT INTO concept_activation (concept, activation, last_kicked, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(concept) DO UPDATE SET
+        activation = MAX(concept_activation.activation, excluded.activation),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_DAEMON = """
+import sys, time
+sys.path.insert(0, {root!r})
+from agent.subconscious import meditation
+end = time.time() + {seconds}
+ticks = []
+while time.time() < end:
+    t0 = time.time()
+    s = meditation.tick()
+    ticks.append(s["elapsed_ms"])
+    time.sleep(max(0.0, 1.0 / {hz} - (time.time() - t0)))
+first, ticks = ticks[0], sorted(ticks[1:])
+print(len(ticks), first, ticks[len(ticks) // 2], ticks[int(len(ticks) * 0.99)])
+"""
+
+
+def _sources(conn):
+    return conn.execute(
+        "SELECT concept, activation FROM concept_activation "
+        "WHERE activation >= ? ORDER BY activation DESC LIMIT ?",
+        (meditation.FLOOR * 2, meditation.SPREAD_SOURCES),
+    ).fetchall()
+
+
+def _push(deltas, nb, push):
+    if push >= meditation.FLOOR and push > deltas.get(nb, 0.0):
+        deltas[nb] = push
+
+
+def _sql(conn):
+    deltas = {}
+    for r in _sources(conn):
+        for nb in conn.execute(
+            "SELECT concept_b AS nb, strength FROM concept_links WHERE concept_a = ? "
+            "UNION SELECT concept_a, strength FROM concept_links WHERE concept_b = ? "
+            "ORDER BY strength DESC LIMIT 8",
+            (r[0], r[0]),
+        ):
+            if nb[1] >= meditation.SPREAD_MIN_LINK and nb[0] != r[0]:
+                _push(deltas, nb[0], meditation.SPREAD * r[1] * nb[1])
+    for nb, push in deltas.items():
+        conn.execute(_UPSERT, (nb, push))
+
+
+def _loop(conn):
+    graph, deltas = get_concept_graph(), {}
+    for r in _sources(conn):
+        for nb, strength in graph.neighbors(r[0], min_strength=0.1, limit=8):
+            if nb != r[0]:
+                _push(deltas, nb, meditation.SPREAD * r[1] * strength)
+    for nb, push in deltas.items():
+        conn.execute(_UPSERT, (nb, push))
+
+
+def _batched(conn):
+    deltas, _n = get_concept_graph().spread_step(
+        {r[0]: r[1] for r in _sources(conn)}, meditation.SPREAD,
+        min_strength=meditation.SPREAD_MIN_LINK, fanout=meditation.SPREAD_FANOUT,
+        floor=meditation.FLOOR,
+    )
+    meditation._max_merge(conn, deltas, kicked=False)
+
+
+def _chat(seconds, rng, names):
+    writes, spreads = [], []
+    end = time.time() + seconds
+    while time.time() < end:
+        t0 = time.perf_counter()
+        with writer() as conn:
+            conn.execute(
+                "INSERT INTO unified_events (event_type, data, source) VALUES ('convo', ?, 'bench')",
+                (" ".join(rng.sample(names, 3)),),
+            )
+        writes.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        get_concept_graph().spread(rng.sample(names, 3), max_hops=2)
+        spreads.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.05)
+    return writes, spreads
+
+
+def _pct(xs):
+    return f"{np.percentile(xs, 50):>8.2f}{np.percentile(xs, 99):>8.2f}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, default=20000)
+    ap.add_argument("--edges", type=int, default=200000)
+    ap.add_argument("--active", type=int, default=300)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--hz", type=float, default=1.0)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    names = [f"concept_{i}" for i in range(args.nodes)]
+    pairs = set()
+    while len(pairs) < args.edges:
+        a, b = rng.sample(names, 2)
+        if (b, a) not in pairs:
+            pairs.add((a, b))
+    init_concept_links_table()
+    init_event_log_table()
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO concept_links (concept_a, concept_b, strength) VALUES (?, ?, ?)",
+            [(a, b, rng.uniform(0.05, 1.0)) for a, b in pairs],
+        )
+    with closing(get_connection()) as conn:
+        meditation._ensure_schema(conn)
+        conn.executemany(
+            "INSERT INTO concept_activation (concept, activation) VALUES (?, ?)",
+            [(c, rng.uniform(0.1, 1.0)) for c in rng.sample(names, args.active)],
+        )
+        conn.commit()
+    t0 = time.perf_counter()
+    get_concept_graph()
+    print(f"{args.edges} edges / {args.nodes} concepts, {args.active} active; "
+          f"graph load {time.perf_counter() - t0:.2f} s")
+
+    print(f"{'spread step':<12}{'p50 ms':>8}{'p99 ms':>8}")
+    with closing(get_connection()) as conn:
+        for label, fn in (("sql", _sql), ("loop", _loop), ("batched", _batched)):
+            runs = []
+            for _ in range(20):
+                t0 = time.perf_counter()
+                fn(conn)
+                runs.append((time.perf_counter() - t0) * 1000)
+                conn.rollback()
+            print(f"{label:<12}{_pct(runs)}")
+
+    print(f"\n{'chat, ms':<22}{'write p50':>10}{'p99':>7}{'spread p50':>12}{'p99':>7}")
+    writes, spreads = _chat(args.seconds, rng, names)
+    print(f"{'meditator off':<22}{_pct(writes)}  {_pct(spreads)}")
+    daemon = subprocess.Popen(
+        [sys.executable, "-c", _DAEMON.format(root=str(ROOT), seconds=args.seconds + 1, hz=args.hz)],
+        stdout=subprocess.PIPE, text=True, env=os.environ,
+    )
+    time.sleep(1.0)  # let it load the graph
+    writes, spreads = _chat(args.seconds - 1, rng, names)
+    print(f"{f'meditator on ({args.hz:g} Hz)':<22}{_pct(writes)}  {_pct(spreads)}")
+    n, first, p50, p99 = daemon.communicate()[0].split()
+    print(f"meditator: first tick {float(first):.0f} ms (graph load), then {n} ticks "
+          f"p50 {float(p50):.1f} ms, p99 {float(p99):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
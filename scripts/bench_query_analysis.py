@@ -0,0 +1,77 @@
+"""Benchmark: spread_activate / concept-extraction calls per turn.
+
+Counts calls made during one score() + build_state() with the shared
+QueryAnalysis ignored (every adapter recomputes, the old behaviour) and
+with it installed, and checks both produce the same STATE.
+
+    AIOS_MODE=demo python scripts/bench_query_analysis.py
+
+Co-activation recording is off so the run doesn't write Hebbian counts.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("AIOS_MODE", "demo")
+
+from agent.threads.linking_core import query as qa  # noqa: E402
+from agent.threads.linking_core import schema  # noqa: E402
+
+QUERIES = [
+    "what do you know about dad",
+    "what tools can you use",
+    "summarize philosophy and values",
+    "show me workspace files about the project",
+]
+
+COUNTS = {"spread_activate": 0, "extract_concepts_from_text": 0}
+
+
+def _count(name: str) -> None:
+    original = getattr(schema, name)
+
+    def wrapper(*args, **kwargs):
+        COUNTS[name] += 1
+        return original(*args, **kwargs)
+
+    setattr(schema, name, wrapper)
+
+
+def _turn(sub, query: str) -> tuple:
+    for k in COUNTS:
+        COUNTS[k] = 0
+    sub._analysis_cache.clear()
+    t0 = time.perf_counter()
+    state = sub.build_state(sub.score(query), query, record_activations=False)
+    ms = (time.perf_counter() - t0) * 1000
+    return state, dict(COUNTS), ms
+
+
+def main() -> int:
+    from agent.subconscious.orchestrator import get_subconscious
+    sub = get_subconscious()
+    sub.build_state(sub.score("warmup"), "warmup", record_activations=False)
+    for name in COUNTS:
+        _count(name)
+
+    print(f"{'query':<44}{'spread before/after':>20}{'extract before/after':>22}{'ms before/after':>17}")
+    for q in QUERIES:
+        qa.SHARED = False
+        before, b_counts, b_ms = _turn(sub, q)
+        qa.SHARED = True
+        after, a_counts, a_ms = _turn(sub, q)
+        assert before == after, f"STATE differs for {q!r}"
+        print(
+            f"{q[:43]:<44}"
+            f"{b_counts['spread_activate']:>12} / {a_counts['spread_activate']:<5}"
+            f"{b_counts['extract_concepts_from_text']:>14} / {a_counts['extract_concepts_from_text']:<5}"
+            f"{b_ms:>9.0f} / {a_ms:<5.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Benchmark: prompt prefix shared between consecutive turns, per STATE layout.
+
+Copies --db (default: data/db/state.db) to a temp dir and runs a fixed
+list of chat queries through score() → build_state() → the system prompt,
+once with AIOS_STATE_LAYOUT=score and once with =stable.  For each turn
+it prints how many leading characters of the system prompt repeat the
+previous turn's verbatim — the part a provider prompt cache or a local
+KV cache can reuse instead of re-prefilling.
+
+    python scripts/bench_state_prefix.py [--db data/db/state_demo.db] [--turns 10]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+QUERIES = [
+    "who are you",
+    "what did we talk about yesterday",
+    "read the README and summarize it",
+    "what are my open goals",
+    "tell me a joke",
+    "what tools do you have",
+    "how is the machine doing",
+    "remind me what I care about",
+    "search the docs for meditation",
+    "what should I work on next",
+]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=str(ROOT / "data" / "db" / "state.db"))
+    ap.add_argument("--turns", type=int, default=len(QUERIES))
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+    shutil.copy(args.db, tmp / "bench.db")
+    os.environ["STATE_DB_PATH"] = str(tmp / "bench.db")
+
+    from agent.agent import Agent
+    from agent.subconscious import orchestrator
+
+    queries = (QUERIES * (args.turns // len(QUERIES) + 1))[: args.turns]
+    print(f"{args.turns} turns on a copy of {args.db}")
+    print(f"{'layout':<8}{'prompt chars':>14}{'prefix chars':>14}{'ratio':>8}{'build ms':>10}")
+    for layout in ("score", "stable"):
+        orchestrator.STATE_LAYOUT = layout
+        sub, agent = orchestrator.Subconscious(), Agent()
+        chars, prefix, ms = [], [], []
+        for q in queries:
+            t0 = time.perf_counter()
+            state = sub.build_state(sub.score(q), q, record_activations=False)
+            ms.append((time.perf_counter() - t0) * 1000)
+            p = agent._note_prompt_prefix(agent._build_system_prompt("Agent", state))
+            chars.append(p["prompt_chars"])
+            prefix.append(p["prefix_chars"])
+        # The first turn has nothing to share with
+        shared = sum(prefix[1:]) / max(1, sum(chars[1:]))
+        print(f"{layout:<8}{sum(chars) / len(chars):>14.0f}{sum(prefix[1:]) / max(1, len(prefix) - 1):>14.0f}"
+              f"{shared:>8.2f}{sorted(ms)[len(ms) // 2]:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Benchmark: row counts for the STATE self-awareness header, COUNT(*) vs counters.
+
+Builds a temp DB with the full schema and --rows rows in unified_events
+(plus --rows / 10 in log_server and concept_links), then times:
+
+  count(*)     the header's old per-build counts, one COUNT(*) per table
+  graph sql    its old concept-graph line (DISTINCT / AVG over concept_links)
+  counters     get_table_counts() reading the trigger-kept table_counts rows
+               (AIOS_TABLE_COUNTS_TTL=0, i.e. every call goes to the DB)
+  cached       get_table_counts() within the TTL
+  header       the whole _build_self_awareness_block() now (counters read
+               cold, graph line from the in-memory concept graph)
+
+and what the triggers add to writes: --write-batch event inserts with and
+without counters installed.
+
+    python scripts/bench_table_counts.py [--rows 1000000] [--runs 5]
+    python scripts/bench_table_counts.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.core import migrations  # noqa: E402
+from data.db import get_connection, writer  # noqa: E402
+from data.db import table_stats  # noqa: E402
+from agent.threads.linking_core.schema import STRENGTH_SQL  # noqa: E402
+
+OLD_HEADER_QUERIES = [
+    "SELECT (SELECT COUNT(*) FROM profiles) || ' profiles, ' || (SELECT COUNT(*) FROM profile_facts) || ' facts'",
+    "SELECT (SELECT COUNT(*) FROM philosophy_profile_facts) || ' stances'",
+    "SELECT (SELECT COUNT(*) FROM reflex_meta_thoughts) || ' meta-thoughts, ' || "
+    "(SELECT COUNT(*) FROM reflex_triggers) || ' triggers'",
+    "SELECT (SELECT COUNT(*) FROM unified_events) || ' events, ' || (SELECT COUNT(*) FROM log_server) || "
+    "' http requests, ' || (SELECT COUNT(*) FROM log_llm_inference) || ' llm calls'",
+    "SELECT (SELECT COUNT(*) FROM form_tools) || ' tools, ' || (SELECT COUNT(*) FROM tool_traces) || ' traces'",
+    "SELECT (SELECT COUNT(*) FROM concept_links) || ' links'",
+    "SELECT COUNT(*) FROM workspace_files",
+    "SELECT COUNT(*) FROM proposed_goals WHERE status IN ('pending','approved','in_progress','paused','blocked')",
+    "SELECT COUNT(*) FROM proposed_goals",
+    "SELECT COUNT(*) FROM convo_turns",
+]
+
+OLD_GRAPH_QUERIES = [
+    "SELECT COUNT(*) FROM concept_links",
+    "SELECT COUNT(DISTINCT concept_a) + COUNT(DISTINCT concept_b) FROM concept_links",
+    f"SELECT AVG({STRENGTH_SQL}) FROM concept_links",
+    f"SELECT COUNT(*) FROM concept_links WHERE strength >= 0.7 AND {STRENGTH_SQL} >= 0.7",
+]
+
+
+def _fill(rows: int) -> None:
+    chunk = 200_000
+    with writer() as conn:
+        for start in range(0, rows, chunk):
+            n = min(chunk, rows - start)
+            conn.executemany(
+                "INSERT INTO unified_events (event_type, source, data) VALUES (?, ?, ?)",
+                ((f"type_{i % 17}", f"src_{i % 5}", "x" * 40) for i in range(start, start + n)),
+            )
+        conn.executemany(
+            "INSERT INTO log_server (method, path, status_code) VALUES ('GET', ?, 200)",
+            ((f"/p/{i}",) for i in range(rows // 10)),
+        )
+        conn.executemany(
+            "INSERT INTO concept_links (concept_a, concept_b, strength) VALUES (?, ?, 0.5)",
+            ((f"c{i}", f"d{i}") for i in range(rows // 10)),
+        )
+
+
+def _old(queries):
+    def run() -> None:
+        with closing(get_connection(readonly=True)) as conn:
+            for q in queries:
+                try:
+                    conn.execute(q).fetchone()
+                except Exception:
+                    pass
+    return run
+
+
+def _timed(fn, runs: int) -> float:
+    ms = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        ms.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(ms))
+
+
+def _write_cost(batch: int) -> float:
+    t0 = time.perf_counter()
+    with writer() as conn:
+        conn.executemany(
+            "INSERT INTO unified_events (event_type, source, data) VALUES ('bench', 'bench', ?)",
+            (("y" * 40,) for _ in range(batch)),
+        )
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--write-batch", type=int, default=10_000)
+    args = ap.parse_args()
+
+    migrations._init_log()
+    migrations._init_linking_core()
+    t0 = time.perf_counter()
+    _fill(args.rows)
+    fill_s = time.perf_counter() - t0
+    plain_write = _write_cost(args.write_batch)
+
+    t0 = time.perf_counter()
+    migrations.ensure_schema()   # creates the rest and installs counters
+    install_s = time.perf_counter() - t0
+    counted_write = _write_cost(args.write_batch)
+
+    from agent.subconscious.orchestrator import Subconscious
+    sub = Subconscious()
+    print(f"{args.rows:,} events (filled in {fill_s:.1f}s); counters installed in {install_s:.2f}s")
+    sub._build_self_awareness_block()   # loads the concept graph
+    print(f"{'read':<12}{'p50 ms':>10}")
+    print(f"{'count(*)':<12}{_timed(_old(OLD_HEADER_QUERIES), args.runs):>10.2f}")
+    print(f"{'graph sql':<12}{_timed(_old(OLD_GRAPH_QUERIES), args.runs):>10.2f}")
+    table_stats.TTL_S = 0
+    print(f"{'counters':<12}{_timed(table_stats.get_table_counts, args.runs):>10.2f}")
+    print(f"{'header':<12}{_timed(sub._build_self_awareness_block, args.runs):>10.2f}")
+    table_stats.TTL_S = 60
+    print(f"{'cached':<12}{_timed(table_stats.get_table_counts, args.runs):>10.3f}")
+    print(f"{args.write_batch:,} event inserts: {plain_write:.0f} ms without counters, "
+          f"{counted_write:.0f} ms with")
+    assert table_stats.get_table_counts()["unified_events"] == args.rows + 2 * args.write_batch
+    assert table_stats.reconcile_table_counts() == 0
+    print("counters match COUNT(*)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""Benchmark: one LLM round of read-only tool calls, sequential vs concurrent.
+
+Syncs the tool registry into a temp DB and runs the same round — regex
+searches over the repo, file reads and directory listings, the kind of
+batch a model asks for when exploring code — through
+dispatch.run_tool_actions with AIOS_TOOL_WORKERS=1 (the old loop) and with
+--workers.  Checks the results match.
+
+These tools are in-process Python, so the GIL caps what concurrency buys
+for them; the gain is in waiting.  A second pass adds --latency-ms of
+sleep to every call, standing in for the network round trip of
+web_search / MCP / HTTP-backed tools.
+
+    python scripts/bench_tool_round.py [--workers 4] [--runs 5] [--latency-ms 300]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "bench.db")
+
+import numpy as np  # noqa: E402
+
+from agent.threads.form.tools import dispatch  # noqa: E402
+from agent.threads.form.tools.registry import ensure_tools_in_db  # noqa: E402
+
+ROUND = [
+    ("regex_search", "search", {"pattern": r"def build_state", "directory": "agent", "file_pattern": "*.py"}),
+    ("regex_search", "search", {"pattern": r"trace_bus\.publish", "directory": "agent", "file_pattern": "*.py"}),
+    ("file_read", "read_file", {"path": "agent/agent.py"}),
+    ("file_read", "read_file", {"path": "agent/subconscious/orchestrator.py"}),
+    ("file_read", "list_directory", {"path": "agent/threads"}),
+    ("file_read", "search_files", {"pattern": "*.md", "directory": "docs"}),
+]
+
+
+def _with_latency(latency_s):
+    execute = dispatch._execute
+
+    def _slow(tool, action, params):
+        time.sleep(latency_s)
+        return execute(tool, action, params)
+    return _slow
+
+
+def _timed(runs):
+    out, ms = None, []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = dispatch.run_tool_actions(ROUND)
+        ms.append((time.perf_counter() - t0) * 1000)
+    return out, ms
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    args = ap.parse_args()
+
+    os.chdir(ROOT)
+    ensure_tools_in_db()
+    print(f"{len(ROUND)} read-only calls per round, {args.runs} runs")
+    print(f"{'round':<14}{'workers':>8}{'p50 ms':>10}{'max ms':>10}")
+    outputs = {}
+    execute = dispatch._execute
+    for label, latency in (("in-process", 0.0), (f"+{args.latency_ms:g} ms io", args.latency_ms)):
+        dispatch._execute = _with_latency(latency / 1000) if latency else execute
+        for workers in (1, args.workers):
+            dispatch.TOOL_WORKERS = workers
+            outputs[workers], ms = _timed(args.runs)
+            print(f"{label:<14}{workers:>8}{np.median(ms):>10.1f}{max(ms):>10.1f}")
+    seq, par = outputs[1], outputs[args.workers]
+    assert [r["output"] for r in seq] == [r["output"] for r in par]
+    print(f"results match; {sum(r['success'] for r in par)}/{len(par)} succeeded")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""Benchmark: trace SSE fan-out, 250 ms polling vs pushed subscriptions.
+
+Runs --subs readers against one publisher: half "active" (every event)
+and half "idle" (filtered to a type that's never published), the mix a
+dashboard plus a few forgotten browser tabs produce.  Two models:
+
+  poll   the old /stream loop: one thread per reader calling a copy of
+         the old events_since() (deque → list copy under the lock,
+         linear seq scan) every 250 ms, filtering types client-side
+  push   trace_bus.watch() readers on one asyncio loop, woken by
+         publish(), types filtered server-side, each frame rendered once
+         and shared (the endpoint's _sse_frame)
+
+Each model gets a --quiet-s phase with no events, then --seconds of
+publishing at --rate events/s.  Reports process CPU per phase, delivery
+latency (publish → reader) and the publisher's per-event cost.  Every
+delivered event is formatted as an SSE frame, as each endpoint did.
+
+    python scripts/bench_trace_fanout.py [--subs 100] [--rate 200] [--seconds 5]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from agent.subconscious import trace_bus  # noqa: E402
+from agent.subconscious.api import _sse_frame, _sse_pack  # noqa: E402
+
+POLL_S = 0.25
+TYPES = ("score", "threshold", "adapter_call", "state_built")
+
+
+class _PollBus:
+    """The pre-subscription trace_bus: a deque copied on every read."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buf = deque(maxlen=trace_bus._MAX_EVENTS)
+        self.seq = 1
+
+    def publish(self, event_type, **fields):
+        ev = {"seq": 0, "ts": time.time(), "type": event_type, **fields}
+        with self.lock:
+            ev["seq"] = self.seq
+            self.buf.append(ev)
+            self.seq += 1
+        return ev["seq"]
+
+    def events_since(self, last_seq, limit=200):
+        with self.lock:
+            snap = list(self.buf)
+        out = []
+        for ev in snap:
+            if ev["seq"] > last_seq:
+                out.append(ev)
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class _Sink:
+    def __init__(self, pack):
+        self.pack = pack
+        self.lat = []
+        self.frames = 0
+        self.lock = threading.Lock()
+
+    def take(self, batch, wanted):
+        now = time.time()
+        lat = []
+        for ev in batch:
+            if wanted is None or ev["type"] in wanted:
+                self.pack(ev)
+                lat.append(now - ev["ts"])
+        with self.lock:
+            self.lat.extend(lat)
+            self.frames += len(lat)
+
+
+def _publish(publish, rate, seconds):
+    """Publish at ``rate``/s for ``seconds``; returns per-call µs."""
+    cost = []
+    step = 1.0 / rate
+    t_next = time.perf_counter()
+    end = t_next + seconds
+    i = 0
+    while t_next < end:
+        delay = t_next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        publish(TYPES[i % len(TYPES)], i=i, score=0.5, source="bench")
+        cost.append((time.perf_counter() - t0) * 1e6)
+        i += 1
+        t_next += step
+    return cost
+
+
+def _phases(publish, args):
+    """(quiet CPU s, load CPU s, publish µs) around the running readers."""
+    time.sleep(0.5)                      # readers settle
+    c0 = time.process_time()
+    time.sleep(args.quiet_s)
+    quiet = time.process_time() - c0
+    c0 = time.process_time()
+    cost = _publish(publish, args.rate, args.seconds)
+    time.sleep(POLL_S * 2)               # last polls drain
+    load = time.process_time() - c0
+    return quiet, load, cost
+
+
+def run_poll(args):
+    bus, sink, stop = _PollBus(), _Sink(_sse_pack), threading.Event()
+
+    def reader(wanted):
+        cursor = bus.seq - 1
+        while not stop.is_set():
+            new = bus.events_since(cursor)
+            if new:
+                cursor = new[-1]["seq"]
+                sink.take(new, wanted)
+            else:
+                time.sleep(POLL_S)
+
+    threads = [
+        threading.Thread(target=reader, args=(None if i % 2 else {"never"},), daemon=True)
+        for i in range(args.subs)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        return _phases(bus.publish, args) + (sink,)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def run_push(args):
+    sink = _Sink(_sse_frame)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    tasks = []
+
+    async def reader(types):
+        async for batch in trace_bus.watch(since=trace_bus.latest_seq(), types=types):
+            sink.take(batch, None)
+
+    async def start():
+        for i in range(args.subs):
+            tasks.append(asyncio.ensure_future(reader(None if i % 2 else ["never"])))
+        await asyncio.sleep(0)
+        ready.set()
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(start(), loop)
+    ready.wait()
+    try:
+        return _phases(trace_bus.publish, args) + (sink,)
+    finally:
+        async def stop():
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.run_coroutine_threadsafe(stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subs", type=int, default=100)
+    ap.add_argument("--rate", type=float, default=200.0)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--quiet-s", type=float, default=3.0)
+    args = ap.parse_args()
+
+    expected = int(args.rate * args.seconds) * (args.subs // 2)
+    print(f"{args.subs} readers ({args.subs // 2} active, {args.subs - args.subs // 2} idle), "
+          f"{args.rate:g} events/s for {args.seconds:g}s after {args.quiet_s:g}s quiet")
+    print(f"{'model':<6}{'quiet cpu%':>11}{'load cpu%':>11}{'lat p50 ms':>12}"
+          f"{'lat p99 ms':>12}{'publish µs':>12}{'frames':>10}")
+    for name, run in (("poll", run_poll), ("push", run_push)):
+        quiet, load, cost, sink = run(args)
+        lat = np.array(sink.lat) * 1000 if sink.lat else np.zeros(1)
+        print(f"{name:<6}{quiet / args.quiet_s * 100:>11.1f}"
+              f"{load / (args.seconds + 2 * POLL_S) * 100:>11.1f}"
+              f"{np.percentile(lat, 50):>12.2f}{np.percentile(lat, 99):>12.2f}"
+              f"{np.median(cost):>12.1f}{sink.frames:>10,}")
+        assert sink.frames == expected, (name, sink.frames, expected)
+    s = trace_bus.stats()
+    print(f"all {expected:,} frames delivered; push dropped={s['dropped']} lost={s['lost']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
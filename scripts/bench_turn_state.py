@@ -0,0 +1,166 @@
+"""Benchmark: per-turn STATE storage, inline JSON vs the section store.
+
+Writes --turns synthetic turns (--turns-per-convo per conversation)
+through chat.schema.add_turn twice, into two temp DBs:
+
+  inline    the old path: the whole snapshot, STATE text included, as
+            convo_turns.state_snapshot_json
+  sections  chat/state_store.py: STATE split at blank lines, each
+            distinct section stored once (zlib), hashes per turn
+
+The STATE is shaped like a real one (~7 KB, 10 sections, see SECTIONS):
+some sections change every turn (self-awareness counts, log, the
+query-dependent ones), others every few to few hundred turns.  Reports
+DB size, STATE bytes, add_turn latency, reading every turn's STATE back
+(verified exact), and compact_turn_states() + VACUUM on the inline DB.
+
+    python scripts/bench_turn_state.py [--turns 50000] [--turns-per-convo 100]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+os.environ["STATE_DB_PATH"] = str(_TMP / "inline.db")
+
+import numpy as np  # noqa: E402
+
+from data.db import close_all_connections, get_connection  # noqa: E402
+from chat import schema, state_store  # noqa: E402
+
+# (section, ~chars, changes every N turns)
+SECTIONS = [
+    ("self", 600, 1),
+    ("log", 1850, 1),
+    ("goals", 290, 200),
+    ("form", 1330, 1000),
+    ("field", 410, 20),
+    ("docs", 1010, 50),
+    ("work", 360, 5),
+    ("linking_core", 890, 1),
+]
+WORDS = ("state thread module concept fact identity reflex tool trace event session "
+         "garden user machine weight level score link memory goal task loop count "
+         "recent active pending approved running idle window budget").split()
+
+
+def _base(name: str, size: int) -> list:
+    rnd = random.Random(name)
+    lines = [f"[{name}] {' '.join(rnd.choices(WORDS, k=6))}"]
+    while sum(map(len, lines)) + len(lines) < size:
+        lines.append(f"  {rnd.choice(WORDS)}_{rnd.choice(WORDS)}: {' '.join(rnd.choices(WORDS, k=rnd.randint(2, 9)))}")
+    return lines
+
+
+BASES = {name: _base(name, size) for name, size, _ in SECTIONS}
+
+
+def _section(name: str, version: int) -> str:
+    lines = list(BASES[name])
+    rnd = random.Random(f"{name}:{version}")
+    for i in rnd.sample(range(1, len(lines)), min(3, len(lines) - 1)):
+        lines[i] = f"  {lines[i].split(':')[0].strip()}: {rnd.randint(0, 10**6)} {rnd.choice(WORDS)}"
+    return "\n".join(lines)
+
+
+def state_text(turn: int) -> str:
+    parts = ["== STATE =="]
+    parts += [_section(name, turn // every) for name, _, every in SECTIONS]
+    parts.append("== END STATE ==")
+    return "\n\n".join(parts)
+
+
+def _write(turns: int, per_convo: int) -> list:
+    ms = []
+    for t in range(turns):
+        snapshot = {"state_block": state_text(t), "context_level": 2,
+                    "feed_type": "react", "source": "bench"}
+        t0 = time.perf_counter()
+        schema.add_turn(f"bench_{t // per_convo}", f"question {t}", f"answer {t} " * 8,
+                        feed_type="react", context_level=2, state_snapshot=snapshot)
+        ms.append((time.perf_counter() - t0) * 1000)
+    return ms
+
+
+def _sizes() -> dict:
+    with closing(get_connection()) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        inline = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(state_snapshot_json)), 0) + "
+            "COALESCE(SUM(LENGTH(state_sections)), 0) FROM convo_turns"
+        ).fetchone()[0]
+        try:
+            stored = conn.execute("SELECT COALESCE(SUM(LENGTH(body)), 0) FROM state_sections").fetchone()[0]
+        except Exception:
+            stored = 0
+    path = Path(os.environ["STATE_DB_PATH"])
+    return {"file": path.stat().st_size, "state": inline + stored}
+
+
+def _read_back(turns: int) -> float:
+    with closing(get_connection(readonly=True)) as conn:
+        ids = [r[0] for r in conn.execute("SELECT id FROM convo_turns ORDER BY id")]
+    t0 = time.perf_counter()
+    got = {}
+    for i in range(0, len(ids), 1000):
+        got.update(state_store.get_turn_states(ids[i:i + 1000]))
+    elapsed = time.perf_counter() - t0
+    assert len(got) == turns
+    assert all(got[turn_id] == state_text(t) for t, turn_id in enumerate(ids))
+    return elapsed
+
+
+def _phase(label: str, db: str, args, inline: bool) -> None:
+    close_all_connections()
+    os.environ["STATE_DB_PATH"] = str(_TMP / db)
+    schema.init_convos_tables()
+    pack = schema.pack_snapshot
+    if inline:
+        schema.pack_snapshot = lambda cur, snap: (json.dumps(snap) if snap else None, None)
+    try:
+        ms = _write(args.turns, args.turns_per_convo)
+    finally:
+        schema.pack_snapshot = pack
+    sizes = _sizes()
+    read_s = _read_back(args.turns)
+    print(f"{label:<10}{sizes['file'] / 2**20:>10.1f}{sizes['state'] / 2**20:>10.1f}"
+          f"{np.median(ms):>10.3f}{np.percentile(ms, 99):>10.3f}{read_s:>10.2f}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=50_000)
+    ap.add_argument("--turns-per-convo", type=int, default=100)
+    args = ap.parse_args()
+
+    avg = np.mean([len(state_text(t)) for t in range(0, args.turns, max(1, args.turns // 200))])
+    print(f"{args.turns:,} turns, STATE ~{avg / 1024:.1f} KB in {len(SECTIONS) + 2} sections")
+    print(f"{'storage':<10}{'db MB':>10}{'state MB':>10}{'p50 ms':>10}{'p99 ms':>10}{'read s':>10}")
+    _phase("inline", "inline.db", args, inline=True)
+    _phase("sections", "sections.db", args, inline=False)
+
+    close_all_connections()
+    os.environ["STATE_DB_PATH"] = str(_TMP / "inline.db")
+    t0 = time.perf_counter()
+    converted = state_store.compact_turn_states()
+    with closing(get_connection()) as conn:
+        conn.execute("VACUUM")
+    sizes = _sizes()
+    print(f"compact_turn_states + VACUUM on inline.db: {converted:,} turns in "
+          f"{time.perf_counter() - t0:.1f}s → {sizes['file'] / 2**20:.1f} MB")
+    _read_back(args.turns)
+    print(f"sections: {state_store.state_store_stats()['sections']:,}; every turn reads back exact")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""Benchmark: top-k retrieval with the vector index vs scoring candidates one by one.
+
+Synthetic clustered float32 vectors (--clusters gaussian blobs, so IVF
+buckets mean something) at each --sizes.  For every size:
+
+    loop      – the old path: cosine_similarity per candidate in Python
+                (only run up to --loop-max rows; it is O(N) Python calls)
+    flat      – _Index below the IVF threshold: one matrix-vector product
+    ivf       – _Index above it: AIOS_VECTOR_NPROBE nearest buckets only
+    mmap load – np.load(mmap_mode="r") of the flat snapshot
+
+Reports build time, p50/p99 query ms over --queries queries and ivf
+recall@10 against flat.
+
+    python scripts/bench_vector_index.py [--sizes 10000,100000,1000000] [--dim 384]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from agent.threads.linking_core import vector_index  # noqa: E402
+from agent.threads.linking_core.scoring import cosine_similarity  # noqa: E402
+
+
+def _corpus(n, dim, clusters, rng, chunk=100000):
+    centers = np.random.default_rng(1).standard_normal((clusters, dim)).astype(np.float32)
+    mat = np.empty((n, dim), dtype=np.float32)
+    for i in range(0, n, chunk):
+        m = min(chunk, n - i)
+        block = centers[rng.integers(0, clusters, m)]
+        block += 0.6 * rng.standard_normal((m, dim), dtype=np.float32)
+        mat[i:i + m] = vector_index._normalize(block)
+    return mat
+
+
+def _latencies(fn, queries):
+    out = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        out.append((time.perf_counter() - t0) * 1000)
+    return np.percentile(out, 50), np.percentile(out, 99)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--clusters", type=int, default=200)
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--loop-max", type=int, default=10000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    tmp = Path(tempfile.mkdtemp(prefix="aios_bench_"))
+    print(f"dim {args.dim}, {args.clusters} clusters, nprobe {vector_index.NPROBE}, "
+          f"{args.queries} queries, k=10")
+    print(f"{'rows':>9} {'path':<10}{'build s':>9}{'p50 ms':>9}{'p99 ms':>9}{'recall':>8}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        mat = _corpus(n, args.dim, args.clusters, rng)
+        ids = [str(i) for i in range(n)]
+        queries = _corpus(args.queries, args.dim, args.clusters, rng)
+
+        if n <= args.loop_max:
+            items = list(zip(ids, mat))
+
+            def loop(q):
+                scored = [(i, cosine_similarity(q, v)) for i, v in items]
+                scored.sort(key=lambda x: x[1], reverse=True)
+                return scored[:10]
+            p50, p99 = _latencies(loop, queries[:5])
+            print(f"{n:>9} {'loop':<10}{'-':>9}{p50:>9.1f}{p99:>9.1f}{'1.000':>8}")
+
+        vector_index.IVF_MIN = n + 1
+        t0 = time.perf_counter()
+        flat = vector_index._Index(ids, ids, mat)
+        build = time.perf_counter() - t0
+        p50, p99 = _latencies(lambda q: flat.search(q, 10), queries)
+        print(f"{n:>9} {'flat':<10}{build:>9.2f}{p50:>9.2f}{p99:>9.2f}{'1.000':>8}")
+
+        vector_index.IVF_MIN = 1
+        t0 = time.perf_counter()
+        ivf = vector_index._Index(ids, ids, mat)
+        build = time.perf_counter() - t0
+        p50, p99 = _latencies(lambda q: ivf.search(q, 10), queries)
+        recall = np.mean([
+            len({i for i, _ in ivf.search(q, 10)} & {i for i, _ in flat.search(q, 10)}) / 10
+            for q in queries
+        ])
+        print(f"{n:>9} {'ivf':<10}{build:>9.2f}{p50:>9.2f}{p99:>9.2f}{recall:>8.3f}")
+
+        vector_index.IVF_MIN = n + 1
+        base = tmp / f"bench.{n}"
+        vector_index._save_snapshot(base, flat)
+        t0 = time.perf_counter()
+        loaded = vector_index._load_snapshot(base)
+        load = time.perf_counter() - t0
+        print(f"{n:>9} {'mmap load':<10}{load:>9.2f}{'':>9}{'':>9}{'':>8}")
+        del flat, ivf, loaded, mat
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -283,6 +283,9 @@ def main() -> int:
         backup = DEMO_DB.with_suffix(f".db.bak-{int(time.time())}")
         shutil.copy(DEMO_DB, backup)
         print(f"backed up existing demo DB → {backup.name}")
+        # Drop pooled handles that would keep pointing at the old file.
+        from data.db import close_all_connections
+        close_all_connections()
         DEMO_DB.unlink()
 
     if args.dry_run:
@@ -100,7 +100,7 @@ class HTTPLoggingMiddleware(BaseHTTPMiddleware):
             client_ip = request.client.host if request.client else None
             user_agent = request.headers.get("user-agent", "")[:500]  # Truncate long UAs
             
-            # Log to database (async-safe via sync call)
+            # Queue for the background log sink (no DB write on the event loop)
             try:
                 from agent.threads.log.schema import log_server_request
                 log_server_request(
@@ -66,7 +66,17 @@ _MOCK_EXTRACT_RESPONSE = {
 
 
 def _mock_ollama_chat(model=None, messages=None, **kwargs):
-    """Route mock responses based on the prompt content."""
+    """Route mock responses based on the prompt content.
+
+    ``stream=True`` returns the same reply as word-sized chunks.
+    """
+    if kwargs.get("stream"):
+        reply = _mock_ollama_chat(model, messages)["message"]["content"]
+        words = reply.split(" ")
+        return iter(
+            {"message": {"role": "assistant", "content": w + (" " if i < len(words) - 1 else "")}}
+            for i, w in enumerate(words)
+        )
     if not messages:
         return _MOCK_CHAT_RESPONSE
 
@@ -0,0 +1,169 @@
+"""
+Connection pool tests — data.db pooled handles, the serialized writer and
+the table counters.
+
+Each test points STATE_DB_PATH at a throwaway file so the pool is keyed
+away from the demo DB.
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    from data import db
+    path = tmp_path / "pool.db"
+    monkeypatch.setenv("STATE_DB_PATH", str(path))
+    db.configure_pool(enabled=True)
+    with closing(db.get_connection()) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+        conn.commit()
+    yield db
+    db.close_all_connections()
+
+
+class TestConnectionPool:
+    """data.db.get_connection — per-thread reuse keyed by DB path."""
+
+    def test_close_returns_handle_to_pool(self, tmp_db):
+        with closing(tmp_db.get_connection()) as first:
+            pass
+        with closing(tmp_db.get_connection()) as second:
+            assert second is first
+
+    def test_nested_checkouts_are_distinct(self, tmp_db):
+        with closing(tmp_db.get_connection()) as a, closing(tmp_db.get_connection()) as b:
+            assert a is not b
+
+    def test_uncommitted_work_discarded_on_close(self, tmp_db):
+        with closing(tmp_db.get_connection()) as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('dropped')")
+        with closing(tmp_db.get_connection()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_row_factory_reset(self, tmp_db):
+        with closing(tmp_db.get_connection()) as conn:
+            conn.row_factory = None
+        with closing(tmp_db.get_connection()) as conn:
+            assert conn.row_factory is sqlite3.Row
+
+    def test_double_close_does_not_duplicate(self, tmp_db):
+        conn = tmp_db.get_connection()
+        conn.close()
+        conn.close()
+        with closing(tmp_db.get_connection()) as a, closing(tmp_db.get_connection()) as b:
+            assert a is not b
+
+    def test_threads_get_own_connections(self, tmp_db):
+        with closing(tmp_db.get_connection()) as mine:
+            pass
+        seen = []
+
+        def worker():
+            with closing(tmp_db.get_connection()) as conn:
+                seen.append(conn)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen and seen[0] is not mine
+
+    def test_close_all_retires_other_threads_lazily(self, tmp_db):
+        parked, go, done = [], threading.Event(), threading.Event()
+
+        def worker():
+            with closing(tmp_db.get_connection()) as conn:
+                parked.append(conn)
+            go.wait(5)
+            with closing(tmp_db.get_connection()) as conn:
+                parked.append(conn)
+            done.set()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        while not parked:
+            threading.Event().wait(0.01)
+        tmp_db.close_all_connections()
+        before = tmp_db.pool_stats()["discarded"]
+        # Not closed from this thread: the owner retires it on next use
+        parked[0].execute("SELECT 1")
+        go.set()
+        done.wait(5)
+        t.join()
+        assert parked[1] is not parked[0]
+        assert tmp_db.pool_stats()["discarded"] == before + 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            parked[0].execute("SELECT 1")
+
+    def test_path_switch_uses_new_db(self, tmp_db, tmp_path, monkeypatch):
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "other.db"))
+        with closing(tmp_db.get_connection()) as conn:
+            tables = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name = 't'"
+            ).fetchall()
+        assert tables == []
+
+
+class TestWriter:
+    """data.db.writer — serialized, re-entrant write transactions."""
+
+    def test_commits_on_exit(self, tmp_db):
+        with tmp_db.writer() as conn:
+            conn.execute("INSERT INTO t (v) VALUES ('a')")
+        with closing(tmp_db.get_connection(readonly=True)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    def test_rolls_back_on_error(self, tmp_db):
+        with pytest.raises(RuntimeError):
+            with tmp_db.writer() as conn:
+                conn.execute("INSERT INTO t (v) VALUES ('a')")
+                raise RuntimeError("boom")
+        with closing(tmp_db.get_connection(readonly=True)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_nested_blocks_share_transaction(self, tmp_db):
+        with tmp_db.writer() as outer:
+            with tmp_db.writer() as inner:
+                assert inner is outer
+                inner.execute("INSERT INTO t (v) VALUES ('a')")
+            assert outer.in_transaction
+
+
+class TestTableCounts:
+    """data.db.table_stats — trigger-kept row counters behind a TTL cache."""
+
+    @pytest.fixture
+    def counts(self, tmp_db, monkeypatch):
+        from data.db import table_stats
+        monkeypatch.setattr(table_stats, "TTL_S", 0)
+        with tmp_db.writer() as conn:
+            conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, status TEXT)")
+            conn.executemany("INSERT INTO tasks (status) VALUES (?)",
+                             [("pending",), ("pending",), ("done",), (None,)])
+        yield table_stats
+        table_stats.invalidate_table_counts()
+
+    def test_seeded_and_kept_by_triggers(self, counts, tmp_db):
+        assert counts.get_table_counts() == {"tasks": 4}
+        assert counts.get_column_counts("tasks", "status") == {"pending": 2, "done": 1, "": 1}
+        with tmp_db.writer() as conn:
+            conn.execute("UPDATE tasks SET status = 'done' WHERE id = 1")
+            conn.execute("DELETE FROM tasks WHERE status IS NULL")
+            conn.execute("INSERT INTO tasks (status) VALUES ('executing')")
+        assert counts.get_table_counts(["tasks", "nope"]) == {"tasks": 4}
+        assert counts.get_column_counts("tasks", "status") == {"pending": 1, "done": 2, "executing": 1}
+
+    def test_reconcile_fixes_drift(self, counts, tmp_db):
+        counts.get_table_counts()
+        with tmp_db.writer() as conn:
+            # REPLACE's implicit delete fires no trigger: +1 that isn't a row
+            conn.execute("INSERT OR REPLACE INTO tasks (id, status) VALUES (1, 'done')")
+        assert counts.get_table_counts()["tasks"] == 5
+        assert counts.reconcile_table_counts() == 2   # total, status=pending
+        assert counts.get_table_counts()["tasks"] == 4
+        assert counts.get_column_counts("tasks", "status") == {"pending": 1, "done": 2, "": 1}
+        assert counts.reconcile_table_counts() == 0
@@ -10,6 +10,18 @@ Flows tested:
   3. Chat round-trip    (send_message → context assembly → response → DB persist)
   4. Feed pipeline      (emit → dedup → handler callback)
   5. Concept learning   (record concepts → graph links → spread_activate retrieval)
+  6. STATE assembly     (scored sources → concurrent section builders → score-ordered STATE)
+  7. Streaming reply    (provider deltas → Agent.generate_stream → filtered deltas + TTFT log)
+  8. Turn offload       (blocking turn work → turn executor, provider slots, cancel on disconnect)
+  9. Log sink           (log_* → bounded queue → batched writer → readers flush first)
+ 10. Embedding store    (get_embeddings → LRU → on-disk store → batched provider misses)
+ 11. Vector index       (add_turn → mark_dirty → incremental upsert → top-k → mmap snapshot)
+ 12. Fact dedup         (pending facts → one batched nearest() → triage confidence)
+ 13. Meditation        (fact writes → fact_concepts → active concepts → state_cache)
+ 14. Tool rounds       (one round's tool calls → read-only ones concurrently → results in order)
+ 15. Code index        (tree → trigram index → candidate files → regex_search output)
+ 16. Trace stream      (publish → subscriber queues → woken SSE readers, overflow refilled from ring)
+ 17. Loop scheduler    (timing heap → local loops concurrent, LLM loops one per provider, idle-aware)
 """
 
 import asyncio
@@ -331,6 +343,57 @@ class TestChatRoundTrip:
         except ImportError:
             pytest.skip("chat.schema not available")
 
+    def test_turn_state_stored_by_section(self, tmp_path, monkeypatch):
+        from contextlib import closing
+        from data.db import close_all_connections, get_connection
+        from chat import state_store
+        from chat.schema import add_turn, delete_conversation, init_convos_tables
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "chat.db"))
+        try:
+            init_convos_tables()
+            head = "== STATE ==\n[self] structure\n  threads: 6"
+            first = f"{head}\n\n[identity] I am Nola\n\n\n[chat] q=one\n\n== END STATE =="
+            second = f"{head}\n\n[identity] I am Nola\n\n[chat] q=two ✓\n\n== END STATE =="
+            add_turn("s1", "one", "a", state_snapshot={"state_block": first, "feed_type": "user"})
+            add_turn("s1", "two", "b", state_snapshot={"state_block": second, "feed_type": "user"})
+            with closing(get_connection()) as conn:
+                ids = [r[0] for r in conn.execute("SELECT id FROM convo_turns ORDER BY id")]
+                # a legacy row: whole block inline
+                conn.execute(
+                    "INSERT INTO convo_turns (convo_id, turn_index, state_snapshot_json) VALUES (1, 2, ?)",
+                    (json.dumps({"state_block": first, "source": "old"}),),
+                )
+                conn.commit()
+                legacy = ids[-1] + 1
+
+            assert state_store.get_turn_state(ids[0]) == first
+            assert state_store.get_turn_state(ids[1]) == second
+            assert state_store.get_turn_snapshots([ids[1]])[ids[1]]["feed_type"] == "user"
+            assert state_store.state_store_stats()["sections"] == 5   # head, identity, end shared
+            assert state_store.get_turn_state(legacy) == first
+            assert state_store.compact_turn_states() == 1
+            assert state_store.get_turn_states(ids + [legacy]) == {
+                ids[0]: first, ids[1]: second, legacy: first,
+            }
+            assert state_store.state_store_stats()["sections"] == 5
+
+            # A turn with a lost section reads back without its STATE;
+            # the rest of the batch is unaffected
+            add_turn("s2", "three", "c", state_snapshot={"state_block": "[lost] x", "feed_type": "user"})
+            with closing(get_connection()) as conn:
+                lost = conn.execute("SELECT MAX(id) FROM convo_turns").fetchone()[0]
+                conn.execute("DELETE FROM state_sections WHERE size = 8")
+                conn.commit()
+            assert state_store.get_turn_states(ids + [lost]) == {ids[0]: first, ids[1]: second}
+            assert state_store.get_turn_snapshots([lost]) == {lost: {"feed_type": "user"}}
+            assert delete_conversation("s2")
+
+            assert delete_conversation("s1")
+            assert state_store.state_store_stats()["sections"] == 0
+        finally:
+            close_all_connections()
+
     def test_context_assembly_runs(self, agent_service):
         """Agent should have consciousness context assembled."""
         # After a message, the agent should have been called with context
@@ -418,6 +481,29 @@ class TestConceptLearning:
         assert isinstance(concepts, list)
         assert len(concepts) >= 1
 
+    def test_entity_matcher_tracks_fact_writes(self, monkeypatch):
+        from agent.threads.identity.schema import delete_profile_fact, push_profile_fact
+        from agent.threads.linking_core import entity_matcher
+        from agent.threads.linking_core.entity_matcher import entity_matcher_stats
+        from agent.threads.linking_core.schema import (
+            extract_concepts_batch, extract_concepts_from_text,
+        )
+
+        key = "test_flow.zanzibar_trip"
+        texts = ["booked the zanzibar ferry", "python and machine learning", ""]
+        assert key not in extract_concepts_from_text(texts[0])
+        builds = entity_matcher_stats()["builds"]
+        monkeypatch.setattr(entity_matcher, "SYNC_S", 0)    # read the change log every call
+
+        push_profile_fact("primary_user", key, "note", l1_value="Trip in May")
+        assert key in extract_concepts_from_text(texts[0])
+        assert [sorted(c) for c in extract_concepts_batch(texts)] == \
+            [sorted(extract_concepts_from_text(t)) for t in texts]
+
+        delete_profile_fact("primary_user", key)
+        assert key not in extract_concepts_from_text(texts[0])
+        assert entity_matcher_stats()["builds"] == builds   # applied in place
+
     def test_create_and_retrieve_link(self):
         from agent.threads.linking_core.schema import create_link, get_links_for_concept
 
@@ -454,3 +540,1159 @@ class TestConceptLearning:
         # We check that the function ran without error — exact links depend on extraction
         # In live mode this will create real concept links
         assert True  # no exception = pass
+
+
+# ===================================================================
+# 6. STATE Assembly
+# ===================================================================
+
+class TestStateAssembly:
+    """build_state fan-out: score-ordered splice, per-source deadlines."""
+
+    @pytest.fixture
+    def sub(self, monkeypatch):
+        import time
+        from agent.subconscious import orchestrator
+        from agent.subconscious.orchestrator import Subconscious
+
+        sub = Subconscious()
+        monkeypatch.setattr(orchestrator, "_late_builds", {})
+        calls = []
+        # Higher-scored sources finish last, so completion order is reversed
+        delays = {"identity": 0.2, "form": 0.02, "chat": 0.0}
+
+        def fake(name, level, threshold, query, budget=200):
+            calls.append((name, level))
+            time.sleep(delays.get(name, 0.0) if level > 1 else 0.0)
+            return [f"[{name}] level={level}"]
+
+        monkeypatch.setattr(sub, "_build_thread_section", fake)
+        monkeypatch.setattr(sub, "_build_module_section", fake)
+        monkeypatch.setattr(sub, "_build_self_awareness_block", lambda: [])
+        monkeypatch.setattr(sub, "_build_salience_hot_block", lambda **kw: [])
+        sub.calls = calls
+        return sub, orchestrator
+
+    SCORES = {"identity": 9.0, "form": 6.0, "chat": 4.0}
+
+    def _sections(self, state):
+        return [l for l in state.splitlines() if l.startswith("[")]
+
+    def test_parallel_matches_sequential(self, sub, monkeypatch):
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 1)
+        sequential = sub.build_state(self.SCORES, "q", record_activations=False)
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 4)
+        parallel = sub.build_state(self.SCORES, "q", record_activations=False)
+        assert parallel == sequential
+        assert self._sections(parallel) == [
+            "[identity] level=3", "[form] level=2", "[chat] level=2",
+        ]
+
+    def test_slow_source_degrades_to_l1(self, sub, monkeypatch):
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 4)
+        monkeypatch.setattr(orchestrator, "SOURCE_DEADLINE_MS", 100)
+        state = sub.build_state(self.SCORES, "q", record_activations=False)
+        assert self._sections(state) == [
+            "[identity] level=1", "[form] level=2", "[chat] level=2",
+        ]
+        assert ("identity", 1) in sub.calls
+
+    def test_hung_source_not_resubmitted(self, sub, monkeypatch):
+        import threading
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 4)
+        monkeypatch.setattr(orchestrator, "SOURCE_DEADLINE_MS", 50)
+        release = threading.Event()
+        calls = []
+
+        def builder(name, level, threshold, query, budget=200):
+            calls.append(name)
+            if name == "identity":
+                release.wait(5)
+            return [f"[{name}]"]
+
+        monkeypatch.setattr(sub, "_build_thread_section", builder)
+        monkeypatch.setattr(sub, "_build_module_section", builder)
+        try:
+            sub.build_state(self.SCORES, "q", record_activations=False)
+            assert calls.count("identity") == 2  # original + L1 retry
+            state = sub.build_state(self.SCORES, "q", record_activations=False)
+            assert calls.count("identity") == 2
+            assert self._sections(state) == ["[form]", "[chat]"]
+        finally:
+            release.set()
+        for futs in orchestrator._late_builds.values():
+            for f in futs:
+                f.result(timeout=5)
+        state = sub.build_state(self.SCORES, "q", record_activations=False)
+        assert self._sections(state) == ["[identity]", "[form]", "[chat]"]
+
+    def test_timings_published(self, sub, monkeypatch):
+        from agent.subconscious import trace_bus
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 4)
+        start = trace_bus.latest_seq()
+        sub.build_state(self.SCORES, "q", record_activations=False)
+        events = trace_bus.events_since(start)
+        timed = {e["source"] for e in events if e["type"] == "section_timing"}
+        assert timed == set(self.SCORES)
+        done = [e for e in events if e["type"] == "sections_done"][-1]
+        assert done["parallel"] and done["critical_source"] == "identity"
+
+    def test_query_analysis_shared_with_workers(self, sub, monkeypatch):
+        from agent.threads.linking_core.query import QueryAnalysis, get_query_analysis
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_WORKERS", 4)
+        analysis = QueryAnalysis(query="q", concepts=["x"])
+        seen = []
+
+        def builder(name, level, threshold, query, budget=200):
+            seen.append(get_query_analysis(query))
+            return [f"[{name}]"]
+
+        monkeypatch.setattr(sub, "_build_thread_section", builder)
+        monkeypatch.setattr(sub, "_build_module_section", builder)
+        sub.build_state(self.SCORES, "q", record_activations=False, analysis=analysis)
+        assert len(seen) == 3 and all(a is analysis for a in seen)
+
+    def test_stable_layout_shares_prefix(self, sub, monkeypatch):
+        from agent.subconscious import trace_bus
+        sub, orchestrator = sub
+        monkeypatch.setattr(orchestrator, "STATE_LAYOUT", "stable")
+
+        def builder(name, level, threshold, query, budget=200):
+            return [f"[{name}] level={level} q={query}"]
+
+        monkeypatch.setattr(sub, "_build_thread_section", builder)
+        monkeypatch.setattr(sub, "_build_module_section", builder)
+        start = trace_bus.latest_seq()
+        first = sub.build_state(self.SCORES, "first", record_activations=False)
+        second = sub.build_state(self.SCORES, "second", record_activations=False)
+        assert self._sections(second) == [
+            "[identity] level=2 q=", "[philosophy] level=2 q=", "[form] level=2 q=",
+            "[chat] level=2 q=second",
+        ]
+        prefix = first[: first.index("[chat]")]
+        assert second.startswith(prefix)
+        layouts = [e for e in trace_bus.events_since(start) if e["type"] == "state_layout"]
+        assert layouts[0]["changed"] == ["identity", "philosophy", "form"]
+        assert layouts[1]["changed"] == []
+
+
+class TestDocsIndex:
+    """docs_index: incremental refresh and term-overlap search."""
+
+    @pytest.fixture
+    def tree(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections
+        from agent.subconscious import docs_index
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "docs.db"))
+        root = tmp_path / "repo"
+        (root / "agent" / "graph").mkdir(parents=True)
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "README.md").write_text("# Root\n\nintro\n")
+        (root / "agent" / "graph" / "README.md").write_text("# Concept Graph\n\nspread activation\n")
+        (root / "agent" / "notes.md").write_text("# Notes\n\nnothing relevant\n")
+        (root / "node_modules" / "pkg" / "README.md").write_text("# vendored\n")
+        monkeypatch.setattr(docs_index, "DOCS_ROOT", root)
+        yield root, docs_index
+        close_all_connections()
+
+    def test_refresh_is_incremental(self, tree):
+        root, docs_index = tree
+        assert docs_index.refresh_docs_index(root)["added"] == 3
+        again = docs_index.refresh_docs_index(root)
+        assert (again["added"], again["updated"], again["removed"]) == (0, 0, 0)
+        (root / "agent" / "notes.md").write_text("# Notes v2\n\nlonger body now\n")
+        (root / "README.md").unlink()
+        stats = docs_index.refresh_docs_index(root)
+        assert (stats["updated"], stats["removed"]) == (1, 1)
+        assert docs_index.get_docs(["agent/notes.md"])["agent/notes.md"][3] == "Notes v2"
+
+    def test_search_and_readmes(self, tree):
+        root, docs_index = tree
+        docs_index.ensure_docs_index()
+        hits = docs_index.search_docs(["graph", "activation"])
+        assert hits[0][0][0] == "agent/graph/README.md"
+        assert [r[0] for r in docs_index.module_readmes()] == ["agent/graph/README.md"]
+        assert docs_index.docs_summary()["total"] == 3
+
+    def test_docs_context_reads_index(self, tree):
+        from agent.subconscious.orchestrator import Subconscious
+        facts = Subconscious()._get_docs_context("concept graph", level=3)
+        assert facts[0].startswith("  docs.README.md: 14B")
+        assert "  docs.agent/graph/README.md.title: Concept Graph" in facts
+
+
+# ===================================================================
+# 7. Streaming Reply
+# ===================================================================
+
+class TestStreamingReply:
+    """provider deltas → Agent.generate_stream → filtered deltas + TTFT log."""
+
+    DELTAS = ["Hel", "lo the", "re.", "\n<expe", "cted>next</expected>", " Bye."]
+
+    @pytest.fixture
+    def agent(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections
+        from agent.services import llm
+        from agent.agent import Agent
+
+        class FakeStreamProvider(llm.LLMProvider):
+            name = "fakestream"
+            default_model = "fake-1"
+
+            def generate(self, messages, model=None, temperature=0.7, max_tokens=2048):
+                return "".join(TestStreamingReply.DELTAS)
+
+            def generate_stream(self, messages, model=None, temperature=0.7, max_tokens=2048):
+                yield from TestStreamingReply.DELTAS
+                llm._note_usage(prompt_tokens=40, completion_tokens=6, cached_tokens=32)
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "stream.db"))
+        monkeypatch.setenv("AIOS_DEMO_ALLOW_LLM", "1")
+        monkeypatch.setenv("AIOS_TOOL_MODE", "text")
+        monkeypatch.setitem(llm.PROVIDER_CLASSES, "fakestream", FakeStreamProvider)
+        monkeypatch.delitem(llm._instances, "fakestream", raising=False)
+        agent = Agent()
+        agent._bootstrapped = True
+        yield agent
+        close_all_connections()
+
+    def _kwargs(self):
+        return dict(consciousness_context="", provider_override="fakestream",
+                    model_override="fake-1")
+
+    def test_stream_matches_generate(self, agent):
+        from agent.agent import FinalReply
+
+        async def collect():
+            return [d async for d in agent.generate_stream("hi", **self._kwargs())]
+
+        *deltas, final = _run(collect())
+        assert isinstance(final, FinalReply) and len(deltas) > 1
+        assert "".join(deltas) == final == agent.generate("hi", **self._kwargs())
+        assert [t["kind"] for t in agent._last_thoughts] == ["expected"]
+
+    def test_tool_round_narration_not_in_reply(self, agent, monkeypatch):
+        from agent.agent import FinalReply
+        from agent.services import llm
+        provider = llm.PROVIDER_CLASSES["fakestream"]
+
+        def reply(messages):
+            if messages[-1]["content"] == "Continue with the results above.":
+                return ["All ", "done."]
+            return ["Let me look.", "\n:::execute\ntool: t\naction: a\n:::"]
+
+        monkeypatch.setattr(provider, "generate", lambda self, messages, **kw: "".join(reply(messages)))
+        monkeypatch.setattr(provider, "generate_stream", lambda self, messages, **kw: iter(reply(messages)))
+        monkeypatch.setattr(agent, "_execute_tool_calls", lambda calls, *a, **kw: ["ok"] * len(calls))
+
+        *deltas, final = list(agent.iter_generate("hi", **self._kwargs()))
+        assert isinstance(final, FinalReply)
+        assert "Let me look." in "".join(deltas)
+        assert final == "All done." == agent.generate("hi", **self._kwargs())
+
+    def test_ttft_logged(self, agent):
+        from agent.threads.log.schema import get_llm_calls, get_llm_stats
+        list(agent.iter_generate("hi", **self._kwargs()))
+        call = get_llm_calls(caller="chat")[0]
+        assert call["provider"] == "fakestream" and call["success"] == 1
+        assert call["ttft_ms"] is not None and call["ttft_ms"] <= call["latency_ms"]
+        assert call["metadata"]["chunks"] == len(self.DELTAS)
+        assert get_llm_stats()["avg_ttft_ms"] is not None
+
+    def test_usage_and_prompt_prefix_logged(self, agent):
+        from agent.threads.log.schema import get_llm_calls, get_llm_stats
+        for query in ("hi", "hello"):
+            list(agent.iter_generate(query, **self._kwargs()))
+        calls = get_llm_calls(caller="chat")
+        assert all((c["prompt_tokens"], c["completion_tokens"], c["cached_tokens"])
+                   == (40, 6, 32) for c in calls)
+        # Same STATE both turns: the second repeats the whole system prompt
+        assert sorted(c["metadata"]["prefix_ratio"] for c in calls) == [0.0, 1.0]
+        assert get_llm_stats()["cached_tokens"] == 64
+
+    def test_prompt_prefix_per_session_on_both_paths(self, agent):
+        from agent.threads.log.schema import get_llm_calls
+        list(agent.iter_generate("hi", session_id="a", **self._kwargs()))
+        agent.generate("hi", session_id="b", **self._kwargs())
+        agent.generate("hello", session_id="a", **self._kwargs())
+        calls = get_llm_calls(caller="chat")
+        streamed = [c for c in calls if c["metadata"].get("stream")]
+        plain = [c for c in calls if not c["metadata"].get("stream")]
+        assert len(streamed) == 1 and len(plain) == 2
+        # Session b starts fresh; a's second turn repeats a's first prompt
+        assert sorted(c["metadata"]["prefix_ratio"] for c in plain) == [0.0, 1.0]
+
+
+# ===================================================================
+# 8. Turn Offload
+# ===================================================================
+
+class TestTurnOffload:
+    """blocking turn work → turn executor, provider slots, cancel on disconnect."""
+
+    def test_loop_stays_responsive(self):
+        import time
+        from agent.services.turn_executor import run_blocking
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            t = asyncio.create_task(ticker())
+            result = await run_blocking(lambda: time.sleep(0.3) or "done")
+            t.cancel()
+            return result, ticks
+
+        result, ticks = _run(scenario())
+        assert result == "done"
+        assert ticks >= 10
+
+    def test_provider_slot_limits_concurrency(self, monkeypatch):
+        import threading
+        import time
+        from agent.services import llm
+
+        monkeypatch.setenv("AIOS_PROVIDER_CONCURRENCY", "slotted=2")
+        monkeypatch.delitem(llm._provider_slots, "slotted", raising=False)
+        peak, active, lock = [0], [0], threading.Lock()
+
+        def call():
+            with llm.provider_slot("slotted"):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        assert peak[0] == 2
+        stats = llm.provider_concurrency_stats()["slotted"]
+        assert stats["limit"] == 2 and stats["active"] == 0 and stats["calls"] >= 6
+
+    def test_shared_service_serializes_turns(self, monkeypatch):
+        import threading
+        import time
+        from agent.services import agent_service as svc_mod
+
+        svc = svc_mod.AgentService()
+        active, peak, lock = [0], [0], threading.Lock()
+
+        class FakeAgent:
+            def generate(self, user_input, **kwargs):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+                return f"re: {user_input}"
+
+        async def nothing(*args, **kwargs):
+            return None
+
+        svc.agent = FakeAgent()
+        monkeypatch.setattr(svc, "_save_conversation_turn", nothing)
+        monkeypatch.setattr(svc.context_manager, "log_interaction", nothing)
+        monkeypatch.setattr(svc_mod, "get_consciousness_context", lambda **kw: "", raising=False)
+
+        async def scenario():
+            return await asyncio.gather(*(svc.send_message(f"m{i}") for i in range(3)))
+
+        replies = _run(scenario())
+        assert [r.content for r in replies] == ["re: m0", "re: m1", "re: m2"]
+        assert peak[0] == 1
+        assert [(m.role, m.content) for m in svc.message_history] == [
+            (role, text) for i in range(3) for role, text in (("user", f"m{i}"), ("assistant", f"re: m{i}"))
+        ]
+
+    def test_disconnect_cancels_turn(self, monkeypatch):
+        from chat.api import WebSocketManager
+
+        manager = WebSocketManager()
+        started, cancelled = asyncio.Event(), []
+
+        async def slow_turn(websocket, client_id, data):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(client_id)
+                raise
+
+        monkeypatch.setattr(manager, "handle_chat_message", slow_turn)
+
+        async def scenario():
+            manager._start_turn(None, "c1", {"type": "chat_message"})
+            await asyncio.wait_for(started.wait(), 1)
+            manager.disconnect("c1")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        _run(scenario())
+        assert cancelled == ["c1"]
+        assert "c1" not in manager._turns
+
+
+# ===================================================================
+# 9. Log Sink
+# ===================================================================
+
+class TestLogSink:
+    """log_* call → bounded queue → batched writer thread → readers flush first."""
+
+    @pytest.fixture
+    def db(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "logsink.db"))
+        yield
+        close_all_connections()
+
+    def test_queued_rows_visible_to_readers(self, db):
+        from agent.threads.log import sink
+        from agent.threads.log.schema import (
+            get_llm_calls, get_server_logs, log_llm_call, log_server_request,
+        )
+        for i in range(20):
+            log_server_request("GET", f"/api/sink/{i}", 200, duration_ms=1.0)
+        log_llm_call(model="m", prompt_tokens=3, completion_tokens=4, caller="sink-test")
+        assert len(get_server_logs(path_prefix="/api/sink/")) == 20
+        assert get_llm_calls(caller="sink-test")[0]["total_tokens"] == 7
+        stats = sink.sink_stats()
+        assert stats["queue_depth"] == 0 and stats["batches"] >= 1
+        # explicit API posts write inline and get their row id back
+        log_id = log_llm_call(model="m", caller="sink-inline", inline=True)
+        assert isinstance(log_id, int)
+        assert get_llm_calls(caller="sink-inline")[0]["id"] == log_id
+
+    def test_function_call_dedup_within_batch(self, db):
+        from agent.threads.log.schema import get_function_calls, log_function_call
+        for _ in range(3):
+            log_function_call("sink.dedup", args_summary={"x": 1})
+        log_function_call("sink.dedup", args_summary={"x": 2})
+        assert len(get_function_calls(function_name="sink.dedup")) == 2
+
+    def test_full_queue_drops(self, db, monkeypatch):
+        import queue
+        from agent.threads.log import sink
+        from agent.threads.log.schema import log_server_request
+
+        monkeypatch.setattr(sink, "_queue", queue.Queue(maxsize=2))
+        monkeypatch.setattr(sink, "_ensure_thread", lambda: None)
+        monkeypatch.setattr(sink, "FULL_WAIT_MS", 0)
+        before = sink.sink_stats()["dropped"]
+        for i in range(5):
+            log_server_request("GET", f"/api/full/{i}", 200)
+        assert sink.sink_stats()["dropped"] - before == 3
+        assert sink._drain() == 2
+
+    def test_api_reads_flush_off_event_loop(self, db, monkeypatch):
+        import threading
+        from agent.threads.log import api, sink
+        from agent.threads.log.schema import init_llm_inference_table, init_server_log_table
+
+        init_llm_inference_table()
+        init_server_log_table()
+        threads = []
+        monkeypatch.setattr(sink, "flush", lambda timeout=0: threads.append(threading.get_ident()) or True)
+
+        async def scenario():
+            await api.list_llm_calls(caller="off-loop", limit=10)
+            await api.server_statistics()
+            return threading.get_ident()
+
+        loop_thread = _run(scenario())
+        assert len(threads) == 2 and loop_thread not in threads
+
+
+# ===================================================================
+# 10. Embedding Store
+# ===================================================================
+
+class TestEmbeddingStore:
+    """get_embeddings → LRU → embedding_store table → batched provider misses."""
+
+    @pytest.fixture
+    def fake_embed(self, tmp_path, monkeypatch):
+        import numpy as np
+        from data.db import close_all_connections
+        from agent.threads.linking_core import scoring
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "embed.db"))
+        monkeypatch.setenv("AIOS_EMBED_PROVIDER", "fake")
+        monkeypatch.setenv("AIOS_EMBED_MODEL", "fake-a")
+        calls = []
+
+        def batch(texts):
+            calls.append(list(texts))
+            return [np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(16) for t in texts]
+
+        monkeypatch.setattr(scoring, "_probe", lambda: True)
+        monkeypatch.setattr(scoring, "_embed_batch_raw", batch)
+        scoring.clear_cache()
+        yield calls
+        scoring.clear_cache()
+        close_all_connections()
+
+    def test_batch_dedups_and_persists(self, fake_embed):
+        import numpy as np
+        from agent.threads.linking_core.scoring import clear_cache, get_embeddings
+
+        first = get_embeddings(["alpha", "beta", "alpha", ""])
+        assert fake_embed == [["alpha", "beta"]]
+        assert first[3] is None and np.array_equal(first[0], first[2])
+
+        clear_cache()  # memory tier gone — disk tier still answers
+        again = get_embeddings(["beta", "alpha"])
+        assert len(fake_embed) == 1
+        assert np.allclose(again[1], first[0])
+
+    def test_model_switch_misses(self, fake_embed, monkeypatch):
+        from agent.threads.linking_core.scoring import get_embedding
+
+        get_embedding("gamma")
+        monkeypatch.setenv("AIOS_EMBED_MODEL", "fake-b")
+        get_embedding("gamma")
+        assert fake_embed == [["gamma"], ["gamma"]]
+
+    def test_rank_items_matches_pairwise_cosine(self, fake_embed):
+        from agent.threads.linking_core.scoring import (
+            _item_to_text, cosine_similarity, get_embedding, rank_items,
+        )
+        items = [{"key": f"k{i}", "data": {"value": f"fact number {i}"}, "weight": i / 10}
+                 for i in range(6)]
+        ranked = rank_items(items, "which fact", threshold=-1.0)
+        q = get_embedding("which fact")
+        expected = {
+            it["key"]: 0.7 * cosine_similarity(q, get_embedding(_item_to_text(it))) + 0.3 * it["weight"]
+            for it in items
+        }
+        assert [r["key"] for r in ranked] == sorted(expected, key=expected.get, reverse=True)
+        for r in ranked:
+            assert r["score"] == pytest.approx(expected[r["key"]], abs=1e-5)
+
+
+# ===================================================================
+# 11. Vector Index
+# ===================================================================
+
+class TestVectorIndex:
+    """add_turn → mark_dirty → incremental upsert → top-k → snapshot reload."""
+
+    @pytest.fixture
+    def bow_embed(self, tmp_path, monkeypatch):
+        import zlib
+        import numpy as np
+        from data.db import close_all_connections
+        from agent.threads.linking_core import scoring, vector_index
+        from chat.schema import init_convos_tables
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "vectors.db"))
+        monkeypatch.setenv("AIOS_EMBED_PROVIDER", "fake")
+        monkeypatch.setenv("AIOS_EMBED_MODEL", "bow-64")
+        calls = []
+
+        def batch(texts):
+            calls.append(len(texts))
+            out = []
+            for t in texts:
+                v = np.zeros(64)
+                for w in t.lower().split():
+                    v[zlib.crc32(w.encode()) % 64] += 1
+                out.append(v)
+            return out
+
+        monkeypatch.setattr(scoring, "_probe", lambda: True)
+        monkeypatch.setattr(scoring, "_embed_batch_raw", batch)
+        scoring.clear_cache()
+        vector_index.reset()
+        init_convos_tables()
+        yield calls
+        vector_index.reset()
+        scoring.clear_cache()
+        close_all_connections()
+
+    def test_turns_are_searchable_incrementally(self, bow_embed):
+        from agent.threads.linking_core import vector_index
+        from chat.schema import add_turn, semantic_search_conversations
+
+        add_turn("s-garden", "my tomatoes need watering", "water them at dawn")
+        add_turn("s-code", "python import error", "check the virtualenv")
+        assert vector_index.ensure_index("convo_turns")
+        assert vector_index.index_stats()["convo_turns"]["size"] == 2
+
+        add_turn("s-bike", "bicycle chain keeps slipping", "adjust the derailleur")
+        assert vector_index.index_stats()["convo_turns"]["pending"] == 1
+        hits = semantic_search_conversations("bicycle chain", limit=1)
+        assert [h["session_id"] for h in hits] == ["s-bike"]
+        assert vector_index.index_stats()["convo_turns"]["size"] == 3
+
+    def test_snapshot_is_memory_mapped_on_reload(self, bow_embed):
+        from agent.threads.linking_core import vector_index
+        from agent.threads.linking_core.scoring import clear_cache
+        from chat.schema import add_turn
+
+        add_turn("s-garden", "my tomatoes need watering", "water them at dawn")
+        vector_index.ensure_index("convo_turns")
+        vector_index.save("convo_turns")
+
+        vector_index.reset()
+        clear_cache()
+        calls_before = len(bow_embed)
+        vector_index.ensure_index("convo_turns")
+        stats = vector_index.index_stats()["convo_turns"]
+        assert stats["memory_mapped"] and stats["size"] == 1
+        assert len(bow_embed) == calls_before  # nothing re-embedded
+        assert vector_index.search("convo_turns", "tomatoes watering", k=1)[0][0]
+
+    def test_snapshot_json_names_its_matrix(self, bow_embed, tmp_path):
+        from agent.threads.linking_core import vector_index
+        from chat.schema import add_turn
+
+        add_turn("s-garden", "my tomatoes need watering", "water them at dawn")
+        vector_index.ensure_index("convo_turns")
+        vector_index.save("convo_turns")
+        add_turn("s-garden", "and the basil?", "pinch the tops")
+        vector_index.flush("convo_turns")
+        vector_index.save("convo_turns")
+
+        metas = list((tmp_path / "vectors").glob("*.json"))
+        assert len(metas) == 1
+        meta = json.loads(metas[0].read_text())
+        # Only the matrix the committed .json names is left behind
+        assert [p.name for p in (tmp_path / "vectors").glob("*.npy")] == [meta["matrix"]]
+        assert len(meta["ids"]) == 2
+
+    def test_ivf_matches_flat_top1(self, monkeypatch):
+        import numpy as np
+        from agent.threads.linking_core import vector_index
+
+        rng = np.random.default_rng(0)
+        mat = vector_index._normalize(rng.standard_normal((3000, 32)))
+        ids = [str(i) for i in range(len(mat))]
+        monkeypatch.setattr(vector_index, "IVF_MIN", 1000)
+        index = vector_index._Index(ids, ids, mat)
+        assert index.ivf is not None
+        assert all(index.search(mat[i], 1)[0][0] == str(i) for i in range(0, 3000, 150))
+
+        index.remove(["0"])
+        assert index.search(mat[0], 1)[0][0] != "0"
+        index.upsert({"new": ("h", mat[0])})
+        assert index.search(mat[0], 1)[0][0] == "new"
+
+
+# ===================================================================
+# 12. Fact Dedup
+# ===================================================================
+
+class TestFactDedup:
+    """pending facts → fact_dedup.nearest (vector index / shingles) → triage."""
+
+    @pytest.fixture
+    def facts_db(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections
+        from agent.subconscious import fact_dedup
+        from agent.threads.identity import schema as identity_schema
+        from agent.threads.linking_core import scoring, vector_index
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "dedup.db"))
+        monkeypatch.setattr(identity_schema, "_initialized", False)
+        identity_schema.create_profile_type("human")
+        identity_schema.create_fact_type("learned", "Auto-learned", 0.5)
+        identity_schema.create_profile("primary_user", "human", "User")
+        for key, value in [
+            ("coffee", "User likes strong black coffee"),
+            ("city", "User lives in Lisbon near the river"),
+            ("pet", "User has a grey cat called Miso"),
+        ]:
+            identity_schema.push_profile_fact("primary_user", key, "learned", l1_value=value)
+        fact_dedup.reset()
+        vector_index.reset()
+        scoring.clear_cache()
+        yield identity_schema
+        fact_dedup.reset()
+        vector_index.reset()
+        scoring.clear_cache()
+        close_all_connections()
+
+    def test_shingle_fallback_flags_duplicates(self, facts_db, monkeypatch):
+        from agent.subconscious.fact_dedup import nearest
+        from agent.subconscious.loops.consolidation import ConsolidationLoop
+
+        monkeypatch.setenv("AIOS_EMBED_PROVIDER", "none")
+        near = nearest(["user likes strong black coffee", "Sailing on weekends", ""])
+        assert near[0][0] == ("primary_user:coffee", 1.0)
+        assert near[1] == [] and near[2] == []
+
+        loop = ConsolidationLoop.__new__(ConsolidationLoop)
+        assert loop._calculate_confidence("user likes strong black coffee", near[0]) == -1.0
+        assert loop._calculate_confidence("Sailing on weekends", near[1]) > 0
+
+        facts_db.delete_profile_fact("primary_user", "coffee")
+        facts_db.push_profile_fact("primary_user", "tea", "learned", l1_value="User drinks green tea")
+        near = nearest(["user likes strong black coffee", "user drinks green tea"])
+        assert all(fid != "primary_user:coffee" for fid, _ in near[0])
+        assert near[1][0] == ("primary_user:tea", 1.0)
+
+    def test_embedding_path_sees_promoted_facts(self, facts_db, monkeypatch):
+        import zlib
+        import numpy as np
+        from agent.threads.linking_core import scoring
+        from agent.subconscious.fact_dedup import dedup_stats, nearest
+
+        def batch(texts):
+            out = []
+            for t in texts:
+                v = np.zeros(64)
+                for w in t.lower().replace(":", " ").split():
+                    v[zlib.crc32(w.encode()) % 64] += 1
+                out.append(v)
+            return out
+
+        monkeypatch.setenv("AIOS_EMBED_PROVIDER", "fake")
+        monkeypatch.setattr(scoring, "_probe", lambda: True)
+        monkeypatch.setattr(scoring, "_embed_batch_raw", batch)
+
+        before = dedup_stats()["embedded"]
+        near = nearest(["grey cat called Miso", "river in Lisbon"], k=2)
+        assert near[0][0][0] == "primary_user:pet"
+        assert near[1][0][0] == "primary_user:city"
+        assert dedup_stats()["embedded"] - before == 2
+
+        facts_db.push_profile_fact("primary_user", "bike", "learned", l1_value="User rides a red bicycle")
+        assert nearest(["rides a red bicycle"], k=1)[0][0][0] == "primary_user:bike"
+
+
+# ===================================================================
+# 13. Meditation Salience
+# ===================================================================
+
+class TestMeditationSalience:
+    """fact writes → fact_concepts triggers → active concepts → state_cache."""
+
+    @pytest.fixture
+    def med_db(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections, writer
+        from agent.threads.identity import schema as identity_schema
+        from agent.threads.log.schema import init_event_log_table
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "meditation.db"))
+        monkeypatch.setattr(identity_schema, "_initialized", False)
+        identity_schema.create_profile_type("human")
+        identity_schema.create_fact_type("learned", "Auto-learned", 0.5)
+        identity_schema.create_profile("primary_user", "human", "User")
+        init_event_log_table()
+        for key, value in [
+            ("family.mom", "Mom lives in Lisbon"),
+            ("likes_coffee", "Drinks espresso every morning"),
+            ("pet", "Grey cat called Miso"),
+        ]:
+            identity_schema.push_profile_fact("primary_user", key, "learned",
+                                              l1_value=value, weight=0.4)
+        yield identity_schema, writer
+        close_all_connections()
+
+    @staticmethod
+    def _salience(key):
+        from agent.subconscious.meditation import top_salient
+        return {r["key"]: r["salience"] for r in top_salient(limit=500)}.get(key)
+
+    def test_fact_terms(self):
+        from agent.subconscious.meditation import _concept_terms, _fact_terms
+
+        terms = _fact_terms("family.mom", "Likes_Coffee, v2.1")
+        assert {"family.mom", "family", "mom", "likes_coffee", "likes", "coffee", "v2.1"} <= terms
+        assert _concept_terms("Mom Lisbon") == ["lisbon", "mom"]
+        # Documented change from INSTR: substrings are not terms
+        assert "art" not in _fact_terms("hobby", "party planning")
+
+    def test_active_concepts_boost_mentioning_facts(self, med_db):
+        from agent.subconscious.meditation import tick
+
+        identity_schema, writer = med_db
+        tick()
+        assert self._salience("pet") == pytest.approx(0.4)
+        with writer() as conn:
+            conn.execute(
+                "INSERT INTO concept_activation (concept, activation) "
+                "VALUES ('coffee', 1.0), ('lisbon mom', 1.0), ('cat called', 1.0), ('cats', 1.0)"
+            )
+        tick()
+        assert self._salience("likes_coffee") > 0.4
+        assert self._salience("family.mom") > 0.4
+        assert self._salience("pet") > 0.4
+
+        # Edits and deletes reach the index through the triggers.
+        identity_schema.push_profile_fact("primary_user", "likes_coffee", "learned",
+                                          l1_value="Drinks tea now", weight=0.4)
+        identity_schema.push_profile_fact("primary_user", "drink", "learned",
+                                          l1_value="Black coffee", weight=0.4)
+        identity_schema.delete_profile_fact("primary_user", "pet")
+        tick()
+        assert self._salience("drink") > 0.4
+        assert self._salience("pet") is None
+        # key still contains "coffee" as a snake_case part
+        assert self._salience("likes_coffee") > 0.4
+
+    def test_read_views_before_activated_at_migration(self, med_db):
+        from agent.subconscious.meditation import hot_concepts, meditation_stats, tick
+
+        _identity_schema, writer = med_db
+        tick()
+        with writer() as conn:
+            conn.execute("DROP TABLE concept_activation")
+            conn.execute(
+                "CREATE TABLE concept_activation (concept TEXT PRIMARY KEY, "
+                "activation REAL NOT NULL DEFAULT 0, "
+                "last_kicked TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute("INSERT INTO concept_activation (concept, activation) VALUES ('coffee', 0.9)")
+        # Read-only connections can't add the column: undecayed values
+        assert [r["concept"] for r in hot_concepts()] == ["coffee"]
+        assert meditation_stats()["active_concepts"] == 1
+        tick()
+        with writer() as conn:
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(concept_activation)")}
+        assert "activated_at" in cols
+        assert hot_concepts()[0]["activation"] == pytest.approx(0.9, rel=1e-3)
+
+
+# ===================================================================
+# 14. Tool Rounds
+# ===================================================================
+
+class TestToolRound:
+    """one round's tool calls → read-only ones concurrently → results in order."""
+
+    @pytest.fixture
+    def agent(self, tmp_path, monkeypatch):
+        import threading
+        import time
+        from data.db import close_all_connections
+        from agent.agent import Agent
+        from agent.threads.form import schema as form_schema
+        from agent.threads.form.tools import dispatch
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "tools.db"))
+        monkeypatch.setattr(dispatch, "TOOL_WORKERS", 4)
+        spans, lock = {}, threading.Lock()
+
+        def fake(tool, action, params):
+            start = time.perf_counter()
+            time.sleep(float(params.get("sleep", 0.2)))
+            with lock:
+                spans[params["id"]] = (start, time.perf_counter())
+            return {"success": True, "output": f"{tool}.{action}#{params['id']}",
+                    "duration_ms": 200}
+
+        monkeypatch.setattr(form_schema, "execute_tool_action", fake)
+        agent = Agent()
+        agent.spans = spans
+        yield agent
+        close_all_connections()
+
+    def test_reads_run_concurrently_in_order(self, agent):
+        import time
+        calls = [("file_read", "read_file", {"id": 0}),
+                 ("regex_search", "search", {"id": 1}),
+                 ("web_search", "search", {"id": 2})]
+        t0 = time.perf_counter()
+        results = agent._run_tool_round(calls, 0)
+        assert time.perf_counter() - t0 < 0.45
+        assert results == ["file_read.read_file#0", "regex_search.search#1",
+                           "web_search.search#2"]
+
+    def test_side_effects_are_barriers(self, agent):
+        calls = [("file_read", "read_file", {"id": 0}),
+                 ("workspace_write", "write_file", {"id": 1, "sleep": 0.05}),
+                 ("file_read", "read_file", {"id": 2}),
+                 ("terminal", "run_command", {"id": 3})]
+        results = agent._run_tool_round(calls, 0)
+        spans = agent.spans
+        assert spans[0][1] <= spans[1][0] and spans[1][1] <= spans[2][0]
+        assert results[3].startswith("BLOCKED") and 3 not in spans
+
+    def test_schema_path_and_timeout(self, agent, monkeypatch):
+        from agent.threads.form.tools import dispatch
+        monkeypatch.setattr(dispatch, "TOOL_CALL_TIMEOUT_S", 0.05)
+        replies = iter([
+            {"content": "", "tool_calls": [
+                {"function": {"name": "file_read__read_file", "arguments": {"id": 0}}},
+                {"function": {"name": "bogus", "arguments": {}}},
+                {"function": {"name": "file_read__list_directory",
+                              "arguments": json.dumps({"id": 1, "sleep": 0})}},
+            ]},
+            {"content": "done", "tool_calls": []},
+        ])
+        monkeypatch.setattr(agent, "_call_llm_with_tools", lambda *a, **kw: next(replies))
+        messages = []
+        assert agent._process_schema_tool_calls("m", messages, []) == "done"
+        assert [m["content"] for m in messages[1:]] == [
+            "Timed out after 0.05s",
+            "Error: unrecognised function name 'bogus'",
+            "file_read.list_directory#1",
+        ]
+
+
+# ===================================================================
+# 15. Code Index
+# ===================================================================
+
+class TestCodeIndex:
+    """tree → trigram index → candidate files → regex_search output."""
+
+    @pytest.fixture
+    def tree(self, tmp_path, monkeypatch):
+        from agent.threads.form.tools import code_index
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "db" / "state.db"))
+        monkeypatch.setattr(code_index, "MAX_AGE_S", 0)
+        root = tmp_path / "repo"
+        (root / "pkg").mkdir(parents=True)
+        (root / "pkg" / "a.py").write_text("def build_state():\n    return 1\n")
+        (root / "pkg" / "b.py").write_text("import os\nSTATE = os.getenv('X')\n")
+        (root / "notes.md").write_text("Build the state by hand.\n")
+        (root / "__pycache__").mkdir()
+        (root / "__pycache__" / "a.py").write_text("def build_state(): pass\n")
+        yield root
+        code_index.invalidate()
+
+    def test_required_trigrams(self):
+        import re
+        from agent.threads.form.tools.code_index import required_trigrams
+        assert len(required_trigrams("build_state")) == 1
+        assert len(required_trigrams("foo|barbaz")) == 2
+        assert required_trigrams(r"\d+|x") is None
+        assert required_trigrams(r"\w+") is None
+        assert required_trigrams("ab") is None
+        # IGNORECASE folds both sides, so the literal still narrows
+        assert required_trigrams("BUILD", re.I) is not None
+
+    def test_matches_walk_and_refreshes(self, tree, monkeypatch):
+        import os
+        import re
+        from agent.threads.form.tools import code_index
+        from agent.threads.form.tools.executables import regex_search
+        monkeypatch.setattr(regex_search, "WORKSPACE_ROOT", tree)
+
+        def both(pattern, flags=0, file_pattern="*"):
+            indexed, n = code_index.search(tree, pattern, flags, ".", file_pattern, 0, 50)
+            walked, m = regex_search._scan_walk(tree, re.compile(pattern, flags), file_pattern, 0)
+            key = lambda hit: (hit["file"], hit["line"])
+            assert sorted(map(key, indexed)) == sorted(map(key, walked)) and n == m
+            return sorted(map(key, indexed))
+
+        assert both("build_state") == [("pkg/a.py", 1)]
+        assert both("build.the state", re.I) == [("notes.md", 1)]
+        assert both("os", file_pattern="*.py") == [("pkg/b.py", 1), ("pkg/b.py", 2)]
+        assert both("xyzzy") == []
+
+        path = tree / "pkg" / "b.py"
+        path.write_text("def build_state_again():\n    pass\n")
+        os.utime(path, (1, 1))
+        assert both("build_state") == [("pkg/a.py", 1), ("pkg/b.py", 1)]
+        assert code_index.index_stats()["builds"] >= 1
+
+    def test_write_tools_mark_files_stale(self, tree, monkeypatch):
+        import os
+        from agent.threads.form.tools import code_index
+        from agent.threads.form.tools.executables import code_edit, file_write
+        monkeypatch.setattr(file_write, "WORKSPACE_ROOT", tree)
+        monkeypatch.setattr(code_edit, "WORKSPACE_ROOT", tree)
+        monkeypatch.setattr(code_index, "MAX_AGE_S", 3600)
+        find = lambda pattern: [hit["file"] for hit in code_index.search(tree, pattern, 0, ".", "*", 0, 50)[0]]
+
+        file_write.run("write_file", {"path": "pkg/c.py", "content": "old_symbol_xyz = 1\n"})
+        assert find("old_symbol_xyz") == ["pkg/c.py"]
+        # Same size, same mtime: only the write tool's hook can tell
+        st = (tree / "pkg" / "c.py").stat()
+        file_write.run("write_file", {"path": "pkg/c.py", "content": "new_symbol_xyz = 1\n"})
+        os.utime(tree / "pkg" / "c.py", ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert find("new_symbol_xyz") == ["pkg/c.py"] and find("old_symbol_xyz") == []
+
+        code_edit.run("edit_file", {"path": "pkg/c.py", "old": "new_symbol", "new": "edited_symbol"})
+        assert find("edited_symbol_xyz") == ["pkg/c.py"]
+
+    def test_build_runs_outside_lock(self, tree, monkeypatch):
+        import os
+        from agent.threads.form.tools import code_index
+        monkeypatch.setattr(code_index, "MAX_AGE_S", 3600)
+        path = tree / "pkg" / "a.py"
+        find = lambda pattern: [hit["file"] for hit in code_index.search(tree, pattern, 0, ".", "*", 0, 50)[0]]
+        assert find("build_state") == ["pkg/a.py"]
+
+        real_read, held, racing = code_index._read, [], [True]
+
+        def read(p):
+            held.append(code_index._lock._is_owned())
+            text = real_read(p)
+            if racing[0] and p == path:
+                # The file is rewritten (same mtime and size) right after
+                # the refresh read it: the mark must carry to the next one
+                racing[0] = False
+                st = path.stat()
+                path.write_text(text.replace("build_state", "zzzzz_qqqqq"))
+                os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+                code_index.mark_stale(path)
+            return text
+
+        monkeypatch.setattr(code_index, "_read", read)
+        code_index.mark_stale(path)
+        assert find("zzzzz_qqqqq") == []   # this refresh read the old text
+        assert find("zzzzz_qqqqq") == ["pkg/a.py"]
+        assert held and not any(held)
+
+
+# ===================================================================
+# 16. Trace Stream
+# ===================================================================
+
+class TestTraceStream:
+    """publish → subscriber queues → woken SSE readers, overflow refilled from ring."""
+
+    def test_filtered_replay_and_overflow(self):
+        from agent.subconscious import trace_bus
+        start = trace_bus.latest_seq()
+        with trace_bus.subscribe(types=["t_a"], since=start, maxsize=2) as sub:
+            seqs = [trace_bus.publish("t_a" if i % 2 else "t_b", i=i) for i in range(10)]
+            assert [e["seq"] for e in trace_bus.events_since(start, types=["t_a"])] == seqs[1::2]
+            got = sub.get(timeout=0)
+            assert [e["seq"] for e in got] == seqs[1::2]
+            assert sub.lost == 0 and sub.get(timeout=0.05) == []
+
+        with trace_bus.subscribe(maxsize=2) as sub:
+            seqs = [trace_bus.publish("t_c") for _ in range(5)]
+            assert [e["seq"] for e in sub.get(timeout=0)] == seqs
+            assert sub.dropped == 3 and sub.lost == 0
+        assert trace_bus.stats()["subscribers"] == 0
+
+    def test_watch_wakes_on_publish(self):
+        import threading
+        import time
+        from agent.subconscious import trace_bus
+
+        async def scenario():
+            stream = trace_bus.watch(since=trace_bus.latest_seq(), types=["t_late"], idle_s=5)
+            assert await stream.__anext__() == []
+            threading.Timer(0.05, trace_bus.publish, ("t_other",)).start()
+            threading.Timer(0.1, trace_bus.publish, ("t_late",)).start()
+            t0 = time.perf_counter()
+            batch = await stream.__anext__()
+            waited = time.perf_counter() - t0
+            await stream.aclose()
+            return batch, waited
+
+        batch, waited = _run(scenario())
+        assert [e["type"] for e in batch] == ["t_late"] and waited < 1
+
+
+# ===================================================================
+# 17. Loop Scheduler
+# ===================================================================
+
+class TestLoopScheduler:
+    """timing heap → local loops concurrent, LLM loops one per provider, idle-aware."""
+
+    @staticmethod
+    def _loop(name, log, cost):
+        import time
+        from agent.subconscious.loops import BackgroundLoop, LoopConfig
+
+        def task():
+            start = time.monotonic()
+            time.sleep(cost)
+            log.append((name, start, time.monotonic()))
+
+        config = LoopConfig(interval_seconds=0.05, name=name, initial_delay=0.01)
+        return BackgroundLoop(config, task)
+
+    def test_lanes_and_user_activity(self, monkeypatch):
+        import time
+        from agent.subconscious.loops import scheduler
+        for name, provider in (("t_llm_a", "t_prov"), ("t_llm_b", "t_prov"), ("t_local", "")):
+            monkeypatch.setitem(scheduler._LOOP_PROVIDER_HINT, name, provider)
+        monkeypatch.setattr(scheduler, "_last_activity", None)
+        monkeypatch.setattr(scheduler, "_last_activity_source", None)
+        monkeypatch.setattr(scheduler, "_ACTIVITY_POLL_S", 0)
+
+        log = []
+        loops = [self._loop("t_llm_a", log, 0.1), self._loop("t_llm_b", log, 0.1),
+                 self._loop("t_local", log, 0.02)]
+        for loop in loops:
+            loop.start()
+        try:
+            time.sleep(0.8)
+            scheduler.note_user_activity("test")
+            noted = time.monotonic()
+            time.sleep(0.4)
+        finally:
+            for loop in loops:
+                loop.stop()
+
+        llm = sorted((start, end) for name, start, end in log if name != "t_local")
+        local = [(start, end) for name, start, end in log if name == "t_local"]
+        assert {name for name, _, _ in log} == {"t_llm_a", "t_llm_b", "t_local"}
+        # one provider lane: LLM runs never overlap, local runs overlap them
+        assert all(nxt[0] >= prev[1] for prev, nxt in zip(llm, llm[1:]))
+        assert any(ls < le and s < e for s, e in local for ls, le in llm)
+        # user active: LLM loops skip their ticks, local ones keep running
+        assert not [s for s, _ in llm if s > noted + 0.15]
+        assert [s for s, _ in local if s > noted + 0.15]
+
+        stats = loops[0].stats
+        assert stats["lane"] == "t_prov" and stats["sched_state"] == "idle"
+        assert stats["skip_counts"].get("user_active", 0) >= 1
+        assert stats["avg_queue_wait"] is not None and stats["avg_cost"] > 0
+        assert loops[2].stats["skip_counts"] == {}
+        summary = scheduler.summary()
+        assert summary["user_activity_source"] == "test" and summary["user_active"]
+        assert summary["run_counts"]["t_local"] == loops[2].stats["run_count"]
+
+    def test_activity_from_other_processes(self, tmp_path, monkeypatch):
+        from data.db import close_all_connections
+        from agent.subconscious.loops import scheduler
+        from agent.threads.log.schema import init_event_log_table, log_event
+        from outbox.schema import create_card, resolve_card
+
+        assert {"heartbeat", "feed_polling", "reflex_schedule"}.isdisjoint(scheduler.CHEAP_LOOPS)
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "activity.db"))
+        for name in ("_last_activity", "_last_activity_source", "_db_activity", "_db_checked_at"):
+            monkeypatch.setattr(scheduler, name, None)
+        monkeypatch.setattr(scheduler, "_ACTIVITY_POLL_S", 30)
+        try:
+            init_event_log_table()
+            assert not scheduler._user_active()
+            # written by another process: seen on the next poll
+            log_event(event_type="convo", data="hi", source="cli")
+            assert not scheduler._user_active()   # still inside the poll window
+            monkeypatch.setattr(scheduler, "_db_checked_at", None)
+            assert scheduler._user_active()
+
+            monkeypatch.setattr(scheduler, "_ACTIVITY_POLL_S", 0)
+            assert not scheduler._user_active()
+            resolve_card(create_card(motor="test", title="t", body="b"), "approved")
+            assert scheduler._user_active() and scheduler._last_activity_source == "user"
+
+            # the DB poll never runs under the scheduler lock
+            held = []
+            monkeypatch.setattr(scheduler, "_db_user_activity",
+                                lambda: held.append(scheduler._cond._is_owned()))
+            scheduler.summary()
+            assert held == [False]
+        finally:
+            close_all_connections()
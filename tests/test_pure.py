@@ -265,6 +265,49 @@ class TestConceptExtraction:
         assert len(result) <= 1
 
 
+# ===================================================================
+# Response Stream Filter (deltas → visible text)
+# ===================================================================
+
+class TestResponseStreamFilter:
+    """agent.services.response_stream — incremental tag / tool-block filter."""
+
+    REPLY = (
+        "Sure thing.\n\n<expected>user will ask</expected>\n\n\n\n"
+        "Ratio a:b, <b>bold</b> and a<b\n<Unknown>x</unknown>  \n\n"
+    )
+
+    def _stream(self, text, size, **kw):
+        from agent.services.response_stream import ResponseStreamFilter
+        filt = ResponseStreamFilter(**kw)
+        out = [filt.feed(text[i:i + size]) for i in range(0, len(text), size)]
+        out.append(filt.finish())
+        return filt, "".join(out)
+
+    def test_matches_batch_strip_for_any_split(self):
+        from agent.services.response_tags import parse_response_tags
+        expected = parse_response_tags(self.REPLY)[0]
+        for size in (1, 2, 3, 5, 8, len(self.REPLY)):
+            assert self._stream(self.REPLY, size)[1] == expected
+
+    def test_partial_tag_is_held(self):
+        from agent.services.response_stream import ResponseStreamFilter
+        filt = ResponseStreamFilter()
+        assert filt.feed("Hi <expe") == "Hi"
+        assert filt.feed("cted>x</expected> there") == "  there"
+
+    def test_unclosed_tag_released_at_finish(self):
+        _, text = self._stream("a <expected>never closed", 4)
+        assert text == "a <expected>never closed"
+
+    def test_tool_block_ends_visible_round(self):
+        reply = "Checking.\n:::execute\ntool: files\naction: read\npath: x\n:::\nhidden"
+        filt, text = self._stream(reply, 3)
+        assert filt.tool_block is True
+        assert text == "Checking."
+        assert filt.text == reply
+
+
 # ===================================================================
 # Feed Intelligence — pure helpers
 # ===================================================================
@@ -190,6 +190,391 @@ class TestCooccurrence:
         high_pairs = {(p["key_a"], p["key_b"]) for p in high["pairs"]}
         assert len(high_pairs) <= len(low_pairs)
 
+    def test_batch_scores_cache_writes_through(self, tmp_path, monkeypatch):
+        """cooccurrence_scores == per-key SQL formula, before and after new writes."""
+        import math
+        from data.db import get_connection, close_all_connections
+        from agent.threads.linking_core.cooccurrence import (
+            cooccurrence_scores, cooccurrence_stats, invalidate_cooccurrence,
+        )
+        from agent.threads.linking_core.schema import (
+            get_cooccurrence_score, record_cooccurrence, record_cooccurrence_batch,
+        )
+
+        def reference(key, ctx):
+            with closing(get_connection(readonly=True)) as conn:
+                total = 0.0
+                for c in ctx:
+                    a, b = sorted((key, c))
+                    row = conn.execute(
+                        "SELECT count FROM key_cooccurrence WHERE key_a = ? AND key_b = ?", (a, b),
+                    ).fetchone()
+                    if row:
+                        total += min(math.log(row[0] + 1) * 0.03, 0.15)
+            return min(total, 0.3)
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "cooc.db"))
+        invalidate_cooccurrence()
+        keys = ["identity.user.name", "identity.user.city", "philosophy.values", "coffee", "tea"]
+        ctx = ["identity.user.name", "coffee", "work.project"]
+        for _ in range(4):
+            record_cooccurrence_batch([(k, c) for k in keys for c in ctx[:2]])
+        record_cooccurrence("tea", "work.project")
+        try:
+            assert cooccurrence_scores(keys, ctx) == pytest.approx([reference(k, ctx) for k in keys])
+            loads = cooccurrence_stats()["loads"]
+            record_cooccurrence_batch([("philosophy.values", "work.project")] * 2 + [("tea", "coffee")])
+            assert cooccurrence_scores(keys, ctx) == pytest.approx([reference(k, ctx) for k in keys])
+            assert cooccurrence_stats()["loads"] == loads  # served from the updated shards
+            assert get_cooccurrence_score("tea", ctx) == pytest.approx(reference("tea", ctx))
+        finally:
+            invalidate_cooccurrence()
+            close_all_connections()
+
+
+# ===================================================================
+# Batched Hebbian concept links
+# ===================================================================
+
+class TestConceptLinkBatch:
+    """linking_core.schema.link_concepts_batch — one-transaction upserts."""
+
+    def _cleanup(self, prefix):
+        from data.db import get_connection
+        with closing(get_connection()) as conn:
+            conn.execute(
+                "DELETE FROM concept_links WHERE concept_a LIKE ? OR concept_b LIKE ?",
+                (prefix + "%", prefix + "%"),
+            )
+            conn.commit()
+
+    def _strength(self, a, b):
+        from data.db import get_connection
+        a, b = sorted((a, b))
+        with closing(get_connection(readonly=True)) as conn:
+            row = conn.execute(
+                "SELECT strength, fire_count FROM concept_links "
+                "WHERE concept_a = ? AND concept_b = ?",
+                (a, b),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def test_matches_sequential_link_concepts(self):
+        """Batch update lands on the same strengths as per-pair calls."""
+        from agent.threads.linking_core.schema import link_concepts, link_concepts_batch
+        self._cleanup("_test_lb")
+        try:
+            for _ in range(3):
+                link_concepts("_test_lb_seq_a", "_test_lb_seq_b", 0.2)
+            link_concepts_batch([("_test_lb_bat_b", "_test_lb_bat_a")] * 3, 0.2)
+            seq = self._strength("_test_lb_seq_a", "_test_lb_seq_b")
+            bat = self._strength("_test_lb_bat_a", "_test_lb_bat_b")
+            assert bat[0] == pytest.approx(seq[0])
+            assert bat[1] == seq[1] == 3
+        finally:
+            self._cleanup("_test_lb")
+
+    def test_counts_created_and_strengthened(self):
+        from agent.threads.linking_core.schema import link_concepts_batch
+        self._cleanup("_test_lc")
+        try:
+            first = link_concepts_batch([("_test_lc_a", "_test_lc_b")])
+            second = link_concepts_batch([
+                ("_test_lc_a", "_test_lc_b"),
+                ("_test_lc_a", "_test_lc_c", 0.4),
+            ])
+            assert first == {"linked": 1, "created": 1, "strengthened": 0}
+            assert second == {"linked": 2, "created": 1, "strengthened": 1}
+            assert self._strength("_test_lc_a", "_test_lc_c")[0] == pytest.approx(0.4)
+        finally:
+            self._cleanup("_test_lc")
+
+    def test_record_concept_cooccurrence_links_all_pairs(self):
+        from agent.threads.linking_core.schema import record_concept_cooccurrence
+        self._cleanup("_test_rc")
+        try:
+            n = record_concept_cooccurrence(["_test_rc_a", "_test_rc_b", "_test_rc_c", "_test_rc_a"])
+            assert n == 3
+            assert self._strength("_test_rc_b", "_test_rc_c") is not None
+        finally:
+            self._cleanup("_test_rc")
+
+
+# ===================================================================
+# In-memory concept graph (spread activation)
+# ===================================================================
+
+class TestConceptGraph:
+    """linking_core.graph.ConceptGraph — CSR spread vs the SQL reference."""
+
+    @pytest.fixture
+    def graph_db(self, tmp_path, monkeypatch):
+        import random
+        from data.db import get_connection, close_all_connections
+        from agent.threads.linking_core.graph import invalidate_concept_graph
+        from agent.threads.linking_core.schema import init_concept_links_table
+
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "graph.db"))
+        invalidate_concept_graph()
+        rng = random.Random(3)
+        names = [f"n{i}" for i in range(300)] + [f"n{i}.kid{j}" for i in range(10) for j in range(2)]
+        edges = set()
+        while len(edges) < 1500:
+            edges.add(tuple(sorted(rng.sample(names, 2))))
+        with closing(get_connection()) as conn:
+            init_concept_links_table(conn)
+            conn.executemany(
+                "INSERT INTO concept_links (concept_a, concept_b, strength) VALUES (?, ?, ?)",
+                [(a, b, rng.random()) for a, b in edges],
+            )
+            conn.commit()
+        yield names, rng
+        invalidate_concept_graph()
+        close_all_connections()
+
+    def _same(self, seeds, hops):
+        from agent.threads.linking_core.schema import _spread_activate_sql, spread_activate
+        sql = _spread_activate_sql(seeds, 0.1, hops, 50)
+        mem = spread_activate(seeds, 0.1, hops, 50)
+        assert sorted(r["activation"] for r in mem) == pytest.approx(
+            sorted(r["activation"] for r in sql)
+        )
+        return mem
+
+    def test_matches_sql_spread(self, graph_db):
+        names, rng = graph_db
+        for _ in range(10):
+            self._same(rng.sample(names, 3), hops=rng.choice([1, 2, 3]))
+
+    def test_hierarchical_children(self, graph_db):
+        results = self._same(["n0"], hops=1)
+        kids = {r["concept"]: r for r in results if r["concept"].startswith("n0.")}
+        assert set(kids) == {"n0.kid0", "n0.kid1"}
+        assert all(r["activation"] >= 0.8 for r in kids.values())
+
+    def test_children_drop_unlinked(self, graph_db):
+        from contextlib import closing
+        from data.db import get_connection
+        from agent.threads.linking_core.graph import get_concept_graph
+        from agent.threads.linking_core.schema import delete_link
+        graph = get_concept_graph()
+        assert graph.children("n0") == ["n0.kid0", "n0.kid1"]
+        with closing(get_connection(readonly=True)) as conn:
+            links = conn.execute(
+                "SELECT concept_a, concept_b FROM concept_links WHERE 'n0.kid0' IN (concept_a, concept_b)"
+            ).fetchall()
+        for a, b in links:
+            assert delete_link(a, b)
+        assert graph.children("n0") == ["n0.kid1"]
+        results = self._same(["n0"], hops=1)
+        assert {r["concept"] for r in results if r["concept"].startswith("n0.")} == {"n0.kid1"}
+
+    def test_paths_multiply_to_activation(self, graph_db):
+        from agent.threads.linking_core.graph import get_concept_graph
+        names, rng = graph_db
+        graph = get_concept_graph()
+        seeds = rng.sample(names[:300], 3)
+        for r in graph.spread(seeds, 0.1, 2, 50):
+            path = r["path"]
+            assert path[0] in seeds and path[-1] == r["concept"]
+            if path[-1].startswith(path[0] + "."):
+                continue
+            product = 1.0
+            for a, b in zip(path, path[1:]):
+                product *= dict(graph.neighbors(a, 0.0, 10_000))[b]
+            assert product == pytest.approx(r["activation"])
+
+    def test_spread_step_matches_per_source_neighbors(self, graph_db):
+        from agent.threads.linking_core.graph import get_concept_graph
+        names, rng = graph_db
+        graph = get_concept_graph()
+        acts = {c: rng.uniform(0.1, 1.0) for c in rng.sample(names, 60)}
+        acts["not_in_graph"] = 1.0
+        expected, count = {}, 0
+        for src, a in acts.items():
+            for nb, strength in graph.neighbors(src, min_strength=0.1, limit=8):
+                push = 0.35 * a * strength
+                if nb == src or push < 0.02:
+                    continue
+                expected[nb] = max(expected.get(nb, 0.0), push)
+                count += 1
+        deltas, n = graph.spread_step(acts, 0.35, min_strength=0.1, fanout=8, floor=0.02)
+        assert n == count
+        assert deltas == pytest.approx(expected)
+        assert graph.spread_step({}, 0.35) == ({}, 0)
+
+    def test_write_paths_update_loaded_graph(self, graph_db):
+        from agent.threads.linking_core.graph import get_concept_graph
+        from agent.threads.linking_core.schema import (
+            decay_concept_links, delete_link, link_concepts_batch,
+        )
+        names, rng = graph_db
+        get_concept_graph()  # load before writing
+        link_concepts_batch([("zz_new_a", "zz_new_b", 0.9)])
+        assert get_concept_graph().neighbors("zz_new_a") == [("zz_new_b", pytest.approx(0.9))]
+        delete_link("zz_new_b", "zz_new_a")
+        assert get_concept_graph().neighbors("zz_new_a") == []
+        decay_concept_links(0.5, 0.05)
+        for _ in range(5):
+            self._same(rng.sample(names, 3), hops=2)
+
+    def test_lazy_decay_reads_and_prune(self, graph_db):
+        import time
+        from data.db import get_connection
+        from agent.threads.linking_core.graph import (
+            LINK_DECAY, LINK_DECAY_PERIOD_S, get_concept_graph,
+        )
+        from agent.threads.linking_core.schema import (
+            decay_concept_links, get_links_for_concept,
+        )
+        with closing(get_connection()) as conn:
+            conn.execute(
+                "INSERT INTO concept_links (concept_a, concept_b, strength, strength_at) "
+                "VALUES ('zz_old', 'zz_peer', 0.8, ?), ('zz_faded', 'zz_peer', 0.8, ?)",
+                (time.time() - 10 * LINK_DECAY_PERIOD_S, time.time() - 200 * LINK_DECAY_PERIOD_S),
+            )
+            conn.commit()
+        expected = 0.8 * LINK_DECAY ** 10
+        sql = {r["concept"]: r["strength"] for r in get_links_for_concept("zz_peer")}
+        assert sql["zz_old"] == pytest.approx(expected, rel=1e-4)
+        assert dict(get_concept_graph().neighbors("zz_peer"))["zz_old"] == pytest.approx(expected, rel=1e-4)
+
+        with closing(get_connection()) as conn:
+            weak = conn.execute(
+                "SELECT COUNT(*) FROM concept_links WHERE strength < 0.05"
+            ).fetchone()[0]
+        assert decay_concept_links(min_strength=0.05) == weak + 1  # + zz_faded
+        with closing(get_connection()) as conn:
+            left = dict(conn.execute(
+                "SELECT concept_a, strength FROM concept_links WHERE concept_b = 'zz_peer'"
+            ).fetchall())
+        assert left == {"zz_old": 0.8}  # survivors are not rewritten
+        assert "zz_faded" not in dict(get_concept_graph().neighbors("zz_peer"))
+
+    def test_get_stats_matches_sql(self, graph_db):
+        from data.db import get_connection
+        from agent.threads.linking_core.schema import STRENGTH_SQL, delete_link, get_stats
+        with closing(get_connection(readonly=True)) as conn:
+            a, b = conn.execute("SELECT concept_a, concept_b FROM concept_links LIMIT 1").fetchone()
+        get_stats()
+        assert delete_link(a, b)  # a tombstone the graph must not count
+        with closing(get_connection(readonly=True)) as conn:
+            concepts = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT concept_a FROM concept_links "
+                "UNION SELECT concept_b FROM concept_links)"
+            ).fetchone()[0]
+            links, avg = conn.execute(
+                f"SELECT COUNT(*), AVG({STRENGTH_SQL}) FROM concept_links"
+            ).fetchone()
+        from data.db.table_stats import invalidate_table_counts
+        assert get_stats()["link_count"] == links + 1  # counter snapshot, TTL-cached
+        invalidate_table_counts()
+        stats = get_stats()
+        assert stats["concept_count"] == concepts and stats["link_count"] == links
+        assert stats["average_strength"] == pytest.approx(avg, abs=1e-3)
+
+    def test_strength_at_migration(self, tmp_path, monkeypatch):
+        import time
+        from data.db import close_all_connections, get_connection
+        from agent.threads.linking_core.schema import init_concept_links_table
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "legacy.db"))
+        try:
+            with closing(get_connection()) as conn:
+                conn.execute(
+                    "CREATE TABLE concept_links (concept_a TEXT, concept_b TEXT, "
+                    "strength REAL DEFAULT 0.5, PRIMARY KEY (concept_a, concept_b))"
+                )
+                conn.execute("INSERT INTO concept_links VALUES ('a', 'b', 0.9)")
+                conn.commit()
+            before = time.time()
+            init_concept_links_table()
+            init_concept_links_table()
+            with closing(get_connection()) as conn:
+                # Rows inserted without strength_at still get one
+                conn.execute("INSERT INTO concept_links (concept_a, concept_b, strength) VALUES ('c', 'd', 0.7)")
+                conn.commit()
+                stamps = [r[0] for r in conn.execute("SELECT strength_at FROM concept_links")]
+            assert len(stamps) == 2 and all(t is not None and t >= before - 1 for t in stamps)
+        finally:
+            close_all_connections()
+
+    def test_query_analysis_views_match_spread(self, graph_db, monkeypatch):
+        from agent.threads.linking_core import graph
+        from agent.threads.linking_core.query import QueryAnalysis
+        from agent.threads.linking_core.schema import spread_activate
+        names, rng = graph_db
+        monkeypatch.setattr(graph, "LINK_DECAY", 1.0)  # exact compare across calls
+        for _ in range(5):
+            seeds = rng.sample(names, 3)
+            analysis = QueryAnalysis(
+                query="", concepts=seeds,
+                activated=spread_activate(seeds, 0.1, 1, 30),
+            )
+            for threshold, limit in [(0.1, 20), (0.1, 10), (0.3, 5)]:
+                direct = spread_activate(seeds, threshold, 1, limit)
+                assert analysis.activations(threshold, limit) == direct
+
+
+# ===================================================================
+# Sparse graph attention (per-head CSR)
+# ===================================================================
+
+class TestGraphAttentionSparse:
+    """linking_core.attention — CSR assets give the dense tensor's results."""
+
+    @pytest.fixture
+    def asset_dirs(self, tmp_path):
+        import random
+        import numpy as np
+        from research.hebbian_attention.graph_to_matrix import (
+            graph_to_attention_bias_with_vocab, graph_to_attention_csr,
+        )
+        rng = random.Random(5)
+        prefixes = ["identity", "user", "tool", "value", "topic"]
+        vocab = [f"{rng.choice(prefixes)}.c{i}" for i in range(200)]
+        c2i = {c: i for i, c in enumerate(vocab)}
+        edges = []
+        for _ in range(800):
+            i, j = rng.sample(range(200), 2)
+            s = rng.random()
+            edges += [(i, j, s), (j, i, s)]
+        dense_dir, csr_dir = tmp_path / "dense", tmp_path / "csr"
+        for d in (dense_dir, csr_dir):
+            d.mkdir()
+            (d / "vocab.json").write_text(json.dumps({"concept_to_idx": c2i, "vocab_size": 200}))
+        np.save(dense_dir / "attention_bias.npy", graph_to_attention_bias_with_vocab(vocab, c2i, edges))
+        np.savez(csr_dir / "attention_bias_csr.npz", **graph_to_attention_csr(vocab, c2i, edges))
+        return dense_dir, csr_dir
+
+    def test_csr_is_memory_mapped(self, asset_dirs):
+        import numpy as np
+        from agent.threads.linking_core.attention import GraphAttention
+        ga = GraphAttention(data_dir=asset_dirs[1])
+        ga._load()
+        assert ga.available and ga.bias is None
+        assert isinstance(ga.data, np.memmap) and isinstance(ga.indices, np.memmap)
+        assert (ga.num_heads, ga.vocab_size) == (6, 200)
+
+    def test_matches_dense_attention(self, asset_dirs):
+        import numpy as np
+        from agent.threads.linking_core.attention import GraphAttention
+        dense, sparse = (GraphAttention(data_dir=d) for d in asset_dirs)
+        for query, seeds in [
+            ("identity c3 and user", ["identity.c3"]),
+            ("tool value c17", ["tool.c17", "value"]),
+            ("nothing matches", []),
+        ]:
+            qv = dense.encode_query(query, seeds)
+            np.testing.assert_allclose(
+                sparse.attend(qv)[0], dense.attend(qv)[0], rtol=1e-5, atol=1e-7
+            )
+            a = dense.shape_state(query, seeds)
+            b = sparse.shape_state(query, seeds)
+            assert b.head_priorities == pytest.approx(a.head_priorities)
+            assert b.query_concept_count == a.query_concept_count
+            for head, entries in a.top_concepts_per_head.items():
+                assert [c for c, _ in b.top_concepts_per_head[head]] == [c for c, _ in entries]
+
 
 # ===================================================================
 # Training Export includes User Feedback
@@ -447,6 +447,8 @@ def chunk_file(file_id: int, chunk_size: int = 500) -> int:
             chunks.append('\n'.join(current_chunk))
         
         # Clear old chunks
+        cursor.execute("SELECT id FROM workspace_chunks WHERE file_id = ?", (file_id,))
+        touched = [r[0] for r in cursor.fetchall()]
         cursor.execute("DELETE FROM workspace_chunks WHERE file_id = ?", (file_id,))
         cursor.execute("DELETE FROM workspace_fts WHERE rowid IN (SELECT id FROM workspace_chunks WHERE file_id = ?)", (file_id,))
         
@@ -458,6 +460,7 @@ def chunk_file(file_id: int, chunk_size: int = 500) -> int:
             """, (file_id, i, chunk, len(chunk.split())))
             
             chunk_id = cursor.lastrowid
+            touched.append(chunk_id)
             
             # Add to FTS
             cursor.execute("INSERT INTO workspace_fts (rowid, content) VALUES (?, ?)", 
@@ -467,9 +470,61 @@ def chunk_file(file_id: int, chunk_size: int = 500) -> int:
         cursor.execute("UPDATE workspace_files SET indexed = 1 WHERE id = ?", (file_id,))
         
         conn.commit()
+    from agent.threads.linking_core.vector_index import mark_dirty_safe
+    mark_dirty_safe("workspace_chunks", *touched)
     return len(chunks)
 
 
+def semantic_search_files(query: str, limit: int = 5, vector=None) -> List[Dict[str, Any]]:
+    """Find files by meaning via the workspace_chunks vector index.
+    
+    Same shape as search_files() (snippet = best-matching chunk), one
+    entry per file ranked by its best chunk.  Returns [] when embeddings
+    are unavailable or the index is still building.
+    """
+    try:
+        from agent.threads.linking_core.vector_index import search
+        hits = search("workspace_chunks", query, k=limit * 4, vector=vector)
+    except Exception:
+        return []
+    if not hits:
+        return []
+    
+    scores = {int(chunk_id): score for chunk_id, score in hits}
+    marks = ",".join("?" * len(scores))
+    with closing(get_connection(readonly=True)) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT wc.id, wf.path, wf.name, wf.mime_type, wf.size, wc.content
+            FROM workspace_chunks wc
+            JOIN workspace_files wf ON wc.file_id = wf.id
+            WHERE wc.id IN ({marks})
+        """, tuple(scores))
+        rows = cursor.fetchall()
+    
+    found = {row[0] for row in rows}
+    missing = [c for c in scores if c not in found]
+    if missing:
+        from agent.threads.linking_core.vector_index import mark_dirty_safe
+        mark_dirty_safe("workspace_chunks", *missing)  # deleted since indexed
+    
+    result: Dict[str, Dict[str, Any]] = {}
+    for row in sorted(rows, key=lambda r: scores[r[0]], reverse=True):
+        if row[1] in result:
+            continue
+        result[row[1]] = {
+            "path": row[1],
+            "name": row[2],
+            "mime_type": row[3],
+            "size": row[4],
+            "snippet": row[5][:300],
+            "score": round(scores[row[0]], 4),
+        }
+        if len(result) >= limit:
+            break
+    return list(result.values())
+
+
 def get_file_chunks(path: str) -> List[str]:
     """Get pre-chunked content for a file (LLM-ready)."""
     with closing(get_connection()) as conn: